@@ -265,6 +265,23 @@ Typical usage is:
     async for row in await db.execute("SELECT ..."):
         print(f"{row=})"""
 
+async_cursor_prefetch_bytes: contextvars.ContextVar[int | None]
+"""When set, async iteration of a :class:`Cursor` adapts how many rows
+are fetched at once.  The number of rows starts small and doubles
+each time the previous rows are all consumed, while the rows fetched
+at once are kept to around this many bytes.  Narrow rows end up
+fetched in large numbers, while wide rows are fetched a few at a
+time.  :attr:`async_cursor_prefetch` is then the maximum number of
+rows, defaulting to 65,536.  The default is ``None`` which uses the
+fixed :attr:`async_cursor_prefetch`.  See :doc:`async` for details.
+Typical usage is:
+
+.. code-block:: python
+
+  with apsw.aio.contextvar_set(apsw.async_cursor_prefetch_bytes, 1_000_000):
+    async for row in await db.execute("SELECT ..."):
+        print(f"{row=})"""
+
 async_run_coro: Callable[[Coroutine], Any]
 """When APSW encounters a :class:`~typing.Coroutine` this called to run
 it and block until getting the result.  The callable would typically
@@ -1407,9 +1424,54 @@ class Connection:
 
     cacheflush = cache_flush ## OLD-NAME
 
-    def cache_stats(self, include_entries: bool = False) -> dict[str, int]:
+    def cache_prepare(self, statements: str, *, prepare_flags: int = 0, explain: int = -1) -> int:
+        """Prepares *statements* and places them in the :ref:`statement cache
+        <statementcache>` without running them, so that a later
+        :meth:`execute` of the same text with the same *prepare_flags* and
+        *explain* is a cache hit.  Use this to warm up the cache of a new
+        connection with queries you know will be run.  Returns how many
+        statements were prepared.
+
+        Any errors, such as a table not existing yet, are raised just as
+        :meth:`execute` would.  Statements are prepared in order, so if more
+        are supplied than the cache size then the earliest are evicted.
+
+        .. seealso::
+
+          * :class:`apsw.ext.StatementWarmer`
+          * :meth:`cache_stats`"""
+        ...
+
+    def cache_resize(self, size: int, maximum: int = 0, *, track: bool = False) -> None:
+        """Changes the number of entries in the :ref:`statement cache
+        <statementcache>`.  If the cache shrinks then the least recently used
+        entries are discarded.
+
+        If *maximum* is larger than *size* then the cache is adaptive.  It
+        grows (up to *maximum* entries) when queries are being evicted and
+        then prepared again, and shrinks (down to *size* entries) when most
+        entries are not being used.  Use :meth:`cache_stats` to see the
+        current size and how often it changed.
+
+        If *track* is True then how long each statement took to prepare,
+        and which queries were evicted and then prepared again, are recorded
+        for :meth:`cache_stats`.  This costs a little on every prepare so it
+        is off by default.  Adaptive sizing always records evictions.
+
+        Sizes are clamped to between zero and 512.  A *size* of zero
+        disables the cache, including adaptive sizing.
+
+        .. seealso::
+
+          * :meth:`cache_stats`"""
+        ...
+
+    def cache_stats(self, include_entries: bool = False, top: int = -1) -> dict[str, int]:
         """Returns information about the statement cache as dict.
 
+        If *top* is zero or more then only that many `entries` are
+        included, in descending order of `uses`.
+
         .. note::
 
           Calling execute with "select a; select b; insert into c ..." will
@@ -1444,6 +1506,17 @@ class Connection:
               in the misses count.
           * - max_cacheable_bytes
             - Maximum size of query (in bytes of utf8) that will be considered for caching
+          * - reprepares
+            - Misses for a query that had previously been evicted.  A
+              large value relative to `misses` means the cache is too small
+              for the workload.  (Queries are matched by hash.)  Only counted
+              when tracking or adaptive sizing is on - see :meth:`cache_resize`
+          * - prepare_ns
+            - Total nanoseconds spent preparing statements.  Only measured
+              when tracking is on
+          * - resizes
+            - How many times adaptive sizing changed the size.  See
+              :meth:`cache_resize`
           * - entries
             - (Only present if `include_entries` is True) A list of the cache entries
 
@@ -1465,6 +1538,16 @@ class Connection:
               if >= 0
           * - uses
             - How many times this entry has been (re)used
+          * - evictions
+            - How many times this query was evicted from the cache and then
+              had to be prepared again.  Only counted when tracking or
+              adaptive sizing is on
+          * - prepare_ns
+            - How many nanoseconds it took to prepare.  Only measured when
+              tracking is on
+          * - age
+            - How many cache lookups have happened since this entry was last
+              used.  Zero means it was the most recent.
           * - has_more
             - Boolean indicating if there was more query text than
               the first statement"""
@@ -1650,6 +1733,69 @@ class Connection:
 
     createcollation = create_collation ## OLD-NAME
 
+    def create_columns_table(self, name: str, columns: dict[str, Buffer | Sequence[SQLiteValue]] | Any) -> None:
+        """Registers an `eponymous only
+        <https://www.sqlite.org/vtab.html#eponymous_only_virtual_tables>`__
+        read only virtual table named *name* whose rows come from
+        in memory columns.  Values from buffers and Arrow data are provided
+        to SQLite directly from C code, without calling any Python code or
+        creating Python objects.  This makes joins and queries against
+        analytics data cheap.
+
+        .. code-block:: python
+
+          connection.create_columns_table("readings", {
+              "sensor": array.array("q", sensors),
+              "value": array.array("d", values),
+              "label": labels,
+          })
+
+          connection.execute("select sensors.name, avg(readings.value) "
+                             "from readings join sensors on readings.sensor = sensors.id "
+                             "group by sensors.name")
+
+          # a pyarrow Table, polars DataFrame etc
+          connection.create_columns_table("frame", table)
+
+        *columns* can be a :class:`dict` mapping column names to columns
+        which must all be the same length.  Each column is one of:
+
+        * A contiguous one dimensional buffer such as :class:`array.array`,
+          :class:`memoryview`, or a numpy array.  Signed integers up to 64
+          bits, unsigned integers up to 32 bits, float, double, and bool
+          (``?``) formats are supported.
+        * A sequence (eg :class:`list`) of any :ref:`supported values
+          <types>`.  It is copied into a :class:`tuple`.  These are the only
+          columns where the GIL is needed to get values.
+
+        Alternatively *columns* can be an object supporting the `Arrow
+        PyCapsule interface
+        <https://arrow.apache.org/docs/format/CDataInterface/PyCapsuleInterface.html>`__
+        via ``__arrow_c_stream__`` (eg tables and data frames) or
+        ``__arrow_c_array__`` (eg record batches).  The Arrow data is
+        consumed immediately.  Null, boolean, integer (except 64 bit
+        unsigned), float, double, string, and binary columns are
+        supported, with dates, times, timestamps, and durations provided
+        as their underlying integer.
+
+        Buffers and Arrow data are kept (preventing resizing) until the
+        table is no longer registered and no statements using it remain.
+        That includes statements in the :ref:`statement cache
+        <statementcache>` - use :meth:`Connection.cache_resize` with zero
+        to discard them, with the data then released when the next
+        statement runs.  Do not modify buffer contents while queries are
+        running.
+
+        The rowid is the row number starting at zero, and rowid equality
+        and range constraints in queries are used to only visit the
+        relevant rows.
+
+        To unregister the table use :meth:`create_module` with *None*, or
+        call this again with the same name to replace it.
+
+        Calls: `sqlite3_create_module_v2 <https://sqlite.org/c3ref/create_module.html>`__"""
+        ...
+
     def create_module(self, name: str, datasource: VTModule | None, *, use_bestindex_object: bool = False, use_no_change: bool = False, iVersion: int = 1, eponymous: bool=False, eponymous_only: bool = False, read_only: bool = False) -> None:
         """Registers a virtual table, or drops it if *datasource* is *None*.
         See :ref:`virtualtables` for details.
@@ -1877,7 +2023,7 @@ class Connection:
         See :meth:`Cursor.execute` for more details, and the :ref:`example <example_executing_sql>`."""
         ...
 
-    def executemany(self, statements: str, sequenceofbindings:Iterable[Bindings], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1) -> Cursor:
+    def executemany(self, statements: str, sequenceofbindings: Iterable[Bindings] | tuple[Sequence[SQLiteValue] | Buffer, ...], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1, columns: bool = False) -> Cursor:
         """This method is for when you want to execute the same statements over a
         sequence of bindings, such as inserting into a database.  (A cursor is
         automatically obtained).
@@ -2670,6 +2816,48 @@ class Cursor:
 
 
 
+    def __arrow_c_stream__(self, requested_schema: object | None = None, *, batch_rows: int = 65536) -> object:
+        """Provides the remaining result rows as `Arrow
+        <https://arrow.apache.org>`__ record batches using the `PyCapsule
+        interface
+        <https://arrow.apache.org/docs/format/CDataInterface/PyCapsuleInterface.html>`__.
+        Values are copied directly from SQLite into Arrow buffers without
+        creating Python objects, and without needing any Arrow library
+        installed.  Libraries like pyarrow, polars, and duckdb can consume
+        the cursor directly.
+
+        .. code-block:: python
+
+          cursor.execute("select id, name, score from results")
+          table = pyarrow.RecordBatchReader.from_stream(cursor).read_all()
+
+        Each column's Arrow type comes from the first non-null value -
+        int64, double, large_utf8, or large_binary.  A column of only nulls
+        in the first batch uses its declared type instead, following
+        SQLite's `affinity rules
+        <https://sqlite.org/datatype3.html#determination_of_column_affinity>`__
+        with NUMERIC as double, and large_binary for expressions and columns
+        without a declared type.  Integers are also accepted in
+        double columns, and numbers in text columns are converted to text.
+        Blob columns accept any value.  Other values end the stream with an
+        error, leaving the row unconsumed.  Use `CAST
+        <https://sqlite.org/lang_expr.html#castexpr>`__ in your query to
+        control the types.
+
+        *requested_schema* is ignored.  Rows are not fetched until the
+        stream is read, and the cursor should not be used for anything else
+        until then.  If the SQL consisted of multiple statements, then the
+        stream ends at a statement with a different number of columns.
+
+        Row tracers are not called.  This is not available in async mode,
+        but can be used in :meth:`Connection.async_run`.
+
+        .. seealso::
+
+          * :meth:`fetch_columns`
+          * :meth:`fetch_into`"""
+        ...
+
     bindings_count: int
     """How many bindings are in the statement.  The ``?`` form
     results in the largest number.  For example you could do
@@ -2807,7 +2995,7 @@ class Cursor:
           * `sqlite3_stmt_explain <https://sqlite.org/c3ref/stmt_explain.html>`__"""
         ...
 
-    def executemany(self, statements: str, sequenceofbindings: Iterable[Bindings], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1) -> Cursor:
+    def executemany(self, statements: str, sequenceofbindings: Iterable[Bindings] | tuple[Sequence[SQLiteValue] | Buffer, ...], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1, columns: bool = False) -> Cursor:
         """This method is for when you want to execute the same statements over
         a sequence of bindings.  Conceptually it does this::
 
@@ -2816,7 +3004,24 @@ class Cursor:
 
         The return is the cursor itself which acts as an iterator.  Your
         statements can return data.  See :meth:`~Cursor.execute` for more
-        information, and the :ref:`example <example_executemany>`."""
+        information, and the :ref:`example <example_executemany>`.
+
+        If *columns* is True then *sequenceofbindings* must be a tuple
+        with one item per binding, each being all the values for that
+        binding.  All the columns must be the same length.  A column can be
+        a sequence of values, or a contiguous buffer of 32 or 64 bit
+        integers or doubles such as :class:`array.array` or a numpy array.
+        Values in buffers are bound directly without creating Python
+        objects.
+
+        .. code-block:: python
+
+          cursor.executemany("insert into samples values(?, ?, ?)",
+                             (sensor_names, array.array("q", timestamps), readings),
+                             columns=True)
+
+        This avoids creating a tuple for each row, only for it to be
+        unpacked again."""
         ...
 
     expanded_sql: str
@@ -2837,6 +3042,73 @@ class Cursor:
 
     Calls: `sqlite3_expanded_sql <https://sqlite.org/c3ref/expanded_sql.html>`__"""
 
+    def fetch_columns(self, count: int = -1) -> tuple[list[SQLiteValue], ...]:
+        """Returns up to *count* of the remaining result rows in columnar
+        form, as a tuple with one list per result column.  A negative
+        *count* means all remaining rows.  An empty tuple is returned when
+        there are no more rows.
+
+        .. code-block:: python
+
+          cursor.execute("select x, y from points")
+          xs, ys = cursor.fetch_columns()
+
+        This avoids creating a tuple per row, which is most of the work
+        when fetching many rows with few columns, and is the layout wanted
+        by numeric and dataframe libraries.
+
+        If the SQL consisted of multiple statements, then fetching stops at
+        the end of a statement if the next one has a different number of
+        columns.  The next call continues with that statement.
+
+        Row tracers are not called when using this method.
+
+        .. seealso::
+
+          * :meth:`fetchall`
+          * :attr:`get`"""
+        ...
+
+    def fetch_into(self, buffers: Sequence[Buffer | None]) -> int:
+        """Fills caller supplied numeric arrays with the remaining result rows,
+        without creating a Python object per value.  This is the result
+        side equivalent of :meth:`apsw.carray`.
+
+        There must be one item in *buffers* per result column.  Each is
+        either ``None`` to ignore that column, or a writable contiguous
+        buffer such as :class:`array.array`, :class:`memoryview`, or a
+        numpy array.  The buffer format must be 64 bit integers (``q``,
+        ``l``, ``i`` of size 8) or doubles (``d``).  Rows are stored until
+        there are no more rows, or the smallest buffer is full.  The number
+        of rows stored is returned.
+
+        .. code-block:: python
+
+          when = array.array("q", [0]) * 10_000
+          reading = array.array("d", [0]) * 10_000
+
+          cursor.execute("select ts, reading from samples")
+          while (count := cursor.fetch_into((when, reading))):
+            process(when[:count], reading[:count])
+
+        Integer buffers require integer values.  Double buffers accept
+        integer and float values, with null stored as NaN.  Any other value
+        results in :exc:`TypeError`, and the row is not consumed so it can
+        be fetched by other means.  If rows have already been stored by the
+        call then their count is returned instead, with the next call
+        raising the exception.
+
+        If the SQL consisted of multiple statements, then fetching stops at
+        the end of a statement if the next one has a different number of
+        columns.
+
+        Row tracers are not called when using this method.
+
+        .. seealso::
+
+          * :meth:`fetch_columns`"""
+        ...
+
     def fetchall(self) -> list[SQLiteValues]:
         """Returns all remaining result rows as a list.  This method is defined
         in DBAPI.  See :meth:`get` which does the same thing, but with the least
@@ -3164,6 +3436,86 @@ class FTS5Tokenizer:
     name: str
     """Tokenizer name"""
 
+@final
+class IOStatsVFS:
+    """A pass through VFS implemented in C that records how many
+    operations of each kind happen, how many bytes are moved, and how
+    long they take.  It is intended to be cheap enough to leave on in
+    production, unlike measuring with a :class:`VFS` implemented in
+    Python.  Statistics are kept per file type, and are read with
+    :meth:`snapshot`.
+
+    .. code-block:: python
+
+      stats = apsw.IOStatsVFS("iostats")
+      con = apsw.Connection("database.db", vfs="iostats")
+      ...
+      print(stats.snapshot()["main_db"]["read"])
+
+    The VFS is unregistered when this object is garbage collected,
+    which won't happen while files opened through it are still open."""
+
+    def __init__(self, name: str, base: str | None = None, makedefault: bool = False):
+        """:param name: The name to register this vfs under.  If the name
+            already exists then this vfs will replace the prior one of the
+            same name.
+        :param base: The vfs to pass everything through to, with *None* or
+            an empty string meaning the default vfs.  It can be a
+            :class:`VFS` implemented in Python.
+        :param makedefault: Whether this becomes the default vfs.
+
+        :raises ValueError: If the base vfs is not found.
+
+        Calls:
+          * `sqlite3_vfs_register <https://sqlite.org/c3ref/vfs_find.html>`__
+          * `sqlite3_vfs_find <https://sqlite.org/c3ref/vfs_find.html>`__"""
+        ...
+
+    def snapshot(self, reset: bool = False) -> dict[str, dict[str, Any]]:
+        """Returns the statistics so far, optionally resetting them to zero
+        atomically.  Only file types that have been used are included,
+        from ``main_db``, ``main_journal``, ``wal``, ``temp_db``,
+        ``temp_journal``, ``transient_db``, ``subjournal``,
+        ``super_journal``, and ``other``.
+
+        Each file type is a dict with ``opens`` being how many files were
+        opened, and a dict for each of ``read``, ``write``, ``sync``,
+        ``truncate``, ``lock``, ``unlock``, ``shm_lock`` (:ref:`WAL <wal>`
+        locking), and ``fetch`` (`memory mapped <https://sqlite.org/mmap.html>`__
+        reads).
+
+        .. list-table::
+          :header-rows: 1
+          :widths: auto
+
+          * - Key
+            - Explanation
+          * - count
+            - How many calls were made
+          * - bytes
+            - Bytes requested for ``read`` and ``write``, and bytes
+              mapped for ``fetch``
+          * - errors
+            - How many calls failed.  Short reads are not counted as errors.
+          * - ns
+            - Total nanoseconds spent in the calls
+          * - histogram
+            - A list of how many calls had each latency.  Item *i* counts
+              calls taking less than 2 ** *i* microseconds (and at least
+              the previous item's limit), with the last item also counting
+              everything longer.
+
+        :param reset: Zero the statistics after taking the snapshot"""
+        ...
+
+    def unregister(self) -> None:
+        """Unregisters the VFS making it unavailable to future database
+        opens.  Databases already open continue to be counted.  It is
+        safe to call this routine multiple times.
+
+        Calls: `sqlite3_vfs_unregister <https://sqlite.org/c3ref/vfs_find.html>`__"""
+        ...
+
 @final
 class IndexInfo:
     """IndexInfo represents the `sqlite3_index_info
@@ -3674,7 +4026,10 @@ class VFSFile:
 
           If the VFS that you inherit from supports :ref:`write ahead
           logging <wal>` then your :class:`VFSFile` will also support the
-          xShm methods necessary to implement wal.
+          xShm methods necessary to implement wal.  If it also supports
+          `memory mapped I/O <https://sqlite.org/mmap.html>`__ and your
+          class does not override :meth:`~VFSFile.xRead` or
+          :meth:`~VFSFile.xReadInto` then memory mapping is available too.
 
         .. seealso::
 
@@ -3760,6 +4115,27 @@ class VFSFile:
         :param offset: Where to start reading."""
         ...
 
+    def xReadInto(self, buffer: Buffer, offset: int) -> int:
+        """Read into the writable *buffer* starting at *offset* in the file,
+        returning how many bytes were read.  Returning less than the
+        buffer length is a short read, and SQLite gets zeroes for the
+        remainder.
+
+        This is an alternative to :meth:`xRead` that avoids allocating
+        and copying a :class:`bytes` for every read.  It is only used if
+        your class defines or overrides it, in which case SQLite's own
+        memory is provided as a :class:`memoryview` that is released
+        when your method returns.  You must not keep references to
+        *buffer* or anything derived from it, and should update it in
+        place such as ``buffer[:] = data`` or passing it to
+        ``super().xReadInto(buffer, offset)`` and then transforming it.
+
+        :param buffer: Writable buffer, whose length is the amount to read
+        :param offset: Where to start reading.
+
+        :raises BufferError: If *buffer* is not writable"""
+        ...
+
     def xSectorSize(self) -> int:
         """Return the native underlying sector size. SQLite uses the value
         returned in determining the default database page size. If you do
@@ -4171,6 +4547,62 @@ class VTModule(Protocol):
         a *table_suffix* of :code:`content`"""
         ...
 
+class VTRowCursor:
+    """A base class implementing :class:`VTCursor` methods in C for rows
+    coming from a Python iterator.  :meth:`apsw.ext.make_virtual_module`
+    uses this so that getting values does not need Python code.  Your
+    subclass provides :meth:`~VTCursor.Filter` which calls
+    :meth:`set_rows`.  SQLite's calls for :meth:`Eof`, :meth:`Next`,
+    :meth:`Column`, and :meth:`Rowid` are then handled directly in C,
+    unless your subclass overrides them."""
+
+    def Close(self) -> None:
+        """Closes the rows iterator if it has not reached the end."""
+        ...
+
+    def Column(self, number: int) -> SQLiteValue:
+        """Returns the value of column *number* in the current row.  Numbers
+        past the row columns come from *hidden_values*, and -1 returns the
+        :meth:`Rowid`.  Values are found using ``row[number]``,
+        ``row[columns[number]]``, or ``getattr(row, columns[number])``
+        depending on *access*."""
+        ...
+
+    def Eof(self) -> bool:
+        """Returns *True* if the end of the rows has been reached."""
+        ...
+
+    def Next(self) -> None:
+        """Advances to the next row."""
+        ...
+
+    def Rowid(self) -> int:
+        """Returns the *primary_key* column, or the :func:`id` of the current
+        row."""
+        ...
+
+    current_row: Any
+    """The current row object, or *None* if there isn't one."""
+
+    def set_rows(self, rows: Iterator[Any], hidden_values: tuple[SQLiteValue, ...] | list[SQLiteValue], columns: tuple[str, ...], access: int, repr_invalid: bool = False, primary_key: int | None = None) -> None:
+        """Starts iterating over *rows*, which is immediately advanced to the
+        first row.
+
+        :param rows: Each item is a row, with the iterator's ``close`` method
+           called when the end is reached.
+        :param hidden_values: Values for columns after *columns*, such as
+           :meth:`apsw.ext.make_virtual_module` parameters.  If it is a
+           list then changes made while iterating *rows* are used for
+           following rows.
+        :param columns: Column names
+        :param access: The value of a :class:`apsw.ext.VTColumnAccess` member saying
+           how column values are found in each row
+        :param repr_invalid: If *True* then values that are not valid
+           :class:`SQLiteValue` are converted to a string using :func:`repr`
+        :param primary_key: Which column is the rowid.  If *None* then the
+           :func:`id` of the row is used."""
+        ...
+
 class VTTable(Protocol):
     """.. note::
 
@@ -6408,9 +6840,54 @@ class AsyncConnection:
         Calls: `sqlite3_db_cacheflush <https://sqlite.org/c3ref/db_cacheflush.html>`__"""
         ...
 
-    def cache_stats(self, include_entries: bool = False) -> dict[str, int]:
+    async def cache_prepare(self, statements: str, *, prepare_flags: int = 0, explain: int = -1) -> int:
+        """Prepares *statements* and places them in the :ref:`statement cache
+        <statementcache>` without running them, so that a later
+        :meth:`execute` of the same text with the same *prepare_flags* and
+        *explain* is a cache hit.  Use this to warm up the cache of a new
+        connection with queries you know will be run.  Returns how many
+        statements were prepared.
+
+        Any errors, such as a table not existing yet, are raised just as
+        :meth:`execute` would.  Statements are prepared in order, so if more
+        are supplied than the cache size then the earliest are evicted.
+
+        .. seealso::
+
+          * :class:`apsw.ext.StatementWarmer`
+          * :meth:`cache_stats`"""
+        ...
+
+    async def cache_resize(self, size: int, maximum: int = 0, *, track: bool = False) -> None:
+        """Changes the number of entries in the :ref:`statement cache
+        <statementcache>`.  If the cache shrinks then the least recently used
+        entries are discarded.
+
+        If *maximum* is larger than *size* then the cache is adaptive.  It
+        grows (up to *maximum* entries) when queries are being evicted and
+        then prepared again, and shrinks (down to *size* entries) when most
+        entries are not being used.  Use :meth:`cache_stats` to see the
+        current size and how often it changed.
+
+        If *track* is True then how long each statement took to prepare,
+        and which queries were evicted and then prepared again, are recorded
+        for :meth:`cache_stats`.  This costs a little on every prepare so it
+        is off by default.  Adaptive sizing always records evictions.
+
+        Sizes are clamped to between zero and 512.  A *size* of zero
+        disables the cache, including adaptive sizing.
+
+        .. seealso::
+
+          * :meth:`cache_stats`"""
+        ...
+
+    def cache_stats(self, include_entries: bool = False, top: int = -1) -> dict[str, int]:
         """Returns information about the statement cache as dict.
 
+        If *top* is zero or more then only that many `entries` are
+        included, in descending order of `uses`.
+
         .. note::
 
           Calling execute with "select a; select b; insert into c ..." will
@@ -6445,6 +6922,17 @@ class AsyncConnection:
               in the misses count.
           * - max_cacheable_bytes
             - Maximum size of query (in bytes of utf8) that will be considered for caching
+          * - reprepares
+            - Misses for a query that had previously been evicted.  A
+              large value relative to `misses` means the cache is too small
+              for the workload.  (Queries are matched by hash.)  Only counted
+              when tracking or adaptive sizing is on - see :meth:`cache_resize`
+          * - prepare_ns
+            - Total nanoseconds spent preparing statements.  Only measured
+              when tracking is on
+          * - resizes
+            - How many times adaptive sizing changed the size.  See
+              :meth:`cache_resize`
           * - entries
             - (Only present if `include_entries` is True) A list of the cache entries
 
@@ -6466,6 +6954,16 @@ class AsyncConnection:
               if >= 0
           * - uses
             - How many times this entry has been (re)used
+          * - evictions
+            - How many times this query was evicted from the cache and then
+              had to be prepared again.  Only counted when tracking or
+              adaptive sizing is on
+          * - prepare_ns
+            - How many nanoseconds it took to prepare.  Only measured when
+              tracking is on
+          * - age
+            - How many cache lookups have happened since this entry was last
+              used.  Zero means it was the most recent.
           * - has_more
             - Boolean indicating if there was more query text than
               the first statement"""
@@ -6645,6 +7143,69 @@ class AsyncConnection:
         Calls: `sqlite3_create_collation_v2 <https://sqlite.org/c3ref/create_collation.html>`__"""
         ...
 
+    async def create_columns_table(self, name: str, columns: dict[str, Buffer | Sequence[SQLiteValue]] | Any) -> None:
+        """Registers an `eponymous only
+        <https://www.sqlite.org/vtab.html#eponymous_only_virtual_tables>`__
+        read only virtual table named *name* whose rows come from
+        in memory columns.  Values from buffers and Arrow data are provided
+        to SQLite directly from C code, without calling any Python code or
+        creating Python objects.  This makes joins and queries against
+        analytics data cheap.
+
+        .. code-block:: python
+
+          connection.create_columns_table("readings", {
+              "sensor": array.array("q", sensors),
+              "value": array.array("d", values),
+              "label": labels,
+          })
+
+          connection.execute("select sensors.name, avg(readings.value) "
+                             "from readings join sensors on readings.sensor = sensors.id "
+                             "group by sensors.name")
+
+          # a pyarrow Table, polars DataFrame etc
+          connection.create_columns_table("frame", table)
+
+        *columns* can be a :class:`dict` mapping column names to columns
+        which must all be the same length.  Each column is one of:
+
+        * A contiguous one dimensional buffer such as :class:`array.array`,
+          :class:`memoryview`, or a numpy array.  Signed integers up to 64
+          bits, unsigned integers up to 32 bits, float, double, and bool
+          (``?``) formats are supported.
+        * A sequence (eg :class:`list`) of any :ref:`supported values
+          <types>`.  It is copied into a :class:`tuple`.  These are the only
+          columns where the GIL is needed to get values.
+
+        Alternatively *columns* can be an object supporting the `Arrow
+        PyCapsule interface
+        <https://arrow.apache.org/docs/format/CDataInterface/PyCapsuleInterface.html>`__
+        via ``__arrow_c_stream__`` (eg tables and data frames) or
+        ``__arrow_c_array__`` (eg record batches).  The Arrow data is
+        consumed immediately.  Null, boolean, integer (except 64 bit
+        unsigned), float, double, string, and binary columns are
+        supported, with dates, times, timestamps, and durations provided
+        as their underlying integer.
+
+        Buffers and Arrow data are kept (preventing resizing) until the
+        table is no longer registered and no statements using it remain.
+        That includes statements in the :ref:`statement cache
+        <statementcache>` - use :meth:`Connection.cache_resize` with zero
+        to discard them, with the data then released when the next
+        statement runs.  Do not modify buffer contents while queries are
+        running.
+
+        The rowid is the row number starting at zero, and rowid equality
+        and range constraints in queries are used to only visit the
+        relevant rows.
+
+        To unregister the table use :meth:`create_module` with *None*, or
+        call this again with the same name to replace it.
+
+        Calls: `sqlite3_create_module_v2 <https://sqlite.org/c3ref/create_module.html>`__"""
+        ...
+
     async def create_module(self, name: str, datasource: VTModule | None, *, use_bestindex_object: bool = False, use_no_change: bool = False, iVersion: int = 1, eponymous: bool=False, eponymous_only: bool = False, read_only: bool = False) -> None:
         """Registers a virtual table, or drops it if *datasource* is *None*.
         See :ref:`virtualtables` for details.
@@ -6841,7 +7402,7 @@ class AsyncConnection:
         See :meth:`Cursor.execute` for more details, and the :ref:`example <example_executing_sql>`."""
         ...
 
-    async def executemany(self, statements: str, sequenceofbindings:Iterable[Bindings], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1)  -> AsyncCursor:
+    async def executemany(self, statements: str, sequenceofbindings: Iterable[Bindings] | tuple[Sequence[SQLiteValue] | Buffer, ...], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1, columns: bool = False)  -> AsyncCursor:
         """This method is for when you want to execute the same statements over a
         sequence of bindings, such as inserting into a database.  (A cursor is
         automatically obtained).
@@ -7701,7 +8262,7 @@ class AsyncCursor:
           * `sqlite3_stmt_explain <https://sqlite.org/c3ref/stmt_explain.html>`__"""
         ...
 
-    async def executemany(self, statements: str, sequenceofbindings: Iterable[Bindings], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1)  -> AsyncCursor:
+    async def executemany(self, statements: str, sequenceofbindings: Iterable[Bindings] | tuple[Sequence[SQLiteValue] | Buffer, ...], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1, columns: bool = False)  -> AsyncCursor:
         """This method is for when you want to execute the same statements over
         a sequence of bindings.  Conceptually it does this::
 
@@ -7710,7 +8271,24 @@ class AsyncCursor:
 
         The return is the cursor itself which acts as an iterator.  Your
         statements can return data.  See :meth:`~Cursor.execute` for more
-        information, and the :ref:`example <example_executemany>`."""
+        information, and the :ref:`example <example_executemany>`.
+
+        If *columns* is True then *sequenceofbindings* must be a tuple
+        with one item per binding, each being all the values for that
+        binding.  All the columns must be the same length.  A column can be
+        a sequence of values, or a contiguous buffer of 32 or 64 bit
+        integers or doubles such as :class:`array.array` or a numpy array.
+        Values in buffers are bound directly without creating Python
+        objects.
+
+        .. code-block:: python
+
+          cursor.executemany("insert into samples values(?, ?, ?)",
+                             (sensor_names, array.array("q", timestamps), readings),
+                             columns=True)
+
+        This avoids creating a tuple for each row, only for it to be
+        unpacked again."""
         ...
 
     expanded_sql: Awaitable[str]
@@ -7731,6 +8309,73 @@ class AsyncCursor:
 
     Calls: `sqlite3_expanded_sql <https://sqlite.org/c3ref/expanded_sql.html>`__"""
 
+    async def fetch_columns(self, count: int = -1) -> tuple[list[SQLiteValue], ...]:
+        """Returns up to *count* of the remaining result rows in columnar
+        form, as a tuple with one list per result column.  A negative
+        *count* means all remaining rows.  An empty tuple is returned when
+        there are no more rows.
+
+        .. code-block:: python
+
+          cursor.execute("select x, y from points")
+          xs, ys = cursor.fetch_columns()
+
+        This avoids creating a tuple per row, which is most of the work
+        when fetching many rows with few columns, and is the layout wanted
+        by numeric and dataframe libraries.
+
+        If the SQL consisted of multiple statements, then fetching stops at
+        the end of a statement if the next one has a different number of
+        columns.  The next call continues with that statement.
+
+        Row tracers are not called when using this method.
+
+        .. seealso::
+
+          * :meth:`fetchall`
+          * :attr:`get`"""
+        ...
+
+    async def fetch_into(self, buffers: Sequence[Buffer | None]) -> int:
+        """Fills caller supplied numeric arrays with the remaining result rows,
+        without creating a Python object per value.  This is the result
+        side equivalent of :meth:`apsw.carray`.
+
+        There must be one item in *buffers* per result column.  Each is
+        either ``None`` to ignore that column, or a writable contiguous
+        buffer such as :class:`array.array`, :class:`memoryview`, or a
+        numpy array.  The buffer format must be 64 bit integers (``q``,
+        ``l``, ``i`` of size 8) or doubles (``d``).  Rows are stored until
+        there are no more rows, or the smallest buffer is full.  The number
+        of rows stored is returned.
+
+        .. code-block:: python
+
+          when = array.array("q", [0]) * 10_000
+          reading = array.array("d", [0]) * 10_000
+
+          cursor.execute("select ts, reading from samples")
+          while (count := cursor.fetch_into((when, reading))):
+            process(when[:count], reading[:count])
+
+        Integer buffers require integer values.  Double buffers accept
+        integer and float values, with null stored as NaN.  Any other value
+        results in :exc:`TypeError`, and the row is not consumed so it can
+        be fetched by other means.  If rows have already been stored by the
+        call then their count is returned instead, with the next call
+        raising the exception.
+
+        If the SQL consisted of multiple statements, then fetching stops at
+        the end of a statement if the next one has a different number of
+        columns.
+
+        Row tracers are not called when using this method.
+
+        .. seealso::
+
+          * :meth:`fetch_columns`"""
+        ...
+
     async def fetchall(self) -> list[SQLiteValues]:
         """Returns all remaining result rows as a list.  This method is defined
         in DBAPI.  See :meth:`get` which does the same thing, but with the least
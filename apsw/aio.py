@@ -3,15 +3,19 @@
 from __future__ import annotations
 
 import asyncio
+import collections
 import contextlib
 import contextvars
+import dataclasses
+import heapq
+import itertools
 import logging
 import math
 import queue
 import sys
 import threading
 import time
-from collections.abc import Callable, Coroutine
+from collections.abc import AsyncIterator, Callable, Coroutine, Iterable
 from typing import Any, TypeVar
 
 import apsw
@@ -94,6 +98,29 @@ This is only used during connection creation.  Typical usage is:
         db = await apsw.Connection.as_async(...)
 """
 
+priority: contextvars.ContextVar[int] = contextvars.ContextVar("apsw.aio.priority", default=0)
+"""Priority for calls waiting to be run by a connection's worker
+
+Calls on a connection are run one at a time.  When several are
+waiting, those with a lower priority value run first.  Amongst equal
+priorities the one with the earliest :attr:`deadline` runs first, and
+otherwise they run in the order they were made.  This lets short
+interactive queries jump ahead of queued batch work.  A call that is
+already running is not interrupted.
+
+The priority is read at the point an APSW call is made.  Typical
+usage is:
+
+.. code-block:: python
+
+    # let lookups go first
+    with apsw.aio.contextvar_set(apsw.aio.priority, 10):
+        await db.execute("INSERT INTO report SELECT ...")
+
+Calls with a higher value can wait indefinitely while lower value
+calls keep arriving.
+"""
+
 
 if sys.version_info >= (3, 14):
 
@@ -139,6 +166,88 @@ async def make_session(db: apsw.AsyncConnection, schema: str) -> apsw.AsyncSessi
     return await db.async_run(apsw.Session, db, schema)
 
 
+async def blob_chunks(
+    blob: apsw.AsyncBlob, *, chunk_size: int = 65536, read_ahead: int = 4
+) -> AsyncIterator[memoryview]:
+    """Async iterator reading an async blob from its current position to the end
+
+    Each trip to the worker thread reads *read_ahead* chunks into a new
+    :class:`bytearray`, and :class:`memoryview` of each *chunk_size*
+    piece are then provided without copying.  At most *chunk_size*
+    times *read_ahead* bytes are read at once, so large blobs can be
+    sent, such as by a web server, without reading them all into
+    memory.
+
+    .. code-block:: python
+
+        blob = await db.blob_open("main", "media", "content", rowid, False)
+        async with blob:
+            async for chunk in apsw.aio.blob_chunks(blob):
+                await response.write(chunk)
+    """
+    if chunk_size < 1 or read_ahead < 1:
+        raise ValueError(f"{chunk_size=} and {read_ahead=} must be at least 1")
+    while (remaining := blob.length() - blob.tell()) > 0:
+        buffer = bytearray(min(remaining, chunk_size * read_ahead))
+        await blob.read_into(buffer)
+        view = memoryview(buffer)
+        for offset in range(0, len(buffer), chunk_size):
+            yield view[offset : offset + chunk_size]
+
+
+class BlobWriter:
+    """Buffers writes to an async blob, making fewer trips to the worker thread
+
+    Data passed to :meth:`write` is collected until there is at least
+    *buffer_size* bytes, which is then written to the blob at its
+    current position in one call.  Use :meth:`flush` or :meth:`aclose`
+    (including via ``async with``) to write any remaining data.  The
+    blob is not closed.
+
+    .. code-block:: python
+
+        await db.execute("INSERT INTO media(content) VALUES(zeroblob(?))", (size,))
+        blob = await db.blob_open("main", "media", "content", db.last_insert_rowid(), True)
+        async with blob, apsw.aio.BlobWriter(blob) as writer:
+            async for data in request.stream():
+                await writer.write(data)
+
+    The blob size can't be changed, so writing beyond its end raises
+    :exc:`ValueError` when the data is flushed.
+    """
+
+    def __init__(self, blob: apsw.AsyncBlob, *, buffer_size: int = 262144):
+        if buffer_size < 1:
+            raise ValueError(f"{buffer_size=} must be at least 1")
+        self.blob = blob
+        "The blob being written to"
+        self.buffer_size = buffer_size
+        "How many bytes are collected before writing"
+        self._buffer = bytearray()
+
+    async def write(self, data: bytes | bytearray | memoryview) -> None:
+        "Adds *data*, writing to the blob if *buffer_size* is reached"
+        self._buffer += data
+        if len(self._buffer) >= self.buffer_size:
+            await self.flush()
+
+    async def flush(self) -> None:
+        "Writes any collected data to the blob"
+        if self._buffer:
+            buffer, self._buffer = self._buffer, bytearray()
+            await self.blob.write(buffer)
+
+    async def aclose(self) -> None:
+        "Flushes any collected data"
+        await self.flush()
+
+    async def __aenter__(self) -> BlobWriter:
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.aclose()
+
+
 class _Cancelled(BaseException):
     """
     Raised in the worker thread on seeing call cancellation.
@@ -178,6 +287,8 @@ class _CallTracker:
         "deadline_monotonic",
         # cancel indication
         "is_cancelled",
+        # from the priority contextvar
+        "priority",
         # if a callback is async and run back in the event loop then
         # this can be called to cancel it
         "cancel_async_cb",
@@ -190,17 +301,23 @@ class _CallTracker:
     deadline_loop: None | float | int
     deadline_monotonic: None | float | int
     is_cancelled: bool
+    priority: int
     cancel_async_cb: Callable[[], Any] | None
 
     def __init__(self, completion: asyncio.Event | anyio.Event | trio.Event, call: Callable[[], Any]) -> None:
         self.is_exception = False
         self.is_cancelled = False
+        self.priority = priority.get()
         self.completion = completion
         self.call = call
         self.deadline_loop = None
         self.deadline_monotonic = None
         self.cancel_async_cb = None
 
+    def sort_key(self) -> tuple[int, int | float]:
+        "Ordering for waiting calls, with lowest first"
+        return self.priority, math.inf if self.deadline_loop is None else self.deadline_loop
+
     def set_deadline(self, value: int | float, loop_time: int | float):
         self.deadline_loop = value
         if value is not math.inf:
@@ -217,6 +334,44 @@ class _CallTracker:
             self.cancel_async_cb()
 
 
+class _PriorityQueue:
+    """Queue of calls for a worker thread, returning the most urgent first
+
+    Calls are added by the event loop with :meth:`put` which uses a
+    :class:`queue.SimpleQueue`, and only the worker thread calls
+    :meth:`get` which moves everything waiting into a heap.
+    """
+
+    __slots__ = ("incoming", "waiting", "counter")
+
+    def __init__(self):
+        self.incoming: queue.SimpleQueue[_CallTracker | None] = queue.SimpleQueue()
+        # (sort key, order added, tracker)
+        self.waiting: list[tuple[tuple[int, int | float], int, _CallTracker | None]] = []
+        self.counter = itertools.count()
+
+    def put(self, tracker: _CallTracker | None):
+        self.incoming.put(tracker)
+
+    def add(self, tracker: _CallTracker | None):
+        # None is used to stop the worker, and goes after everything else
+        key = (math.inf, math.inf) if tracker is None else tracker.sort_key()
+        heapq.heappush(self.waiting, (key, next(self.counter), tracker))
+
+    def get(self) -> _CallTracker | None:
+        if not self.waiting:
+            self.add(self.incoming.get())
+        while True:
+            try:
+                self.add(self.incoming.get_nowait())
+            except queue.Empty:
+                break
+        return heapq.heappop(self.waiting)[2]
+
+    def empty(self) -> bool:
+        return not self.waiting and self.incoming.empty()
+
+
 # These are used to directly return values and exceptions without
 # sending to the worker thread such as prefetched query rows.
 async def _coro_for_value(value):
@@ -242,7 +397,22 @@ async def _coro_for_stopasynciteration():
 
 
 class AsyncIO:
-    """:class:`Controller <apsw.AsyncConnectionController>` for :mod:`asyncio`"""
+    """:class:`Controller <apsw.AsyncConnectionController>` for :mod:`asyncio`
+
+    :param thread_name: Name for the worker thread
+    :param completion_batch: The worker normally wakes the event loop
+        as each call completes.  If more than 1 then completed calls
+        are held while more calls are queued, and up to this many are
+        delivered in one wakeup.  This reduces overhead when many
+        tasks use the same connection at once, at the cost of results
+        waiting for the following queued calls to finish.
+    """
+
+    completion_batch: int = 1
+    "Most completed calls delivered in one event loop wakeup"
+
+    completed: list[tuple[Callable[[asyncio.Future, Any], None], asyncio.Future, Any]]
+    "Results held for the next batch"
 
     def configure(self, db: apsw.Connection):
         "Setup database, just after it is created"
@@ -284,21 +454,46 @@ class AsyncIO:
         q = self.queue
 
         while (tracker := q.get()) is not None:
-            if not tracker.is_cancelled:
-                # we don't restore this because the queue is not
-                # re-entrant, so there is no point
-                _tls.current_call = tracker
-
-                try:
-                    # should we even start?
-                    if tracker.monotonic_exceeded():
-                        raise TimeoutError()
-                    self.loop.call_soon_threadsafe(self.set_future_result, tracker.completion, tracker.call())
-
-                except BaseException as exc:
-                    # BaseException is deliberately used because CancelledError
-                    # is a subclass of it
-                    self.loop.call_soon_threadsafe(self.set_future_exception, tracker.completion, exc)
+            self.process(tracker)
+            if self.completed and (len(self.completed) >= self.completion_batch or q.empty()):
+                self.deliver_completed()
+
+        if self.completed:
+            self.deliver_completed()
+
+    def process(self, tracker: _CallTracker):
+        "Makes one call in the worker thread and delivers the result"
+        if not tracker.is_cancelled:
+            # we don't restore this because the queue is not
+            # re-entrant, so there is no point
+            _tls.current_call = tracker
+
+            try:
+                # should we even start?
+                if tracker.monotonic_exceeded():
+                    raise TimeoutError()
+                self.complete(self.set_future_result, tracker.completion, tracker.call())
+
+            except BaseException as exc:
+                # BaseException is deliberately used because CancelledError
+                # is a subclass of it
+                self.complete(self.set_future_exception, tracker.completion, exc)
+
+    def complete(self, setter: Callable[[asyncio.Future, Any], None], future: asyncio.Future, value: Any):
+        "Called in the worker thread to deliver a result now, or hold it for the next batch"
+        if self.completion_batch > 1:
+            self.completed.append((setter, future, value))
+        else:
+            self.loop.call_soon_threadsafe(setter, future, value)
+
+    def deliver_completed(self):
+        "Sends held results to the event loop in one wakeup"
+        batch, self.completed = self.completed, []
+        self.loop.call_soon_threadsafe(self.set_future_batch, batch)
+
+    def set_future_batch(self, batch: list[tuple[Callable[[asyncio.Future, Any], None], asyncio.Future, Any]]):
+        for setter, future, value in batch:
+            setter(future, value)
 
     def set_future_result(self, future: asyncio.Future, value: Any):
         if not future.done():
@@ -317,6 +512,10 @@ class AsyncIO:
             if tracker.is_cancelled:
                 raise _Cancelled("cancelled in async_run_coro")
 
+            # the coroutine could be waiting on a held result
+            if self.completed:
+                self.deliver_completed()
+
             return asyncio.run_coroutine_threadsafe(
                 self.run_coro_in_loop(coro, tracker, contextvars.copy_context()), self.loop
             ).result()
@@ -368,9 +567,17 @@ class AsyncIO:
             async with asyncio.timeout_at(tracker.deadline_loop):
                 return await task
 
-    def __init__(self, *, thread_name: str = "asyncio apsw background worker"):
-        self.queue: queue.SimpleQueue[_CallTracker | None] = queue.SimpleQueue()
+    def bind_event_loop(self):
+        "Remembers the running event loop that calls come from"
         self.loop = asyncio.get_running_loop()
+
+    def __init__(self, *, thread_name: str = "asyncio apsw background worker", completion_batch: int = 1):
+        if completion_batch < 1:
+            raise ValueError(f"{completion_batch=} must be at least 1")
+        self.completion_batch = completion_batch
+        self.completed = []
+        self.queue = _PriorityQueue()
+        self.bind_event_loop()
         threading.Thread(name=thread_name, target=self.worker_thread_run).start()
 
 
@@ -419,25 +626,29 @@ class Trio:
         q = self.queue
 
         while (tracker := q.get()) is not None:
-            if not tracker.is_cancelled:
-                # we don't restore this because the queue is not
-                # re-entrant, so there is no point
-                _tls.current_call = tracker
-
-                try:
-                    # should we even start?
-                    if tracker.monotonic_exceeded():
-                        raise trio.TooSlowError()
-                    tracker.result = tracker.call()
-
-                except BaseException as exc:
-                    # BaseException is deliberately used because Cancelled
-                    # is a subclass of it
-                    tracker.result = exc
-                    tracker.is_exception = True
-
-                finally:
-                    self.token.run_sync_soon(tracker.completion.set)
+            self.process(tracker)
+
+    def process(self, tracker: _CallTracker):
+        "Makes one call in the worker thread and delivers the result"
+        if not tracker.is_cancelled:
+            # we don't restore this because the queue is not
+            # re-entrant, so there is no point
+            _tls.current_call = tracker
+
+            try:
+                # should we even start?
+                if tracker.monotonic_exceeded():
+                    raise trio.TooSlowError()
+                tracker.result = tracker.call()
+
+            except BaseException as exc:
+                # BaseException is deliberately used because Cancelled
+                # is a subclass of it
+                tracker.result = exc
+                tracker.is_exception = True
+
+            finally:
+                self.token.run_sync_soon(tracker.completion.set)
 
     def async_run_coro(self, coro: Coroutine):
         "Called in worker thread to run a coroutine in the event loop"
@@ -458,12 +669,16 @@ class Trio:
                 return
             return await coro
 
-    def __init__(self, *, thread_name: str = "trio apsw background worker"):
+    def bind_event_loop(self):
+        "Remembers the running event loop that calls come from"
         global trio
         import trio
 
-        self.queue: queue.SimpleQueue[_CallTracker | None] = queue.SimpleQueue()
         self.token = trio.lowlevel.current_trio_token()
+
+    def __init__(self, *, thread_name: str = "trio apsw background worker"):
+        self.queue = _PriorityQueue()
+        self.bind_event_loop()
         threading.Thread(name=thread_name, target=self.worker_thread_run).start()
 
 
@@ -514,25 +729,29 @@ class AnyIO:
         q = self.queue
 
         while (tracker := q.get()) is not None:
-            if not tracker.is_cancelled:
-                # we don't restore this because the queue is not
-                # re-entrant, so there is no point
-                _tls.current_call = tracker
-
-                try:
-                    # should we even start?
-                    if tracker.monotonic_exceeded():
-                        raise TimeoutError("Deadline exceeded in queue")
-                    tracker.result = tracker.call()
-
-                except BaseException as exc:
-                    # BaseException is deliberately used because CancelledError
-                    # is a subclass of it
-                    tracker.result = exc
-                    tracker.is_exception = True
-
-                finally:
-                    anyio.from_thread.run_sync(tracker.completion.set, token=self.token)
+            self.process(tracker)
+
+    def process(self, tracker: _CallTracker):
+        "Makes one call in the worker thread and delivers the result"
+        if not tracker.is_cancelled:
+            # we don't restore this because the queue is not
+            # re-entrant, so there is no point
+            _tls.current_call = tracker
+
+            try:
+                # should we even start?
+                if tracker.monotonic_exceeded():
+                    raise TimeoutError("Deadline exceeded in queue")
+                tracker.result = tracker.call()
+
+            except BaseException as exc:
+                # BaseException is deliberately used because CancelledError
+                # is a subclass of it
+                tracker.result = exc
+                tracker.is_exception = True
+
+            finally:
+                anyio.from_thread.run_sync(tracker.completion.set, token=self.token)
 
     def async_run_coro(self, coro: Coroutine):
         "Called in worker thread to run a coroutine in the event loop"
@@ -558,39 +777,24 @@ class AnyIO:
                 return
             return await coro
 
-    def __init__(self, *, thread_name: str = "anyio apsw background worker"):
+    def bind_event_loop(self):
+        "Remembers the running event loop that calls come from"
         global anyio
         import anyio
 
-        self.queue: queue.SimpleQueue[_CallTracker | None] = queue.SimpleQueue()
         self.token = anyio.lowlevel.current_token()
+
+    def __init__(self, *, thread_name: str = "anyio apsw background worker"):
+        self.queue = _PriorityQueue()
+        self.bind_event_loop()
         threading.Thread(name=thread_name, target=self.worker_thread_run).start()
 
 # True means they can be tried, False means too old etc
 _anyio_usable = True
 _trio_usable = True
 
-def Auto() -> Trio | AsyncIO | AnyIO:
-    """
-    Automatically detects the current async framework running event
-    loop and returns the appropriate controller.  This is the default
-    for :attr:`apsw.async_controller`.
-
-    **AnyIO note**
-
-        The :class:`AnyIO` controller is only returned if
-        :func:`anyio.run` is in the call stack.
-
-        If you are simultaneously using anyio and another framework
-        then you should manually configure
-        :attr:`apsw.async_controller` to get the one you want.
-
-        This matters especially for timeouts and cancellations where
-        each framework is different.
-
-    :exc:`RuntimeError` is raised if the framework can't be detected.
-
-    """
+def _detect_controller() -> type[Trio] | type[AsyncIO] | type[AnyIO]:
+    "Returns the controller class for the currently running async framework"
     global _anyio_usable, _trio_usable
     # This variable tracks which class to use.  It is instantiated
     # outside of the try/except blocks so exceptions in its
@@ -657,4 +861,477 @@ def Auto() -> Trio | AsyncIO | AnyIO:
     if not found:
         raise RuntimeError("Unable to determine current Async environment")
 
-    return found()
+    return found
+
+
+def Auto() -> Trio | AsyncIO | AnyIO:
+    """
+    Automatically detects the current async framework running event
+    loop and returns the appropriate controller.  This is the default
+    for :attr:`apsw.async_controller`.
+
+    **AnyIO note**
+
+        The :class:`AnyIO` controller is only returned if
+        :func:`anyio.run` is in the call stack.
+
+        If you are simultaneously using anyio and another framework
+        then you should manually configure
+        :attr:`apsw.async_controller` to get the one you want.
+
+        This matters especially for timeouts and cancellations where
+        each framework is different.
+
+    :exc:`RuntimeError` is raised if the framework can't be detected.
+
+    """
+    return _detect_controller()()
+
+
+@dataclasses.dataclass
+class MultiplexStats:
+    "A :mod:`dataclass <dataclasses>` with metrics from :meth:`Multiplex.stats`"
+
+    workers: int
+    "How many worker threads are running"
+    connections: int
+    "How many connections are open"
+    queue_depth: int
+    "How many calls are waiting for a worker"
+    max_queue_depth: int
+    "Largest value of *queue_depth* seen"
+    calls: int
+    "How many calls have been run"
+    wait_ns: int
+    "Total nanoseconds calls spent waiting for a worker"
+    max_wait_ns: int
+    "Longest nanoseconds a call waited for a worker"
+    run_ns: int
+    "Total nanoseconds spent running calls"
+
+
+class _MultiplexQueue:
+    "Used as the queue of a controller, sending its calls to :class:`Multiplex` workers"
+
+    __slots__ = ("multiplex", "controller", "pending", "counter", "scheduled")
+
+    def __init__(self, multiplex: Multiplex, controller: AsyncIO | Trio | AnyIO):
+        self.multiplex = multiplex
+        self.controller = controller
+        # heap of (sort key, order added, time enqueued, tracker)
+        self.pending: list[tuple[tuple[int, int | float], int, int, _CallTracker]] = []
+        self.counter = itertools.count()
+        # True while in the runnable queue or a worker is running our call
+        self.scheduled = False
+
+    def put(self, tracker: _CallTracker | None):
+        if tracker is None:
+            self.multiplex._connection_closed()
+        else:
+            self.multiplex._enqueue(self, tracker)
+
+
+class Multiplex:
+    """Runs many async connections over a bounded number of worker threads
+
+    The :class:`AsyncIO`, :class:`Trio`, and :class:`AnyIO`
+    controllers each start a dedicated worker thread per connection.
+    When there are many connections, such as a database per tenant,
+    this uses a correspondingly large number of threads.
+
+    An instance of this class can be used as
+    :attr:`apsw.async_controller`, with the calls for all connections
+    made using at most *workers* threads.  Calls for each connection are
+    still made one at a time in :attr:`priority` order.  Connections
+    with calls waiting take turns, one call at a time.
+
+    .. code-block:: python
+
+        apsw.async_controller.set(apsw.aio.Multiplex(workers=8))
+
+        tenants = {
+            name: await apsw.Connection.as_async(f"{name}.db")
+            for name in names
+        }
+
+    The async framework is detected the same way as :func:`Auto`.
+    Worker threads are started as needed, and exit once all the
+    connections are closed.  A long running call on one connection
+    occupies a worker, so size *workers* for how many calls you expect
+    to be running at once.
+    """
+
+    def __init__(self, *, workers: int = 4, thread_name: str = "apsw multiplex worker"):
+        if workers < 1:
+            raise ValueError(f"{workers=} must be at least 1")
+        self.workers = workers
+        "Maximum number of worker threads"
+        self.thread_name = thread_name
+        "Name for worker threads"
+        self._cond = threading.Condition()
+        self._runnable: collections.deque[_MultiplexQueue] = collections.deque()
+        self._threads = 0
+        self._idle_threads = 0
+        self._connections = 0
+        self._queue_depth = 0
+        self._max_queue_depth = 0
+        self._calls = 0
+        self._wait_ns = 0
+        self._max_wait_ns = 0
+        self._run_ns = 0
+
+    def __call__(self) -> AsyncIO | Trio | AnyIO:
+        "Called by :meth:`apsw.Connection.as_async` to get the controller for a connection"
+        klass = _detect_controller()
+        # the controller is made without its own worker thread
+        controller = klass.__new__(klass)
+        controller.bind_event_loop()
+        controller.queue = _MultiplexQueue(self, controller)
+        with self._cond:
+            self._connections += 1
+        return controller
+
+    def _enqueue(self, q: _MultiplexQueue, tracker: _CallTracker):
+        with self._cond:
+            heapq.heappush(q.pending, (tracker.sort_key(), next(q.counter), time.monotonic_ns(), tracker))
+            self._queue_depth += 1
+            self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+            if not q.scheduled:
+                q.scheduled = True
+                self._runnable.append(q)
+                if self._idle_threads:
+                    self._cond.notify()
+                elif self._threads < self.workers:
+                    self._threads += 1
+                    threading.Thread(name=self.thread_name, target=self._worker_thread_run).start()
+
+    def _connection_closed(self):
+        with self._cond:
+            self._connections -= 1
+            self._cond.notify_all()
+
+    def _worker_thread_run(self):
+        "Runs calls from connections with pending calls"
+        cond = self._cond
+        while True:
+            with cond:
+                while not self._runnable:
+                    if self._connections == 0:
+                        self._threads -= 1
+                        return
+                    self._idle_threads += 1
+                    cond.wait()
+                    self._idle_threads -= 1
+                q = self._runnable.popleft()
+                _, _, enqueued, tracker = heapq.heappop(q.pending)
+                self._queue_depth -= 1
+                start = time.monotonic_ns()
+                waited = start - enqueued
+                self._wait_ns += waited
+                self._max_wait_ns = max(self._max_wait_ns, waited)
+
+            q.controller.process(tracker)
+
+            with cond:
+                self._calls += 1
+                self._run_ns += time.monotonic_ns() - start
+                if q.pending:
+                    # go to the back so other connections get a turn
+                    self._runnable.append(q)
+                else:
+                    q.scheduled = False
+
+    def stats(self) -> MultiplexStats:
+        "Returns the current metrics"
+        with self._cond:
+            return MultiplexStats(
+                workers=self._threads,
+                connections=self._connections,
+                queue_depth=self._queue_depth,
+                max_queue_depth=self._max_queue_depth,
+                calls=self._calls,
+                wait_ns=self._wait_ns,
+                max_wait_ns=self._max_wait_ns,
+                run_ns=self._run_ns,
+            )
+
+
+@dataclasses.dataclass
+class ReadWritePoolStats:
+    "A :mod:`dataclass <dataclasses>` with metrics from :meth:`ReadWritePool.stats`"
+
+    readers: int
+    "How many reader connections are open"
+    reads: int
+    "How many queries were run on a reader"
+    writes: int
+    "How many queries were run on the writer"
+    rerouted: int
+    "How many queries started on a reader but needed the writer"
+    in_flight: int
+    "How many queries are currently running or waiting on a reader"
+    max_in_flight: int
+    "Largest value of *in_flight* seen"
+
+
+class ReadWritePool:
+    """One logical async database using a writer and several reader connections
+
+    Each :class:`apsw.AsyncConnection` makes its calls one at a time
+    in its worker, so queries from many tasks on the same connection
+    wait for each other.  This opens a single writer connection plus
+    *readers* read only connections to the same database, each with
+    their own worker.  Read only queries are spread across the
+    readers, running concurrently, while changes go to the writer.
+
+    Use :meth:`open` to create an instance.
+
+    .. code-block:: python
+
+        pool = await apsw.aio.ReadWritePool.open("app.db", readers=4)
+
+        # these run at the same time on different readers
+        counts = await asyncio.gather(
+            pool.execute("SELECT COUNT(*) FROM orders"),
+            pool.execute("SELECT COUNT(*) FROM customers"),
+        )
+
+        # goes to the writer
+        await pool.execute("INSERT INTO orders VALUES(?, ?)", (7, "widget"))
+
+        await pool.aclose()
+
+    This relies on `WAL <https://www.sqlite.org/wal.html>`__ (the
+    default *setup* turns it on) so readers and the writer don't block
+    each other.  :meth:`execute` uses :attr:`Cursor.is_readonly
+    <apsw.Cursor.is_readonly>` to decide if a query needs the writer.
+    Transactions spanning several calls, or anything else needing a
+    particular connection, should use :attr:`writer` directly.
+    """
+
+    def __init__(self, writer: apsw.AsyncConnection, readers: list[apsw.AsyncConnection]):
+        self.writer = writer
+        "The :class:`apsw.AsyncConnection` used for changes"
+        self.readers = tuple(readers)
+        "The read only :class:`apsw.AsyncConnection`"
+        # queries outstanding per reader, only touched in the event loop
+        self._in_flight = [0] * len(readers)
+        self._next = 0
+        self._stats = ReadWritePoolStats(
+            readers=len(readers), reads=0, writes=0, rerouted=0, in_flight=0, max_in_flight=0
+        )
+
+    @classmethod
+    async def open(
+        cls,
+        filename: str,
+        *,
+        readers: int = 4,
+        flags: int = apsw.SQLITE_OPEN_READWRITE | apsw.SQLITE_OPEN_CREATE,
+        vfs: str | None = None,
+        statementcachesize: int = 100,
+        setup: Iterable[Callable[[apsw.Connection], None]] | None = None,
+    ) -> ReadWritePool:
+        """Opens the writer and then the reader connections
+
+        :param filename: Database to open
+        :param readers: How many read only connections to open
+        :param flags: Used for the writer.  Readers use
+            :attr:`~apsw.SQLITE_OPEN_READONLY` plus
+            :attr:`~apsw.SQLITE_OPEN_URI` if present.
+        :param vfs: Passed to :meth:`apsw.Connection.as_async`
+        :param statementcachesize: Passed to :meth:`apsw.Connection.as_async`
+        :param setup: Called with each connection in its worker.  The
+            default is the connection functions from
+            :attr:`apsw.bestpractice.recommended`.  Use an empty tuple
+            for none.
+        """
+        if readers < 1:
+            raise ValueError(f"{readers=} must be at least 1")
+        if setup is None:
+            import apsw.bestpractice
+
+            setup = [f for f in apsw.bestpractice.recommended if f.__name__.startswith("connection_")]
+        setup = tuple(setup)
+
+        async def connect(flags: int) -> apsw.AsyncConnection:
+            con = await apsw.Connection.as_async(filename, flags, vfs, statementcachesize)
+            try:
+                for func in setup:
+                    await con.async_run(func, con)
+            except:
+                await con.aclose()
+                raise
+            return con
+
+        # done first so the database exists and is in WAL mode
+        writer = await connect(flags)
+        opened: list[apsw.AsyncConnection] = []
+        try:
+            for _ in range(readers):
+                opened.append(await connect(apsw.SQLITE_OPEN_READONLY | (flags & apsw.SQLITE_OPEN_URI)))
+        except:
+            for con in opened:
+                await con.aclose()
+            await writer.aclose()
+            raise
+        return cls(writer, opened)
+
+    def _choose_reader(self) -> int:
+        "Index of the reader with the fewest queries outstanding, taking turns on ties"
+        count = len(self.readers)
+        best = self._next
+        for offset in range(1, count):
+            i = (self._next + offset) % count
+            if self._in_flight[i] < self._in_flight[best]:
+                best = i
+        self._next = (best + 1) % count
+        return best
+
+    async def execute(self, statements: str, bindings: apsw.Bindings | None = None) -> list[apsw.SQLiteValues]:
+        """Runs *statements* returning all the result rows
+
+        A reader is used, and if any statement is not :attr:`read only
+        <apsw.Cursor.is_readonly>` then it is stopped before running,
+        and all the statements are run again with the writer instead.
+        """
+        result = await self._read(statements, bindings, True)
+        if result is not _NEEDS_WRITER:
+            return result
+        self._stats.rerouted += 1
+        return await self.write(statements, bindings)
+
+    async def read(self, statements: str, bindings: apsw.Bindings | None = None) -> list[apsw.SQLiteValues]:
+        """Runs *statements* on a reader returning all the result rows
+
+        Statements that make changes will fail with :exc:`apsw.ReadOnlyError`."""
+        return await self._read(statements, bindings, False)
+
+    async def _read(
+        self, statements: str, bindings: apsw.Bindings | None, reroute: bool
+    ) -> list[apsw.SQLiteValues] | object:
+        i = self._choose_reader()
+        self._in_flight[i] += 1
+        self._stats.in_flight += 1
+        self._stats.max_in_flight = max(self._stats.max_in_flight, self._stats.in_flight)
+        try:
+            result = await self.readers[i].async_run(_run_on_reader, self.readers[i], statements, bindings, reroute)
+        finally:
+            self._in_flight[i] -= 1
+            self._stats.in_flight -= 1
+        if result is not _NEEDS_WRITER:
+            self._stats.reads += 1
+        return result
+
+    async def write(self, statements: str, bindings: apsw.Bindings | None = None) -> list[apsw.SQLiteValues]:
+        "Runs *statements* on the writer returning all the result rows"
+        result = await self.writer.async_run(_run_on_writer, self.writer, statements, bindings)
+        self._stats.writes += 1
+        return result
+
+    def stats(self) -> ReadWritePoolStats:
+        "Returns a copy of the current metrics"
+        return dataclasses.replace(self._stats)
+
+    async def aclose(self) -> None:
+        "Closes the readers and then the writer"
+        for con in self.readers:
+            await con.aclose()
+        await self.writer.aclose()
+
+    async def __aenter__(self) -> ReadWritePool:
+        return self
+
+    async def __aexit__(self, *_) -> None:
+        await self.aclose()
+
+
+_NEEDS_WRITER = object()
+"Returned by :func:`_run_on_reader` when a statement is not read only"
+
+
+def _readonly_only(cursor: apsw.Cursor, sql: str, bindings: apsw.Bindings | None) -> bool:
+    return cursor.is_readonly
+
+
+def _run_on_reader(
+    con: apsw.Connection, statements: str, bindings: apsw.Bindings | None, reroute: bool
+) -> list[apsw.SQLiteValues] | object:
+    "Runs in the reader worker thread"
+    cursor = con.cursor()
+    if reroute:
+        cursor.exec_trace = _readonly_only
+    try:
+        return cursor.execute(statements, bindings).fetchall()
+    except apsw.ExecTraceAbort:
+        return _NEEDS_WRITER
+
+
+def _run_on_writer(con: apsw.Connection, statements: str, bindings: apsw.Bindings | None) -> list[apsw.SQLiteValues]:
+    "Runs in the writer worker thread"
+    return con.execute(statements, bindings).fetchall()
+
+
+class Pipeline:
+    """Runs several queries on an async connection in one worker call
+
+    Each call on an :class:`apsw.AsyncConnection` is a separate trip
+    to its worker thread and back.  A request handler that makes
+    several small queries pays that latency for each one.  Add the
+    queries to a pipeline, and they are all run together by
+    :meth:`run` with the results returned at once.
+
+    .. code-block:: python
+
+        pipeline = apsw.aio.Pipeline()
+        pipeline.execute("INSERT INTO log VALUES(?, ?)", (now, "view"))
+        pipeline.executemany("INSERT INTO seen VALUES(?)", items)
+        pipeline.execute("SELECT name, price FROM items WHERE id=?", (item_id,))
+
+        _, _, rows = await pipeline.run(db)
+
+    The queries run in the order they were added, stopping at the
+    first exception which is then raised.  A pipeline can be run
+    multiple times, and on different connections.
+    """
+
+    def __init__(self):
+        # (method name, statements, bindings)
+        self.queries: list[tuple[str, str, Any]] = []
+
+    def execute(self, statements: str, bindings: apsw.Bindings | None = None) -> int:
+        "Adds a :meth:`~apsw.Cursor.execute` returning its index in the results"
+        self.queries.append(("execute", statements, bindings))
+        return len(self.queries) - 1
+
+    def executemany(self, statements: str, sequenceofbindings: Iterable[apsw.Bindings]) -> int:
+        """Adds a :meth:`~apsw.Cursor.executemany` returning its index in the results
+
+        *sequenceofbindings* is consumed in the worker thread when the
+        pipeline is run, so use a list if running more than once."""
+        self.queries.append(("executemany", statements, sequenceofbindings))
+        return len(self.queries) - 1
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    async def run(self, db: apsw.AsyncConnection, *, transaction: bool = False) -> list[list[apsw.SQLiteValues]]:
+        """Runs the queries in a single call to the worker thread
+
+        :param db: Connection to use
+        :param transaction: If True then the queries are run inside a
+            transaction, so they all take effect or none do.
+        :returns: The result rows of each query, in the order added
+        """
+        return await db.async_run(_run_pipeline, db, tuple(self.queries), transaction)
+
+
+def _run_pipeline(
+    con: apsw.Connection, queries: tuple[tuple[str, str, Any], ...], transaction: bool
+) -> list[list[apsw.SQLiteValues]]:
+    "Runs in the worker thread"
+    if transaction:
+        with con:
+            return _run_pipeline(con, queries, False)
+    cursor = con.cursor()
+    return [getattr(cursor, method)(statements, bindings).fetchall() for method, statements, bindings in queries]
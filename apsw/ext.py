@@ -4,6 +4,8 @@ from __future__ import annotations
 
 import abc
 import collections
+import concurrent.futures
+import contextlib
 import contextvars
 import dataclasses
 import enum
@@ -16,14 +18,17 @@ import math
 import os
 import re
 import string
+import struct
 import sys
+import threading
 import time
 import traceback
 import types
+import zlib
 from dataclasses import dataclass, is_dataclass, make_dataclass
 from fractions import Fraction
 from typing import Any, Literal, Protocol, TextIO, overload, TYPE_CHECKING
-from collections.abc import Callable, Iterator, AsyncIterator, AsyncIterable, Iterable, Sequence, Awaitable
+from collections.abc import Callable, Iterator, AsyncIterator, AsyncIterable, Iterable, Mapping, Sequence, Awaitable
 from types import NoneType
 
 import apsw
@@ -1275,6 +1280,447 @@ class ShowResourceUsage:
     }
 
 
+@dataclass
+class WarmupStats:
+    "A :mod:`dataclass <dataclasses>` with the cost of warming up one named set of queries in :class:`StatementWarmer`"
+
+    connections: int = 0
+    "How many connections have been warmed up"
+    statements: int = 0
+    "How many statements were prepared across all the connections"
+    failures: int = 0
+    """How many queries could not be prepared, such as when a table
+    does not exist yet"""
+    elapsed_ns: int = 0
+    "Total nanoseconds spent preparing"
+
+
+class StatementWarmer:
+    """Prepares named sets of queries in connections before they are used
+
+    Each query is placed in the connection's :ref:`statement cache
+    <statementcache>` by :meth:`Connection.cache_prepare
+    <apsw.Connection.cache_prepare>`, so the first execution is as
+    quick as later ones.  This is useful when many connections run the
+    same queries, such as in a pool.  Add the instance to
+    :attr:`apsw.connection_hooks` to warm up every new connection, or
+    call it with a connection.
+
+    .. code-block:: python
+
+        warmer = apsw.ext.StatementWarmer()
+        warmer.register("orders", [
+            "SELECT * FROM orders WHERE id=?",
+            "INSERT INTO orders VALUES(?, ?, ?)",
+        ])
+        apsw.connection_hooks.append(warmer)
+
+    Queries that fail to prepare, such as when a table has not been
+    created yet, are skipped and counted in :meth:`stats`.  They are
+    prepared as normal when first executed.  Make sure the
+    *statementcachesize* passed to :class:`apsw.Connection` is large
+    enough to hold all the queries.
+
+    SQLite automatically prepares cached statements again after a
+    schema change, so there is no need to warm up again.
+    """
+
+    def __init__(self):
+        self._sets: dict[str, tuple[str, ...]] = {}
+        self._stats: dict[str, WarmupStats] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, queries: Iterable[str]) -> None:
+        "Adds or replaces the named set of queries, resetting its stats"
+        queries = tuple(queries)
+        with self._lock:
+            self._sets[name] = queries
+            self._stats[name] = WarmupStats()
+
+    def unregister(self, name: str) -> None:
+        "Removes the named set of queries"
+        with self._lock:
+            del self._sets[name]
+            del self._stats[name]
+
+    def warm(self, connection: apsw.Connection, name: str | None = None) -> None:
+        "Prepares the queries from the named set, or all of them if *name* is None"
+        with self._lock:
+            if name is None:
+                sets = list(self._sets.items())
+            else:
+                sets = [(name, self._sets[name])]
+
+        for set_name, queries in sets:
+            statements = failures = 0
+            start = time.monotonic_ns()
+            for query in queries:
+                try:
+                    statements += connection.cache_prepare(query)
+                except apsw.SQLError:
+                    failures += 1
+            elapsed = time.monotonic_ns() - start
+            with self._lock:
+                # it could have been replaced or unregistered meanwhile
+                if self._sets.get(set_name) is not queries:
+                    continue
+                stats = self._stats[set_name]
+                stats.connections += 1
+                stats.statements += statements
+                stats.failures += failures
+                stats.elapsed_ns += elapsed
+
+    def __call__(self, connection: apsw.Connection) -> None:
+        "Prepares all the queries, used when this is in :attr:`apsw.connection_hooks`"
+        self.warm(connection)
+
+    def stats(self) -> dict[str, WarmupStats]:
+        "Returns a copy of the stats for each named set"
+        with self._lock:
+            return {name: dataclasses.replace(stats) for name, stats in self._stats.items()}
+
+
+@dataclass
+class ConnectionPoolStats:
+    "A :mod:`dataclass <dataclasses>` with metrics from :meth:`ConnectionPool.stats`"
+
+    connections: int = 0
+    "How many connections are currently open, including the writer with *readonly_readers*"
+    idle: int = 0
+    "How many of the open connections are not checked out"
+    opened: int = 0
+    "How many connections have been opened in total"
+    checkouts: int = 0
+    "How many times a connection was checked out"
+    write_checkouts: int = 0
+    "How many of the checkouts were for writing"
+    affinity_hits: int = 0
+    "How many checkouts got the same connection the thread used last time"
+    waits: int = 0
+    "How many times a checkout had to wait for a connection or for the writer"
+    wait_ns: int = 0
+    "Total nanoseconds spent waiting"
+    max_wait_ns: int = 0
+    "Longest wait in nanoseconds"
+    timeouts: int = 0
+    "How many checkouts gave up waiting"
+
+
+class ConnectionPool:
+    """Hands out :class:`apsw.Connection` to the same database across threads
+
+    :param filename: Database to open
+    :param max_connections: Most connections that are open at once.
+        Checkouts wait for a connection to be returned once this many
+        are in use.
+    :param flags: Passed to :class:`apsw.Connection`
+    :param vfs: Passed to :class:`apsw.Connection`
+    :param statementcachesize: Passed to :class:`apsw.Connection`
+    :param setup: Called with each new connection.  The default is
+        the connection functions from :attr:`apsw.bestpractice.recommended`.
+        Use an empty tuple for none.
+    :param warmer: If supplied then each new connection is warmed up
+        with all its queries, keeping the :ref:`statement caches
+        <statementcache>` ready.
+    :param timeout: Default seconds to wait in :meth:`connection`
+        before raising :exc:`TimeoutError`, with None meaning forever.
+    :param readonly_readers: Keep a single writer connection opened
+        with *flags*, and open the other connections with
+        :attr:`~apsw.SQLITE_OPEN_READONLY`.  See below.
+
+    .. code-block:: python
+
+        pool = apsw.ext.ConnectionPool("app.db", max_connections=8)
+
+        with pool.connection() as con:
+            print(con.execute("SELECT COUNT(*) FROM orders").get)
+
+        with pool.connection(write=True) as con:
+            with con:
+                con.execute("INSERT INTO orders VALUES(?, ?)", (7, "widget"))
+
+    Each thread gets back the connection it used last time if it is
+    idle, which keeps the statement cache and SQLite page cache
+    relevant to the work that thread does.  Otherwise the most recently
+    returned connection is used, opening a new one if there are none.
+
+    Only one checkout with *write* True is allowed at a time, so
+    writers queue in Python rather than getting :exc:`apsw.BusyError`
+    from SQLite.  Nothing stops writing through a connection not
+    checked out for writing.
+
+    With *readonly_readers* the writer connection is opened
+    immediately, and is what every checkout with *write* True gets.
+    Up to *max_connections* read only connections are used for the
+    other checkouts, so they can't accidentally make changes.  This
+    works best with `WAL <https://www.sqlite.org/wal.html>`__ (the
+    default *setup* turns it on) where readers and the writer don't
+    block each other.
+
+    :meth:`execute` uses :attr:`Cursor.is_readonly
+    <apsw.Cursor.is_readonly>` to decide if a query needs the writer.
+
+    The hooks in :attr:`apsw.connection_hooks` run as usual for each
+    new connection.  This is for regular (not :doc:`async <async>`)
+    connections.
+    """
+
+    def __init__(
+        self,
+        filename: str,
+        *,
+        max_connections: int = 8,
+        flags: int = apsw.SQLITE_OPEN_READWRITE | apsw.SQLITE_OPEN_CREATE,
+        vfs: str | None = None,
+        statementcachesize: int = 100,
+        setup: Iterable[Callable[[apsw.Connection], None]] | None = None,
+        warmer: StatementWarmer | None = None,
+        timeout: float | None = None,
+        readonly_readers: bool = False,
+    ):
+        if max_connections < 1:
+            raise ValueError(f"{max_connections=} must be at least 1")
+        if setup is None:
+            import apsw.bestpractice
+
+            setup = [f for f in apsw.bestpractice.recommended if f.__name__.startswith("connection_")]
+        self.filename = filename
+        "Database filename"
+        self.max_connections = max_connections
+        "Most connections open at once"
+        self.timeout = timeout
+        "Default seconds to wait for a checkout"
+        self._open_args = dict(flags=flags, vfs=vfs, statementcachesize=statementcachesize)
+        self._reader_args = self._open_args
+        if readonly_readers:
+            self._reader_args = dict(
+                self._open_args, flags=apsw.SQLITE_OPEN_READONLY | (flags & apsw.SQLITE_OPEN_URI)
+            )
+        self._readonly_readers = readonly_readers
+        self._setup = tuple(setup)
+        self._warmer = warmer
+        self._lock = threading.Condition()
+        self._writer = threading.Lock()
+        self._idle: list[apsw.Connection] = []
+        # open connections plus those being opened
+        self._count = 0
+        self._closed = False
+        self._affinity = threading.local()
+        self._stats = ConnectionPoolStats()
+        # only used with readonly_readers
+        self._writer_connection: apsw.Connection | None = None
+        if readonly_readers:
+            # done first so the database exists and is in WAL mode
+            self._writer_connection = self._open(self._open_args)
+            self._stats.opened += 1
+
+    def _open(self, args: dict[str, Any]) -> apsw.Connection:
+        con = apsw.Connection(self.filename, **args)
+        try:
+            for func in self._setup:
+                func(con)
+            if self._warmer is not None:
+                self._warmer.warm(con)
+        except:
+            con.close()
+            raise
+        return con
+
+    def _record_wait(self, start: int) -> None:
+        # caller holds lock
+        waited = time.monotonic_ns() - start
+        self._stats.waits += 1
+        self._stats.wait_ns += waited
+        self._stats.max_wait_ns = max(self._stats.max_wait_ns, waited)
+
+    def _checkout(self, deadline: float | None, start: int) -> apsw.Connection:
+        last = getattr(self._affinity, "connection", None)
+        waited = False
+        with self._lock:
+            while True:
+                if self._closed:
+                    raise apsw.ConnectionClosedError("The pool has been closed")
+                if self._idle:
+                    if last is not None and any(c is last for c in self._idle):
+                        con = last
+                        self._idle.remove(con)
+                        self._stats.affinity_hits += 1
+                    else:
+                        con = self._idle.pop()
+                    break
+                if self._count < self.max_connections:
+                    self._count += 1
+                    con = None
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    self._stats.timeouts += 1
+                    raise TimeoutError("No connection available within the timeout")
+                waited = True
+                self._lock.wait(remaining)
+            if waited:
+                self._record_wait(start)
+
+        if con is None:
+            try:
+                con = self._open(self._reader_args)
+            except:
+                with self._lock:
+                    self._count -= 1
+                    self._lock.notify()
+                raise
+            with self._lock:
+                self._stats.opened += 1
+        self._affinity.connection = con
+        return con
+
+    def _reset(self, con: apsw.Connection) -> bool:
+        "Rolls back any transaction, returning False if the connection is not usable"
+        try:
+            if con.in_transaction:
+                con.execute("ROLLBACK")
+            return True
+        except apsw.Error:
+            # closed by the caller, or the rollback failed
+            return False
+
+    def _checkout_writer(self) -> apsw.Connection:
+        # caller holds the writer lock
+        with self._lock:
+            if self._closed:
+                raise apsw.ConnectionClosedError("The pool has been closed")
+            con = self._writer_connection
+        if con is None:
+            con = self._open(self._open_args)
+            with self._lock:
+                self._writer_connection = con
+                self._stats.opened += 1
+        return con
+
+    def _checkin_writer(self, con: apsw.Connection) -> None:
+        usable = self._reset(con)
+        with self._lock:
+            keep = usable and not self._closed
+            if not keep:
+                self._writer_connection = None
+        if not keep:
+            con.close()
+
+    def _checkin(self, con: apsw.Connection) -> None:
+        usable = self._reset(con)
+        with self._lock:
+            keep = usable and not self._closed
+            if keep:
+                self._idle.append(con)
+            else:
+                self._count -= 1
+            self._lock.notify()
+        if not keep:
+            con.close()
+
+    @contextlib.contextmanager
+    def connection(self, *, write: bool = False, timeout: float | None = None) -> Iterator[apsw.Connection]:
+        """Checks out a connection for the duration of a `with` block
+
+        :param write: Set to True to wait until no other writer has a
+            connection checked out
+        :param timeout: Seconds to wait, overriding the pool default
+
+        If the connection is still in a transaction when returned then
+        the transaction is rolled back.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        start = time.monotonic_ns()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        if write:
+            if not self._writer.acquire(blocking=False):
+                if not self._writer.acquire(timeout=-1 if timeout is None else timeout):
+                    with self._lock:
+                        self._stats.timeouts += 1
+                    raise TimeoutError("The writer did not become available within the timeout")
+                with self._lock:
+                    self._record_wait(start)
+                start = time.monotonic_ns()
+        try:
+            split_writer = write and self._readonly_readers
+            con = self._checkout_writer() if split_writer else self._checkout(deadline, start)
+            with self._lock:
+                self._stats.checkouts += 1
+                if write:
+                    self._stats.write_checkouts += 1
+            try:
+                yield con
+            finally:
+                if split_writer:
+                    self._checkin_writer(con)
+                else:
+                    self._checkin(con)
+        finally:
+            if write:
+                self._writer.release()
+
+    def stats(self) -> ConnectionPoolStats:
+        "Returns a copy of the current metrics"
+        with self._lock:
+            stats = dataclasses.replace(self._stats)
+            stats.connections = self._count
+            stats.idle = len(self._idle)
+            if self._writer_connection is not None:
+                stats.connections += 1
+                if not self._writer.locked():
+                    stats.idle += 1
+        return stats
+
+    def execute(self, statements: str, bindings: apsw.Bindings | None = None) -> list[apsw.SQLiteValues]:
+        """Runs *statements* returning all the result rows
+
+        A reader connection is checked out, and if any statement is
+        not :attr:`read only <apsw.Cursor.is_readonly>` then it is
+        stopped before running, and all the statements are run
+        again with the writer instead.
+        """
+
+        def readonly_only(cursor: apsw.Cursor, sql: str, bindings: apsw.Bindings | None) -> bool:
+            return cursor.is_readonly
+
+        with self.connection() as con:
+            cursor = con.cursor()
+            cursor.exec_trace = readonly_only
+            try:
+                return cursor.execute(statements, bindings).fetchall()
+            except apsw.ExecTraceAbort:
+                pass
+        with self.connection(write=True) as con:
+            return con.execute(statements, bindings).fetchall()
+
+    def close(self) -> None:
+        """Closes idle connections, and the rest as they are returned
+
+        Further checkouts raise :exc:`apsw.ConnectionClosedError`."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+            self._lock.notify_all()
+        for con in idle:
+            con.close()
+        if self._writer.acquire(blocking=False):
+            try:
+                with self._lock:
+                    con, self._writer_connection = self._writer_connection, None
+                if con is not None:
+                    con.close()
+            finally:
+                self._writer.release()
+
+    def __enter__(self) -> ConnectionPool:
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+
 @dataclasses.dataclass
 class PageUsage:
     """Returned by :func:`analyze_pages`"""
@@ -1693,6 +2139,683 @@ query_limit_context: contextvars.ContextVar[query_limit.limit] = contextvars.Con
 """
 
 
+class PageCodec(Protocol):
+    """Compresses and decompresses database pages for :class:`CompressedVFS`"""
+
+    name: str
+    "Recorded in the database file, which can then only be opened with the same codec name"
+
+    def compress(self, data: bytes) -> bytes:
+        "Returns *data* compressed"
+        ...
+
+    def decompress(self, data: bytes) -> bytes:
+        "Returns the original data"
+        ...
+
+
+class ZlibCodec:
+    """:class:`PageCodec` using :mod:`zlib`
+
+    :param level: Compression level from 1 (fastest) to 9 (smallest)"""
+
+    name = "zlib"
+
+    def __init__(self, level: int = 6):
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        return zlib.compress(data, self.level)
+
+    def decompress(self, data: bytes) -> bytes:
+        return zlib.decompress(data)
+
+
+class LZMACodec:
+    """:class:`PageCodec` using :mod:`lzma`, which compresses better
+    than zlib but is slower
+
+    :param preset: Compression preset from 0 (fastest) to 9 (smallest)"""
+
+    name = "lzma"
+
+    def __init__(self, preset: int = 6):
+        import lzma
+
+        self._lzma = lzma
+        # raw format avoids the container overhead on every page
+        self._filters = [{"id": lzma.FILTER_LZMA2, "preset": preset}]
+
+    def compress(self, data: bytes) -> bytes:
+        return self._lzma.compress(data, format=self._lzma.FORMAT_RAW, filters=self._filters)
+
+    def decompress(self, data: bytes) -> bytes:
+        return self._lzma.decompress(data, format=self._lzma.FORMAT_RAW, filters=self._filters)
+
+
+# CompressedVFS file layout.  The header is followed by slots, each
+# holding one compressed page with spare room so rewrites that still
+# fit go in place, otherwise a new slot is appended.  The last slot
+# for a page is current.  Truncations are recorded by appending a
+# marker slot.  The generation is updated by writers so other
+# connections know to discard their caches.
+_CPR_MAGIC = b"APSWCPR1"
+_CPR_HEADER = struct.Struct(">8sI16sQ")  # magic, page size, codec name, generation
+_CPR_HEADER_SIZE = 64
+_CPR_SLOT = struct.Struct(">IIII")  # page number, capacity, length, crc32 of data
+_CPR_SLOT_UPDATE = struct.Struct(">II")  # length, crc32 of data
+_CPR_RAW = 0x80000000  # length flag for page stored uncompressed
+_CPR_TRUNCATE = 0xFFFFFFFF  # page number for truncation marker
+_CPR_PAGE_SIZES = {1 << n for n in range(9, 17)}
+
+
+def _cpr_truncate_crc(page_count: int) -> int:
+    return zlib.crc32(page_count.to_bytes(4, "big"))
+
+
+class CompressedVFSFile(apsw.VFSFile):
+    """Main database file for :class:`CompressedVFS`
+
+    Each page is stored compressed by the *codec* with an in memory
+    index of where each page is, and up to *cache_pages* decompressed
+    pages are kept in a least recently used cache."""
+
+    def __init__(
+        self,
+        vfs: str,
+        filename: str | apsw.URIFilename | None,
+        flags: list[int],
+        codec: PageCodec,
+        cache_pages: int,
+    ):
+        super().__init__(vfs, filename, flags)
+        self.codec = codec
+        self.cache_pages = cache_pages
+        self.cache: collections.OrderedDict[int, bytes] = collections.OrderedDict()
+        "Decompressed pages by page number (zero based)"
+        self.index: dict[int, tuple[int, int]] = {}
+        "Slot offset and capacity by page number (zero based)"
+        self.page_size = 0
+        self.page_count = 0
+        self.generation = 0
+        self.end = _CPR_HEADER_SIZE
+        "Where the next slot is appended"
+        self.size = 0
+        "Size of the underlying file"
+        self.dirty = False
+        self.lock_level = apsw.SQLITE_LOCK_NONE
+        self._load()
+
+    def _load(self) -> None:
+        "(Re)reads the header and scans any slots not already indexed"
+        size = super().xFileSize()
+        if size == 0:
+            if self.page_size:
+                # deleted and recreated underneath us
+                self._reset()
+            return
+        magic, page_size, codec, generation = _CPR_HEADER.unpack_from(super().xRead(_CPR_HEADER.size, 0))
+        if magic != _CPR_MAGIC:
+            raise apsw.NotADBError("File is not a CompressedVFS database")
+        codec = codec.rstrip(b"\0").decode("ascii")
+        if codec != self.codec.name:
+            raise ValueError(f"Database pages are compressed with {codec!r} not {self.codec.name!r}")
+        if (generation, size) == (self.generation, self.size):
+            return
+        if page_size != self.page_size or size < self.end:
+            self._reset()
+        self.page_size = page_size
+        self.generation = generation
+        self.size = size
+        self.cache.clear()
+
+        offset = self.end
+        while offset + _CPR_SLOT.size <= size:
+            page, capacity, length, crc = _CPR_SLOT.unpack(super().xRead(_CPR_SLOT.size, offset))
+            if page == _CPR_TRUNCATE:
+                if capacity or crc != _cpr_truncate_crc(length):
+                    break
+                self._truncate_index(length)
+            else:
+                # an incompletely written slot can only be at the end
+                if not capacity or capacity % 16 or capacity > page_size or offset + _CPR_SLOT.size + capacity > size:
+                    break
+                self.index[page] = (offset, capacity)
+                self.page_count = max(self.page_count, page + 1)
+            offset += _CPR_SLOT.size + capacity
+        self.end = offset
+
+    def _reset(self) -> None:
+        self.cache.clear()
+        self.index.clear()
+        self.page_size = self.page_count = self.generation = self.size = 0
+        self.end = _CPR_HEADER_SIZE
+
+    def _write_header(self) -> None:
+        header = _CPR_HEADER.pack(_CPR_MAGIC, self.page_size, self.codec.name.encode("ascii"), self.generation)
+        super().xWrite(header.ljust(_CPR_HEADER_SIZE, b"\0"), 0)
+        self.size = max(self.size, _CPR_HEADER_SIZE)
+
+    def _truncate_index(self, page_count: int) -> None:
+        for page in [page for page in self.index if page >= page_count]:
+            del self.index[page]
+            self.cache.pop(page, None)
+        self.page_count = min(self.page_count, page_count)
+
+    def _append(self, data: bytes) -> int:
+        "Appends *data* returning its offset"
+        if self.size > self.end:
+            # discard an incompletely written slot
+            super().xTruncate(self.end)
+        offset = self.end
+        super().xWrite(data, offset)
+        self.end = self.size = offset + len(data)
+        return offset
+
+    def _cache_put(self, page: int, data: bytes) -> None:
+        if self.cache_pages > 0:
+            self.cache[page] = data
+            self.cache.move_to_end(page)
+            if len(self.cache) > self.cache_pages:
+                self.cache.popitem(last=False)
+
+    def _read_page(self, page: int) -> bytes:
+        data = self.cache.get(page)
+        if data is not None:
+            self.cache.move_to_end(page)
+            return data
+        slot = self.index.get(page)
+        if slot is None:
+            # never written
+            return bytes(self.page_size)
+        offset, capacity = slot
+        stored = super().xRead(_CPR_SLOT.size + capacity, offset)
+        _, _, length, crc = _CPR_SLOT.unpack_from(stored)
+        raw = length & _CPR_RAW
+        length &= ~_CPR_RAW
+        stored = stored[_CPR_SLOT.size : _CPR_SLOT.size + length]
+        if len(stored) != length or zlib.crc32(stored) != crc:
+            raise apsw.CorruptError(f"Compressed page {page + 1} fails checksum")
+        data = stored if raw else self.codec.decompress(stored)
+        if len(data) != self.page_size:
+            raise apsw.CorruptError(f"Compressed page {page + 1} has wrong size {len(data)}")
+        self._cache_put(page, data)
+        return data
+
+    def _write_page(self, page: int, data: bytes) -> None:
+        stored = self.codec.compress(data)
+        length = len(stored)
+        if length >= len(data):
+            stored, length = data, len(data) | _CPR_RAW
+        crc = zlib.crc32(stored)
+        slot = self.index.get(page)
+        if slot is not None and len(stored) <= slot[1]:
+            super().xWrite(_CPR_SLOT_UPDATE.pack(length, crc) + stored, slot[0] + 8)
+        else:
+            # leave some room to grow
+            capacity = min(self.page_size, (len(stored) + len(stored) // 8 + 15) & ~15)
+            offset = self._append(
+                _CPR_SLOT.pack(page, capacity, length, crc) + stored + bytes(capacity - len(stored))
+            )
+            self.index[page] = (offset, capacity)
+        self.page_count = max(self.page_count, page + 1)
+        self._cache_put(page, bytes(data))
+        self.dirty = True
+
+    def _finish_write(self) -> None:
+        if self.dirty:
+            self.generation += 1
+            self._write_header()
+            self.dirty = False
+
+    def xRead(self, amount: int, offset: int) -> bytes:
+        page_size = self.page_size
+        if not page_size:
+            return b""
+        result: list[bytes] = []
+        end = min(offset + amount, self.page_count * page_size)
+        while offset < end:
+            page, within = divmod(offset, page_size)
+            chunk = self._read_page(page)[within : within + end - offset]
+            result.append(chunk)
+            offset += len(chunk)
+        # returning less than amount is a short read
+        return b"".join(result)
+
+    def xWrite(self, data: bytes, offset: int) -> None:
+        if not self.page_size:
+            # this is almost always page 1, but any page size works
+            self.page_size = len(data) if offset == 0 and len(data) in _CPR_PAGE_SIZES else 4096
+            self._write_header()
+        page_size = self.page_size
+        pos = 0
+        while pos < len(data):
+            page, within = divmod(offset + pos, page_size)
+            count = min(page_size - within, len(data) - pos)
+            if count == page_size:
+                self._write_page(page, data[pos : pos + count])
+            else:
+                existing = self._read_page(page) if page < self.page_count else bytes(page_size)
+                self._write_page(page, existing[:within] + data[pos : pos + count] + existing[within + count :])
+            pos += count
+
+    def xTruncate(self, newsize: int) -> None:
+        if not self.page_size:
+            return
+        page_count = -(-newsize // self.page_size)
+        if page_count >= self.page_count:
+            return
+        self._append(_CPR_SLOT.pack(_CPR_TRUNCATE, 0, page_count, _cpr_truncate_crc(page_count)))
+        self._truncate_index(page_count)
+        self.dirty = True
+
+    def xFileSize(self) -> int:
+        return self.page_count * self.page_size
+
+    def xSync(self, flags: int) -> None:
+        self._finish_write()
+        super().xSync(flags)
+
+    def xLock(self, level: int) -> None:
+        super().xLock(level)
+        previous, self.lock_level = self.lock_level, level
+        if previous == apsw.SQLITE_LOCK_NONE:
+            # another connection may have made changes
+            try:
+                self._load()
+            except BaseException:
+                super().xUnlock(previous)
+                self.lock_level = previous
+                raise
+
+    def xUnlock(self, level: int) -> None:
+        if level < self.lock_level:
+            self._finish_write()
+        super().xUnlock(level)
+        self.lock_level = level
+
+    def xFileControl(self, op: int, ptr: int) -> bool:
+        # these would operate on the underlying file size
+        if op in (apsw.SQLITE_FCNTL_SIZE_HINT, apsw.SQLITE_FCNTL_CHUNK_SIZE):
+            return False
+        if op == apsw.SQLITE_FCNTL_PRAGMA:
+            pragma = apsw.VFSFcntlPragma(ptr)
+            if pragma.name.lower() == "journal_mode" and (pragma.value or "").lower() == "wal":
+                raise apsw.CantOpenError("CompressedVFS does not support WAL")
+        return super().xFileControl(op, ptr)
+
+    def xDeviceCharacteristics(self) -> int:
+        # writes are not the byte ranges SQLite asked for, so claim no
+        # atomicity or powersafe overwrite
+        return 0
+
+
+class CompressedVFS(apsw.VFS):
+    """A :class:`VFS <apsw.VFS>` that compresses each main database page
+
+    Journals and temporary files are passed through unchanged.
+    Compressed pages vary in size, so they are stored with extra space
+    to allow rewrites in place, and when a page no longer fits it is
+    written at the end of the file, leaving the previous space unused.
+    Use ``VACUUM INTO`` with a new file name to get a compact copy.
+
+    ::
+
+        vfs = apsw.ext.CompressedVFS("compressed", codec=apsw.ext.ZlibCodec(level=9))
+        con = apsw.Connection("data.db", vfs="compressed")
+
+    Several connections (including in other processes) can use the
+    same database, with changes detected when each transaction starts.
+    :ref:`WAL <wal>` is not supported because that detection is not
+    possible.
+
+    :param name: Name to register the VFS under
+    :param base: VFS that does the actual storage, with empty string
+        meaning the default
+    :param codec: How pages are compressed, defaulting to :class:`ZlibCodec`
+    :param cache_pages: How many decompressed pages each open database
+        keeps in a least recently used cache
+    :param makedefault: Make this the default VFS
+    """
+
+    def __init__(
+        self,
+        name: str = "compressed",
+        base: str = "",
+        *,
+        codec: PageCodec | None = None,
+        cache_pages: int = 1024,
+        makedefault: bool = False,
+    ):
+        self.vfs_name = name
+        self.base_vfs = base
+        self.codec = codec if codec is not None else ZlibCodec()
+        if len(self.codec.name.encode("ascii")) > 16:
+            raise ValueError("Codec names are limited to 16 characters")
+        self.cache_pages = cache_pages
+        super().__init__(name, base, makedefault=makedefault)
+
+    def xOpen(self, name: str | apsw.URIFilename | None, flags: list[int]) -> apsw.VFSFile:
+        if flags[0] & apsw.SQLITE_OPEN_MAIN_DB:
+            return CompressedVFSFile(self.base_vfs, name, flags, self.codec, self.cache_pages)
+        if flags[0] & apsw.SQLITE_OPEN_WAL:
+            raise apsw.CantOpenError("CompressedVFS does not support WAL")
+        return super().xOpen(name, flags)
+
+
+@dataclass
+class HTTPVFSStats:
+    "A :mod:`dataclass <dataclasses>` with metrics from :meth:`HTTPVFS.stats`"
+
+    requests: int = 0
+    "How many range requests were made"
+    bytes: int = 0
+    "Bytes received"
+    hits: int = 0
+    "How many blocks were found in the cache"
+    misses: int = 0
+    "How many blocks were not in the cache, including those that were already being prefetched"
+    prefetches: int = 0
+    "How many blocks were requested by read ahead"
+    request_ns: int = 0
+    "Total nanoseconds spent in requests, which can overlap"
+
+
+class HTTPVFSFile:
+    """Read only database file for :class:`HTTPVFS`
+
+    This implements the :class:`VFSFile <apsw.VFSFile>` methods without
+    inheriting, since there is no underlying file."""
+
+    def __init__(self, vfs: HTTPVFS, url: str):
+        self.vfs = vfs
+        self.url = url
+        self.executor: concurrent.futures.ThreadPoolExecutor | None = None
+        self.pending: dict[int, concurrent.futures.Future[bytes]] = {}
+        "Blocks being fetched in the background"
+        self.validator: str | None = None
+        "ETag or Last-Modified of the file, used to detect changes"
+        self.size = -1
+        self.last_end = -1
+        "Where the previous read ended"
+        self.sequential = 0
+        "How many consecutive reads have been sequential"
+        block = self._fetch(0)
+        self.blocks = -(-self.size // vfs.block_size)
+        self.vfs._cache_put(self._key(0), block)
+
+    def _key(self, block: int) -> tuple[str, str | None, int]:
+        return self.url, self.validator, block
+
+    def _fetch(self, block: int) -> bytes:
+        "Retrieves *block* from the server, also called from worker threads"
+        start = block * self.vfs.block_size
+        headers = {**self.vfs.headers, "Range": f"bytes={start}-{start + self.vfs.block_size - 1}"}
+        begin = time.monotonic_ns()
+        try:
+            with self.vfs._urlopen(
+                self.vfs._urllib.request.Request(self.url, headers=headers), timeout=self.vfs.timeout
+            ) as response:
+                if response.status != 206:
+                    raise apsw.IOError(f"{self.url} does not support range requests")
+                content_range = response.headers.get("Content-Range", "")
+                validator = response.headers.get("ETag") or response.headers.get("Last-Modified")
+                data = response.read()
+        except self.vfs._urllib.error.URLError as exc:
+            raise apsw.IOError(f"Fetching {self.url}: {exc}") from exc
+        mo = re.fullmatch(r"bytes\s+(\d+)-\d+/(\d+)", content_range.strip())
+        if not mo or int(mo.group(1)) != start:
+            raise apsw.IOError(f"{self.url} gave unexpected Content-Range {content_range!r}")
+        size = int(mo.group(2))
+        if self.size < 0:
+            self.size, self.validator = size, validator
+        elif (size, validator) != (self.size, self.validator):
+            raise apsw.IOError(f"{self.url} has changed")
+        with self.vfs._lock:
+            self.vfs._stats.requests += 1
+            self.vfs._stats.bytes += len(data)
+            self.vfs._stats.request_ns += time.monotonic_ns() - begin
+        return data
+
+    def _submit(self, block: int) -> concurrent.futures.Future[bytes]:
+        if self.executor is None:
+            self.executor = concurrent.futures.ThreadPoolExecutor(
+                self.vfs.max_workers, thread_name_prefix="apsw.ext.HTTPVFS"
+            )
+        future = self.pending[block] = self.executor.submit(self._fetch, block)
+        return future
+
+    def _get_blocks(self, first: int, last: int) -> list[bytes]:
+        result: list[bytes | concurrent.futures.Future[bytes] | None] = []
+        missing: list[int] = []
+        for block in range(first, last + 1):
+            data = self.vfs._cache_get(self._key(block))
+            if data is None:
+                missing.append(block)
+            result.append(data)
+        with self.vfs._lock:
+            self.vfs._stats.hits += len(result) - len(missing)
+            self.vfs._stats.misses += len(missing)
+
+        if len(missing) == 1 and missing[0] not in self.pending:
+            # no benefit from another thread
+            result[missing[0] - first] = self._fetch(missing[0])
+        else:
+            for block in missing:
+                result[block - first] = self.pending.get(block) or self._submit(block)
+
+        for i, item in enumerate(result):
+            if isinstance(item, concurrent.futures.Future):
+                self.pending.pop(first + i, None)
+                result[i] = item.result()
+            if first + i in missing:
+                self.vfs._cache_put(self._key(first + i), result[i])  # type: ignore[arg-type]
+        return result  # type: ignore[return-value]
+
+    def _read_ahead(self, after: int) -> None:
+        # gather completed prefetches so failures are not kept around
+        for block, future in list(self.pending.items()):
+            if future.done():
+                del self.pending[block]
+                if future.exception() is None:
+                    self.vfs._cache_put(self._key(block), future.result())
+        count = 0
+        for block in range(after, min(after + self.vfs.read_ahead, self.blocks)):
+            if len(self.pending) >= self.vfs.read_ahead:
+                break
+            if block not in self.pending and not self.vfs._cache_contains(self._key(block)):
+                self._submit(block)
+                count += 1
+        with self.vfs._lock:
+            self.vfs._stats.prefetches += count
+
+    def xRead(self, amount: int, offset: int) -> bytes:
+        end = min(offset + amount, self.size)
+        if offset >= end:
+            return b""
+        block_size = self.vfs.block_size
+        first, last = offset // block_size, (end - 1) // block_size
+
+        if self.last_end <= offset <= self.last_end + block_size:
+            self.sequential += 1
+        else:
+            self.sequential = 0
+        self.last_end = end
+
+        data = b"".join(self._get_blocks(first, last))
+        if self.sequential >= 2 and self.vfs.read_ahead:
+            self._read_ahead(last + 1)
+        start = offset - first * block_size
+        # returning less than amount is a short read
+        return data[start : start + end - offset]
+
+    def xFileSize(self) -> int:
+        return self.size
+
+    def xClose(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+        self.pending.clear()
+
+    def xWrite(self, data: bytes, offset: int) -> None:
+        raise apsw.ReadOnlyError("HTTPVFS files are read only")
+
+    def xTruncate(self, newsize: int) -> None:
+        raise apsw.ReadOnlyError("HTTPVFS files are read only")
+
+    def xSync(self, flags: int) -> None:
+        pass
+
+    def xLock(self, level: int) -> None:
+        pass
+
+    def xUnlock(self, level: int) -> None:
+        pass
+
+    def xCheckReservedLock(self) -> bool:
+        return False
+
+    def xFileControl(self, op: int, ptr: int) -> bool:
+        return False
+
+    def xSectorSize(self) -> int:
+        return 4096
+
+    def xDeviceCharacteristics(self) -> int:
+        # SQLite then skips locking and checking for journals
+        return apsw.SQLITE_IOCAP_IMMUTABLE
+
+
+class HTTPVFS(apsw.VFS):
+    """A read only :class:`VFS <apsw.VFS>` that gets databases from
+    HTTP(S) servers using range requests
+
+    Only the parts of the database that queries need are transferred,
+    in blocks of *block_size*.  Blocks are kept in a least recently
+    used cache shared by all connections using the VFS, so the same
+    database opened again does not fetch them again.  When reads are
+    sequential (such as a table scan) the following *read_ahead*
+    blocks are fetched in parallel in background threads.  Several
+    blocks needed for one read are also fetched in parallel.
+
+    ::
+
+        vfs = apsw.ext.HTTPVFS("http", base_url="https://example.com/data/")
+        con = apsw.Connection("reference.db", vfs="http", flags=apsw.SQLITE_OPEN_READONLY)
+
+    The filename is joined to *base_url*, or can be a complete
+    ``http://`` or ``https://`` URL.  Other filenames (eg temporary
+    files) are handled by *base*.  The server must support range
+    requests.  The database must not change while open - an
+    :exc:`apsw.IOError` is raised if the size, ETag, or Last-Modified
+    differs.  The database must not be in :ref:`WAL <wal>` mode.
+
+    :param name: Name to register the VFS under
+    :param base: VFS used for non URL files, with empty string meaning
+        the default
+    :param base_url: Relative filenames are joined to this
+    :param block_size: Bytes in each range request
+    :param cache_blocks: How many blocks to keep in the cache
+    :param read_ahead: How many blocks to fetch ahead of sequential
+        reads, with zero disabling read ahead
+    :param max_workers: Most background requests at once for each
+        open database
+    :param timeout: Seconds to wait for each request
+    :param headers: Extra HTTP headers sent with each request, such
+        as authorization
+    :param makedefault: Make this the default VFS
+    """
+
+    def __init__(
+        self,
+        name: str = "http",
+        base: str = "",
+        *,
+        base_url: str | None = None,
+        block_size: int = 65536,
+        cache_blocks: int = 256,
+        read_ahead: int = 8,
+        max_workers: int = 4,
+        timeout: float = 30,
+        headers: dict[str, str] | None = None,
+        makedefault: bool = False,
+    ):
+        import urllib.error
+        import urllib.parse
+        import urllib.request
+
+        if block_size < 512:
+            raise ValueError("block_size must be at least 512")
+        self._urllib = urllib
+        self._urlopen = urllib.request.urlopen
+        self.vfs_name = name
+        self.base_url = base_url
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.read_ahead = read_ahead
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.headers = dict(headers or {})
+        self._cache: collections.OrderedDict[tuple[str, str | None, int], bytes] = collections.OrderedDict()
+        self._stats = HTTPVFSStats()
+        self._lock = threading.Lock()
+        super().__init__(name, base, makedefault=makedefault)
+
+    def stats(self) -> HTTPVFSStats:
+        "Returns a copy of the current metrics"
+        with self._lock:
+            return dataclasses.replace(self._stats)
+
+    def _url(self, name: str) -> str | None:
+        "Returns the URL for *name*, or None if it isn't one"
+        if self.base_url is not None:
+            name = self._urllib.parse.urljoin(self.base_url, name)
+        if name.lower().startswith(("http://", "https://")):
+            return name
+        return None
+
+    def _cache_get(self, key: tuple[str, str | None, int]) -> bytes | None:
+        with self._lock:
+            data = self._cache.get(key)
+            if data is not None:
+                self._cache.move_to_end(key)
+            return data
+
+    def _cache_contains(self, key: tuple[str, str | None, int]) -> bool:
+        with self._lock:
+            return key in self._cache
+
+    def _cache_put(self, key: tuple[str, str | None, int], data: bytes) -> None:
+        with self._lock:
+            if self.cache_blocks > 0:
+                self._cache[key] = data
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.cache_blocks:
+                    self._cache.popitem(last=False)
+
+    def xFullPathname(self, name: str) -> str:
+        return self._url(name) or super().xFullPathname(name)
+
+    def xAccess(self, pathname: str, flags: int) -> bool:
+        if self._url(pathname):
+            # there are never journals or similar
+            return False
+        return super().xAccess(pathname, flags)
+
+    def xOpen(self, name: str | apsw.URIFilename | None, flags: list[int]) -> apsw.VFSFile:
+        filename = name.filename() if isinstance(name, apsw.URIFilename) else name
+        url = self._url(filename) if filename else None
+        if url is None:
+            return super().xOpen(name, flags)
+        if not flags[0] & apsw.SQLITE_OPEN_MAIN_DB:
+            raise apsw.CantOpenError(f"HTTPVFS can only open main databases not {url}")
+        file = HTTPVFSFile(self, url)
+        flags[1] |= apsw.SQLITE_OPEN_READONLY
+        # it has the VFSFile methods without inheriting
+        return file  # type: ignore[return-value]
+
+
 class QueryLimitNoException(Exception):
     """Indicates that no exception will be raised when a :class:`query_limit` is exceeded"""
 
@@ -2210,6 +3333,30 @@ class VTColumnAccess(enum.Enum):
     "By attribute like with :mod:`dataclasses` - eg :code:`row.quantity`"
 
 
+@dataclass(frozen=True)
+class VTConstraints:
+    """A :mod:`dataclass <dataclasses>` with the query constraints given to
+    :meth:`make_virtual_module` callables that have *constraints* set.
+
+    They are advisory.  SQLite still checks every row you return
+    against the WHERE clause, and applies ORDER BY (unless
+    *order_by_consumed* was set), LIMIT, and OFFSET.  You can use them to
+    avoid producing rows that would be discarded anyway."""
+
+    where: tuple[tuple[str, str, apsw.SQLiteValue | set[apsw.SQLiteValue]], ...] = ()
+    """Each item is a column name, operator, and value.  Operators are
+    ``=``, ``>``, ``>=``, ``<``, ``<=``, and ``in`` where the value is a
+    :class:`set`.  ``BETWEEN`` is provided as ``>=`` and ``<=``."""
+    order_by: tuple[tuple[str, bool], ...] = ()
+    "Each item is a column name and *True* if descending"
+    limit: int | None = None
+    """The LIMIT if there are no WHERE constraints on columns.  At most
+    *offset* plus *limit* rows are needed, as SQLite still skips the
+    first *offset* rows itself."""
+    offset: int | None = None
+    "The OFFSET if *limit* is present"
+
+
 def get_column_names(row: Any) -> tuple[Sequence[str], VTColumnAccess]:
     r"""
     Works out column names and access given an example row
@@ -2276,6 +3423,12 @@ class VirtualModuleCallable(Protocol):
     "How to get values from each row"
     primary_key: int | None = None
     "Which column if any is a primary key"
+    constraints: bool = False
+    "If *True* then a :class:`VTConstraints` is passed as the *constraints* keyword argument"
+    order_by_consumed: bool = False
+    "If *True* then rows are returned in the order given by :attr:`VTConstraints.order_by`"
+    batch_parameters: Sequence[str] = ()
+    "Parameters that get all the values of an ``IN`` at once"
 
     def __call__(self, *args, **kwargs) -> Iterable | AsyncIterable:
         "It can either an iterator over the values"
@@ -2395,6 +3548,34 @@ def make_virtual_module(
     non-equality for WHERE clauses of parameters then the query will
     fail with :class:`apsw.SQLError` and a message from SQLite of
     "no query solution"
+
+    If the *callable* has an attribute named *constraints* that is
+    *True* then it is called with a keyword argument named
+    *constraints* containing a :class:`VTConstraints` describing
+    WHERE clauses on the columns, ORDER BY, LIMIT, and OFFSET.  That
+    lets it skip work, such as only fetching matching rows from
+    external storage.  If it also has an attribute named
+    *order_by_consumed* that is *True* then it must return rows in
+    :attr:`VTConstraints.order_by` order, and SQLite won't sort them.
+
+    Normally ``WHERE param IN (1, 2, 3)`` calls *callable* once per
+    value.  If *callable* has an attribute named *batch_parameters*
+    with parameter names, then a parameter from that list is given a
+    :class:`set` of all the values in one call, so it can do a single
+    bulk lookup.  It must return a :class:`dict` (or other
+    :class:`~collections.abc.Mapping`) with each value as a key, and
+    the rows for that value.  Values with no rows can be left out.
+    (Only one parameter per query is batched.)  For example::
+
+      def lookup(user_id):
+          if isinstance(user_id, set):
+              return fetch_many(user_id)
+          return fetch_many({user_id}).get(user_id, [])
+
+      lookup.batch_parameters = ("user_id",)
+
+    The cursor is a subclass of :class:`apsw.VTRowCursor` so rows and
+    column values are retrieved by C code.
     """
 
     class Module:
@@ -2405,8 +3586,11 @@ def make_virtual_module(
             column_access: VTColumnAccess,
             primary_key: int | None,
             repr_invalid: bool,
+            constraints: bool,
+            order_by_consumed: bool,
+            batch_parameters: Sequence[str],
         ):
-            self.columns = columns
+            self.columns = tuple(columns)
             self.callable: Callable = callable
             if not isinstance(column_access, VTColumnAccess):
                 raise ValueError(f"Expected column_access to be {VTColumnAccess} not {column_access!r}")
@@ -2415,7 +3599,11 @@ def make_virtual_module(
             # These are as representable as SQLiteValue and are not used
             # for the actual call.
             self.defaults: list[apsw.SQLiteValue] = []
+            self.constraints = constraints
+            self.order_by_consumed = order_by_consumed
             for p, v in inspect.signature(callable).parameters.items():
+                if constraints and p == "constraints":
+                    continue
                 self.parameters.append(p)
                 default = None if v.default is inspect.Parameter.empty else v.default
                 try:
@@ -2429,6 +3617,9 @@ def make_virtual_module(
                 raise ValueError(f"Same name in columns and in paramters: {both}")
 
             self.all_columns: tuple[str] = tuple(self.columns) + tuple(self.parameters)  # type: ignore[assignment]
+            self.batch_parameters = set(batch_parameters)
+            if self.batch_parameters - set(self.parameters):
+                raise ValueError(f"batch_parameters {self.batch_parameters - set(self.parameters)} are not parameters")
             self.primary_key = primary_key
             if self.primary_key is not None and not (0 <= self.primary_key < len(self.columns)):
                 raise ValueError(f"{self.primary_key!r} should be None or a column number < {len(self.columns)}")
@@ -2463,25 +3654,68 @@ def make_virtual_module(
                 self.param_values = param_values
 
             def BestIndexObject(self, o: apsw.IndexInfo) -> bool:
+                # idx_str items are p:name for parameters, b:name for a
+                # batched parameter, c:column:op for column constraints,
+                # limit, offset (all those consume Filter args in order)
+                # and o:column:desc for ORDER BY
                 idx_str: list[str] = []
+                params: set[str] = set()
+                batch: str | None = None
                 param_start = len(self.module.columns)
+                limits: list[tuple[int, str]] = []
                 for c in range(o.nConstraint):
-                    if o.get_aConstraint_iColumn(c) >= param_start:
+                    column = o.get_aConstraint_iColumn(c)
+                    op = o.get_aConstraint_op(c)
+                    if op in (apsw.SQLITE_INDEX_CONSTRAINT_LIMIT, apsw.SQLITE_INDEX_CONSTRAINT_OFFSET):
+                        if self.module.constraints and o.get_aConstraint_usable(c):
+                            limits.append((c, "limit" if op == apsw.SQLITE_INDEX_CONSTRAINT_LIMIT else "offset"))
+                        continue
+                    if column >= param_start:
                         if not o.get_aConstraint_usable(c):
                             continue
-                        if o.get_aConstraint_op(c) != apsw.SQLITE_INDEX_CONSTRAINT_EQ:
+                        if op != apsw.SQLITE_INDEX_CONSTRAINT_EQ:
                             return False
                         o.set_aConstraintUsage_argvIndex(c, len(idx_str) + 1)
                         o.set_aConstraintUsage_omit(c, True)
-                        n = self.module.all_columns[o.get_aConstraint_iColumn(c)]
+                        n = self.module.all_columns[column]
                         # a parameter could be a function parameter and where
                         #    generate_series(7) where start=8
                         # the order they appear in IndexInfo is random so we
                         # have to abort the query because a random one would
                         # prevail
-                        if n in idx_str:
+                        if n in params:
                             return False
-                        idx_str.append(n)
+                        params.add(n)
+                        if batch is None and n in self.module.batch_parameters and o.get_aConstraintUsage_in(c):
+                            o.set_aConstraintUsage_in(c, True)
+                            batch = n
+                            idx_str.append(f"b:{n}")
+                        else:
+                            idx_str.append(f"p:{n}")
+                    elif self.module.constraints and o.get_aConstraint_usable(c):
+                        if column < 0 or op not in _vt_constraint_ops:
+                            continue
+                        op_name = _vt_constraint_ops[op]
+                        if o.get_aConstraintUsage_in(c):
+                            o.set_aConstraintUsage_in(c, True)
+                            op_name = "in"
+                        # not omitted so SQLite double checks
+                        o.set_aConstraintUsage_argvIndex(c, len(idx_str) + 1)
+                        idx_str.append(f"c:{column}:{op_name}")
+
+                if self.module.constraints:
+                    has_where = any(item.startswith("c:") for item in idx_str)
+                    if o.nOrderBy and all(0 <= o.get_aOrderBy_iColumn(i) < param_start for i in range(o.nOrderBy)):
+                        for i in range(o.nOrderBy):
+                            idx_str.append(f"o:{o.get_aOrderBy_iColumn(i)}:{int(o.get_aOrderBy_desc(i))}")
+                        # batched rows are grouped by value
+                        o.orderByConsumed = self.module.order_by_consumed and batch is None
+                    # LIMIT is only correct for the callable to apply when
+                    # SQLite isn't going to discard or reorder rows
+                    if not has_where and batch is None and (not o.nOrderBy or o.orderByConsumed):
+                        for c, kind in limits:
+                            o.set_aConstraintUsage_argvIndex(c, sum(not i.startswith("o:") for i in idx_str) + 1)
+                            idx_str.append(kind)
 
                 o.idxStr = ",".join(idx_str)
                 # say there are a huge number of rows so the query planner avoids us
@@ -2496,118 +3730,80 @@ def make_virtual_module(
 
             Destroy = Disconnect
 
-        class Cursor:
+        class Cursor(apsw.VTRowCursor):
+            # Eof, Next, Column, and Rowid are implemented in C by
+            # apsw.VTRowCursor so that no Python code runs per value
             def __init__(self, module: Module, param_values: dict[str, apsw.SQLiteValue]):
                 self.module = module
                 self.param_values = param_values
-                self.iterating: Iterator[apsw.SQLiteValues] | AsyncIterator[apsw.SQLiteValues] | None = None
-                self.current_row: Any = None
-                self.columns = module.columns
-                self.repr_invalid = module.repr_invalid
-                self.num_columns = len(self.columns)
-                self.access = self.module.column_access
-                col_func = f"_Column_{self.access.name}"
-                f = getattr(self, col_func, self.Column)
-                if self.repr_invalid:
-                    setattr(self, "Column", self._Column_repr_invalid)
-                    setattr(self, "_Column_get", f)
-                else:
-                    setattr(self, "Column", f)
-                self.is_async = False
 
             def Filter(self, idx_num: int, idx_str: str, args: tuple[apsw.SQLiteValue]) -> None:
                 params: dict[str, apsw.SQLiteValue] = self.param_values.copy()
-                params.update(zip(idx_str.split(","), args))
-                values = self.module.callable(**params)
-                self.is_async = False
-                if inspect.isasyncgen(values):
-                    self.iterating = aiter(values)
-                    self._impl_next = _get_anext
-                    self.is_async = True
-                elif inspect.iscoroutine(values):
-                    self.iterating = iter(apsw.async_run_coro(values))
-                    self._impl_next = next
-                else:
-                    self.iterating = iter(values)
-                    self._impl_next = next
-                # proactively advance so we can tell if eof
-                self.Next()
+                where: list[tuple[str, str, apsw.SQLiteValue]] = []
+                order_by: list[tuple[str, bool]] = []
+                limits: dict[str, int] = {}
+                batch: str | None = None
+                values_iter = iter(args)
+                for item in idx_str.split(",") if idx_str else ():
+                    kind, _, rest = item.partition(":")
+                    if kind == "p":
+                        params[rest] = next(values_iter)
+                    elif kind == "b":
+                        batch = rest
+                        params[rest] = next(values_iter)
+                    elif kind == "c":
+                        column, op = rest.split(":")
+                        where.append((self.module.columns[int(column)], op, next(values_iter)))
+                    elif kind == "o":
+                        column, desc = rest.split(":")
+                        order_by.append((self.module.columns[int(column)], desc == "1"))
+                    else:
+                        limits[kind] = next(values_iter)  # type: ignore[assignment]
 
-                self.hidden_values: list[apsw.SQLiteValue] = self.module.defaults[:]
+                hidden_values: list[apsw.SQLiteValue] = self.module.defaults[:]
                 for k, v in params.items():
-                    self.hidden_values[self.module.parameters.index(k)] = v
-
-            def Eof(self) -> bool:
-                return self.iterating is None
-
-            def Close(self) -> None:
-                if self.iterating:
-                    if self.is_async:
-                        if (aclose := getattr(self.iterating, "aclose", None)) is not None:
-                            apsw.async_run_coro(aclose())
-                    elif hasattr(self.iterating, "close"):
-                        self.iterating.close()
-                    self.iterating = None
-
-            def Column(self, which: int) -> apsw.SQLiteValue:
-                # This is the specification/documentation for the custom
-                # versions which should produce exactly the same output
-                if which >= self.num_columns:
-                    return self.hidden_values[which - self.num_columns]
-                if self.access is VTColumnAccess.By_Index:
-                    v = self.current_row[which]
-                elif self.access is VTColumnAccess.By_Name:
-                    v = self.current_row[self.columns[which]]
-                elif self.access is VTColumnAccess.By_Attr:
-                    v = getattr(self.current_row, self.columns[which])
-                if self.repr_invalid and v is not None and not isinstance(v, (int, float, str, bytes)):
-                    v = repr(v)
-                return v  # type: ignore[no-any-return]
-
-            def _Column_repr_invalid(self, which: int) -> apsw.SQLiteValue:
-                v = self._Column_get(which)  # type: ignore[attr-defined]
-                return v if v is None or isinstance(v, (int, float, str, bytes)) else repr(v)
-
-            def _Column_By_Attr(self, which: int) -> apsw.SQLiteValue:
-                return (
-                    getattr(self.current_row, self.columns[which])
-                    if which < self.num_columns
-                    else self.hidden_values[which - self.num_columns]
-                )
-
-            def _Column_By_Name(self, which: int) -> apsw.SQLiteValue:
-                return (
-                    self.current_row[self.columns[which]]
-                    if which < self.num_columns
-                    else self.hidden_values[which - self.num_columns]
-                )
+                    hidden_values[self.module.parameters.index(k)] = v
 
-            def _Column_By_Index(self, which: int) -> apsw.SQLiteValue:
-                return (
-                    self.current_row[which]
-                    if which < self.num_columns
-                    else self.hidden_values[which - self.num_columns]
+                if self.module.constraints:
+                    params["constraints"] = VTConstraints(  # type: ignore[assignment]
+                        tuple(where), tuple(order_by), limits.get("limit"), limits.get("offset")
+                    )
+                values = self.module.callable(**params)
+                if batch is not None:
+                    if inspect.iscoroutine(values):
+                        values = apsw.async_run_coro(values)
+                    if not isinstance(values, Mapping):
+                        raise TypeError(f"Expected a Mapping for batch parameter {batch} not {type(values)}")
+                    # the hidden column for batch is updated for each
+                    # value's rows
+                    rows: Iterator[Any] = _batch_rows(
+                        values, params[batch], hidden_values, self.module.parameters.index(batch)
+                    )
+                elif inspect.isasyncgen(values):
+                    rows = _AsyncRowsIterator(values)
+                elif inspect.iscoroutine(values):
+                    rows = iter(apsw.async_run_coro(values))
+                else:
+                    rows = iter(values)
+
+                self.set_rows(
+                    rows,
+                    hidden_values if batch is not None else tuple(hidden_values),
+                    self.module.columns,
+                    self.module.column_access.value,
+                    self.module.repr_invalid,
+                    self.module.primary_key,
                 )
 
-            def Next(self) -> None:
-                try:
-                    self.current_row = self._impl_next(self.iterating)  # type: ignore[arg-type]
-                except (StopIteration, StopAsyncIteration):
-                    if hasattr(self.iterating, "close"):
-                        self.iterating.close()  # type: ignore[union-attr]
-                    self.iterating = None
-
-            def Rowid(self):
-                if self.module.primary_key is None:
-                    return id(self.current_row)
-                return self.Column(self.module.primary_key)
-
     mod = Module(
         callable,
         callable.columns,  # type: ignore[attr-defined]
         callable.column_access,  # type: ignore[attr-defined]
         getattr(callable, "primary_key", None),
         repr_invalid,
+        bool(getattr(callable, "constraints", False)),
+        bool(getattr(callable, "order_by_consumed", False)),
+        getattr(callable, "batch_parameters", ()),
     )
 
     return db.create_module(
@@ -2619,12 +3815,61 @@ def make_virtual_module(
         read_only=True,
     )
 
+
+_vt_constraint_ops = {
+    apsw.SQLITE_INDEX_CONSTRAINT_EQ: "=",
+    apsw.SQLITE_INDEX_CONSTRAINT_GT: ">",
+    apsw.SQLITE_INDEX_CONSTRAINT_GE: ">=",
+    apsw.SQLITE_INDEX_CONSTRAINT_LT: "<",
+    apsw.SQLITE_INDEX_CONSTRAINT_LE: "<=",
+}
+
+
+def _batch_rows(
+    results: Mapping[apsw.SQLiteValue, Iterable[Any]],
+    values: set[apsw.SQLiteValue],
+    hidden_values: list[apsw.SQLiteValue],
+    index: int,
+) -> Iterator[Any]:
+    "Yields the rows for each value, setting the hidden column to that value"
+    for value in values:
+        rows = results.get(value)
+        if rows is not None:
+            hidden_values[index] = value
+            yield from rows
+
+
 def _get_anext(aiterator: AsyncIterator[apsw.SQLiteValues]) -> apsw.SQLiteValues:
     async def async_get_anext():
         return await anext(aiterator)
 
     return apsw.async_run_coro(async_get_anext())
 
+
+class _AsyncRowsIterator:
+    "Makes an async generator look like a sync iterator for :class:`apsw.VTRowCursor`"
+
+    def __init__(self, agen: AsyncIterator[apsw.SQLiteValues]):
+        self.agen: AsyncIterator[apsw.SQLiteValues] | None = agen
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> apsw.SQLiteValues:
+        if self.agen is None:
+            raise StopIteration
+        try:
+            return _get_anext(self.agen)
+        except StopAsyncIteration:
+            # exhausted so no aclose needed
+            self.agen = None
+            raise StopIteration
+
+    def close(self) -> None:
+        agen, self.agen = self.agen, None
+        if agen is not None and (aclose := getattr(agen, "aclose", None)) is not None:
+            apsw.async_run_coro(aclose())
+
 def generate_series_sqlite(
     start: apsw.SQLiteValue = None, stop: apsw.SQLiteValue = 0xFFFF_FFFF_FFFF_FFFF, step: apsw.SQLiteValue = 1
 ):
@@ -327,6 +327,7 @@ class APSW(unittest.TestCase):
         "set_update_hook": 1,
         "set_progress_handler": 2,
         "enableloadextension": 1,
+        "create_columns_table": 2,
         "create_module": 2,
         "file_control": 3,
         "set_exec_trace": 1,
@@ -931,6 +932,7 @@ class APSW(unittest.TestCase):
                         | "get_row_trace"
                         | "get_exec_trace"
                         | "fetchall"
+                        | "fetch_columns"
                     ):
                         getattr(cursor, n)()
                     # read attributes
@@ -956,6 +958,8 @@ class APSW(unittest.TestCase):
                         cursor.execute("select 1,2,3")
                     case "executemany":
                         cursor.executemany("select ?", ((1,), (2,)))
+                    case "fetch_into":
+                        cursor.fetch_into((None,))
                     case "setexectrace" | "set_exec_trace" | "setrowtrace" | "set_row_trace":
                         # set it to get results which should have no effect
                         getattr(cursor, n)(getattr(cursor, "g" + n[1:])())
@@ -1024,7 +1028,17 @@ class APSW(unittest.TestCase):
                         # async in sync context
                         self.assertIsInstance(this[k], TypeError)
                         self.assertIsInstance(thread[k], TypeError)
-                    case "__next__" | "close" | "execute" | "executemany" | "fetchall" | "fetchone" | "get":
+                    case (
+                        "__next__"
+                        | "close"
+                        | "execute"
+                        | "executemany"
+                        | "fetchall"
+                        | "fetch_columns"
+                        | "fetch_into"
+                        | "fetchone"
+                        | "get"
+                    ):
                         # re-entrant use not allowed
                         self.assertIsInstance(this[k], apsw.ThreadingViolationError)
                         self.assertIsInstance(thread[k], apsw.ThreadingViolationError)
@@ -1413,6 +1427,343 @@ class APSW(unittest.TestCase):
         # non-contiguous buffers
         self.assertRaises(BufferError, c.execute, "select ?", (memoryview(b"234567890")[::2],))
 
+    def testCursorFetchColumns(self):
+        "Check columnar fetching"
+        c = self.db.cursor()
+        self.assertEqual(c.fetch_columns(), ())
+        self.assertRaises(TypeError, c.fetch_columns, "3")
+        c.execute("create table foo(x,y); insert into foo values(1, 'one'), (2, 'two'), (3, null)")
+        self.assertEqual(c.execute("select * from foo where x>99").fetch_columns(), ())
+        self.assertEqual(c.execute("select x, y from foo").fetch_columns(), ([1, 2, 3], ["one", "two", None]))
+        self.assertEqual(c.fetch_columns(), ())
+
+        # batches
+        c.execute("select x, y from foo")
+        self.assertEqual(c.fetch_columns(2), ([1, 2], ["one", "two"]))
+        self.assertEqual(c.fetch_columns(0), ())
+        self.assertEqual(c.fetch_columns(count=2), ([3], [None]))
+        self.assertEqual(c.fetch_columns(2), ())
+
+        # mixing with iteration
+        c.execute("select x from foo")
+        self.assertEqual(next(c), (1,))
+        self.assertEqual(c.fetch_columns(1), ([2],))
+        self.assertEqual(c.fetchall(), [(3,)])
+
+        # multiple statements
+        c.execute("select 1, 2; select 3, 4; select 5; select 6")
+        self.assertEqual(c.fetch_columns(), ([1, 3], [2, 4]))
+        self.assertEqual(c.fetch_columns(), ([5, 6],))
+        self.assertEqual(c.fetch_columns(), ())
+
+        # row tracer is not called
+        c.row_trace = lambda *args: 1 / 0
+        self.assertEqual(c.execute("select x from foo").fetch_columns(), ([1, 2, 3],))
+        c.row_trace = None
+
+        # errors
+        def func():
+            1 / 0
+
+        self.db.create_scalar_function("func", func)
+        c.execute("select 1, 2 union all select x, func() from foo where x=3")
+        self.assertEqual(c.fetch_columns(1), ([1], [2]))
+        self.assertRaises(ZeroDivisionError, c.fetch_columns)
+
+    def testCursorFetchInto(self):
+        "Check fetching into buffers"
+        c = self.db.cursor()
+        c.execute("create table foo(x,y,z); insert into foo values(1, 1.5, 'one'), (2, 2, 'two'), (3, null, null)")
+        ints = array.array("q", [0] * 2)
+        doubles = array.array("d", [0] * 5)
+
+        self.assertRaises(TypeError, c.fetch_into)
+        self.assertRaises(TypeError, c.fetch_into, 3)
+        self.assertEqual(c.fetch_into(()), 0)
+        self.assertEqual(c.fetch_into((ints, doubles)), 0)
+        self.assertRaises(BufferError, c.fetch_into, (b"\0" * 8,))
+        self.assertRaises(ValueError, c.fetch_into, (array.array("i", [0]),))
+        self.assertRaises(ValueError, c.fetch_into, (bytearray(8),))
+
+        c.execute("select x, y, z from foo")
+        self.assertRaises(ValueError, c.fetch_into, (ints, doubles))
+        self.assertEqual(c.fetch_into((ints, doubles, None)), 2)
+        self.assertEqual(list(ints), [1, 2])
+        self.assertEqual(list(doubles[:2]), [1.5, 2.0])
+        self.assertEqual(c.fetch_into((ints, doubles, None)), 1)
+        self.assertEqual(ints[0], 3)
+        self.assertTrue(math.isnan(doubles[0]))
+        self.assertEqual(c.fetch_into((ints, doubles, None)), 0)
+
+        # memoryview and slicing
+        ints = array.array("q", [-1] * 10)
+        c.execute("select x from foo")
+        self.assertEqual(c.fetch_into((memoryview(ints)[3:],)), 3)
+        self.assertEqual(list(ints[:7]), [-1, -1, -1, 1, 2, 3, -1])
+
+        # bad values are left for the next call
+        c.execute("select x from foo where x < 3 union all select y from foo")
+        self.assertEqual(c.fetch_into((ints,)), 2)
+        self.assertEqual(list(ints[:2]), [1, 2])
+        self.assertRaises(TypeError, c.fetch_into, (ints,))
+        self.assertEqual(next(c), (1.5,))
+        self.assertEqual(c.fetch_into((doubles,)), 2)
+        self.assertEqual(doubles[0], 2.0)
+        self.assertTrue(math.isnan(doubles[1]))
+
+        # multiple statements
+        c.execute("select 1; select 2; select 3, 4")
+        self.assertEqual(c.fetch_into((ints,)), 2)
+        self.assertEqual(c.fetch_into((ints, doubles)), 1)
+        self.assertEqual((ints[0], doubles[0]), (3, 4.0))
+
+        # row tracer is not called
+        c.row_trace = lambda *args: 1 / 0
+        self.assertEqual(c.execute("select x from foo").fetch_into((ints,)), 3)
+        c.row_trace = None
+
+    def testCursorArrow(self):
+        "Check Arrow record batch export"
+        c = self.db.cursor()
+        c.execute("create table foo(i, d, t, b, n)")
+        c.execute(
+            "insert into foo values(1, 1.5, 'one', x'01', null), (2, 2, null, 'two', null), (null, null, 'three', null, null)"
+        )
+
+        self.assertRaises(TypeError, c.__arrow_c_stream__, None, 3)
+        self.assertRaises(ValueError, c.__arrow_c_stream__, batch_rows=0)
+        capsule = c.execute("select * from foo").__arrow_c_stream__()
+        self.assertIn("arrow_array_stream", repr(capsule))
+        # unconsumed stream released
+        del capsule
+        self.assertEqual(c.fetchall()[0], (1, 1.5, "one", b"\x01", None))
+
+        if not ctypes:
+            return
+
+        class ArrowSchema(ctypes.Structure):
+            pass
+
+        ArrowSchema._fields_ = [
+            ("format", ctypes.c_char_p),
+            ("name", ctypes.c_char_p),
+            ("metadata", ctypes.c_char_p),
+            ("flags", ctypes.c_int64),
+            ("n_children", ctypes.c_int64),
+            ("children", ctypes.POINTER(ctypes.POINTER(ArrowSchema))),
+            ("dictionary", ctypes.POINTER(ArrowSchema)),
+            ("release", ctypes.c_void_p),
+            ("private_data", ctypes.c_void_p),
+        ]
+
+        class ArrowArray(ctypes.Structure):
+            pass
+
+        ArrowArray._fields_ = [
+            ("length", ctypes.c_int64),
+            ("null_count", ctypes.c_int64),
+            ("offset", ctypes.c_int64),
+            ("n_buffers", ctypes.c_int64),
+            ("n_children", ctypes.c_int64),
+            ("buffers", ctypes.POINTER(ctypes.c_void_p)),
+            ("children", ctypes.POINTER(ctypes.POINTER(ArrowArray))),
+            ("dictionary", ctypes.POINTER(ArrowArray)),
+            ("release", ctypes.CFUNCTYPE(None, ctypes.POINTER(ArrowArray))),
+            ("private_data", ctypes.c_void_p),
+        ]
+
+        class ArrowArrayStream(ctypes.Structure):
+            pass
+
+        ArrowArrayStream._fields_ = [
+            (
+                "get_schema",
+                ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ArrowArrayStream), ctypes.POINTER(ArrowSchema)),
+            ),
+            (
+                "get_next",
+                ctypes.CFUNCTYPE(ctypes.c_int, ctypes.POINTER(ArrowArrayStream), ctypes.POINTER(ArrowArray)),
+            ),
+            ("get_last_error", ctypes.CFUNCTYPE(ctypes.c_char_p, ctypes.POINTER(ArrowArrayStream))),
+            ("release", ctypes.CFUNCTYPE(None, ctypes.POINTER(ArrowArrayStream))),
+            ("private_data", ctypes.c_void_p),
+        ]
+
+        get_pointer = ctypes.pythonapi.PyCapsule_GetPointer
+        get_pointer.restype = ctypes.c_void_p
+        get_pointer.argtypes = [ctypes.py_object, ctypes.c_char_p]
+
+        def consume(cursor, **kwargs):
+            # returns formats, names, and a list of batches of columns
+            capsule = cursor.__arrow_c_stream__(**kwargs)
+            stream = ArrowArrayStream.from_address(get_pointer(capsule, b"arrow_array_stream"))
+            schema = ArrowSchema()
+            self.assertEqual(stream.get_schema(ctypes.byref(stream), ctypes.byref(schema)), 0)
+            self.assertEqual(schema.format, b"+s")
+            formats = [schema.children[i].contents.format.decode() for i in range(schema.n_children)]
+            names = [schema.children[i].contents.name.decode() for i in range(schema.n_children)]
+            ctypes.CFUNCTYPE(None, ctypes.POINTER(ArrowSchema))(schema.release)(ctypes.byref(schema))
+            self.assertFalse(schema.release)
+            batches = []
+            while True:
+                array = ArrowArray()
+                res = stream.get_next(ctypes.byref(stream), ctypes.byref(array))
+                if res:
+                    raise Exception(stream.get_last_error(ctypes.byref(stream)).decode())
+                if not array.release:
+                    break
+                columns = []
+                for i in range(array.n_children):
+                    child = array.children[i].contents
+                    self.assertEqual(child.length, array.length)
+                    validity = child.buffers[0] if child.n_buffers else None
+                    column = []
+                    for row in range(child.length):
+                        if formats[i] == "n" or (
+                            validity and not ctypes.c_uint8.from_address(validity + row // 8).value & (1 << (row % 8))
+                        ):
+                            column.append(None)
+                            continue
+                        match formats[i]:
+                            case "l":
+                                column.append(ctypes.c_int64.from_address(child.buffers[1] + 8 * row).value)
+                            case "g":
+                                column.append(ctypes.c_double.from_address(child.buffers[1] + 8 * row).value)
+                            case "U" | "Z":
+                                start, end = (ctypes.c_int64 * 2).from_address(child.buffers[1] + 8 * row)
+                                value = ctypes.string_at(child.buffers[2] + start, end - start) if end > start else b""
+                                column.append(value.decode() if formats[i] == "U" else value)
+                    columns.append(column)
+                batches.append(columns)
+                array.release(ctypes.byref(array))
+            del capsule
+            return formats, names, batches
+
+        formats, names, batches = consume(c.execute("select * from foo"))
+        self.assertEqual(formats, ["l", "g", "U", "Z", "Z"])
+        self.assertEqual(names, ["i", "d", "t", "b", "n"])
+        self.assertEqual(
+            batches,
+            [
+                [
+                    [1, 2, None],
+                    [1.5, 2.0, None],
+                    ["one", None, "three"],
+                    [b"\x01", b"two", None],
+                    [None, None, None],
+                ]
+            ],
+        )
+
+        # batching and empty results
+        formats, names, batches = consume(c.execute("select i from foo where i is not null"), batch_rows=1)
+        self.assertEqual(batches, [[[1]], [[2]]])
+
+        # columns with only nulls in the first batch use the declared type
+        c.execute("create table sparse(i INTEGER, d REAL, t VARCHAR(10), b BLOB, n NUMERIC, u)")
+        c.execute("insert into sparse values(null, null, null, null, null, null), (1, 1.5, 'one', x'01', 2, 'u')")
+        formats, names, batches = consume(c.execute("select * from sparse"), batch_rows=1)
+        self.assertEqual(formats, ["l", "g", "U", "Z", "g", "Z"])
+        self.assertEqual(batches, [[[None]] * 6, [[1], [1.5], ["one"], [b"\x01"], [2.0], [b"u"]]])
+        formats, names, batches = consume(c.execute("select i from foo where 0"))
+        self.assertEqual((formats, batches), ([], []))
+
+        # kind comes from the first non-null value, with bad values
+        # leaving the row unconsumed
+        c.execute("select i from foo where i is not null union all select t from foo")
+        with self.assertRaisesRegex(Exception, "Column 0 .i. has a text value"):
+            consume(c, batch_rows=1)
+        self.assertEqual(next(c), ("one",))
+
+        # multiple statements
+        formats, names, batches = consume(c.execute("select 1; select 2; select 3, 4"))
+        self.assertEqual(batches, [[[1, 2]]])
+        self.assertEqual(next(c), (3, 4))
+
+        # row tracer is not called
+        c.row_trace = lambda *args: 1 / 0
+        self.assertEqual(consume(c.execute("select 7"))[2], [[[7]]])
+        c.row_trace = None
+
+        try:
+            import pyarrow
+        except ImportError:
+            return
+
+        table = pyarrow.RecordBatchReader.from_stream(c.execute("select * from foo")).read_all()
+        self.assertEqual(table.column_names, ["i", "d", "t", "b", "n"])
+        self.assertEqual(table.column("t").to_pylist(), ["one", None, "three"])
+        self.assertEqual(table.column("b").to_pylist(), [b"\x01", b"two", None])
+
+    def testExecutemanyColumns(self):
+        "Check executemany with columns"
+        c = self.db.cursor()
+        c.execute("create table foo(a, b, c, d)")
+        ins = "insert into foo values(?, ?, ?, ?)"
+        names = ["one", None, b"three", 4.5]
+        int32s = array.array("i", [1, -2, 3, 2**31 - 1])
+        int64s = array.array("q", [1, -2, 2**40, -(2**63)])
+        doubles = array.array("d", [0.5, -1, 1e300, math.inf])
+
+        c.executemany(ins, (names, int32s, int64s, doubles), columns=True)
+        self.assertEqual(
+            c.execute("select * from foo").fetchall(), list(zip(names, int32s, int64s, doubles))
+        )
+        self.assertEqual(c.execute("select typeof(c), typeof(d) from foo").fetchall(), [("integer", "real")] * 4)
+
+        # connection and memoryview
+        self.db.execute("delete from foo")
+        self.db.executemany(ins, (memoryview(int64s)[1:3], (1, 2), [3, 4], ("x", "y")), columns=True)
+        self.assertEqual(c.execute("select * from foo").fetchall(), [(-2, 1, 3, "x"), (2**40, 2, 4, "y")])
+
+        # empty
+        self.assertIs(c.executemany(ins, ([], [], [], []), columns=True), c)
+        self.assertEqual(c.fetchall(), [])
+
+        # multiple statements and returning data
+        self.assertEqual(
+            c.executemany("select ?, ?; select ?", ((1, 2), array.array("d", [3, 4]), "ab"), columns=True).fetchall(),
+            [(1, 3.0), ("a",), (2, 4.0), ("b",)],
+        )
+
+        # exec tracer sees each row
+        traced = []
+
+        def tracer(cursor, sql, bindings):
+            traced.append(bindings)
+            return True
+
+        c.exec_trace = tracer
+        c.executemany("select ?, ?; select ?", ((1, 2), int64s[:2], "ab"), columns=True).fetchall()
+        self.assertEqual(traced, [(1, 1), ("a",), (2, -2), ("b",)])
+        c.exec_trace = None
+
+        # errors
+        self.assertRaises(TypeError, c.executemany, ins, [names, names, names, names], columns=True)
+        self.assertRaises(ValueError, c.executemany, ins, (), columns=True)
+        self.assertRaises(ValueError, c.executemany, ins, (names, names, names, names[:2]), columns=True)
+        self.assertRaises(ValueError, c.executemany, ins, (names, names, names, b"abcd"), columns=True)
+        self.assertRaises(ValueError, c.executemany, ins, (names, names, names, array.array("f", [1] * 4)), columns=True)
+        self.assertRaises(TypeError, c.executemany, ins, (names, names, names, 3), columns=True)
+        self.assertRaises(apsw.BindingsError, c.executemany, ins, (names, names, names), columns=True)
+        self.assertRaises(apsw.BindingsError, c.executemany, ins, (names,) * 5, columns=True)
+        self.assertRaises(TypeError, c.executemany, ins, (names, names, names, [1, 2, 3, object()]), columns=True)
+
+        # not fully consumed
+        c.executemany("select ?", ([1, 2, 3],), columns=True)
+        self.assertRaises(apsw.IncompleteExecutionError, c.execute, "select 3")
+
+        # column modified while executing
+        col = [1, 2, 3]
+
+        def shrink(cursor, sql, bindings):
+            col.clear()
+            return True
+
+        c.exec_trace = shrink
+        self.assertRaises(ValueError, c.executemany("select ?", (col,), columns=True).fetchall)
+        c.exec_trace = None
+
     def testIssue373(self):
         "issue 373: dict type checking in bindings"
 
@@ -2278,6 +2629,266 @@ class APSW(unittest.TestCase):
         ),
     )
 
+    def testColumnsTable(self):
+        "Test columns virtual table"
+        ints = array.array("q", [1, -2, 3, 2**62])
+        columns = {
+            "i": ints,
+            "d": array.array("d", [0.5, -1, float("nan"), 1e300]),
+            "f": array.array("f", [1.5, 2, 3, 4]),
+            "h": array.array("H", [0, 1, 2, 65535]),
+            "u8": b"\x00\x01\x02\xff",
+            "flag": memoryview(b"\x00\x01\x00\x02").cast("?"),
+            "with space": ["one", None, b"three", 4.5],
+        }
+        self.db.create_columns_table("data", columns)
+
+        self.assertEqual(
+            self.db.execute("select * from data").fetchall(),
+            [
+                (1, 0.5, 1.5, 0, 0, 0, "one"),
+                (-2, -1.0, 2.0, 1, 1, 1, None),
+                (3, None, 3.0, 2, 2, 0, b"three"),
+                (2**62, 1e300, 4.0, 65535, 255, 1, 4.5),
+            ],
+        )
+        self.assertEqual(
+            [row[1:3] for row in self.db.execute("pragma table_info(data)")],
+            [
+                ("i", "INTEGER"),
+                ("d", "REAL"),
+                ("f", "REAL"),
+                ("h", "INTEGER"),
+                ("u8", "INTEGER"),
+                ("flag", "INTEGER"),
+                ("with space", ""),
+            ],
+        )
+
+        # rowid constraints
+        for where, expected in (
+            ("rowid = 2", [2]),
+            ("rowid = 2.0", [2]),
+            ("rowid = 2.5", []),
+            ("rowid = 99", []),
+            ("rowid = -1", []),
+            ("rowid > 1", [2, 3]),
+            ("rowid >= 1.5", [2, 3]),
+            ("rowid < 2", [0, 1]),
+            ("rowid <= 2.5", [0, 1, 2]),
+            ("rowid between 1 and 2", [1, 2]),
+            ("rowid > 1 and rowid < 1", []),
+            ("rowid < 'abc'", [0, 1, 2, 3]),
+            ("rowid in (3, 0)", [0, 3]),
+            ("rowid > null", []),
+        ):
+            self.assertEqual(
+                [row[0] for row in self.db.execute(f"select rowid from data where {where} order by rowid")],
+                expected,
+                where,
+            )
+
+        # joins
+        self.db.execute("create table names(id, name); insert into names values(1, 'a'), (3, 'c'), (5, 'e')")
+        self.assertEqual(
+            self.db.execute("select name, d from names join data on names.id = data.i order by name").fetchall(),
+            [("a", 0.5), ("c", None)],
+        )
+
+        # buffers are held until unregistered and cached statements are gone
+        self.assertRaises(BufferError, ints.append, 7)
+        self.db.create_module("data", None)
+        self.assertRaises(apsw.SQLError, self.db.execute, "select * from data")
+        cache_size = self.db.cache_stats()["size"]
+        self.db.cache_resize(0)
+        self.db.execute("select 3").get
+        gc.collect()
+        ints.append(7)
+        self.db.cache_resize(cache_size)
+
+        # errors
+        self.assertRaises(TypeError, self.db.create_columns_table, "bad", 3)
+        self.assertRaises(ValueError, self.db.create_columns_table, "bad", {})
+        self.assertRaises(TypeError, self.db.create_columns_table, "bad", {3: [1]})
+        self.assertRaises(TypeError, self.db.create_columns_table, "bad", {"x": "abc"})
+        self.assertRaises(TypeError, self.db.create_columns_table, "bad", {"x": 3})
+        self.assertRaises(ValueError, self.db.create_columns_table, "bad", {"x": [1, 2], "y": [1]})
+        self.assertRaises(ValueError, self.db.create_columns_table, "bad", {"x": array.array("Q", [1])})
+        self.assertRaises(ValueError, self.db.create_columns_table, "bad", {"x": memoryview(b"\0" * 8).cast("B", (2, 4))})
+        self.assertRaises(ValueError, self.db.create_columns_table, "bad", {"x": memoryview(b"\0" * 9)[1:].cast("q")})
+        self.db.create_columns_table("bad", {"x": [1], "X": [2]})
+        self.assertRaises(apsw.SQLError, self.db.execute, "select * from bad")
+        self.db.create_columns_table("bad", {"x": [1, {}]})
+        self.assertRaises(TypeError, self.db.execute("select x from bad").fetchall)
+
+        # replacing
+        self.db.create_columns_table("data", {"x": [1]})
+        self.db.create_columns_table("data", {"y": range(3)})
+        self.assertEqual(self.db.execute("select sum(y) from data").get, 3)
+
+        # Arrow streams, using our own cursor as the source
+        self.db.execute("create table foo(i, d, t, b); insert into foo values(1, 1.5, 'one', x'01'), (2, null, null, x'')")
+        self.db.create_columns_table("arrow", self.db.execute("select i, d, t, b, null as n from foo"))
+        self.assertEqual(
+            self.db.execute("select * from arrow").fetchall(), [(1, 1.5, "one", b"\x01", None), (2, None, None, b"", None)]
+        )
+        # no rows means no columns
+        self.assertRaises(ValueError, self.db.create_columns_table, "arrow", self.db.execute("select i from foo where 0"))
+
+        class Batched:
+            def __init__(self, cursor):
+                self.cursor = cursor
+
+            def __arrow_c_stream__(self, requested_schema=None):
+                return self.cursor.__arrow_c_stream__(requested_schema, batch_rows=7)
+
+        query = "with recursive s(value) as (select 0 union all select value+1 from s where value<99) select value from s"
+        self.db.create_columns_table("arrow", Batched(self.db.execute(query)))
+        self.assertEqual(
+            self.db.execute("select rowid, value from arrow where rowid in (0, 6, 7, 50, 99)").fetchall(),
+            [(0, 0), (6, 6), (7, 7), (50, 50), (99, 99)],
+        )
+        self.assertEqual(self.db.execute("select count(*), sum(value) from arrow where rowid >= 13").get, (87, 4872))
+
+        try:
+            import pyarrow
+        except ImportError:
+            return
+
+        batch = pyarrow.record_batch(
+            {
+                "b": [True, None, False, True],
+                "i8": pyarrow.array([1, 2, None, 4], pyarrow.int8()),
+                "u32": pyarrow.array([1, 2**32 - 1, 3, 4], pyarrow.uint32()),
+                "s": ["a", None, "ccc", ""],
+                "z": pyarrow.array([b"a", None, b"ccc", b""], pyarrow.binary()),
+            }
+        )
+        self.db.create_columns_table("arrow", batch.slice(1))
+        self.assertEqual(
+            self.db.execute("select * from arrow").fetchall(),
+            [(None, 2, 2**32 - 1, None, None), (0, None, 3, "ccc", b"ccc"), (1, 4, 4, "", b"")],
+        )
+        self.assertRaises(
+            ValueError, self.db.create_columns_table, "arrow", pyarrow.record_batch({"x": pyarrow.array([1], pyarrow.uint64())})
+        )
+        self.db.create_columns_table("arrow", pyarrow.table({"x": [1, 2]}))
+        self.assertEqual(self.db.execute("select sum(x) from arrow").get, 3)
+
+    def testVTRowCursor(self):
+        "Test C implemented virtual table row cursor"
+        c = apsw.VTRowCursor()
+        self.assertTrue(c.Eof())
+        self.assertIsNone(c.current_row)
+        self.assertRaises(IndexError, c.Column, 0)
+
+        closed = []
+
+        def gen(rows):
+            try:
+                yield from rows
+            finally:
+                closed.append(True)
+
+        rows = [(1, "one"), (2, "two"), (3, "three")]
+        c.set_rows(gen(rows), ("hidden",), ("a", "b"), 1)
+        got = []
+        while not c.Eof():
+            self.assertEqual(c.Rowid(), id(c.current_row))
+            self.assertEqual(c.Column(-1), c.Rowid())
+            got.append((c.Column(0), c.Column(1), c.Column(2)))
+            c.Next()
+        self.assertEqual(got, [row + ("hidden",) for row in rows])
+        self.assertEqual(closed, [True])
+        self.assertRaises(IndexError, c.Column, 3)
+        c.Next()
+        self.assertTrue(c.Eof())
+
+        # early close
+        c.set_rows(gen(rows), (), ("a", "b"), 1, primary_key=0)
+        self.assertEqual(c.Rowid(), 1)
+        c.Close()
+        self.assertTrue(c.Eof())
+        self.assertEqual(closed, [True, True])
+
+        # dict and attribute access, repr_invalid
+        c.set_rows([{"a": 1, "b": [2]}], (), ("a", "b"), 2, repr_invalid=True)
+        self.assertEqual(c.Column(1), "[2]")
+        c.set_rows([{"a": 1, "b": [2]}], (), ("a", "b"), 2)
+        self.assertEqual(c.Column(1), [2])
+        @dataclasses.dataclass
+        class Row:
+            a: int
+            b: bytes
+
+        c.set_rows([Row(1, b"2")], (), ("a", "b"), 3)
+        self.assertEqual(c.Column(1), b"2")
+        c.set_rows([{}], (), ("a",), 2)
+        self.assertRaises(KeyError, c.Column, 0)
+        c.set_rows([object()], (), ("a",), 3)
+        self.assertRaises(AttributeError, c.Column, 0)
+
+        self.assertRaises(ValueError, c.set_rows, [], (), ("a",), 0)
+        self.assertRaises(ValueError, c.set_rows, [], (), ("a",), 1, primary_key=1)
+        self.assertRaises(TypeError, c.set_rows, [], (), (3,), 1)
+        self.assertRaises(TypeError, c.set_rows, [], {}, ("a",), 1)
+
+        # hidden values in a list can be changed while iterating
+        hidden = [None]
+
+        def changing():
+            for i in range(3):
+                hidden[0] = i * 10
+                yield (i,)
+
+        c.set_rows(changing(), hidden, ("a",), 1)
+        got = []
+        while not c.Eof():
+            got.append((c.Column(0), c.Column(1)))
+            c.Next()
+        self.assertEqual(got, [(0, 0), (1, 10), (2, 20)])
+        self.assertRaises(TypeError, c.set_rows, 3, (), ("a",), 1)
+        self.assertRaises(ZeroDivisionError, c.set_rows, (1 / 0 for _ in range(1)), (), ("a",), 1)
+
+        # as a virtual table cursor, including overriding methods in a subclass
+        class Source:
+            def Create(self, *args):
+                return "create table x(a,b,c HIDDEN)", Table()
+
+            Connect = Create
+
+        class Table:
+            cursor = None
+
+            def BestIndex(self, *args):
+                return None
+
+            def Open(self):
+                return Table.cursor()
+
+            def Disconnect(self):
+                pass
+
+            Destroy = Disconnect
+
+        class Cursor(apsw.VTRowCursor):
+            def Filter(self, *args):
+                self.set_rows(gen(rows), (99,), ("a", "b"), 1, primary_key=0)
+
+        class Doubled(Cursor):
+            def Column(self, number):
+                return super().Column(number) * 2
+
+        self.db.create_module("rowcursor", Source(), eponymous=True)
+        for klass, expected in (
+            (Cursor, [(1, 1, "one", 99), (2, 2, "two", 99), (3, 3, "three", 99)]),
+            (Doubled, [(1, 2, "oneone", 198), (2, 4, "twotwo", 198), (3, 6, "threethree", 198)]),
+        ):
+            Table.cursor = klass
+            self.assertEqual(self.db.execute("select rowid, a, b, c from rowcursor").fetchall(), expected)
+        self.db.execute("select * from rowcursor limit 1").fetchall()
+        self.assertEqual(closed[-1], True)
+
     def testVTableNoChange(self):
         "Test virtual table no change values on update"
 
@@ -6201,6 +6812,44 @@ class APSW(unittest.TestCase):
         self.db.execute("select 997", can_cache=True).fetchall()
         self.assertEqual(s["misses"] + 2 + (1 if not scsize else 0), self.db.cache_stats().pop("misses"))
 
+        # per entry information and top
+        self.assertRaises(TypeError, self.db.cache_stats, top="orange")
+        # timing and evictions are only tracked when asked for
+        self.assertEqual(self.db.cache_stats()["prepare_ns"], 0)
+        self.assertEqual(self.db.cache_stats()["reprepares"], 0)
+        self.assertRaises(TypeError, self.db.cache_resize, scsize, 0, True)
+        self.db.cache_resize(scsize, track=True)
+        self.db.execute("select 996").fetchall()
+        s = self.db.cache_stats(True)
+        self.assertGreater(s["prepare_ns"], 0)
+        if not scsize:
+            self.assertEqual(s["entries"], [])
+        for entry in s["entries"]:
+            self.assertGreaterEqual(entry["age"], 0)
+            self.assertGreaterEqual(entry["prepare_ns"], 0)
+            self.assertGreaterEqual(entry["evictions"], 0)
+        self.assertEqual(self.db.cache_stats(True, top=0)["entries"], [])
+        if scsize:
+            for _ in range(5):
+                self.db.execute("select 998").fetchall()
+            top = self.db.cache_stats(True, top=3)["entries"]
+            self.assertLessEqual(len(top), 3)
+            self.assertEqual([e["uses"] for e in top], sorted([e["uses"] for e in top], reverse=True))
+            self.assertEqual(top[0]["uses"], max(e["uses"] for e in self.db.cache_stats(True)["entries"]))
+            self.db.execute("select 999").fetchall()
+            entries = {e["query"]: e for e in self.db.cache_stats(True)["entries"]}
+            self.assertEqual(entries["select 999"]["age"], 0)
+            self.assertGreater(entries["select 998"]["age"], 0)
+            # push select 999 out of the cache and then bring it back
+            s = self.db.cache_stats()
+            for i in range(s["size"] + 2):
+                self.db.execute(f"select {i} as evict").fetchall()
+            self.db.execute("select 999").fetchall()
+            s2 = self.db.cache_stats(True)
+            self.assertGreater(s2["reprepares"], s["reprepares"])
+            entries = {e["query"]: e for e in s2["entries"]}
+            self.assertEqual(entries["select 999"]["evictions"], 1)
+
         # prepare_flags
         class VTModule:
             def Create(self, *args):
@@ -6260,6 +6909,146 @@ class APSW(unittest.TestCase):
         self.db = apsw.Connection(TESTFILEPREFIX + "testdb", statementcachesize=17000)
         self.testStatementCache(170000)
 
+    def testStatementCacheResize(self):
+        "Verify statement cache resizing and adaptive sizing"
+        self.assertRaises(TypeError, self.db.cache_resize)
+        self.assertRaises(TypeError, self.db.cache_resize, "orange")
+        self.assertRaises(TypeError, self.db.cache_resize, 10, maximum="orange")
+
+        def entries():
+            return [e["query"] for e in self.db.cache_stats(True)["entries"]]
+
+        for size in (-5, 0, 7, 100, 512, 10000):
+            self.db.cache_resize(size)
+            self.assertEqual(self.db.cache_stats()["size"], max(0, min(size, 512)))
+
+        # large cache uses the index - everything should be a hit second time around
+        queries = [f"select {i}" for i in range(400)]
+        for q in queries:
+            self.db.execute(q).fetchall()
+        s = self.db.cache_stats()
+        for q in queries:
+            self.assertEqual(self.db.execute(q).fetchall(), [(int(q.split()[1]),)])
+        self.assertEqual(self.db.cache_stats()["hits"], s["hits"] + len(queries))
+
+        # same query in use multiple times gives multiple entries with the same hash
+        curs = [self.db.execute("select 7 union all select 8") for _ in range(3)]
+        for c in curs:
+            c.fetchall()
+        self.assertEqual(entries().count("select 7 union all select 8"), 3)
+
+        # shrinking keeps the most recent
+        s = self.db.cache_stats()
+        self.db.cache_resize(5)
+        self.assertEqual(len(entries()), 5)
+        self.assertEqual(set(entries()), {"select 7 union all select 8", "select 398", "select 399"})
+        self.assertGreater(self.db.cache_stats()["evictions"], s["evictions"])
+        # and growing keeps everything
+        self.db.cache_resize(64)
+        self.assertEqual(len(entries()), 5)
+        s = self.db.cache_stats()
+        self.db.execute("select 399").fetchall()
+        self.assertEqual(self.db.cache_stats()["hits"], s["hits"] + 1)
+
+        # resize while statements are in use
+        cur = self.db.execute("select 1 union all select 2")
+        self.db.cache_resize(0)
+        self.assertEqual(cur.fetchall(), [(1,), (2,)])
+        self.assertEqual(entries(), [])
+        cur = self.db.execute("select 1 union all select 2")
+        self.db.cache_resize(3)
+        self.assertEqual(cur.fetchall(), [(1,), (2,)])
+        self.assertEqual(entries(), ["select 1 union all select 2"])
+
+        # adaptive grows when queries keep getting evicted and reprepared
+        self.db.cache_resize(4, maximum=256)
+        queries = [f"select {i}, 'adaptive'" for i in range(40)]
+        for _ in range(150):
+            for q in queries:
+                self.db.execute(q).fetchall()
+        s = self.db.cache_stats()
+        self.assertGreaterEqual(s["size"], 40)
+        self.assertGreater(s["resizes"], 0)
+        self.assertGreater(s["hits"], s["misses"])
+        # and shrinks when they are not used
+        for _ in range(10000):
+            self.db.execute(queries[0]).fetchall()
+        s2 = self.db.cache_stats()
+        self.assertEqual(s2["size"], 4)
+        self.assertGreater(s2["resizes"], s["resizes"])
+        self.assertIn(queries[0], entries())
+        # not adaptive any more
+        self.db.cache_resize(4)
+        s = self.db.cache_stats()
+        for _ in range(50):
+            for q in queries:
+                self.db.execute(q).fetchall()
+        self.assertEqual(self.db.cache_stats()["resizes"], s["resizes"])
+        self.assertEqual(self.db.cache_stats()["size"], 4)
+
+    def testStatementCachePrepare(self):
+        "Verify preparing statements into the cache and warming up connections"
+        self.assertRaises(TypeError, self.db.cache_prepare)
+        self.assertRaises(TypeError, self.db.cache_prepare, 3)
+        self.assertRaises(TypeError, self.db.cache_prepare, "select 3", 0)
+        self.assertRaises(apsw.SQLError, self.db.cache_prepare, "select * from no_such_table")
+
+        def entries():
+            return [e["query"] for e in self.db.cache_stats(True)["entries"]]
+
+        self.db.execute("create table foo(x)")
+        self.assertEqual(self.db.cache_prepare("select * from foo"), 1)
+        self.assertIn("select * from foo", entries())
+        s = self.db.cache_stats()
+        self.db.execute("select * from foo").fetchall()
+        self.assertEqual(self.db.cache_stats()["hits"], s["hits"] + 1)
+
+        # options have to match
+        self.assertEqual(self.db.cache_prepare("select 3", prepare_flags=apsw.SQLITE_PREPARE_NO_VTAB), 1)
+        s = self.db.cache_stats()
+        self.db.execute("select 3").fetchall()
+        self.assertEqual(self.db.cache_stats()["hits"], s["hits"])
+        self.db.execute("select 3", prepare_flags=apsw.SQLITE_PREPARE_NO_VTAB).fetchall()
+        self.assertEqual(self.db.cache_stats()["hits"], s["hits"] + 1)
+
+        # multiple statements, nothing is run
+        self.assertEqual(self.db.cache_prepare("insert into foo values(1); insert into foo values(2)"), 2)
+        self.assertEqual(self.db.execute("select count(*) from foo").get, 0)
+        s = self.db.cache_stats()
+        self.db.execute("insert into foo values(1); insert into foo values(2)")
+        self.assertEqual(self.db.cache_stats()["hits"], s["hits"] + 2)
+        self.assertEqual(self.db.execute("select count(*) from foo").get, 2)
+        # error part way through
+        self.assertRaises(apsw.SQLError, self.db.cache_prepare, "select 4; select * from no_such_table")
+
+        warmer = apsw.ext.StatementWarmer()
+        warmer.register("foo", ["select x from foo", "select * from no_such_table; select 5"])
+        warmer.register("bar", (f"select {i}, 'bar'" for i in range(3)))
+        apsw.connection_hooks.append(warmer)
+        db2 = apsw.Connection(TESTFILEPREFIX + "testdb")
+        queries = [e["query"] for e in db2.cache_stats(True)["entries"]]
+        self.assertIn("select x from foo", queries)
+        self.assertIn("select 2, 'bar'", queries)
+        stats = warmer.stats()
+        self.assertEqual(set(stats), {"foo", "bar"})
+        self.assertEqual(stats["foo"].connections, 1)
+        self.assertEqual(stats["foo"].statements, 1)
+        self.assertEqual(stats["foo"].failures, 1)
+        self.assertEqual(stats["bar"].statements, 3)
+        self.assertGreater(stats["bar"].elapsed_ns, 0)
+        # returned stats are a copy
+        stats["bar"].connections = 77
+        self.assertEqual(warmer.stats()["bar"].connections, 1)
+
+        warmer.warm(self.db, "bar")
+        self.assertEqual(warmer.stats()["bar"].connections, 2)
+        self.assertEqual(warmer.stats()["foo"].connections, 1)
+        self.assertRaises(KeyError, warmer.warm, self.db, "orange")
+        warmer.unregister("foo")
+        self.assertRaises(KeyError, warmer.unregister, "foo")
+        self.assertEqual(set(warmer.stats()), {"bar"})
+        db2.close()
+
     def testStmtExplain(self):
         "Verify sqlite3_stmt_explain operation"
 
@@ -6333,6 +7122,8 @@ class APSW(unittest.TestCase):
                 "ZeroBlobBind",
                 "APSWVFS",
                 "APSWVFSFile",
+                "APSWIOStatsVFS",
+                "apswiostatsvfs",
                 "APSWBuffer",
                 "FunctionCBInfo",
                 "APSWFTS5Tokenizer",
@@ -6342,6 +7133,7 @@ class APSW(unittest.TestCase):
                 "AwaitableWrapper",
                 "BoxedCall",
                 "APSWChangeset",
+                "VTRowCursor",
             )
             or name in {"apsw_no_change_repr", "convert_column_to_pyobject"}
             or name.split("_")[:2] == ["apsw", "module"]
@@ -6356,6 +7148,10 @@ class APSW(unittest.TestCase):
                     "init",
                     "dobinding",
                     "dobindings",
+                    "dobindings_columns",
+                    "emcolumns_clear",
+                    "emcolumns_init",
+                    "emcolumns_value",
                     "do_exec_trace",
                     "do_row_trace",
                     "step",
@@ -6472,6 +7268,11 @@ class APSW(unittest.TestCase):
                 "req": {"check": "CHECKVFSFILEPY", "notimpl": "VFSFILENOTIMPLEMENTED(%(base)s,"},
                 "order": ("check", "notimpl"),
             },
+            "apswvfsfilepy_xReadInto": {
+                # implemented using the base xRead
+                "req": {"check": "CHECKVFSFILEPY", "notimpl": "VFSFILENOTIMPLEMENTED(xRead,"},
+                "order": ("check", "notimpl"),
+            },
             "SqliteIndexInfo": {
                 "req": {
                     "check": "CHECK_INDEX",
@@ -8987,6 +9788,225 @@ class APSW(unittest.TestCase):
             if n not in ("xClose", "excepthook") and not n.startswith("__"):
                 self.assertRaises(apsw.VFSFileClosedError, getattr(t, n))
 
+    def testVFSReadInto(self):
+        "Verify VFSFile.xReadInto"
+        calls = {"xRead": 0, "xReadInto": 0}
+        kept = []
+
+        def xorme(buffer):
+            for i in range(len(buffer)):
+                buffer[i] ^= 0xA5
+
+        class ReadIntoVFSFile(apsw.VFSFile):
+            mode = "ok"
+
+            def xRead(self, amount, offset):
+                calls["xRead"] += 1
+                return super().xRead(amount, offset)
+
+            def xReadInto(self, buffer, offset):
+                calls["xReadInto"] += 1
+                kept.append(buffer)
+                mode = ReadIntoVFSFile.mode
+                if mode == "error":
+                    1 / 0
+                if mode == "type":
+                    return "three"
+                if mode == "range":
+                    return len(buffer) + 1
+                if mode == "short":
+                    return max(0, super().xReadInto(buffer, offset) - 1)
+                res = super().xReadInto(buffer, offset)
+                xorme(buffer[:res])
+                return res
+
+            def xWrite(self, data, offset):
+                data = bytearray(data)
+                xorme(data)
+                super().xWrite(data, offset)
+
+        class ReadIntoVFS(apsw.VFS):
+            def __init__(self):
+                super().__init__("readinto", "")
+
+            def xOpen(self, name, flags):
+                return ReadIntoVFSFile("", name, flags)
+
+        vfs = ReadIntoVFS()
+        fname = TESTFILEPREFIX + "testdb2"
+        db = apsw.Connection(fname, vfs="readinto")
+        db.execute("create table foo(x); insert into foo values(zeroblob(10000)), ('hello')")
+        db.close()
+        db = apsw.Connection(fname, vfs="readinto")
+        self.assertEqual(db.execute("select x from foo where rowid=2").get, "hello")
+        self.assertEqual(calls["xRead"], 0)
+        self.assertGreater(calls["xReadInto"], 0)
+        self.assertTrue(all(isinstance(buffer, memoryview) for buffer in kept))
+        # SQLite's memory must not be usable after the call
+        self.assertRaises(ValueError, len, kept[-1])
+        db.close()
+
+        # file contents are obfuscated
+        self.assertNotIn(b"hello", read_whole_file(fname, "rb"))
+
+        try:
+            for mode, exc in (("error", ZeroDivisionError), ("type", TypeError), ("range", ValueError)):
+                # page 1 is read while opening
+                db = apsw.Connection(fname, vfs="readinto")
+                ReadIntoVFSFile.mode = mode
+                self.assertRaises(exc, db.execute, "select * from foo")
+                ReadIntoVFSFile.mode = "ok"
+                db.close()
+        finally:
+            ReadIntoVFSFile.mode = "ok"
+            vfs.unregister()
+
+        # the inherited implementation
+        f = apsw.VFSFile("", os.path.abspath(fname), [apsw.SQLITE_OPEN_MAIN_DB | apsw.SQLITE_OPEN_READONLY, 0])
+        size = f.xFileSize()
+        buffer = bytearray(size)
+        self.assertEqual(f.xReadInto(buffer, 0), size)
+        self.assertEqual(f.xRead(size, 0), bytes(buffer))
+        buffer = bytearray(100)
+        self.assertEqual(f.xReadInto(memoryview(buffer)[10:20], 0), 10)
+        self.assertEqual(buffer[10:20], f.xRead(10, 0))
+        self.assertEqual(buffer[:10], bytes(10))
+        # short reads are the amount before trailing zeroes
+        self.assertEqual(f.xReadInto(bytearray(10), size - 5), len(f.xRead(5, size - 5).rstrip(b"\0")))
+        self.assertRaises(BufferError, f.xReadInto, b"readonly", 0)
+        self.assertRaises(TypeError, f.xReadInto, 3, 0)
+        self.assertRaises(OverflowError, f.xReadInto, bytearray(10), 0xFFFFFFFFEEEEEEEE0)
+        f.xClose()
+        self.assertRaises(apsw.VFSFileClosedError, f.xReadInto, bytearray(10), 0)
+
+    def testIOStatsVFS(self):
+        "Verify IOStatsVFS"
+        self.assertRaises(ValueError, apsw.IOStatsVFS, "iostats", "no such vfs")
+        self.assertRaises(TypeError, apsw.IOStatsVFS, 3)
+        self.assertNotIn("iostats", apsw.vfs_names())
+
+        stats = apsw.IOStatsVFS("iostats")
+        self.assertIn("iostats", apsw.vfs_names())
+        self.assertIn('"iostats" inherits from', repr(stats))
+        self.assertEqual(stats.snapshot(), {})
+
+        fname = TESTFILEPREFIX + "testdb2"
+        db = apsw.Connection(fname, vfs="iostats")
+        self.assertTrue(db.vfsname("main").startswith("iostats/"))
+        db.execute("create table foo(x); insert into foo values(zeroblob(100000))")
+        self.assertEqual(db.execute("select length(x) from foo").get, 100000)
+
+        snap = stats.snapshot()
+        main = snap["main_db"]
+        self.assertEqual(main["opens"], 1)
+        self.assertEqual(
+            set(main), {"opens", "read", "write", "sync", "truncate", "lock", "unlock", "shm_lock", "fetch"}
+        )
+        self.assertGreater(main["write"]["count"], 0)
+        self.assertGreaterEqual(main["write"]["bytes"], 100000)
+        self.assertGreater(main["lock"]["count"], 0)
+        for name, op in main.items():
+            if name == "opens":
+                continue
+            self.assertEqual(set(op), {"count", "bytes", "errors", "ns", "histogram"})
+            self.assertEqual(len(op["histogram"]), 24)
+            self.assertEqual(sum(op["histogram"]), op["count"])
+            self.assertEqual(op["errors"], 0)
+        self.assertTrue("main_journal" in snap or "wal" in snap)
+
+        # reset
+        self.assertEqual(stats.snapshot(reset=True), snap)
+        self.assertEqual(stats.snapshot(), {})
+        db.execute("select * from foo").get
+        self.assertEqual(stats.snapshot()["main_db"]["opens"], 0)
+
+        # open files keep it alive
+        del stats
+        gc.collect()
+        self.assertIn("iostats", apsw.vfs_names())
+        db.close()
+        gc.collect()
+        self.assertNotIn("iostats", apsw.vfs_names())
+
+        # python vfs as base
+        class PyVFS(apsw.VFS):
+            def __init__(self):
+                self.opens = 0
+                super().__init__("pyvfs", "")
+
+            def xOpen(self, name, flags):
+                self.opens += 1
+                return super().xOpen(name, flags)
+
+        pyvfs = PyVFS()
+        stats = apsw.IOStatsVFS("iostats", "pyvfs")
+        del pyvfs
+        gc.collect()
+        db = apsw.Connection(fname, vfs="iostats")
+        # length() doesn't need the overflow pages
+        self.assertEqual(len(db.execute("select x from foo").get), 100000)
+        self.assertGreater(stats.snapshot()["main_db"]["read"]["bytes"], 100000)
+        self.assertTrue(db.vfsname("main").startswith("iostats/"))
+        db.close()
+        stats.unregister()
+        stats.unregister()
+        self.assertNotIn("iostats", apsw.vfs_names())
+        self.assertRaises(RuntimeError, stats.__init__, "iostats")
+
+    def testVFSFetch(self):
+        "Verify memory mapping is inherited by VFSFile"
+        stats = apsw.IOStatsVFS("iostatsmm")
+        reads = []
+
+        class PlainFile(apsw.VFSFile):
+            def xLock(self, level):
+                super().xLock(level)
+
+        class ReadFile(apsw.VFSFile):
+            def xRead(self, amount, offset):
+                reads.append(offset)
+                return super().xRead(amount, offset)
+
+        class FetchVFS(apsw.VFS):
+            file_class = PlainFile
+
+            def __init__(self):
+                super().__init__("fetchvfs", "iostatsmm")
+
+            def xOpen(self, name, flags):
+                return self.file_class("iostatsmm", name, flags)
+
+        vfs = FetchVFS()
+        fname = TESTFILEPREFIX + "testdb2"
+        db = apsw.Connection(fname, vfs="fetchvfs")
+        if not db.pragma("mmap_size", 10_000_000):
+            # mmap not compiled in
+            db.close()
+            vfs.unregister()
+            return
+        db.execute("create table foo(x); insert into foo values(randomblob(100000)), ('hello')")
+        db.close()
+
+        for file_class in PlainFile, ReadFile:
+            FetchVFS.file_class = file_class
+            stats.snapshot(reset=True)
+            reads.clear()
+            db = apsw.Connection(fname, vfs="fetchvfs")
+            db.pragma("mmap_size", 10_000_000)
+            self.assertEqual(db.execute("select x from foo where rowid=2").get, "hello")
+            self.assertEqual(db.execute("select length(x) from foo where rowid=1").get, 100000)
+            fetches = stats.snapshot()["main_db"]["fetch"]["count"]
+            if file_class is PlainFile:
+                self.assertGreater(fetches, 0)
+            else:
+                # overriding xRead must see every read
+                self.assertEqual(fetches, 0)
+                self.assertGreater(len(reads), 0)
+            db.close()
+
+        vfs.unregister()
+        stats.unregister()
+
     def testWith(self):
         "Context manager functionality"
 
@@ -9489,6 +10509,134 @@ class APSW(unittest.TestCase):
         with self.assertNoLogs():
             apsw.Connection(self.db.filename, flags=apsw.SQLITE_OPEN_READONLY)
 
+    def testExtConnectionPool(self) -> None:
+        "apsw.ext.ConnectionPool"
+        self.assertRaises(ValueError, apsw.ext.ConnectionPool, TESTFILEPREFIX + "testdb", max_connections=0)
+
+        warmer = apsw.ext.StatementWarmer()
+        warmer.register("pool", ["select 3"])
+        setup_calls = []
+        setup = [setup_calls.append, apsw.bestpractice.connection_wal, apsw.bestpractice.connection_busy_timeout]
+        pool = apsw.ext.ConnectionPool(
+            TESTFILEPREFIX + "testdb", max_connections=2, setup=setup, warmer=warmer, timeout=0.1
+        )
+
+        with pool.connection(write=True) as con:
+            con.execute("create table foo(x)")
+            self.assertIn("select 3", [e["query"] for e in con.cache_stats(True)["entries"]])
+            # writer is exclusive
+            self.assertRaises(TimeoutError, pool.connection(write=True).__enter__)
+            with pool.connection() as con2:
+                self.assertIsNot(con, con2)
+                # no connections left
+                self.assertRaises(TimeoutError, pool.connection().__enter__)
+                self.assertRaises(TimeoutError, pool.connection(timeout=0).__enter__)
+        self.assertEqual(setup_calls, [con, con2])
+        self.assertEqual(warmer.stats()["pool"].connections, 2)
+
+        # thread affinity
+        with pool.connection() as c:
+            self.assertIs(c, con2)
+        with pool.connection() as c:
+            self.assertIs(c, con2)
+
+        # uncommitted transactions are rolled back
+        with pool.connection(write=True) as c:
+            c.execute("begin ; insert into foo values(3)")
+        with pool.connection() as c:
+            self.assertFalse(c.in_transaction)
+            self.assertEqual(c.execute("select count(*) from foo").get, 0)
+
+        # closed connections are discarded
+        with pool.connection() as c:
+            c.close()
+        self.assertEqual(pool.stats().connections, 1)
+
+        def worker():
+            for i in range(20):
+                with pool.connection(write=i % 3 == 0, timeout=None) as c:
+                    if i % 3 == 0:
+                        with c:
+                            c.execute("insert into foo values(?)", (i,))
+                    else:
+                        c.execute("select count(*) from foo").get
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        with pool.connection() as c:
+            self.assertEqual(c.execute("select count(*) from foo").get, 4 * 7)
+
+        stats = pool.stats()
+        self.assertLessEqual(stats.connections, 2)
+        self.assertEqual(stats.idle, stats.connections)
+        self.assertEqual(stats.opened, 3)
+        self.assertGreater(stats.affinity_hits, 0)
+        self.assertGreaterEqual(stats.timeouts, 3)
+        self.assertEqual(stats.checkouts - stats.write_checkouts, 4 * 13 + 6)
+
+        with pool:
+            pass
+        self.assertEqual(pool.stats().connections, 0)
+        self.assertRaises(apsw.ConnectionClosedError, pool.connection().__enter__)
+
+    def testExtConnectionPoolReadonly(self) -> None:
+        "apsw.ext.ConnectionPool with readonly_readers"
+        pool = apsw.ext.ConnectionPool(TESTFILEPREFIX + "testdb", max_connections=3, readonly_readers=True, timeout=0.1)
+        self.assertEqual(pool.stats().connections, 1)
+
+        with pool.connection(write=True) as writer:
+            self.assertEqual(writer.pragma("journal_mode"), "wal")
+            writer.execute("create table foo(x)")
+            with pool.connection() as reader:
+                self.assertTrue(reader.readonly("main"))
+                self.assertRaises(apsw.ReadOnlyError, reader.execute, "insert into foo values(1)")
+            self.assertEqual(pool.stats().connections, 2)
+            self.assertEqual(pool.stats().idle, 1)
+        self.assertEqual(pool.stats().idle, 2)
+
+        # writer is always the same connection
+        with pool.connection(write=True) as con:
+            self.assertIs(con, writer)
+
+        # routing
+        self.assertEqual(pool.execute("insert into foo values(?) returning x", (3,)), [(3,)])
+        self.assertEqual(pool.execute("select * from foo"), [(3,)])
+        self.assertEqual(pool.execute("select 7; insert into foo values(4)"), [(7,)])
+        self.assertEqual(pool.execute("select count(*) from foo"), [(2,)])
+        stats = pool.stats()
+        self.assertEqual(stats.write_checkouts, 4)
+        self.assertEqual(stats.checkouts, 9)
+
+        def worker(n):
+            for i in range(20):
+                if i % 4 == 0:
+                    pool.execute("insert into foo values(?)", (n,))
+                else:
+                    pool.execute("select count(*) from foo")
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(pool.execute("select count(*) from foo"), [(2 + 5 * 5,)])
+        self.assertLessEqual(pool.stats().connections, 4)
+
+        # writer closed by caller is reopened
+        with pool.connection(write=True) as con:
+            con.close()
+        with pool.connection(write=True) as con:
+            self.assertIsNot(con, writer)
+            self.assertEqual(con.execute("select count(*) from foo").get, 27)
+
+        pool.close()
+        self.assertEqual(pool.stats().connections, 0)
+        self.assertRaises(apsw.ConnectionClosedError, pool.connection(write=True).__enter__)
+
     def testExtTracing(self) -> None:
         "apsw.ext Tracing and Resource usage"
 
@@ -9963,6 +11111,253 @@ class APSW(unittest.TestCase):
         ):
             self.assertRaises(apsw.SQLError, self.db.execute, query)
 
+    def testExtVirtualModuleConstraints(self) -> None:
+        "make_virtual_module constraints"
+        calls = []
+
+        def source(count, constraints):
+            calls.append(constraints)
+            rows = [(i, str(i)) for i in range(count)]
+            for column, desc in reversed(constraints.order_by):
+                rows.sort(key=lambda row: row[source.columns.index(column)], reverse=desc)
+            return rows
+
+        source.columns = ("a", "b")
+        source.column_access = apsw.ext.VTColumnAccess.By_Index
+        source.constraints = True
+        apsw.ext.make_virtual_module(self.db, "source", source)
+
+        # constraints is not a hidden column
+        self.assertEqual(
+            [row[1] for row in self.db.execute("pragma table_xinfo(source)")],
+            ["a", "b", "count"],
+        )
+
+        self.db.execute("create temp table source2(a,b)")
+        self.db.executemany("insert into source2 values(?,?)", ((i, str(i)) for i in range(10)))
+
+        for query, where, limit, offset in (
+            ("select * from source(10) where a>3 and a<=5", (("a", ">", 3), ("a", "<=", 5)), None, None),
+            ("select * from source(10) where a between 2 and 4", (("a", ">=", 2), ("a", "<=", 4)), None, None),
+            ("select * from source(10) where a in (1, 3, 5, 99)", (("a", "in", {1, 3, 5, 99}),), None, None),
+            ("select * from source where count=10 and b='3'", (("b", "=", "3"),), None, None),
+            ("select * from source(10) limit 2 offset 3", (), 2, 3),
+            ("select * from source(10) limit 2", (), 2, None),
+            # limit isn't provided when SQLite will discard rows
+            ("select * from source(10) where a>3 limit 2", (("a", ">", 3),), None, None),
+            ("select * from source(10) where b like '1%' limit 2", (), None, None),
+        ):
+            calls.clear()
+            expected = self.db.execute(
+                query.replace("source(10)", "source2").replace("source where count=10 and", "source2 where")
+            ).get
+            self.assertEqual(self.db.execute(query).get, expected)
+            self.assertEqual(len(calls), 1)
+            self.assertEqual(calls[0].where, where)
+            self.assertEqual((calls[0].limit, calls[0].offset), (limit, offset))
+
+        # order by is advisory unless order_by_consumed
+        calls.clear()
+        self.assertEqual(self.db.execute("select a from source(12) order by b desc limit 3").get, [9, 8, 7])
+        self.assertEqual(calls[0].order_by, (("b", True),))
+        self.assertIsNone(calls[0].limit)
+
+        source.order_by_consumed = True
+        apsw.ext.make_virtual_module(self.db, "ordered", source)
+        query = "select a from ordered(12) order by b desc limit 3"
+        calls.clear()
+        self.assertEqual(self.db.execute(query).get, [9, 8, 7])
+        self.assertEqual(calls[0].order_by, (("b", True),))
+        self.assertEqual(calls[0].limit, 3)
+        self.assertNotIn("ORDER BY", " ".join(row[3] for row in self.db.execute("explain query plan " + query)))
+
+    def testExtVirtualModuleBatch(self) -> None:
+        "make_virtual_module batch parameters"
+        calls = []
+        data = {1: [("one",)], 2: [("two",), ("deux",)], 3: [("three",)]}
+
+        def lookup(key):
+            calls.append(key)
+            if isinstance(key, set):
+                return {k: data[k] for k in key if k in data}
+            return data.get(key, [])
+
+        lookup.columns = ("name",)
+        lookup.column_access = apsw.ext.VTColumnAccess.By_Index
+        lookup.batch_parameters = ("key",)
+        apsw.ext.make_virtual_module(self.db, "lookup", lookup)
+
+        self.assertEqual(
+            sorted(self.db.execute("select key, name from lookup where key in (1, 2, 7)")),
+            [(1, "one"), (2, "deux"), (2, "two")],
+        )
+        self.assertEqual(calls, [{1, 2, 7}])
+
+        calls.clear()
+        self.assertEqual(self.db.execute("select name from lookup where key=3").get, "three")
+        self.assertEqual(self.db.execute("select name from lookup(1)").get, "one")
+        self.assertEqual(calls, [3, 1])
+
+        calls.clear()
+        self.db.execute("create temp table keys(k); insert into keys values(1),(3)")
+        self.assertEqual(
+            self.db.execute("select name from lookup where key in (select k from keys) order by name").get,
+            ["one", "three"],
+        )
+        self.assertEqual(calls, [{1, 3}])
+
+        lookup.batch_parameters = ("nope",)
+        self.assertRaises(ValueError, apsw.ext.make_virtual_module, self.db, "bad", lookup)
+
+        def not_mapping(key):
+            return [("x",)]
+
+        not_mapping.columns = lookup.columns
+        not_mapping.column_access = lookup.column_access
+        not_mapping.batch_parameters = ("key",)
+        apsw.ext.make_virtual_module(self.db, "not_mapping", not_mapping)
+        self.assertRaises(TypeError, self.db.execute, "select * from not_mapping where key in (1, 2)")
+
+    def testExtCompressedVFS(self) -> None:
+        "apsw.ext.CompressedVFS"
+        self.assertRaises(ValueError, apsw.ext.CompressedVFS, "cpr", codec=type("C", (), {"name": "x" * 17})())
+
+        vfs = apsw.ext.CompressedVFS("cpr")
+        fname = TESTFILEPREFIX + "testdb2"
+        db = apsw.Connection(fname, vfs="cpr")
+        db.execute("create table foo(x); create index foo_x on foo(x)")
+        with db:
+            for i in range(2000):
+                db.execute("insert into foo values(?)", ("compress me please " * 20 + str(i),))
+        page_bytes = db.pragma("page_count") * db.pragma("page_size")
+        self.assertLess(os.path.getsize(fname), page_bytes / 2)
+        self.assertEqual(db.pragma("integrity_check"), "ok")
+
+        # another connection sees changes
+        db2 = apsw.Connection(fname, vfs="cpr")
+        self.assertEqual(db2.execute("select count(*) from foo").get, 2000)
+        db.execute("delete from foo where rowid > 1000")
+        self.assertEqual(db2.execute("select count(*) from foo").get, 1000)
+
+        # rollback
+        with contextlib.suppress(ZeroDivisionError):
+            with db:
+                db.execute("update foo set x=randomblob(100)")
+                1 / 0
+        self.assertEqual(db2.execute("select count(*) from foo where x like 'compress%'").get, 1000)
+
+        # shrinking
+        before = db.pragma("page_count")
+        db.execute("vacuum")
+        self.assertLess(db.pragma("page_count"), before)
+        self.assertEqual(db2.execute("select count(*) from foo").get, 1000)
+        self.assertEqual(db2.pragma("integrity_check"), "ok")
+
+        self.assertRaises(apsw.CantOpenError, db.pragma, "journal_mode", "wal")
+        self.assertEqual(db.pragma("journal_mode"), "delete")
+
+        # compact copy
+        db.execute("vacuum into ?", (TESTFILEPREFIX + "testdb3",))
+        self.assertLessEqual(os.path.getsize(TESTFILEPREFIX + "testdb3"), os.path.getsize(fname))
+        db.close()
+        db2.close()
+
+        # reopen with no cache, and with the wrong codec
+        vfs2 = apsw.ext.CompressedVFS("cpr2", cache_pages=0)
+        db = apsw.Connection(fname, vfs="cpr2")
+        self.assertEqual(db.execute("select count(*) from foo").get, 1000)
+        db.close()
+        vfs3 = apsw.ext.CompressedVFS("cpr3", codec=apsw.ext.LZMACodec())
+        self.assertRaises(ValueError, apsw.Connection, fname, vfs="cpr3")
+        db = apsw.Connection(TESTFILEPREFIX + "testdb3", vfs="cpr2")
+        self.assertEqual(db.execute("select count(*) from foo").get, 1000)
+        db.close()
+
+        # a regular database
+        self.db.execute("create table x(y)")
+        self.assertRaises(apsw.NotADBError, apsw.Connection, self.db.filename, vfs="cpr")
+
+        for v in vfs, vfs2, vfs3:
+            v.unregister()
+
+    def testExtHTTPVFS(self) -> None:
+        "apsw.ext.HTTPVFS"
+        import http.server
+
+        self.db.execute("create table foo(id integer primary key, x)")
+        with self.db:
+            self.db.executemany("insert into foo values(?, ?)", ((i, "some text " * 20) for i in range(5000)))
+        self.db.close()
+        with open(TESTFILEPREFIX + "testdb", "rb") as f:
+            content = f.read()
+        etag = ['"one"']
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path != "/test.db":
+                    self.send_error(404)
+                    return
+                if self.headers["X-No-Range"]:
+                    self.send_response(200)
+                    self.send_header("Content-Length", str(len(content)))
+                    self.end_headers()
+                    self.wfile.write(content)
+                    return
+                start, end = map(int, re.fullmatch(r"bytes=(\d+)-(\d+)", self.headers["Range"]).groups())
+                end = min(end, len(content) - 1)
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{end}/{len(content)}")
+                self.send_header("Content-Length", str(end - start + 1))
+                self.send_header("ETag", etag[0])
+                self.end_headers()
+                self.wfile.write(content[start : end + 1])
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/"
+
+        try:
+            self.assertRaises(ValueError, apsw.ext.HTTPVFS, "httptest", block_size=100)
+            vfs = apsw.ext.HTTPVFS("httptest", base_url=url, block_size=4096, cache_blocks=1000, read_ahead=4)
+            db = apsw.Connection("test.db", vfs="httptest", flags=apsw.SQLITE_OPEN_READONLY)
+            self.assertEqual(db.filename, url + "test.db")
+            self.assertEqual(db.execute("select x from foo where id=17").get, "some text " * 20)
+            self.assertEqual(db.execute("select count(*) from foo").get, 5000)
+            self.assertEqual(db.pragma("integrity_check"), "ok")
+            stats = vfs.stats()
+            self.assertGreater(stats.prefetches, 0)
+            self.assertGreater(stats.hits, 0)
+            # each block fetched only once
+            self.assertLessEqual(stats.bytes, len(content))
+            self.assertRaises(apsw.ReadOnlyError, db.execute, "insert into foo values(null, 3)")
+
+            # cache is shared
+            db2 = apsw.Connection(url + "test.db", vfs="httptest")
+            misses = vfs.stats().misses
+            self.assertEqual(db2.execute("select x from foo where id=17").get, "some text " * 20)
+            self.assertEqual(vfs.stats().misses, misses)
+            db2.execute("create temp table bar(x)")
+
+            # changed on the server
+            etag[0] = '"two"'
+            vfs.cache_blocks = 0
+            vfs._cache.clear()
+            self.assertRaises(apsw.IOError, db2.execute, "select count(*) from foo")
+            db.close()
+            db2.close()
+
+            self.assertRaises(apsw.IOError, apsw.Connection, "missing.db", vfs="httptest")
+            # server without range support
+            vfs.headers["X-No-Range"] = "1"
+            self.assertRaises(apsw.IOError, apsw.Connection, "test.db", vfs="httptest")
+            vfs.unregister()
+        finally:
+            server.shutdown()
+            server.server_close()
+
     def testExtAnalyzePages(self) -> None:
         "analyze pages"
         if "dbstat" not in (self.db.pragma("module_list") or tuple()):
@@ -55,7 +55,7 @@ class Async(unittest.TestCase):
 
     def testOverwrite(self):
         "make sure module contextvars can't be overwritten"
-        for name in "async_controller", "async_cursor_prefetch":
+        for name in "async_controller", "async_cursor_prefetch", "async_cursor_prefetch_bytes":
             self.assertRaisesRegex(AttributeError, ".*Do not overwrite apsw.*context", setattr, apsw, name, 3)
         # used to be a contextvar, now thread local
         self.assertIsNone(apsw.async_run_coro)
@@ -309,6 +309,49 @@ class Async(unittest.TestCase):
 
         self.assertRaises(ValueError, blob.length)
 
+    async def atestBlobStream(self, fw):
+        db = await apsw.Connection.as_async(":memory:")
+        data = bytes(random.randrange(256) for _ in range(100_000))
+        await db.execute(
+            "create table media(content); insert into media(rowid, content) values(1, ?), (2, zeroblob(?))",
+            (data, len(data)),
+        )
+
+        async with await db.blob_open("main", "media", "content", 1, False) as blob:
+            with self.assertRaises(ValueError):
+                async for _ in apsw.aio.blob_chunks(blob, chunk_size=0):
+                    pass
+            chunks = [bytes(chunk) async for chunk in apsw.aio.blob_chunks(blob, chunk_size=7_000, read_ahead=3)]
+            self.assertEqual(b"".join(chunks), data)
+            self.assertEqual({len(chunk) for chunk in chunks[:-1]}, {7_000})
+            self.assertEqual(len(chunks[-1]), len(data) % 7_000)
+
+            # from current position
+            blob.seek(99_990)
+            self.assertEqual([bytes(chunk) async for chunk in apsw.aio.blob_chunks(blob)], [data[-10:]])
+            self.assertEqual([chunk async for chunk in apsw.aio.blob_chunks(blob)], [])
+
+        self.assertRaises(ValueError, apsw.aio.BlobWriter, None, buffer_size=0)
+        async with await db.blob_open("main", "media", "content", 2, True) as blob:
+            async with apsw.aio.BlobWriter(blob, buffer_size=10_000) as writer:
+                offset = 0
+                while offset < len(data):
+                    size = random.randrange(1, 3_000)
+                    await writer.write(data[offset : offset + size])
+                    offset += size
+                    # held until there is buffer_size
+                    self.assertLess(offset - blob.tell(), 10_000)
+            self.assertEqual(blob.tell(), len(data))
+
+            blob.seek(-5, 2)
+            writer = apsw.aio.BlobWriter(blob)
+            await writer.write(b"too much data")
+            with self.assertRaises(ValueError):
+                await writer.flush()
+
+        self.assertEqual(await (await db.execute("select content from media where rowid=2")).get, data)
+        await db.aclose()
+
     async def atestBackup(self, fw):
         db = await apsw.Connection.as_async(":memory:")
         db2 = await apsw.Connection.as_async(":memory:")
@@ -1028,6 +1071,242 @@ class Async(unittest.TestCase):
             with fail_after(timeout):
                 await (await db.execute(fractal_sql)).get
 
+    async def atestMultiplex(self, fw):
+        self.assertRaises(ValueError, apsw.aio.Multiplex, workers=0)
+        multiplex = apsw.aio.Multiplex(workers=2, thread_name="multiplex test")
+
+        async def async_double(x):
+            return x * 2
+
+        with apsw.aio.contextvar_set(apsw.async_controller, multiplex):
+            dbs = [await apsw.Connection.as_async(":memory:") for _ in range(6)]
+
+        for db in dbs:
+            await db.create_scalar_function("async_double", async_double)
+            await db.execute("create table foo(x)")
+
+        for i in range(20):
+            for n, db in enumerate(dbs):
+                await db.execute("insert into foo values(async_double(?))", (i + n,))
+
+        for n, db in enumerate(dbs):
+            self.assertEqual(await (await db.execute("select sum(x) from foo")).get, 2 * sum(range(n, n + 20)))
+            rows = []
+            async for row in await db.execute("select x from foo order by rowid"):
+                rows.append(row[0])
+            self.assertEqual(rows, [2 * (i + n) for i in range(20)])
+
+        names = [t.name for t in threading.enumerate()]
+        self.assertLessEqual(names.count("multiplex test"), 2)
+
+        stats = multiplex.stats()
+        self.assertEqual(stats.connections, 6)
+        self.assertLessEqual(stats.workers, 2)
+        self.assertGreater(stats.calls, 6 * 22)
+        self.assertGreaterEqual(stats.max_queue_depth, 1)
+        self.assertEqual(stats.queue_depth, 0)
+        self.assertGreater(stats.run_ns, 0)
+
+        for db in dbs:
+            await db.aclose()
+        self.assertEqual(multiplex.stats().connections, 0)
+
+    async def atestPrefetchBytes(self, fw):
+        db = await apsw.Connection.as_async(":memory:")
+        # appended to in the worker thread as each row is produced
+        fetched = []
+        await db.create_scalar_function("fetched", lambda x: fetched.append(x) or x)
+
+        def query(rows, extra=""):
+            return f"""with recursive c(x) as (values(0) union all select x+1 from c where x<{rows - 1})
+                        select fetched(x){extra} from c"""
+
+        async def rows_ahead(sql):
+            # how many rows had been fetched beyond the one being consumed
+            fetched.clear()
+            ahead = []
+            async for row in await db.execute(sql):
+                ahead.append(len(fetched) - row[0] - 1)
+            return ahead
+
+        with apsw.aio.contextvar_set(apsw.async_cursor_prefetch_bytes, 250_000):
+            # wide rows stay within the budget
+            ahead = await rows_ahead(query(50, ", zeroblob(100000)"))
+            self.assertEqual(len(ahead), 50)
+            self.assertLessEqual(max(ahead), 2)
+
+            # narrow rows grow well past the fixed default of 64
+            ahead = await rows_ahead(query(20000))
+            self.assertEqual(len(ahead), 20000)
+            self.assertGreater(max(ahead), 1000)
+
+            # async_cursor_prefetch is the maximum
+            with apsw.aio.contextvar_set(apsw.async_cursor_prefetch, 100):
+                ahead = await rows_ahead(query(20000))
+                self.assertEqual(len(ahead), 20000)
+                self.assertLess(max(ahead), 100)
+
+        # fixed size when not set
+        ahead = await rows_ahead(query(1000))
+        self.assertLess(max(ahead), 64)
+
+        await db.aclose()
+
+    async def atestCompletionBatch(self, fw):
+        if fw != "asyncio":
+            return
+
+        self.assertRaises(ValueError, apsw.aio.AsyncIO, completion_batch=0)
+
+        async def async_double(x):
+            return x * 2
+
+        with apsw.aio.contextvar_set(apsw.async_controller, functools.partial(apsw.aio.AsyncIO, completion_batch=16)):
+            db = await apsw.Connection.as_async(":memory:")
+
+        self.assertEqual(db.async_controller.completion_batch, 16)
+        await db.create_scalar_function("async_double", async_double)
+
+        async def query(i):
+            return await (await db.execute("select ?, async_double(?)", (i, i))).get
+
+        results = await asyncio.gather(*(query(i) for i in range(100)))
+        self.assertEqual(results, [(i, 2 * i) for i in range(100)])
+
+        with self.assertRaises(apsw.SQLError):
+            await asyncio.gather(*(db.execute("select 1") for _ in range(10)), db.execute("syntax error"))
+
+        self.assertEqual(db.async_controller.completed, [])
+        await db.aclose()
+
+    async def atestPriority(self, fw):
+        if fw != "asyncio":
+            return
+
+        db = await apsw.Connection.as_async(":memory:")
+        order = []
+        await db.create_scalar_function("record", order.append)
+
+        started, block = threading.Event(), threading.Event()
+
+        def hold():
+            started.set()
+            block.wait()
+
+        now = asyncio.get_running_loop().time()
+        # (priority, deadline, label) in order made
+        calls = (
+            (5, None, "five"),
+            (0, None, "zero"),
+            (3, None, "three"),
+            (0, now + 100, "zero far deadline"),
+            (0, now + 50, "zero near deadline"),
+            (-1, None, "minus one"),
+            (0, None, "zero again"),
+        )
+
+        holder = asyncio.ensure_future(db.async_run(hold))
+        while not started.is_set():
+            await asyncio.sleep(0.001)
+
+        tasks = []
+        for p, d, label in calls:
+            with apsw.aio.contextvar_set(apsw.aio.priority, p), apsw.aio.contextvar_set(apsw.aio.deadline, d):
+                tasks.append(asyncio.ensure_future(db.execute("select record(?)", (label,))))
+        # let them all get queued
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        block.set()
+        await holder
+        await asyncio.gather(*tasks)
+
+        self.assertEqual(
+            order,
+            ["minus one", "zero near deadline", "zero far deadline", "zero", "zero again", "three", "five"],
+        )
+        await db.aclose()
+
+    async def atestPipeline(self, fw):
+        db = await apsw.Connection.as_async(":memory:")
+        await db.execute("create table foo(x UNIQUE)")
+
+        pipeline = apsw.aio.Pipeline()
+        self.assertEqual(pipeline.execute("insert into foo values(?)", (1,)), 0)
+        self.assertEqual(pipeline.executemany("insert into foo values(?)", [(2,), (3,)]), 1)
+        self.assertEqual(pipeline.execute("select x from foo order by x"), 2)
+        self.assertEqual(len(pipeline), 3)
+
+        class CountingQueue:
+            def __init__(self, queue):
+                self.queue = queue
+                self.count = 0
+
+            def put(self, item):
+                self.count += 1
+                self.queue.put(item)
+
+        counter = CountingQueue(db.async_controller.queue)
+        db.async_controller.queue = counter
+        try:
+            self.assertEqual(await pipeline.run(db), [[], [], [(1,), (2,), (3,)]])
+        finally:
+            db.async_controller.queue = counter.queue
+        # one trip to the worker
+        self.assertEqual(counter.count, 1)
+
+        # stops at the first error, which is raised
+        pipeline = apsw.aio.Pipeline()
+        pipeline.execute("insert into foo values(4)")
+        pipeline.execute("insert into foo values(1)")
+        pipeline.execute("insert into foo values(5)")
+        with self.assertRaises(apsw.ConstraintError):
+            await pipeline.run(db)
+        self.assertEqual(await (await db.execute("select group_concat(x) from foo")).get, "1,2,3,4")
+
+        # all or nothing in a transaction
+        await db.execute("delete from foo where x=4")
+        with self.assertRaises(apsw.ConstraintError):
+            await pipeline.run(db, transaction=True)
+        self.assertEqual(await (await db.execute("select group_concat(x) from foo")).get, "1,2,3")
+
+        await db.aclose()
+
+    async def atestReadWritePool(self, fw):
+        with tempfile.TemporaryDirectory(prefix="apsw-atestReadWritePool") as tempd:
+            with self.assertRaises(ValueError):
+                await apsw.aio.ReadWritePool.open(f"{tempd}/db", readers=0)
+
+            async with await apsw.aio.ReadWritePool.open(f"{tempd}/db", readers=3) as pool:
+                self.assertEqual(len(pool.readers), 3)
+                self.assertEqual(await pool.read("pragma journal_mode"), [("wal",)])
+
+                # needs the writer
+                await pool.execute("create table foo(x)")
+                await pool.execute("insert into foo values(?)", (1,))
+                self.assertEqual(pool.stats().rerouted, 2)
+
+                await pool.write("insert into foo values(2), (3)")
+                self.assertEqual(await pool.read("select sum(x) from foo"), [(6,)])
+                with self.assertRaises(apsw.ReadOnlyError):
+                    await pool.read("insert into foo values(4)")
+
+                for i in range(9):
+                    self.assertEqual(await pool.execute("select count(*) + ? from foo", (i,)), [(3 + i,)])
+
+                stats = pool.stats()
+                self.assertEqual(stats.readers, 3)
+                self.assertEqual(stats.writes, 3)
+                self.assertEqual(stats.rerouted, 2)
+                self.assertEqual(stats.reads, 11)
+                self.assertEqual(stats.in_flight, 0)
+                self.assertGreaterEqual(stats.max_in_flight, 1)
+
+                # idle readers take turns
+                for reader in pool.readers:
+                    cache = reader.cache_stats()
+                    self.assertGreater(cache["hits"] + cache["misses"], 0)
+
     async def atestSession(self, fw):
         if not hasattr(apsw, "Session"):
             with self.assertRaisesRegex(apsw.MisuseError, ".*The session extension is not enabled and available.*"):
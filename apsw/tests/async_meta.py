@@ -127,6 +127,8 @@ class AsyncMeta(unittest.TestCase):
                             args = "main", "dummy", "column", 73, False
                         case "column_metadata":
                             args = "main", "dummy", "column"
+                        case "create_columns_table":
+                            args = "foo", {"x": [1]}
                         case "config":
                             args = apsw.SQLITE_DBCONFIG_ENABLE_FKEY, -1
                         case (
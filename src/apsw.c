@@ -1992,7 +1992,8 @@ apsw_module_setattr(PyObject *module, PyObject *name, PyObject *value)
 {
   if (module_is_initialized
       && (PyObject_RichCompareBool(apst.async_controller, name, Py_EQ) == 1
-          || (!PyErr_Occurred() && PyObject_RichCompareBool(apst.async_cursor_prefetch, name, Py_EQ) == 1)))
+          || (!PyErr_Occurred() && PyObject_RichCompareBool(apst.async_cursor_prefetch, name, Py_EQ) == 1)
+          || (!PyErr_Occurred() && PyObject_RichCompareBool(apst.async_cursor_prefetch_bytes, name, Py_EQ) == 1)))
   {
     PyErr_Format(PyExc_AttributeError,
                  "Do not overwrite apsw.%S.  It is a context var - use its set method in your context", name);
@@ -2244,9 +2245,11 @@ PyInit_apsw(void)
   if (PyModule_AddType(m, &ConnectionType) || PyModule_AddType(m, &APSWCursorType) || PyModule_AddType(m, &APSWBlobType)
       || PyModule_AddType(m, &APSWBackupType) || PyModule_AddType(m, &ZeroBlobBindType)
       || PyModule_AddType(m, &APSWVFSType) || PyModule_AddType(m, &APSWVFSFileType)
+      || PyModule_AddType(m, &APSWIOStatsVFSType)
       || PyModule_AddType(m, &apswfcntl_pragma_Type) || PyModule_AddType(m, &APSWURIFilenameType)
-      || PyModule_AddType(m, &SqliteIndexInfoType) || PyModule_AddType(m, &APSWFTS5TokenizerType)
-      || PyModule_AddType(m, &APSWFTS5ExtensionAPIType) || PyModule_AddType(m, &PyObjectBindType)
+      || PyModule_AddType(m, &SqliteIndexInfoType) || PyModule_AddType(m, &VTRowCursorType)
+      || PyModule_AddType(m, &APSWFTS5TokenizerType) || PyModule_AddType(m, &APSWFTS5ExtensionAPIType)
+      || PyModule_AddType(m, &PyObjectBindType)
 #ifdef SQLITE_ENABLE_CARRAY
       || PyModule_AddType(m, &CArrayBindType)
 #endif
@@ -2377,6 +2380,34 @@ PyInit_apsw(void)
   if (PyModule_AddObjectRef(m, "async_cursor_prefetch", async_cursor_prefetch_context_var))
     goto fail;
 
+  /** .. attribute:: async_cursor_prefetch_bytes
+    :type: contextvars.ContextVar[int | None]
+
+    When set, async iteration of a :class:`Cursor` adapts how many rows
+    are fetched at once.  The number of rows starts small and doubles
+    each time the previous rows are all consumed, while the rows fetched
+    at once are kept to around this many bytes.  Narrow rows end up
+    fetched in large numbers, while wide rows are fetched a few at a
+    time.  :attr:`async_cursor_prefetch` is then the maximum number of
+    rows, defaulting to 65,536.  The default is ``None`` which uses the
+    fixed :attr:`async_cursor_prefetch`.  See :doc:`async` for details.
+    Typical usage is:
+
+    .. code-block:: python
+
+      with apsw.aio.contextvar_set(apsw.async_cursor_prefetch_bytes, 1_000_000):
+        async for row in await db.execute("SELECT ..."):
+            print(f"{row=})
+  */
+
+  if (!async_cursor_prefetch_bytes_context_var)
+    if (NULL
+        == (async_cursor_prefetch_bytes_context_var = PyContextVar_New("apsw.async_cursor_prefetch_bytes", Py_None)))
+      goto fail;
+
+  if (PyModule_AddObjectRef(m, "async_cursor_prefetch_bytes", async_cursor_prefetch_bytes_context_var))
+    goto fail;
+
   /** .. attribute:: no_change
     :type: object
 
@@ -2,8 +2,10 @@
 /* some forward declarations we can't have here because they don't know the
    contents of struct Connection */
 static PyObject *async_get_controller_from_connection(PyObject *connection);
+static void async_set_worker_thread(PyObject *connection);
 
 static PyObject *async_cursor_prefetch_context_var;
+static PyObject *async_cursor_prefetch_bytes_context_var;
 static PyObject *async_controller_context_var;
 
 /* used for getting call details im a non-worker thread that can be invoked in the worker thread */
@@ -24,6 +26,11 @@ typedef struct BoxedCall
   /* PyContext to run call in */
   PyObject *context;
 
+  /* Connection the call is for, so the thread running the call can be
+     recorded as its worker.  Controllers can run a connection's calls
+     on different threads as long as only one runs at a time. */
+  PyObject *connection;
+
   union
   {
     struct
@@ -72,6 +79,8 @@ BoxedCall_clear(PyObject *self_, int call_type)
 {
   BoxedCall *self = (BoxedCall *)self_;
 
+  Py_CLEAR(self->connection);
+
   switch ((call_type < 0) ? self->call_type : (enum BoxedCall_call_type)call_type)
   {
   case Dormant:
@@ -131,6 +140,9 @@ BoxedCall_internal_call(BoxedCall *self)
   enum BoxedCall_call_type call_type = self->call_type;
   self->call_type = Dormant;
 
+  if (self->connection)
+    async_set_worker_thread(self->connection);
+
   if (0 == PyContext_Enter(self->context))
   {
     switch (call_type)
@@ -220,6 +232,7 @@ make_boxed_call(Py_ssize_t total_args)
   if (box)
   {
     box->call_type = Dormant;
+    box->connection = NULL;
 
     box->context = PyContext_CopyCurrent();
     if (!box->context)
@@ -263,6 +276,7 @@ async_shutdown_controller(PyObject *controller)
 static PyObject *
 async_send_boxed_call(PyObject *connection, PyObject *boxed_call)
 {
+  ((BoxedCall *)boxed_call)->connection = Py_NewRef(connection);
   PyObject *vargs[] = { NULL, async_get_controller_from_connection(connection), boxed_call };
   PyObject *result = PyObject_VectorcallMethod_NoAsync(apst.send, vargs + 1, 2 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
   Py_DECREF(boxed_call);
@@ -11,18 +11,6 @@ struct iovec
 #endif
 #endif
 
-/* dance to get alignment requirement for a type */
-#if defined(__STDC_VERSION__) && __STDC_VERSION__ >= 201112L
-#include <stdalign.h>
-#define APSW_ALIGNOF(type) alignof(type)
-#elif defined(_MSC_VER)
-#define APSW_ALIGNOF(type) __alignof(type)
-#elif defined(__GNUC__) || defined(__clang__)
-#define APSW_ALIGNOF(type) __alignof__(type)
-#else
-#define APSW_ALIGNOF(type) offsetof(struct { char c; type m; }, m)
-#endif
-
 typedef struct
 {
   PyObject_HEAD
@@ -661,8 +661,8 @@ Connection_init(PyObject *self_, PyObject *args, PyObject *kwargs)
   /* clamp cache size */
   if (statementcachesize < 0)
     statementcachesize = 0;
-  if (statementcachesize > 512)
-    statementcachesize = 512;
+  if (statementcachesize > SC_MAX_ENTRIES)
+    statementcachesize = SC_MAX_ENTRIES;
 
   /* Technically there is a race condition as a vfs of the same name
      could be registered between our find and the open starting.
@@ -4486,6 +4486,114 @@ finally:
   Py_RETURN_NONE;
 }
 
+struct columns_table;
+static struct columns_table *columns_table_create(PyObject *columns);
+static void columns_table_free(void *context);
+static sqlite3_module columns_module;
+
+/** .. method:: create_columns_table(name: str, columns: dict[str, Buffer | Sequence[SQLiteValue]] | Any) -> None
+
+    Registers an `eponymous only
+    <https://www.sqlite.org/vtab.html#eponymous_only_virtual_tables>`__
+    read only virtual table named *name* whose rows come from
+    in memory columns.  Values from buffers and Arrow data are provided
+    to SQLite directly from C code, without calling any Python code or
+    creating Python objects.  This makes joins and queries against
+    analytics data cheap.
+
+    .. code-block:: python
+
+      connection.create_columns_table("readings", {
+          "sensor": array.array("q", sensors),
+          "value": array.array("d", values),
+          "label": labels,
+      })
+
+      connection.execute("select sensors.name, avg(readings.value) "
+                         "from readings join sensors on readings.sensor = sensors.id "
+                         "group by sensors.name")
+
+      # a pyarrow Table, polars DataFrame etc
+      connection.create_columns_table("frame", table)
+
+    *columns* can be a :class:`dict` mapping column names to columns
+    which must all be the same length.  Each column is one of:
+
+    * A contiguous one dimensional buffer such as :class:`array.array`,
+      :class:`memoryview`, or a numpy array.  Signed integers up to 64
+      bits, unsigned integers up to 32 bits, float, double, and bool
+      (``?``) formats are supported.
+    * A sequence (eg :class:`list`) of any :ref:`supported values
+      <types>`.  It is copied into a :class:`tuple`.  These are the only
+      columns where the GIL is needed to get values.
+
+    Alternatively *columns* can be an object supporting the `Arrow
+    PyCapsule interface
+    <https://arrow.apache.org/docs/format/CDataInterface/PyCapsuleInterface.html>`__
+    via ``__arrow_c_stream__`` (eg tables and data frames) or
+    ``__arrow_c_array__`` (eg record batches).  The Arrow data is
+    consumed immediately.  Null, boolean, integer (except 64 bit
+    unsigned), float, double, string, and binary columns are
+    supported, with dates, times, timestamps, and durations provided
+    as their underlying integer.
+
+    Buffers and Arrow data are kept (preventing resizing) until the
+    table is no longer registered and no statements using it remain.
+    That includes statements in the :ref:`statement cache
+    <statementcache>` - use :meth:`Connection.cache_resize` with zero
+    to discard them, with the data then released when the next
+    statement runs.  Do not modify buffer contents while queries are
+    running.
+
+    The rowid is the row number starting at zero, and rowid equality
+    and range constraints in queries are used to only visit the
+    relevant rows.
+
+    To unregister the table use :meth:`create_module` with *None*, or
+    call this again with the same name to replace it.
+
+    -* sqlite3_create_module_v2
+*/
+static PyObject *
+Connection_create_columns_table(PyObject *self_, PyObject *const *fast_args, Py_ssize_t fast_nargs,
+                                PyObject *fast_kwnames)
+{
+  Connection *self = (Connection *)self_;
+  const char *name = NULL;
+  PyObject *columns = NULL;
+  struct columns_table *ct = NULL;
+  int res;
+
+  CHECK_CLOSED(self, NULL);
+
+  {
+    Connection_create_columns_table_CHECK;
+    ARG_PROLOG(2, Connection_create_columns_table_KWNAMES);
+    ARG_MANDATORY ARG_str(name);
+    ARG_MANDATORY ARG_pyobject(columns);
+    ARG_EPILOG(NULL, Connection_create_columns_table_USAGE, );
+  }
+
+  ASYNC_FASTCALL(self, Connection_create_columns_table);
+
+  DBMUTEX_ENSURE(self);
+
+  ct = columns_table_create(columns);
+  if (ct)
+  {
+    /* Note that it calls the destructor on failure  */
+    res = sqlite3_create_module_v2(self->db, name, &columns_module, ct, columns_table_free);
+    SET_EXC(res, self->db);
+  }
+
+  sqlite3_mutex_leave(self->dbmutex);
+
+  if (PyErr_Occurred())
+    return NULL;
+
+  Py_RETURN_NONE;
+}
+
 /** .. method:: vtab_config(op: int, val: int = 0) -> None
 
  Callable during virtual table :meth:`~VTModule.Connect`/:meth:`~VTModule.Create`.
@@ -5271,7 +5379,7 @@ fail:
   return res;
 }
 
-/** .. method:: executemany(statements: str, sequenceofbindings:Iterable[Bindings], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1) -> Cursor
+/** .. method:: executemany(statements: str, sequenceofbindings: Iterable[Bindings] | tuple[Sequence[SQLiteValue] | Buffer, ...], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1, columns: bool = False) -> Cursor
 
 This method is for when you want to execute the same statements over a
 sequence of bindings, such as inserting into a database.  (A cursor is
@@ -5407,10 +5515,13 @@ error:
   return res;
 }
 
-/** .. method:: cache_stats(include_entries: bool = False) -> dict[str, int]
+/** .. method:: cache_stats(include_entries: bool = False, top: int = -1) -> dict[str, int]
 
 Returns information about the statement cache as dict.
 
+If *top* is zero or more then only that many `entries` are
+included, in descending order of `uses`.
+
 .. note::
 
   Calling execute with "select a; select b; insert into c ..." will
@@ -5445,6 +5556,17 @@ The returned dictionary has the following information.
       in the misses count.
   * - max_cacheable_bytes
     - Maximum size of query (in bytes of utf8) that will be considered for caching
+  * - reprepares
+    - Misses for a query that had previously been evicted.  A
+      large value relative to `misses` means the cache is too small
+      for the workload.  (Queries are matched by hash.)  Only counted
+      when tracking or adaptive sizing is on - see :meth:`cache_resize`
+  * - prepare_ns
+    - Total nanoseconds spent preparing statements.  Only measured
+      when tracking is on
+  * - resizes
+    - How many times adaptive sizing changed the size.  See
+      :meth:`cache_resize`
   * - entries
     - (Only present if `include_entries` is True) A list of the cache entries
 
@@ -5466,6 +5588,16 @@ If `entries` is present, then each list entry is a dict with the following infor
       if >= 0
   * - uses
     - How many times this entry has been (re)used
+  * - evictions
+    - How many times this query was evicted from the cache and then
+      had to be prepared again.  Only counted when tracking or
+      adaptive sizing is on
+  * - prepare_ns
+    - How many nanoseconds it took to prepare.  Only measured when
+      tracking is on
+  * - age
+    - How many cache lookups have happened since this entry was last
+      used.  Zero means it was the most recent.
   * - has_more
     - Boolean indicating if there was more query text than
       the first statement
@@ -5475,17 +5607,165 @@ static PyObject *
 Connection_cache_stats(PyObject *self_, PyObject *const *fast_args, Py_ssize_t fast_nargs, PyObject *fast_kwnames)
 {
   Connection *self = (Connection *)self_;
-  int include_entries = 0;
+  int include_entries = 0, top = -1;
 
   CHECK_CLOSED(self, NULL);
 
   {
     Connection_cache_stats_CHECK;
-    ARG_PROLOG(1, Connection_cache_stats_KWNAMES);
+    ARG_PROLOG(2, Connection_cache_stats_KWNAMES);
     ARG_OPTIONAL ARG_bool(include_entries);
+    ARG_OPTIONAL ARG_int(top);
     ARG_EPILOG(NULL, Connection_cache_stats_USAGE, );
   }
-  return statementcache_stats(self->stmtcache, include_entries);
+  return statementcache_stats(self->stmtcache, include_entries, top);
+}
+
+/** .. method:: cache_resize(size: int, maximum: int = 0, *, track: bool = False) -> None
+
+Changes the number of entries in the :ref:`statement cache
+<statementcache>`.  If the cache shrinks then the least recently used
+entries are discarded.
+
+If *maximum* is larger than *size* then the cache is adaptive.  It
+grows (up to *maximum* entries) when queries are being evicted and
+then prepared again, and shrinks (down to *size* entries) when most
+entries are not being used.  Use :meth:`cache_stats` to see the
+current size and how often it changed.
+
+If *track* is True then how long each statement took to prepare,
+and which queries were evicted and then prepared again, are recorded
+for :meth:`cache_stats`.  This costs a little on every prepare so it
+is off by default.  Adaptive sizing always records evictions.
+
+Sizes are clamped to between zero and 512.  A *size* of zero
+disables the cache, including adaptive sizing.
+
+.. seealso::
+
+  * :meth:`cache_stats`
+*/
+static PyObject *
+Connection_cache_resize(PyObject *self_, PyObject *const *fast_args, Py_ssize_t fast_nargs, PyObject *fast_kwnames)
+{
+  Connection *self = (Connection *)self_;
+  int size, maximum = 0, track = 0;
+  StatementCache *sc;
+  unsigned adaptive_min, adaptive_max;
+  int old_track;
+
+  CHECK_CLOSED(self, NULL);
+
+  {
+    Connection_cache_resize_CHECK;
+    ARG_PROLOG(2, Connection_cache_resize_KWNAMES);
+    ARG_MANDATORY ARG_int(size);
+    ARG_OPTIONAL ARG_int(maximum);
+    ARG_OPTIONAL ARG_bool(track);
+    ARG_EPILOG(NULL, Connection_cache_resize_USAGE, );
+  }
+
+  ASYNC_FASTCALL(self, Connection_cache_resize);
+
+  size = Py_MIN(Py_MAX(size, 0), SC_MAX_ENTRIES);
+  maximum = Py_MIN(Py_MAX(maximum, 0), SC_MAX_ENTRIES);
+
+  DBMUTEX_ENSURE(self);
+  sc = self->stmtcache;
+  adaptive_min = sc->adaptive_min;
+  adaptive_max = sc->adaptive_max;
+  old_track = sc->track;
+  /* set first because resize sizes the evicted table for the maximum */
+  sc->adaptive_min = (size && maximum > size) ? size : 0;
+  sc->adaptive_max = (size && maximum > size) ? maximum : 0;
+  sc->track = track;
+  if (statementcache_resize(sc, size))
+  {
+    sc->adaptive_min = adaptive_min;
+    sc->adaptive_max = adaptive_max;
+    sc->track = old_track;
+    PyErr_NoMemory();
+  }
+  else
+  {
+    sc->window_lookups = sc->lookups;
+    sc->window_reprepares = sc->reprepares;
+  }
+  sqlite3_mutex_leave(self->dbmutex);
+
+  if (PyErr_Occurred())
+    return NULL;
+  Py_RETURN_NONE;
+}
+
+/** .. method:: cache_prepare(statements: str, *, prepare_flags: int = 0, explain: int = -1) -> int
+
+Prepares *statements* and places them in the :ref:`statement cache
+<statementcache>` without running them, so that a later
+:meth:`execute` of the same text with the same *prepare_flags* and
+*explain* is a cache hit.  Use this to warm up the cache of a new
+connection with queries you know will be run.  Returns how many
+statements were prepared.
+
+Any errors, such as a table not existing yet, are raised just as
+:meth:`execute` would.  Statements are prepared in order, so if more
+are supplied than the cache size then the earliest are evicted.
+
+.. seealso::
+
+  * :class:`apsw.ext.StatementWarmer`
+  * :meth:`cache_stats`
+*/
+static PyObject *
+Connection_cache_prepare(PyObject *self_, PyObject *const *fast_args, Py_ssize_t fast_nargs, PyObject *fast_kwnames)
+{
+  Connection *self = (Connection *)self_;
+  PyObject *statements;
+  int prepare_flags = 0, explain = -1, res = SQLITE_OK;
+  long count = 0;
+  APSWStatementOptions options;
+  APSWStatement *statement;
+
+  CHECK_CLOSED(self, NULL);
+
+  {
+    Connection_cache_prepare_CHECK;
+    ARG_PROLOG(1, Connection_cache_prepare_KWNAMES);
+    ARG_MANDATORY ARG_PyUnicode(statements);
+    ARG_OPTIONAL ARG_int(prepare_flags);
+    ARG_OPTIONAL ARG_int(explain);
+    ARG_EPILOG(NULL, Connection_cache_prepare_USAGE, );
+  }
+
+  ASYNC_FASTCALL(self, Connection_cache_prepare);
+
+  options.can_cache = 1;
+  options.prepare_flags = prepare_flags;
+  options.explain = explain;
+
+  DBMUTEX_ENSURE(self);
+  statement = statementcache_prepare(self->stmtcache, statements, &options);
+  if (statement)
+  {
+    count++;
+    while (res == SQLITE_OK && statementcache_hasmore(statement))
+    {
+      res = statementcache_next(self->stmtcache, &statement);
+      if (res == SQLITE_OK)
+        count++;
+    }
+    if (res == SQLITE_OK)
+      res = statementcache_finalize(self->stmtcache, statement);
+    SET_EXC(res, self->db);
+  }
+  sqlite3_mutex_leave(self->dbmutex);
+
+  if (PyErr_Occurred())
+  {
+    AddTraceBackHere(__FILE__, __LINE__, "Connection.cache_prepare", "{s: O}", "statements", statements);
+    return NULL;
+  }
+  return PyLong_FromLong(count);
 }
 
 /** .. method:: table_exists(dbname: str | None, table_name: str) -> bool
@@ -7027,6 +7307,8 @@ static PyMethodDef Connection_methods[] = {
   { "load_extension", (PyCFunction)Connection_load_extension, METH_FASTCALL | METH_KEYWORDS,
     Connection_load_extension_DOC },
 #endif
+  { "create_columns_table", (PyCFunction)Connection_create_columns_table, METH_FASTCALL | METH_KEYWORDS,
+    Connection_create_columns_table_DOC },
   { "create_module", (PyCFunction)Connection_create_module, METH_FASTCALL | METH_KEYWORDS,
     Connection_create_module_DOC },
   { "overload_function", (PyCFunction)Connection_overload_function, METH_FASTCALL | METH_KEYWORDS,
@@ -7062,6 +7344,10 @@ static PyMethodDef Connection_methods[] = {
   { "execute", (PyCFunction)Connection_execute, METH_FASTCALL | METH_KEYWORDS, Connection_execute_DOC },
   { "executemany", (PyCFunction)Connection_executemany, METH_FASTCALL | METH_KEYWORDS, Connection_executemany_DOC },
   { "cache_stats", (PyCFunction)Connection_cache_stats, METH_FASTCALL | METH_KEYWORDS, Connection_cache_stats_DOC },
+  { "cache_resize", (PyCFunction)Connection_cache_resize, METH_FASTCALL | METH_KEYWORDS,
+    Connection_cache_resize_DOC },
+  { "cache_prepare", (PyCFunction)Connection_cache_prepare, METH_FASTCALL | METH_KEYWORDS,
+    Connection_cache_prepare_DOC },
   { "table_exists", (PyCFunction)Connection_table_exists, METH_FASTCALL | METH_KEYWORDS, Connection_table_exists_DOC },
   { "column_metadata", (PyCFunction)Connection_column_metadata, METH_FASTCALL | METH_KEYWORDS,
     Connection_column_metadata_DOC },
@@ -7183,6 +7469,14 @@ async_get_controller_from_connection(PyObject *connection_)
   return connection->async_controller;
 }
 
+static void
+async_set_worker_thread(PyObject *connection_)
+{
+  assert(PyObject_TypeCheck(connection_, &ConnectionType));
+  Connection *connection = (Connection *)connection_;
+  connection->async_thread_id = PyThread_get_thread_ident();
+}
+
 #ifdef SQLITE_ENABLE_PREUPDATE_HOOK
 
 /** .. class:: PreUpdate
@@ -73,6 +73,15 @@ struct APSWCursor
   PyObject *emoriginalquery;
   APSWStatementOptions emoptions;
 
+  /* executemany with columns instead of emiter.  emcolumns has the
+     PySequence_Fast of each column, or None if it is a buffer in
+     emviews */
+  PyObject *emcolumns;
+  Py_buffer *emviews;
+  int *emkinds;
+  Py_ssize_t emrow;
+  Py_ssize_t emrows;
+
   /* tracing functions */
   PyObject *exectrace;
   PyObject *rowtrace;
@@ -92,6 +101,13 @@ struct APSWCursor
   /* next entry to fill */
   int aiter_tail;
 
+  /* adaptive prefetch - zero budget means a fixed aiter_slots_allocated rows */
+  Py_ssize_t aiter_budget;
+  /* rows to fetch next time */
+  int aiter_batch;
+  /* most rows to fetch at once */
+  int aiter_max;
+
   PyObject **aiter_slots;
 
   /* weak reference support */
@@ -153,6 +169,141 @@ static PyTypeObject APSWCursorType;
     }                                                                                                                  \
   } while (0)
 
+/* item types for columns in executemany */
+#define EMCOLUMN_SEQUENCE 0
+#define EMCOLUMN_INT32 1
+#define EMCOLUMN_INT64 2
+#define EMCOLUMN_DOUBLE 3
+
+static void
+APSWCursor_emcolumns_clear(APSWCursor *self)
+{
+  if (self->emviews && self->emcolumns)
+  {
+    Py_ssize_t ncolumns = PyTuple_GET_SIZE(self->emcolumns);
+    for (Py_ssize_t i = 0; i < ncolumns; i++)
+      if (self->emviews[i].obj)
+        PyBuffer_Release(&self->emviews[i]);
+  }
+  PyMem_Free(self->emviews);
+  self->emviews = NULL;
+  PyMem_Free(self->emkinds);
+  self->emkinds = NULL;
+  Py_CLEAR(self->emcolumns);
+  self->emrow = self->emrows = 0;
+}
+
+/* sets up emcolumns from the tuple of columns.  0 on success, -1 on error */
+static int
+APSWCursor_emcolumns_init(APSWCursor *self, PyObject *columns)
+{
+  Py_ssize_t ncolumns, i, length;
+
+  assert(!self->emcolumns);
+
+  if (!PyTuple_Check(columns))
+  {
+    PyErr_Format(PyExc_TypeError, "Expected a tuple of columns, not %s", Py_TypeName(columns));
+    return -1;
+  }
+  ncolumns = PyTuple_GET_SIZE(columns);
+  if (!ncolumns)
+  {
+    PyErr_Format(PyExc_ValueError, "At least one column must be supplied");
+    return -1;
+  }
+
+  self->emcolumns = PyTuple_New(ncolumns);
+  self->emviews = PyMem_Calloc(ncolumns, sizeof(Py_buffer));
+  self->emkinds = PyMem_Calloc(ncolumns, sizeof(int));
+  if (!self->emcolumns || !self->emviews || !self->emkinds)
+  {
+    if (!PyErr_Occurred())
+      PyErr_NoMemory();
+    goto error;
+  }
+
+  for (i = 0; i < ncolumns; i++)
+  {
+    PyObject *column = PyTuple_GET_ITEM(columns, i);
+    if (PyObject_CheckBuffer(column))
+    {
+      Py_buffer *view = &self->emviews[i];
+      if (0 != PyObject_GetBuffer(column, view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS))
+        goto error;
+      if ((view->itemsize == 4 || view->itemsize == 8)
+          && (0 == strcmp(view->format, "i") || 0 == strcmp(view->format, "l") || 0 == strcmp(view->format, "q")))
+        self->emkinds[i] = (view->itemsize == 4) ? EMCOLUMN_INT32 : EMCOLUMN_INT64;
+      else if (view->itemsize == 8 && 0 == strcmp(view->format, "d"))
+        self->emkinds[i] = EMCOLUMN_DOUBLE;
+      else
+      {
+        PyErr_Format(PyExc_ValueError, "Column #%zd buffer format \"%s\" size %zd is not a 32 or 64 bit integer or double",
+                     i, view->format, view->itemsize);
+        goto error;
+      }
+      /* see carray for why this is checked */
+      unsigned align = ((uintptr_t)view->buf)
+                       % ((self->emkinds[i] == EMCOLUMN_INT32)   ? APSW_ALIGNOF(int)
+                          : (self->emkinds[i] == EMCOLUMN_INT64) ? APSW_ALIGNOF(sqlite3_int64)
+                                                                 : APSW_ALIGNOF(double));
+      if (align)
+      {
+        PyErr_Format(PyExc_ValueError, "Column #%zd data is at %p which is not aligned, misaligned at %u", i,
+                     view->buf, align);
+        goto error;
+      }
+      length = view->len / view->itemsize;
+      PyTuple_SET_ITEM(self->emcolumns, i, Py_NewRef(Py_None));
+    }
+    else
+    {
+      PyObject *sequence = PySequence_Fast(column, "Expected each column to be a sequence or buffer");
+      if (!sequence)
+        goto error;
+      length = PySequence_Fast_GET_SIZE(sequence);
+      PyTuple_SET_ITEM(self->emcolumns, i, sequence);
+    }
+    if (i == 0)
+      self->emrows = length;
+    else if (length != self->emrows)
+    {
+      PyErr_Format(PyExc_ValueError, "Column #%zd has %zd items while column #0 has %zd", i, length, self->emrows);
+      goto error;
+    }
+  }
+  self->emrow = 0;
+  return 0;
+
+error:
+  assert(PyErr_Occurred());
+  APSWCursor_emcolumns_clear(self);
+  return -1;
+}
+
+/* returns new reference to value at the current row in emcolumns */
+static PyObject *
+APSWCursor_emcolumns_value(APSWCursor *self, Py_ssize_t column)
+{
+  PyObject *sequence = PyTuple_GET_ITEM(self->emcolumns, column);
+  Py_buffer *view = &self->emviews[column];
+
+  switch (self->emkinds[column])
+  {
+  case EMCOLUMN_INT32:
+    return PyLong_FromLong(((int *)view->buf)[self->emrow]);
+  case EMCOLUMN_INT64:
+    return PyLong_FromLongLong(((sqlite3_int64 *)view->buf)[self->emrow]);
+  case EMCOLUMN_DOUBLE:
+    return PyFloat_FromDouble(((double *)view->buf)[self->emrow]);
+  }
+  /* the sequence could have been modified */
+  if (self->emrow >= PySequence_Fast_GET_SIZE(sequence))
+    return PyErr_Format(PyExc_ValueError, "Column #%zd was changed and no longer has %zd items", column,
+                        self->emrows);
+  return Py_NewRef(PySequence_Fast_GET_ITEM(sequence, self->emrow));
+}
+
 /* Do finalization and free resources.  Returns the SQLITE error code.  If force is 2 then don't raise any exceptions */
 static int
 resetcursor(APSWCursor *self, int force)
@@ -218,8 +369,16 @@ resetcursor(APSWCursor *self, int force)
     }
   }
 
+  if (!force && self->status != C_DONE && self->emcolumns && self->emrow + 1 < self->emrows)
+  {
+    if (!PyErr_Occurred())
+      PyErr_Format(ExcIncomplete, "Error: The values for executemany were not fully consumed");
+    res = SQLITE_ERROR;
+  }
+
   Py_CLEAR(self->emiter);
   Py_CLEAR(self->emoriginalquery);
+  APSWCursor_emcolumns_clear(self);
 
   self->status = C_DONE;
 
@@ -360,6 +519,7 @@ APSWCursor_tp_traverse(PyObject *self_, visitproc visit, void *arg)
   Py_VISIT(self->convert_jsonb);
   Py_VISIT(self->emiter);
   Py_VISIT(self->emoriginalquery);
+  Py_VISIT(self->emcolumns);
   for (int i = self->aiter_head; i < self->aiter_tail; i++)
     Py_VISIT(self->aiter_slots[i]);
   return 0;
@@ -839,6 +999,67 @@ APSWCursor_dobinding(APSWCursor *self, int arg, PyObject *obj)
   return 0;
 }
 
+/* internal function - bindings from the current row of executemany columns */
+static int
+APSWCursor_dobindings_columns(APSWCursor *self)
+{
+  int nargs, arg, res = SQLITE_OK;
+  Py_ssize_t column, ncolumns = PyTuple_GET_SIZE(self->emcolumns);
+  sqlite3_stmt *stmt = self->statement->vdbestatement;
+
+  nargs = stmt ? sqlite3_bind_parameter_count(stmt) : 0;
+
+  if ((statementcache_hasmore(self->statement) && ncolumns - self->bindingsoffset < nargs)
+      || (!statementcache_hasmore(self->statement) && ncolumns - self->bindingsoffset != nargs))
+  {
+    PyErr_Format(ExcBindings,
+                 "Incorrect number of bindings supplied.  The current statement uses %d and there are %d columns.  "
+                 "Current offset is %d",
+                 nargs, (int)ncolumns, (int)(self->bindingsoffset));
+    return -1;
+  }
+
+  /* nb sqlite starts bind args at one not zero */
+  for (arg = 1; arg <= nargs; arg++)
+  {
+    column = arg - 1 + self->bindingsoffset;
+    switch (self->emkinds[column])
+    {
+    case EMCOLUMN_INT32:
+      res = sqlite3_bind_int64(stmt, arg, ((int *)self->emviews[column].buf)[self->emrow]);
+      break;
+    case EMCOLUMN_INT64:
+      res = sqlite3_bind_int64(stmt, arg, ((sqlite3_int64 *)self->emviews[column].buf)[self->emrow]);
+      break;
+    case EMCOLUMN_DOUBLE:
+      res = sqlite3_bind_double(stmt, arg, ((double *)self->emviews[column].buf)[self->emrow]);
+      break;
+    default:
+    {
+      PyObject *obj = APSWCursor_emcolumns_value(self, column);
+      if (!obj)
+        return -1;
+      res = APSWCursor_dobinding(self, arg, obj);
+      Py_DECREF(obj);
+      if (res)
+      {
+        assert(PyErr_Occurred());
+        return -1;
+      }
+      continue;
+    }
+    }
+    if (res != SQLITE_OK)
+    {
+      SET_EXC(res, self->connection->db);
+      return -1;
+    }
+  }
+
+  self->bindingsoffset += nargs;
+  return 0;
+}
+
 /* internal function */
 static int
 APSWCursor_dobindings(APSWCursor *self)
@@ -853,6 +1074,9 @@ APSWCursor_dobindings(APSWCursor *self)
   if (Py_Is(self->bindings, apsw_cursor_null_bindings))
     return 0;
 
+  if (self->emcolumns)
+    return APSWCursor_dobindings_columns(self);
+
   nargs = self->statement->vdbestatement ? sqlite3_bind_parameter_count(self->statement->vdbestatement) : 0;
   if (nargs == 0 && !self->bindings)
     return 0; /* common case, no bindings needed or supplied */
@@ -980,7 +1204,23 @@ APSWCursor_do_exec_trace(APSWCursor *self, Py_ssize_t savedbindingsoffset)
     goto error_out;
 
   /* now deal with the bindings */
-  if (self->bindings)
+  if (self->emcolumns)
+  {
+    bindings = PyTuple_New(self->bindingsoffset - savedbindingsoffset);
+    if (!bindings)
+      goto error_out;
+    for (Py_ssize_t i = savedbindingsoffset; i < self->bindingsoffset; i++)
+    {
+      PyObject *value = APSWCursor_emcolumns_value(self, i);
+      if (!value)
+      {
+        Py_DECREF(bindings);
+        goto error_out;
+      }
+      PyTuple_SET_ITEM(bindings, i - savedbindingsoffset, value);
+    }
+  }
+  else if (self->bindings)
   {
     if (APSWCursor_is_dict_binding(self->bindings))
     {
@@ -1147,7 +1387,7 @@ APSWCursor_step(APSWCursor *self)
       PyObject *next;
 
       /* in executemany mode ?*/
-      if (!self->emiter)
+      if (!self->emiter && !self->emcolumns)
       {
         /* no more so we finalize */
         res = resetcursor(self, 0);
@@ -1155,6 +1395,21 @@ APSWCursor_step(APSWCursor *self)
         return 0;
       }
 
+      if (self->emcolumns)
+      {
+        self->emrow++;
+        if (self->emrow == self->emrows)
+        {
+          res = resetcursor(self, 0);
+          assert(res == SQLITE_OK);
+          return 0;
+        }
+        statementcache_finalize(self->connection->stmtcache, self->statement);
+        self->statement = NULL;
+        self->bindingsoffset = 0;
+        goto restart_statement;
+      }
+
       /* we are in executemany mode */
       next = PyIter_Next(self->emiter);
       if (PyErr_Occurred())
@@ -1195,11 +1450,12 @@ APSWCursor_step(APSWCursor *self)
       assert(self->bindings);
     }
 
+  restart_statement:
     /* finalise and go again */
     if (!self->statement)
     {
       /* we are going again in executemany mode */
-      assert(self->emiter);
+      assert(self->emiter || self->emcolumns);
       self->statement = statementcache_prepare(self->connection->stmtcache, self->emoriginalquery, &self->emoptions);
       res = (self->statement) ? SQLITE_OK : SQLITE_ERROR;
     }
@@ -1387,7 +1643,7 @@ error_out:
   return NULL;
 }
 
-/** .. method:: executemany(statements: str, sequenceofbindings: Iterable[Bindings], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1) -> Cursor
+/** .. method:: executemany(statements: str, sequenceofbindings: Iterable[Bindings] | tuple[Sequence[SQLiteValue] | Buffer, ...], *, can_cache: bool = True, prepare_flags: int = 0, explain: int = -1, columns: bool = False) -> Cursor
 
   This method is for when you want to execute the same statements over
   a sequence of bindings.  Conceptually it does this::
@@ -1399,6 +1655,22 @@ error_out:
   statements can return data.  See :meth:`~Cursor.execute` for more
   information, and the :ref:`example <example_executemany>`.
 
+  If *columns* is True then *sequenceofbindings* must be a tuple
+  with one item per binding, each being all the values for that
+  binding.  All the columns must be the same length.  A column can be
+  a sequence of values, or a contiguous buffer of 32 or 64 bit
+  integers or doubles such as :class:`array.array` or a numpy array.
+  Values in buffers are bound directly without creating Python
+  objects.
+
+  .. code-block:: python
+
+    cursor.executemany("insert into samples values(?, ?, ?)",
+                       (sensor_names, array.array("q", timestamps), readings),
+                       columns=True)
+
+  This avoids creating a tuple for each row, only for it to be
+  unpacked again.
 */
 
 static PyObject *
@@ -1413,6 +1685,7 @@ APSWCursor_executemany(PyObject *self_, PyObject *const *fast_args, Py_ssize_t f
   int can_cache = 1;
   int prepare_flags = 0;
   int explain = -1;
+  int columns = 0;
 
   CHECK_CURSOR_CLOSED(NULL);
 
@@ -1424,6 +1697,7 @@ APSWCursor_executemany(PyObject *self_, PyObject *const *fast_args, Py_ssize_t f
     ARG_OPTIONAL ARG_bool(can_cache);
     ARG_OPTIONAL ARG_int(prepare_flags);
     ARG_OPTIONAL ARG_int(explain);
+    ARG_OPTIONAL ARG_bool(columns);
     ARG_EPILOG(NULL, Cursor_executemany_USAGE, );
   }
 
@@ -1445,9 +1719,24 @@ APSWCursor_executemany(PyObject *self_, PyObject *const *fast_args, Py_ssize_t f
 
   assert(!self->bindings);
   assert(!self->emiter);
+  assert(!self->emcolumns);
   assert(!self->emoriginalquery);
   assert(self->status == C_DONE);
 
+  if (columns)
+  {
+    if (APSWCursor_emcolumns_init(self, sequenceofbindings))
+      goto error_out;
+    if (!self->emrows)
+    {
+      APSWCursor_emcolumns_clear(self);
+      self->in_query = 0;
+      sqlite3_mutex_leave(self->connection->dbmutex);
+      return Py_NewRef((PyObject *)self);
+    }
+    goto prepare;
+  }
+
   self->emiter = PyObject_GetIter(sequenceofbindings);
   if (!self->emiter)
     goto error_out;
@@ -1479,6 +1768,7 @@ APSWCursor_executemany(PyObject *self_, PyObject *const *fast_args, Py_ssize_t f
       goto error_out;
   }
 
+prepare:
   self->emoptions.can_cache = can_cache;
   self->emoptions.prepare_flags = prepare_flags;
   self->emoptions.explain = explain;
@@ -1700,12 +1990,36 @@ APSWCursor_next(PyObject *self_)
   return APSWCursor_next_internal(self_, 1);
 }
 
+/* approximate memory used by a result row, for the adaptive prefetch
+   budget */
+static Py_ssize_t
+aiter_row_size(PyObject *row)
+{
+  if (!PyTuple_CheckExact(row))
+    return 64;
+
+  Py_ssize_t size = (Py_ssize_t)sizeof(PyTupleObject);
+  for (Py_ssize_t i = 0; i < PyTuple_GET_SIZE(row); i++)
+  {
+    PyObject *item = PyTuple_GET_ITEM(row, i);
+    size += (Py_ssize_t)sizeof(PyObject *) + 32;
+    if (PyBytes_CheckExact(item))
+      size += PyBytes_GET_SIZE(item);
+    else if (PyUnicode_CheckExact(item))
+      size += PyUnicode_GET_LENGTH(item) * PyUnicode_KIND(item);
+  }
+  return size;
+}
+
 static PyObject *
 APSWCursor_async_next_fill(PyObject *self_)
 {
   APSWCursor *self = (APSWCursor *)self_;
   CHECK_CURSOR_CLOSED(NULL);
 
+  int limit;
+  Py_ssize_t fetched_bytes;
+
   assert(IN_WORKER_THREAD(self->connection));
 
 again:
@@ -1751,8 +2065,27 @@ again:
   }
 
   self->aiter_head = self->aiter_tail = 0;
+  fetched_bytes = 0;
+
+  limit = self->aiter_slots_allocated;
+  if (self->aiter_budget)
+  {
+    limit = self->aiter_batch;
+    if (limit > self->aiter_slots_allocated)
+    {
+      PyObject **new_slots = PyMem_Resize(self->aiter_slots, PyObject *, limit);
+      if (!new_slots)
+      {
+        PyErr_NoMemory();
+        return NULL;
+      }
+      self->aiter_slots = new_slots;
+      self->aiter_slots_allocated = limit;
+    }
+  }
 
-  while (self->aiter_tail < self->aiter_slots_allocated && self->aiter_state == AIter_On)
+  while (self->aiter_tail < limit && self->aiter_state == AIter_On
+         && (!self->aiter_budget || fetched_bytes < self->aiter_budget))
   {
     PyObject *next_value = APSWCursor_next_internal(self_, self->aiter_head == self->aiter_tail);
 
@@ -1792,6 +2125,18 @@ again:
 
     self->aiter_slots[self->aiter_tail] = next_value;
     self->aiter_tail++;
+    if (self->aiter_budget)
+      fetched_bytes += aiter_row_size(next_value);
+  }
+
+  if (self->aiter_budget && self->aiter_state == AIter_On)
+  {
+    /* the consumer used all the previous rows so fetch more next
+       time, unless the budget is what stopped us */
+    if (fetched_bytes >= self->aiter_budget)
+      self->aiter_batch = Py_MAX(1, self->aiter_tail);
+    else
+      self->aiter_batch = Py_MIN(self->aiter_max, self->aiter_batch * 2);
   }
   goto again;
 }
@@ -1876,8 +2221,26 @@ APSWCursor_aiter(PyObject *self_)
   self->aiter_head = self->aiter_tail = 0;
 
   int slots_desired = 64;
+  Py_ssize_t budget = 0;
 
   PyObject *desired = NULL;
+  if (0 != PyContextVar_Get(async_cursor_prefetch_bytes_context_var, NULL, &desired))
+    return NULL;
+  assert(desired);
+  if (Py_IsNone(desired))
+    Py_XDECREF(desired);
+  else
+  {
+    budget = PyLong_AsSsize_t(desired);
+    Py_DECREF(desired);
+    if (budget == -1 && PyErr_Occurred())
+      return NULL;
+    if (budget < 1)
+      budget = 1;
+    slots_desired = 65536;
+  }
+
+  desired = NULL;
   if (0 != PyContextVar_Get(async_cursor_prefetch_context_var, NULL, &desired))
     return NULL;
   assert(desired);
@@ -1895,6 +2258,15 @@ APSWCursor_aiter(PyObject *self_)
       slots_desired = 65536;
   }
 
+  self->aiter_budget = budget;
+  if (budget)
+  {
+    /* start small so the first rows arrive quickly, with the slots
+       grown as needed in APSWCursor_async_next_fill */
+    self->aiter_max = slots_desired;
+    self->aiter_batch = slots_desired = Py_MIN(8, slots_desired);
+  }
+
   if (slots_desired != self->aiter_slots_allocated)
   {
     PyObject **new_slots = PyMem_Resize(self->aiter_slots, PyObject *, slots_desired);
@@ -2064,6 +2436,1065 @@ APSWCursor_fetchone(PyObject *self_, PyObject *unused)
   return res;
 }
 
+/** .. method:: fetch_columns(count: int = -1) -> tuple[list[SQLiteValue], ...]
+
+  Returns up to *count* of the remaining result rows in columnar
+  form, as a tuple with one list per result column.  A negative
+  *count* means all remaining rows.  An empty tuple is returned when
+  there are no more rows.
+
+  .. code-block:: python
+
+    cursor.execute("select x, y from points")
+    xs, ys = cursor.fetch_columns()
+
+  This avoids creating a tuple per row, which is most of the work
+  when fetching many rows with few columns, and is the layout wanted
+  by numeric and dataframe libraries.
+
+  If the SQL consisted of multiple statements, then fetching stops at
+  the end of a statement if the next one has a different number of
+  columns.  The next call continues with that statement.
+
+  Row tracers are not called when using this method.
+
+  .. seealso::
+
+    * :meth:`fetchall`
+    * :attr:`get`
+*/
+static PyObject *
+APSWCursor_fetch_columns(PyObject *self_, PyObject *const *fast_args, Py_ssize_t fast_nargs, PyObject *fast_kwnames)
+{
+  APSWCursor *self = (APSWCursor *)self_;
+  PyObject *retval = NULL, *item;
+  int count = -1, numcols = -1, i;
+
+  CHECK_CURSOR_CLOSED(NULL);
+
+  {
+    Cursor_fetch_columns_CHECK;
+    ARG_PROLOG(1, Cursor_fetch_columns_KWNAMES);
+    ARG_OPTIONAL ARG_int(count);
+    ARG_EPILOG(NULL, Cursor_fetch_columns_USAGE, );
+  }
+
+  ASYNC_FASTCALL(self->connection, APSWCursor_fetch_columns);
+
+  if (0 != cursor_mutex_get(self))
+    return NULL;
+
+  while (count != 0)
+  {
+    if (self->status == C_BEGIN || self->status == C_END_OF_STATEMENT)
+    {
+      do
+      {
+        if (APSWCursor_step(self))
+          goto error;
+      } while (self->status == C_END_OF_STATEMENT);
+    }
+
+    if (self->status == C_DONE)
+      break;
+
+    assert(self->status == C_ROW);
+
+    if (!retval)
+    {
+      numcols = sqlite3_data_count(self->statement->vdbestatement);
+      retval = PyTuple_New(numcols);
+      if (!retval)
+        goto error;
+      for (i = 0; i < numcols; i++)
+      {
+        item = PyList_New(0);
+        if (!item)
+          goto error;
+        PyTuple_SET_ITEM(retval, i, item);
+      }
+    }
+    else if (numcols != sqlite3_data_count(self->statement->vdbestatement))
+      break;
+
+    self->status = C_BEGIN;
+
+    for (i = 0; i < numcols; i++)
+    {
+      item = convert_column_to_pyobject(self, i);
+      if (!item)
+        goto error;
+      if (0 != PyList_Append(PyTuple_GET_ITEM(retval, i), item))
+      {
+        Py_DECREF(item);
+        goto error;
+      }
+      Py_DECREF(item);
+    }
+
+    if (count > 0)
+      count--;
+  }
+
+  self->in_query = 0;
+  sqlite3_mutex_leave(self->connection->dbmutex);
+
+  if (!retval)
+    return PyTuple_New(0);
+  return retval;
+
+error:
+  Py_XDECREF(retval);
+  assert(PyErr_Occurred());
+
+  self->in_query = 0;
+  sqlite3_mutex_leave(self->connection->dbmutex);
+  return NULL;
+}
+
+/* item types for fetch_into */
+#define FETCH_INTO_SKIP 0
+#define FETCH_INTO_INT64 1
+#define FETCH_INTO_DOUBLE 2
+
+/** .. method:: fetch_into(buffers: Sequence[Buffer | None]) -> int
+
+  Fills caller supplied numeric arrays with the remaining result rows,
+  without creating a Python object per value.  This is the result
+  side equivalent of :meth:`apsw.carray`.
+
+  There must be one item in *buffers* per result column.  Each is
+  either ``None`` to ignore that column, or a writable contiguous
+  buffer such as :class:`array.array`, :class:`memoryview`, or a
+  numpy array.  The buffer format must be 64 bit integers (``q``,
+  ``l``, ``i`` of size 8) or doubles (``d``).  Rows are stored until
+  there are no more rows, or the smallest buffer is full.  The number
+  of rows stored is returned.
+
+  .. code-block:: python
+
+    when = array.array("q", [0]) * 10_000
+    reading = array.array("d", [0]) * 10_000
+
+    cursor.execute("select ts, reading from samples")
+    while (count := cursor.fetch_into((when, reading))):
+      process(when[:count], reading[:count])
+
+  Integer buffers require integer values.  Double buffers accept
+  integer and float values, with null stored as NaN.  Any other value
+  results in :exc:`TypeError`, and the row is not consumed so it can
+  be fetched by other means.  If rows have already been stored by the
+  call then their count is returned instead, with the next call
+  raising the exception.
+
+  If the SQL consisted of multiple statements, then fetching stops at
+  the end of a statement if the next one has a different number of
+  columns.
+
+  Row tracers are not called when using this method.
+
+  .. seealso::
+
+    * :meth:`fetch_columns`
+*/
+static PyObject *
+APSWCursor_fetch_into(PyObject *self_, PyObject *const *fast_args, Py_ssize_t fast_nargs, PyObject *fast_kwnames)
+{
+  APSWCursor *self = (APSWCursor *)self_;
+  PyObject *buffers = NULL, *sequence = NULL;
+  Py_buffer *views = NULL;
+  int *kinds = NULL;
+  Py_ssize_t nbuffers = 0, i, capacity = PY_SSIZE_T_MAX, count = 0;
+  int have_mutex = 0, coltype = SQLITE_NULL;
+
+  CHECK_CURSOR_CLOSED(NULL);
+
+  {
+    Cursor_fetch_into_CHECK;
+    ARG_PROLOG(1, Cursor_fetch_into_KWNAMES);
+    ARG_MANDATORY ARG_pyobject(buffers);
+    ARG_EPILOG(NULL, Cursor_fetch_into_USAGE, );
+  }
+
+  ASYNC_FASTCALL(self->connection, APSWCursor_fetch_into);
+
+  sequence = PySequence_Fast(buffers, "expected a sequence for " Cursor_fetch_into_USAGE);
+  if (!sequence)
+    goto finally;
+
+  nbuffers = PySequence_Fast_GET_SIZE(sequence);
+  views = PyMem_Calloc(nbuffers + 1, sizeof(Py_buffer));
+  kinds = PyMem_Calloc(nbuffers + 1, sizeof(int));
+  if (!views || !kinds)
+  {
+    PyErr_NoMemory();
+    goto finally;
+  }
+
+  for (i = 0; i < nbuffers; i++)
+  {
+    PyObject *item = PySequence_Fast_GET_ITEM(sequence, i);
+    if (Py_IsNone(item))
+      continue;
+    if (0 != PyObject_GetBuffer(item, &views[i], PyBUF_WRITABLE | PyBUF_FORMAT | PyBUF_C_CONTIGUOUS))
+      goto finally;
+    if (views[i].itemsize == 8
+        && (0 == strcmp(views[i].format, "i") || 0 == strcmp(views[i].format, "l")
+            || 0 == strcmp(views[i].format, "q")))
+      kinds[i] = FETCH_INTO_INT64;
+    else if (views[i].itemsize == 8 && 0 == strcmp(views[i].format, "d"))
+      kinds[i] = FETCH_INTO_DOUBLE;
+    else
+    {
+      PyErr_Format(PyExc_ValueError, "Buffer #%zd format \"%s\" size %zd is not a 64 bit integer or double", i,
+                   views[i].format, views[i].itemsize);
+      goto finally;
+    }
+    /* see carray for why this is checked */
+    unsigned align = ((uintptr_t)views[i].buf)
+                     % ((kinds[i] == FETCH_INTO_INT64) ? APSW_ALIGNOF(sqlite3_int64) : APSW_ALIGNOF(double));
+    if (align)
+    {
+      PyErr_Format(PyExc_ValueError, "Buffer #%zd data is at %p which is not aligned, misaligned at %u", i,
+                   views[i].buf, align);
+      goto finally;
+    }
+    capacity = Py_MIN(capacity, views[i].len / 8);
+  }
+
+  if (0 != cursor_mutex_get(self))
+    goto finally;
+  have_mutex = 1;
+
+  while (count < capacity)
+  {
+    if (self->status == C_BEGIN || self->status == C_END_OF_STATEMENT)
+    {
+      do
+      {
+        if (APSWCursor_step(self))
+          goto finally;
+      } while (self->status == C_END_OF_STATEMENT);
+    }
+
+    if (self->status == C_DONE)
+      break;
+
+    assert(self->status == C_ROW);
+
+    if (nbuffers != sqlite3_data_count(self->statement->vdbestatement))
+    {
+      if (count)
+        break;
+      PyErr_Format(PyExc_ValueError, "%zd buffers supplied but the query has %d columns", nbuffers,
+                   sqlite3_data_count(self->statement->vdbestatement));
+      goto finally;
+    }
+
+    /* check all values first so a bad row is left unconsumed */
+    for (i = 0; i < nbuffers; i++)
+    {
+      coltype = sqlite3_column_type(self->statement->vdbestatement, i);
+      if (kinds[i] == FETCH_INTO_SKIP || coltype == SQLITE_INTEGER
+          || (kinds[i] == FETCH_INTO_DOUBLE && (coltype == SQLITE_FLOAT || coltype == SQLITE_NULL)))
+        continue;
+      break;
+    }
+    if (i != nbuffers)
+    {
+      /* return what we have so far, and the next call gets the error */
+      if (count)
+        break;
+      PyErr_Format(PyExc_TypeError, "Column %zd has a %s value which can't be stored in a %s buffer", i,
+                   (coltype == SQLITE_FLOAT)  ? "float"
+                   : (coltype == SQLITE_TEXT) ? "text"
+                   : (coltype == SQLITE_BLOB) ? "blob"
+                                              : "null",
+                   (kinds[i] == FETCH_INTO_INT64) ? "int64" : "double");
+      goto finally;
+    }
+
+    self->status = C_BEGIN;
+
+    for (i = 0; i < nbuffers; i++)
+    {
+      switch (kinds[i])
+      {
+      case FETCH_INTO_INT64:
+        ((sqlite3_int64 *)views[i].buf)[count] = sqlite3_column_int64(self->statement->vdbestatement, i);
+        break;
+      case FETCH_INTO_DOUBLE:
+        ((double *)views[i].buf)[count] = (sqlite3_column_type(self->statement->vdbestatement, i) == SQLITE_NULL)
+                                              ? Py_NAN
+                                              : sqlite3_column_double(self->statement->vdbestatement, i);
+        break;
+      }
+    }
+    count++;
+  }
+
+finally:
+  if (have_mutex)
+  {
+    self->in_query = 0;
+    sqlite3_mutex_leave(self->connection->dbmutex);
+  }
+  if (views)
+    for (i = 0; i < nbuffers; i++)
+      if (views[i].obj)
+        PyBuffer_Release(&views[i]);
+  PyMem_Free(views);
+  PyMem_Free(kinds);
+  Py_XDECREF(sequence);
+
+  if (PyErr_Occurred())
+    return NULL;
+  return PyLong_FromSsize_t(count);
+}
+
+/* Arrow C data and stream interfaces.  These definitions are copied
+   from https://arrow.apache.org/docs/format/CDataInterface.html and
+   https://arrow.apache.org/docs/format/CStreamInterface.html which
+   say to do so. */
+#ifndef ARROW_C_DATA_INTERFACE
+#define ARROW_C_DATA_INTERFACE
+
+#define ARROW_FLAG_DICTIONARY_ORDERED 1
+#define ARROW_FLAG_NULLABLE 2
+#define ARROW_FLAG_MAP_KEYS_SORTED 4
+
+struct ArrowSchema
+{
+  const char *format;
+  const char *name;
+  const char *metadata;
+  int64_t flags;
+  int64_t n_children;
+  struct ArrowSchema **children;
+  struct ArrowSchema *dictionary;
+  void (*release)(struct ArrowSchema *);
+  void *private_data;
+};
+
+struct ArrowArray
+{
+  int64_t length;
+  int64_t null_count;
+  int64_t offset;
+  int64_t n_buffers;
+  int64_t n_children;
+  const void **buffers;
+  struct ArrowArray **children;
+  struct ArrowArray *dictionary;
+  void (*release)(struct ArrowArray *);
+  void *private_data;
+};
+
+#endif /* ARROW_C_DATA_INTERFACE */
+
+#ifndef ARROW_C_STREAM_INTERFACE
+#define ARROW_C_STREAM_INTERFACE
+
+struct ArrowArrayStream
+{
+  int (*get_schema)(struct ArrowArrayStream *, struct ArrowSchema *out);
+  int (*get_next)(struct ArrowArrayStream *, struct ArrowArray *out);
+  const char *(*get_last_error)(struct ArrowArrayStream *);
+  void (*release)(struct ArrowArrayStream *);
+  void *private_data;
+};
+
+#endif /* ARROW_C_STREAM_INTERFACE */
+
+/* column types in the arrow stream, decided by the first non-null
+   value, or the declared type if the first batch only has nulls */
+enum
+{
+  ARROW_KIND_UNKNOWN,
+  ARROW_KIND_INT64,
+  ARROW_KIND_DOUBLE,
+  ARROW_KIND_UTF8,
+  ARROW_KIND_BINARY,
+};
+
+static const char *const arrow_kind_format[] = { "n", "l", "g", "U", "Z" };
+static const char *const arrow_kind_name[] = { "null", "int64", "double", "large_utf8", "large_binary" };
+
+/* uses the column affinity rules from
+   https://sqlite.org/datatype3.html#determination_of_column_affinity
+   with numeric going to double */
+static int
+arrow_decltype_kind(const char *decltype)
+{
+  if (!decltype || !*decltype)
+    return ARROW_KIND_BINARY;
+  if (0 == sqlite3_strlike("%INT%", decltype, 0))
+    return ARROW_KIND_INT64;
+  if (0 == sqlite3_strlike("%CHAR%", decltype, 0) || 0 == sqlite3_strlike("%CLOB%", decltype, 0)
+      || 0 == sqlite3_strlike("%TEXT%", decltype, 0))
+    return ARROW_KIND_UTF8;
+  if (0 == sqlite3_strlike("%BLOB%", decltype, 0))
+    return ARROW_KIND_BINARY;
+  return ARROW_KIND_DOUBLE;
+}
+
+/* the memory for one column of one batch.  Everything is allocated
+   with sqlite3_malloc because release can be called in any thread
+   without the GIL */
+typedef struct
+{
+  const void *buffers[3];
+  uint8_t *validity;
+  /* int64 or double values, or int64 offsets */
+  int64_t *values;
+  unsigned char *data;
+  sqlite3_int64 data_len, data_allocated;
+  int64_t null_count;
+} ArrowColumn;
+
+typedef struct
+{
+  APSWCursor *cursor;
+  int ncols;
+  int *kinds;
+  /* kinds from the declared types */
+  int *decl_kinds;
+  char **names;
+  int batch_rows;
+  /* a batch has been made so kinds are known */
+  int started;
+  /* no more batches */
+  int done;
+  /* first batch made to determine kinds in get_schema */
+  struct ArrowArray pending;
+  /* error to report on the next get_next, after returning the rows
+     before it */
+  char *pending_error;
+  char *last_error;
+} ArrowStreamPrivate;
+
+static char *
+arrow_strdup(const char *s)
+{
+  return sqlite3_mprintf("%s", s);
+}
+
+static void
+arrow_column_free(ArrowColumn *col)
+{
+  if (col)
+  {
+    sqlite3_free(col->validity);
+    sqlite3_free(col->values);
+    sqlite3_free(col->data);
+    sqlite3_free(col);
+  }
+}
+
+static void
+arrow_child_array_release(struct ArrowArray *array)
+{
+  arrow_column_free((ArrowColumn *)array->private_data);
+  array->release = NULL;
+}
+
+static void
+arrow_array_release(struct ArrowArray *array)
+{
+  for (int64_t i = 0; array->children && i < array->n_children; i++)
+  {
+    if (array->children[i])
+    {
+      if (array->children[i]->release)
+        array->children[i]->release(array->children[i]);
+      sqlite3_free(array->children[i]);
+    }
+  }
+  sqlite3_free(array->children);
+  sqlite3_free(array->private_data);
+  array->release = NULL;
+}
+
+static void
+arrow_schema_release(struct ArrowSchema *schema)
+{
+  for (int64_t i = 0; schema->children && i < schema->n_children; i++)
+  {
+    if (schema->children[i])
+    {
+      if (schema->children[i]->release)
+        schema->children[i]->release(schema->children[i]);
+      sqlite3_free(schema->children[i]);
+    }
+  }
+  sqlite3_free(schema->children);
+  sqlite3_free((char *)schema->name);
+  schema->release = NULL;
+}
+
+static void
+arrow_child_schema_release(struct ArrowSchema *schema)
+{
+  sqlite3_free((char *)schema->name);
+  schema->release = NULL;
+}
+
+/* sets last_error from the current Python exception, clearing it */
+static void
+arrow_stream_set_error_from_python(ArrowStreamPrivate *priv)
+{
+  PY_ERR_FETCH(exc);
+  PY_ERR_NORMALIZE(exc);
+  PyObject *str = exc ? PyObject_Str(exc) : NULL;
+  const char *msg = str ? PyUnicode_AsUTF8(str) : NULL;
+
+  sqlite3_free(priv->last_error);
+  priv->last_error = sqlite3_mprintf("%s: %s", exc ? Py_TypeName(exc) : "Error", msg ? msg : "(unknown)");
+  PyErr_Clear();
+  Py_XDECREF(str);
+  PY_ERR_CLEAR(exc);
+}
+
+/* Is the value at column i acceptable to its kind?  Returns 0 if
+   so, else an error message from sqlite3_mprintf (NULL for no
+   memory is handled by the caller treating it as an error too) */
+static char *
+arrow_check_value(ArrowStreamPrivate *priv, int i, int coltype, int *ok)
+{
+  int kind = priv->kinds[i];
+  *ok = 1;
+  if (coltype == SQLITE_NULL || kind == ARROW_KIND_UNKNOWN || kind == ARROW_KIND_BINARY
+      || (kind == ARROW_KIND_INT64 && coltype == SQLITE_INTEGER)
+      || (kind == ARROW_KIND_DOUBLE && (coltype == SQLITE_INTEGER || coltype == SQLITE_FLOAT))
+      || (kind == ARROW_KIND_UTF8 && coltype != SQLITE_BLOB))
+    return NULL;
+  *ok = 0;
+  return sqlite3_mprintf("TypeError: Column %d (%s) has a %s value which can't be stored as Arrow %s", i,
+                         priv->names[i],
+                         (coltype == SQLITE_INTEGER) ? "integer"
+                         : (coltype == SQLITE_FLOAT) ? "float"
+                         : (coltype == SQLITE_TEXT)  ? "text"
+                                                     : "blob",
+                         arrow_kind_name[kind]);
+}
+
+static int
+arrow_column_append_data(ArrowColumn *col, const void *data, int len)
+{
+  if (col->data_len + len > col->data_allocated)
+  {
+    sqlite3_int64 size = Py_MAX(col->data_allocated * 2, col->data_len + len + 1024);
+    unsigned char *new_data = sqlite3_realloc64(col->data, size);
+    if (!new_data)
+      return -1;
+    col->data = new_data;
+    col->data_allocated = size;
+  }
+  if (len)
+    memcpy(col->data + col->data_len, data, len);
+  col->data_len += len;
+  return 0;
+}
+
+/* Fills out with the next batch of rows.  Returns 0 on success, -1
+   with a Python exception, or 1 with priv->last_error set */
+static int
+arrow_make_batch(ArrowStreamPrivate *priv, struct ArrowArray *out)
+{
+  APSWCursor *self = priv->cursor;
+  ArrowColumn **cols = NULL;
+  struct ArrowArray **children = NULL;
+  const void **top_buffers = NULL;
+  int have_mutex = 0, res = -1, i, ncols = priv->ncols;
+  int64_t rows = 0;
+  sqlite3_uint64 validity_size = ((sqlite3_uint64)priv->batch_rows + 7) / 8,
+                 values_size = sizeof(int64_t) * ((sqlite3_uint64)priv->batch_rows + 1);
+
+  memset(out, 0, sizeof(*out));
+  priv->started = 1;
+
+  CHECK_CURSOR_CLOSED(-1);
+  if (!IN_WORKER_THREAD(self->connection))
+  {
+    error_sync_in_async_context();
+    return -1;
+  }
+
+  cols = sqlite3_malloc64(sizeof(ArrowColumn *) * (ncols + 1));
+  if (!cols)
+    goto nomem;
+  memset(cols, 0, sizeof(ArrowColumn *) * (ncols + 1));
+  for (i = 0; i < ncols; i++)
+  {
+    cols[i] = sqlite3_malloc64(sizeof(ArrowColumn));
+    if (!cols[i])
+      goto nomem;
+    memset(cols[i], 0, sizeof(ArrowColumn));
+    cols[i]->validity = sqlite3_malloc64(validity_size);
+    cols[i]->values = sqlite3_malloc64(values_size);
+    if (!cols[i]->validity || !cols[i]->values)
+      goto nomem;
+    memset(cols[i]->validity, 0, validity_size);
+    memset(cols[i]->values, 0, values_size);
+    /* variable length data must have a buffer even if empty */
+    if (arrow_column_append_data(cols[i], NULL, 0))
+      goto nomem;
+  }
+
+  if (!priv->done)
+  {
+    if (0 != cursor_mutex_get(self))
+      goto finally;
+    have_mutex = 1;
+  }
+
+  while (!priv->done && rows < priv->batch_rows)
+  {
+    if (self->status == C_BEGIN || self->status == C_END_OF_STATEMENT)
+    {
+      do
+      {
+        if (APSWCursor_step(self))
+          goto finally;
+      } while (self->status == C_END_OF_STATEMENT);
+    }
+
+    if (self->status == C_DONE || ncols != sqlite3_data_count(self->statement->vdbestatement))
+    {
+      priv->done = 1;
+      break;
+    }
+
+    assert(self->status == C_ROW);
+    sqlite3_stmt *stmt = self->statement->vdbestatement;
+
+    /* check all values first so a bad row is left unconsumed */
+    for (i = 0; i < ncols; i++)
+    {
+      int ok;
+      char *msg = arrow_check_value(priv, i, sqlite3_column_type(stmt, i), &ok);
+      if (!ok)
+      {
+        priv->done = 1;
+        if (!msg)
+          goto nomem;
+        sqlite3_free(priv->pending_error);
+        priv->pending_error = msg;
+        break;
+      }
+    }
+    if (priv->done)
+      break;
+
+    self->status = C_BEGIN;
+
+    for (i = 0; i < ncols; i++)
+    {
+      ArrowColumn *col = cols[i];
+      int coltype = sqlite3_column_type(stmt, i);
+
+      if (coltype == SQLITE_NULL)
+      {
+        col->null_count++;
+        col->values[rows + 1] = col->values[rows];
+        continue;
+      }
+
+      if (priv->kinds[i] == ARROW_KIND_UNKNOWN)
+        priv->kinds[i] = (coltype == SQLITE_INTEGER) ? ARROW_KIND_INT64
+                         : (coltype == SQLITE_FLOAT) ? ARROW_KIND_DOUBLE
+                         : (coltype == SQLITE_TEXT)  ? ARROW_KIND_UTF8
+                                                     : ARROW_KIND_BINARY;
+
+      col->validity[rows / 8] |= (uint8_t)(1 << (rows % 8));
+
+      switch (priv->kinds[i])
+      {
+      case ARROW_KIND_INT64:
+        col->values[rows] = sqlite3_column_int64(stmt, i);
+        break;
+      case ARROW_KIND_DOUBLE: {
+        double d = sqlite3_column_double(stmt, i);
+        memcpy(&col->values[rows], &d, sizeof(d));
+        break;
+      }
+      case ARROW_KIND_UTF8: {
+        const unsigned char *text = sqlite3_column_text(stmt, i);
+        if (!text || arrow_column_append_data(col, text, sqlite3_column_bytes(stmt, i)))
+          goto nomem;
+        col->values[rows + 1] = col->data_len;
+        break;
+      }
+      case ARROW_KIND_BINARY: {
+        const void *blob = sqlite3_column_blob(stmt, i);
+        int len = sqlite3_column_bytes(stmt, i);
+        if ((!blob && len) || arrow_column_append_data(col, blob, len))
+          goto nomem;
+        col->values[rows + 1] = col->data_len;
+        break;
+      }
+      }
+    }
+    rows++;
+  }
+
+  if (have_mutex)
+  {
+    self->in_query = 0;
+    sqlite3_mutex_leave(self->connection->dbmutex);
+    have_mutex = 0;
+  }
+
+  if (!rows && priv->pending_error)
+  {
+    sqlite3_free(priv->last_error);
+    priv->last_error = priv->pending_error;
+    priv->pending_error = NULL;
+    res = 1;
+    goto finally;
+  }
+
+  /* columns with only nulls in the first batch use the declared type */
+  for (i = 0; i < ncols; i++)
+    if (priv->kinds[i] == ARROW_KIND_UNKNOWN)
+      priv->kinds[i] = priv->decl_kinds[i];
+
+  children = sqlite3_malloc64(sizeof(struct ArrowArray *) * (ncols + 1));
+  top_buffers = sqlite3_malloc64(sizeof(void *));
+  if (!children || !top_buffers)
+    goto nomem;
+  memset(children, 0, sizeof(struct ArrowArray *) * (ncols + 1));
+  top_buffers[0] = NULL;
+
+  for (i = 0; i < ncols; i++)
+  {
+    ArrowColumn *col = cols[i];
+    struct ArrowArray *child = children[i] = sqlite3_malloc64(sizeof(struct ArrowArray));
+    if (!child)
+      goto nomem;
+    memset(child, 0, sizeof(*child));
+    child->length = rows;
+    child->null_count = col->null_count;
+    col->buffers[0] = col->null_count ? col->validity : NULL;
+    switch (priv->kinds[i])
+    {
+    case ARROW_KIND_INT64:
+    case ARROW_KIND_DOUBLE:
+      col->buffers[1] = col->values;
+      child->n_buffers = 2;
+      break;
+    default:
+      col->buffers[1] = col->values;
+      col->buffers[2] = col->data;
+      child->n_buffers = 3;
+      break;
+    }
+    child->buffers = col->buffers;
+    child->release = arrow_child_array_release;
+    child->private_data = col;
+    /* now owned by child */
+    cols[i] = NULL;
+  }
+
+  out->length = rows;
+  out->n_buffers = 1;
+  out->buffers = top_buffers;
+  out->n_children = ncols;
+  out->children = children;
+  out->private_data = (void *)top_buffers;
+  out->release = arrow_array_release;
+  children = NULL;
+  top_buffers = NULL;
+  res = 0;
+  goto finally;
+
+nomem:
+  if (!PyErr_Occurred())
+    PyErr_NoMemory();
+  priv->done = 1;
+  res = -1;
+
+finally:
+  if (have_mutex)
+  {
+    self->in_query = 0;
+    sqlite3_mutex_leave(self->connection->dbmutex);
+  }
+  if (children)
+  {
+    for (i = 0; i < ncols; i++)
+      if (children[i])
+      {
+        arrow_column_free((ArrowColumn *)children[i]->private_data);
+        sqlite3_free(children[i]);
+      }
+    sqlite3_free(children);
+  }
+  sqlite3_free(top_buffers);
+  if (cols)
+  {
+    for (i = 0; i < ncols; i++)
+      arrow_column_free(cols[i]);
+    sqlite3_free(cols);
+  }
+  if (res < 0)
+    priv->done = 1;
+  return res;
+}
+
+static int
+arrow_stream_get_schema(struct ArrowArrayStream *stream, struct ArrowSchema *out)
+{
+  ArrowStreamPrivate *priv = (ArrowStreamPrivate *)stream->private_data;
+  int res = 0, i;
+  PyGILState_STATE gilstate = PyGILState_Ensure();
+
+  memset(out, 0, sizeof(*out));
+
+  /* the column kinds come from the data */
+  if (!priv->started && !priv->done)
+  {
+    res = arrow_make_batch(priv, &priv->pending);
+    if (res < 0)
+      arrow_stream_set_error_from_python(priv);
+    if (res)
+    {
+      res = EIO;
+      goto end;
+    }
+  }
+  /* kinds of a stream without rows */
+  for (i = 0; i < priv->ncols; i++)
+    if (priv->kinds[i] == ARROW_KIND_UNKNOWN)
+      priv->kinds[i] = priv->decl_kinds[i];
+
+  out->format = "+s";
+  out->name = arrow_strdup("");
+  out->n_children = priv->ncols;
+  out->children = sqlite3_malloc64(sizeof(struct ArrowSchema *) * (priv->ncols + 1));
+  out->release = arrow_schema_release;
+  if (!out->name || !out->children)
+    goto nomem;
+  memset(out->children, 0, sizeof(struct ArrowSchema *) * (priv->ncols + 1));
+
+  for (i = 0; i < priv->ncols; i++)
+  {
+    struct ArrowSchema *child = out->children[i] = sqlite3_malloc64(sizeof(struct ArrowSchema));
+    if (!child)
+      goto nomem;
+    memset(child, 0, sizeof(*child));
+    child->format = arrow_kind_format[priv->kinds[i]];
+    child->name = arrow_strdup(priv->names[i]);
+    child->flags = ARROW_FLAG_NULLABLE;
+    child->release = arrow_child_schema_release;
+    if (!child->name)
+      goto nomem;
+  }
+  goto end;
+
+nomem:
+  arrow_schema_release(out);
+  sqlite3_free(priv->last_error);
+  priv->last_error = NULL;
+  res = ENOMEM;
+
+end:
+  PyGILState_Release(gilstate);
+  return res;
+}
+
+static int
+arrow_stream_get_next(struct ArrowArrayStream *stream, struct ArrowArray *out)
+{
+  ArrowStreamPrivate *priv = (ArrowStreamPrivate *)stream->private_data;
+  int res = 0;
+  PyGILState_STATE gilstate = PyGILState_Ensure();
+
+  if (priv->pending.release)
+  {
+    *out = priv->pending;
+    priv->pending.release = NULL;
+  }
+  else
+  {
+    res = arrow_make_batch(priv, out);
+    if (res < 0)
+      arrow_stream_set_error_from_python(priv);
+    if (res)
+      res = EIO;
+    /* an empty batch is the end of the stream */
+    else if (out->length == 0)
+      out->release(out);
+  }
+
+  PyGILState_Release(gilstate);
+  return res;
+}
+
+static const char *
+arrow_stream_get_last_error(struct ArrowArrayStream *stream)
+{
+  return ((ArrowStreamPrivate *)stream->private_data)->last_error;
+}
+
+static void
+arrow_stream_release(struct ArrowArrayStream *stream)
+{
+  ArrowStreamPrivate *priv = (ArrowStreamPrivate *)stream->private_data;
+  PyGILState_STATE gilstate = PyGILState_Ensure();
+
+  if (priv->pending.release)
+    priv->pending.release(&priv->pending);
+  Py_CLEAR(priv->cursor);
+  if (priv->names)
+    for (int i = 0; i < priv->ncols; i++)
+      sqlite3_free(priv->names[i]);
+  sqlite3_free(priv->names);
+  sqlite3_free(priv->kinds);
+  sqlite3_free(priv->decl_kinds);
+  sqlite3_free(priv->pending_error);
+  sqlite3_free(priv->last_error);
+  sqlite3_free(priv);
+  stream->release = NULL;
+
+  PyGILState_Release(gilstate);
+}
+
+static void
+arrow_stream_capsule_destructor(PyObject *capsule)
+{
+  struct ArrowArrayStream *stream = PyCapsule_GetPointer(capsule, "arrow_array_stream");
+  if (!stream)
+  {
+    PyErr_Clear();
+    return;
+  }
+  if (stream->release)
+    stream->release(stream);
+  sqlite3_free(stream);
+}
+
+/** .. method:: __arrow_c_stream__(requested_schema: object | None = None, *, batch_rows: int = 65536) -> object
+
+  Provides the remaining result rows as `Arrow
+  <https://arrow.apache.org>`__ record batches using the `PyCapsule
+  interface
+  <https://arrow.apache.org/docs/format/CDataInterface/PyCapsuleInterface.html>`__.
+  Values are copied directly from SQLite into Arrow buffers without
+  creating Python objects, and without needing any Arrow library
+  installed.  Libraries like pyarrow, polars, and duckdb can consume
+  the cursor directly.
+
+  .. code-block:: python
+
+    cursor.execute("select id, name, score from results")
+    table = pyarrow.RecordBatchReader.from_stream(cursor).read_all()
+
+  Each column's Arrow type comes from the first non-null value -
+  int64, double, large_utf8, or large_binary.  A column of only nulls
+  in the first batch uses its declared type instead, following
+  SQLite's `affinity rules
+  <https://sqlite.org/datatype3.html#determination_of_column_affinity>`__
+  with NUMERIC as double, and large_binary for expressions and columns
+  without a declared type.  Integers are also accepted in
+  double columns, and numbers in text columns are converted to text.
+  Blob columns accept any value.  Other values end the stream with an
+  error, leaving the row unconsumed.  Use `CAST
+  <https://sqlite.org/lang_expr.html#castexpr>`__ in your query to
+  control the types.
+
+  *requested_schema* is ignored.  Rows are not fetched until the
+  stream is read, and the cursor should not be used for anything else
+  until then.  If the SQL consisted of multiple statements, then the
+  stream ends at a statement with a different number of columns.
+
+  Row tracers are not called.  This is not available in async mode,
+  but can be used in :meth:`Connection.async_run`.
+
+  .. seealso::
+
+    * :meth:`fetch_columns`
+    * :meth:`fetch_into`
+*/
+static PyObject *
+APSWCursor_arrow_c_stream(PyObject *self_, PyObject *const *fast_args, Py_ssize_t fast_nargs,
+                          PyObject *fast_kwnames)
+{
+  APSWCursor *self = (APSWCursor *)self_;
+  PyObject *requested_schema = NULL, *capsule = NULL;
+  int batch_rows = 65536, i;
+  struct ArrowArrayStream *stream = NULL;
+  ArrowStreamPrivate *priv = NULL;
+
+  CHECK_CURSOR_CLOSED(NULL);
+
+  if (!IN_WORKER_THREAD(self->connection))
+    return error_sync_in_async_context();
+
+  {
+    Cursor_arrow_c_stream_CHECK;
+    ARG_PROLOG(1, Cursor_arrow_c_stream_KWNAMES);
+    ARG_OPTIONAL ARG_pyobject(requested_schema);
+    ARG_OPTIONAL ARG_int(batch_rows);
+    ARG_EPILOG(NULL, Cursor_arrow_c_stream_USAGE, );
+  }
+  (void)requested_schema;
+
+  if (batch_rows < 1)
+    return PyErr_Format(PyExc_ValueError, "batch_rows must be at least 1, not %d", batch_rows);
+
+  stream = sqlite3_malloc64(sizeof(struct ArrowArrayStream));
+  priv = sqlite3_malloc64(sizeof(ArrowStreamPrivate));
+  if (!stream || !priv)
+    goto nomem;
+  memset(stream, 0, sizeof(*stream));
+  memset(priv, 0, sizeof(*priv));
+  stream->private_data = priv;
+  stream->get_schema = arrow_stream_get_schema;
+  stream->get_next = arrow_stream_get_next;
+  stream->get_last_error = arrow_stream_get_last_error;
+  stream->release = arrow_stream_release;
+
+  priv->cursor = (APSWCursor *)Py_NewRef(self_);
+  priv->batch_rows = batch_rows;
+  if (self->statement && self->status != C_DONE)
+    priv->ncols = sqlite3_column_count(self->statement->vdbestatement);
+  else
+    priv->done = 1;
+
+  priv->kinds = sqlite3_malloc64(sizeof(int) * (priv->ncols + 1));
+  priv->decl_kinds = sqlite3_malloc64(sizeof(int) * (priv->ncols + 1));
+  priv->names = sqlite3_malloc64(sizeof(char *) * (priv->ncols + 1));
+  if (!priv->kinds || !priv->decl_kinds || !priv->names)
+    goto nomem;
+  memset(priv->kinds, 0, sizeof(int) * (priv->ncols + 1));
+  memset(priv->decl_kinds, 0, sizeof(int) * (priv->ncols + 1));
+  memset(priv->names, 0, sizeof(char *) * (priv->ncols + 1));
+  for (i = 0; i < priv->ncols; i++)
+  {
+    const char *name = sqlite3_column_name(self->statement->vdbestatement, i);
+    priv->names[i] = arrow_strdup(name ? name : "");
+    if (!priv->names[i])
+      goto nomem;
+    priv->decl_kinds[i] = arrow_decltype_kind(sqlite3_column_decltype(self->statement->vdbestatement, i));
+  }
+
+  capsule = PyCapsule_New(stream, "arrow_array_stream", arrow_stream_capsule_destructor);
+  if (capsule)
+    return capsule;
+  goto error;
+
+nomem:
+  PyErr_NoMemory();
+error:
+  if (stream && stream->release)
+    stream->release(stream);
+  else
+    sqlite3_free(priv);
+  sqlite3_free(stream);
+  return NULL;
+}
+
 /** .. attribute:: convert_binding
   :type: ConvertBinding | None
 
@@ -2604,6 +4035,11 @@ static PyMethodDef APSWCursor_methods[] = {
   { "aclose", (PyCFunction)APSWCursor_aclose, METH_FASTCALL | METH_KEYWORDS, Cursor_aclose_DOC },
   { "fetchall", (PyCFunction)APSWCursor_fetchall, METH_NOARGS, Cursor_fetchall_DOC },
   { "fetchone", (PyCFunction)APSWCursor_fetchone, METH_NOARGS, Cursor_fetchone_DOC },
+  { "fetch_columns", (PyCFunction)APSWCursor_fetch_columns, METH_FASTCALL | METH_KEYWORDS,
+    Cursor_fetch_columns_DOC },
+  { "fetch_into", (PyCFunction)APSWCursor_fetch_into, METH_FASTCALL | METH_KEYWORDS, Cursor_fetch_into_DOC },
+  { "__arrow_c_stream__", (PyCFunction)APSWCursor_arrow_c_stream, METH_FASTCALL | METH_KEYWORDS,
+    Cursor_arrow_c_stream_DOC },
 #ifndef APSW_OMIT_OLD_NAMES
   { Cursor_set_exec_trace_OLDNAME, (PyCFunction)APSWCursor_set_exec_trace, METH_FASTCALL | METH_KEYWORDS,
     Cursor_set_exec_trace_OLDDOC },
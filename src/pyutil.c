@@ -139,6 +139,37 @@ PyWeakref_GetRef(PyObject *ref, PyObject **pobj)
 }
 #endif
 
+#if PY_VERSION_HEX < 0x030d0000
+/* earlier versions only have private API so we use the platform
+   monotonic clock instead, in nanoseconds */
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <time.h>
+#endif
+
+typedef long long PyTime_t;
+
+#undef PyTime_PerfCounterRaw
+static int
+PyTime_PerfCounterRaw(PyTime_t *result)
+{
+#ifdef _WIN32
+  LARGE_INTEGER counter, frequency;
+  QueryPerformanceCounter(&counter);
+  QueryPerformanceFrequency(&frequency);
+  /* whole seconds separately to avoid overflow */
+  *result = (counter.QuadPart / frequency.QuadPart) * 1000000000LL
+            + (counter.QuadPart % frequency.QuadPart) * 1000000000LL / frequency.QuadPart;
+#else
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  *result = (PyTime_t)ts.tv_sec * 1000000000LL + ts.tv_nsec;
+#endif
+  return 0;
+}
+#endif
+
 /* some we made up in the same spirit*/
 static void
 Py_TpFree(PyObject *o)
@@ -31,6 +31,18 @@
    A copy of the query has to be kept around for doing equality
    comparisons when looking in the cache.  But sqlite also keeps a
    copy of the query, so we try to use that if possible.
+
+   The linear search stops being cheap once the cache has hundreds of
+   entries, so larger caches also maintain an index of hash buckets
+   with a chain of entries per bucket.  Each entry can only be in one
+   bucket so the chain links are a parallel array to hashes.
+
+   The cache can be resized, and in adaptive mode does so itself.  It
+   grows as soon as enough misses were for queries that had been
+   evicted, and shrinks if most entries went unused over
+   SC_ADAPT_WINDOW lookups.  Evicted queries are remembered by hash in
+   a direct mapped table (collisions overwrite) so checking a miss is
+   a single probe.
 */
 
 typedef struct APSWStatementOptions
@@ -50,7 +62,10 @@ typedef struct APSWStatement
                                   (the utf8 could have more than one query) */
   Py_hash_t hash;              /* hash of all of utf8 */
   APSWStatementOptions options;
-  unsigned uses; /* how many times the prepared statement has been (re)used */
+  unsigned uses;              /* how many times the prepared statement has been (re)used */
+  unsigned evictions;         /* how many times this query was evicted then prepared again */
+  PyTime_t prepare_ns;        /* how long sqlite3_prepare_v3 took */
+  unsigned long long last_use; /* value of lookups when last used */
 } APSWStatement;
 
 /* recycle bin for APSWStatements to avoid repeated malloc/free calls */
@@ -76,6 +91,31 @@ typedef struct StatementCache
   unsigned misses;    /* not found in cache */
   unsigned no_vdbe;   /* no bytecode emitted */
   unsigned too_big;   /* query was bigger than SC_MAX_ITEM_SIZE */
+  unsigned reprepares; /* misses for a query that had been evicted */
+  unsigned long long lookups; /* hits plus misses including not cacheable */
+  PyTime_t prepare_ns;        /* total time in sqlite3_prepare_v3 */
+
+  /* hashes of recently evicted statements and how many times each has
+     been evicted, so we can tell when a miss is for an evicted query */
+  Py_hash_t *evicted_hashes;
+  unsigned *evicted_counts;
+  unsigned evicted_mask; /* number of slots - 1 */
+
+  /* hash index used instead of linear search for larger caches */
+  unsigned *index_heads; /* bucket -> first entry + 1, zero for empty */
+  unsigned *index_next;  /* entry -> next entry in same bucket + 1 */
+  unsigned index_mask;   /* number of buckets - 1 */
+
+  /* adaptive sizing, with adaptive_max zero meaning not adaptive */
+  unsigned adaptive_min;
+  unsigned adaptive_max;
+  unsigned resizes;                  /* how many times adaptive sizing changed the size */
+  unsigned long long window_lookups; /* lookups at start of current window */
+  unsigned window_reprepares;        /* reprepares at start of current window */
+
+  /* record prepare times and evicted queries, which adaptive sizing
+     also needs */
+  int track;
 } StatementCache;
 
 /* we don't bother caching larger than this many bytes */
@@ -84,6 +124,15 @@ typedef struct StatementCache
 /* the hash value we use for unoccupied */
 #define SC_SENTINEL_HASH (-1)
 
+/* maximum number of entries */
+#define SC_MAX_ENTRIES 512
+
+/* caches with at least this many entries use the hash index */
+#define SC_INDEX_MIN_ENTRIES 32
+
+/* how many lookups between adaptive sizing decisions */
+#define SC_ADAPT_WINDOW 1024
+
 static int
 statementcache_free_statement(StatementCache *sc, APSWStatement *s)
 {
@@ -107,6 +156,52 @@ statementcache_free_statement(StatementCache *sc, APSWStatement *s)
   return res;
 }
 
+static unsigned
+statementcache_mix(Py_hash_t hash, unsigned mask)
+{
+  Py_uhash_t h = (Py_uhash_t)hash;
+  return (unsigned)((h ^ (h >> 15)) & mask);
+}
+
+static unsigned
+statementcache_bucket(StatementCache *sc, Py_hash_t hash)
+{
+  return statementcache_mix(hash, sc->index_mask);
+}
+
+static void
+statementcache_index_add(StatementCache *sc, unsigned entry)
+{
+  unsigned bucket = statementcache_bucket(sc, sc->hashes[entry]);
+  sc->index_next[entry] = sc->index_heads[bucket];
+  sc->index_heads[bucket] = entry + 1;
+}
+
+static void
+statementcache_index_remove(StatementCache *sc, unsigned entry)
+{
+  unsigned *link = &sc->index_heads[statementcache_bucket(sc, sc->hashes[entry])];
+  while (*link != entry + 1)
+  {
+    assert(*link);
+    link = &sc->index_next[*link - 1];
+  }
+  *link = sc->index_next[entry];
+}
+
+static void
+statementcache_record_eviction(StatementCache *sc, APSWStatement *evictee)
+{
+  if (sc->evicted_hashes)
+  {
+    unsigned slot = statementcache_mix(evictee->hash, sc->evicted_mask);
+    sc->evicted_hashes[slot] = evictee->hash;
+    sc->evicted_counts[slot] = evictee->evictions + 1;
+  }
+  statementcache_free_statement(sc, evictee);
+  sc->evictions++;
+}
+
 static int
 statementcache_hasmore(APSWStatement *statement)
 {
@@ -121,7 +216,8 @@ statementcache_finalize(StatementCache *sc, APSWStatement *statement)
   if (!statement)
     return res;
 
-  if (sc && statement->hash != SC_SENTINEL_HASH)
+  /* maxentries can be zero if the cache was resized while the statement was in use */
+  if (sc && statement->hash != SC_SENTINEL_HASH && sc->maxentries)
   {
     APSWStatement *evictee = NULL;
 
@@ -140,18 +236,19 @@ statementcache_finalize(StatementCache *sc, APSWStatement *statement)
     {
       assert(sc->hashes[sc->next_eviction] != SC_SENTINEL_HASH);
       evictee = sc->caches[sc->next_eviction];
+      if (sc->index_heads)
+        statementcache_index_remove(sc, sc->next_eviction);
     }
     sc->hashes[sc->next_eviction] = statement->hash;
     sc->caches[sc->next_eviction] = statement;
+    if (sc->index_heads)
+      statementcache_index_add(sc, sc->next_eviction);
     sc->highest_used = Py_MAX(sc->highest_used, sc->next_eviction);
     sc->next_eviction++;
     if (sc->next_eviction == sc->maxentries)
       sc->next_eviction = 0;
     if (evictee)
-    {
-      statementcache_free_statement(sc, evictee);
-      sc->evictions++;
-    }
+      statementcache_record_eviction(sc, evictee);
   }
   else
   {
@@ -191,6 +288,191 @@ apsw_hash_bytes(void *data, Py_ssize_t nbytes)
   return (Py_hash_t)hash;
 }
 
+/* Changes the number of entries.  Existing entries are kept in
+   eviction order, with the oldest evicted if there is not enough
+   room.  The evicted table is only kept when tracking or adaptive, and
+   is sized for the adaptive maximum so it can still recognise queries
+   the cache would have kept had it been larger.  Returns 0 on success and -1 if out of memory in which case
+   the cache is unchanged. */
+static int
+statementcache_resize(StatementCache *sc, unsigned size)
+{
+  Py_hash_t *hashes = NULL, *evicted_hashes = NULL;
+  APSWStatement **caches = NULL, **old_caches = sc->caches;
+  unsigned *evicted_counts = NULL, *index_heads = NULL, *index_next = NULL;
+  unsigned i, buckets = 0, live = 0, kept = 0, evicted_slots = 0;
+  unsigned old_maxentries = sc->maxentries, old_next_eviction = sc->next_eviction;
+  int new_evicted;
+
+  if (size && (sc->track || sc->adaptive_max))
+    for (evicted_slots = 1; evicted_slots < Py_MAX(size, sc->adaptive_max) * 2; evicted_slots *= 2)
+      ;
+  new_evicted = evicted_slots != (sc->evicted_hashes ? sc->evicted_mask + 1 : 0);
+
+  if (size)
+  {
+    hashes = PyMem_Calloc(size, sizeof(Py_hash_t));
+    caches = PyMem_Calloc(size, sizeof(APSWStatement *));
+    if (new_evicted && evicted_slots)
+    {
+      evicted_hashes = PyMem_Calloc(evicted_slots, sizeof(Py_hash_t));
+      evicted_counts = PyMem_Calloc(evicted_slots, sizeof(unsigned));
+    }
+    if (size >= SC_INDEX_MIN_ENTRIES)
+    {
+      /* power of two at least twice the size keeps the chains short */
+      for (buckets = 1; buckets < size * 2; buckets *= 2)
+        ;
+      index_heads = PyMem_Calloc(buckets, sizeof(unsigned));
+      index_next = PyMem_Calloc(size, sizeof(unsigned));
+    }
+    if (!hashes || !caches || (new_evicted && evicted_slots && (!evicted_hashes || !evicted_counts))
+        || (size >= SC_INDEX_MIN_ENTRIES && (!index_heads || !index_next)))
+    {
+      PyMem_Free(hashes);
+      PyMem_Free(caches);
+      PyMem_Free(evicted_hashes);
+      PyMem_Free(evicted_counts);
+      PyMem_Free(index_heads);
+      PyMem_Free(index_next);
+      return -1;
+    }
+    for (i = 0; i < size; i++)
+      hashes[i] = SC_SENTINEL_HASH;
+    for (i = 0; new_evicted && i < evicted_slots; i++)
+      evicted_hashes[i] = SC_SENTINEL_HASH;
+  }
+
+  for (i = 0; i < old_maxentries; i++)
+    if (old_caches[i])
+      live++;
+
+  PyMem_Free(sc->hashes);
+  PyMem_Free(sc->index_heads);
+  PyMem_Free(sc->index_next);
+  sc->hashes = hashes;
+  sc->caches = caches;
+  sc->index_heads = index_heads;
+  sc->index_next = index_next;
+  sc->index_mask = buckets ? buckets - 1 : 0;
+  sc->maxentries = size;
+  if (new_evicted)
+  {
+    /* carry over what we remember */
+    for (i = 0; evicted_hashes && sc->evicted_hashes && i <= sc->evicted_mask; i++)
+      if (sc->evicted_hashes[i] != SC_SENTINEL_HASH)
+      {
+        unsigned slot = statementcache_mix(sc->evicted_hashes[i], evicted_slots - 1);
+        evicted_hashes[slot] = sc->evicted_hashes[i];
+        evicted_counts[slot] = sc->evicted_counts[i];
+      }
+    PyMem_Free(sc->evicted_hashes);
+    PyMem_Free(sc->evicted_counts);
+    sc->evicted_hashes = evicted_hashes;
+    sc->evicted_counts = evicted_counts;
+    sc->evicted_mask = evicted_slots ? evicted_slots - 1 : 0;
+  }
+
+  /* visit in eviction order which is oldest first */
+  for (i = 0; i < old_maxentries; i++)
+  {
+    APSWStatement *statement = old_caches[(old_next_eviction + i) % old_maxentries];
+    if (!statement)
+      continue;
+    if (live - kept > size)
+    {
+      live--;
+      if (size)
+        statementcache_record_eviction(sc, statement);
+      else
+      {
+        statementcache_free_statement(sc, statement);
+        sc->evictions++;
+      }
+      continue;
+    }
+    hashes[kept] = statement->hash;
+    caches[kept] = statement;
+    kept++;
+  }
+  PyMem_Free(old_caches);
+
+  sc->highest_used = kept ? kept - 1 : 0;
+  sc->next_eviction = (kept == size) ? 0 : kept;
+  if (index_heads)
+    for (i = 0; i < kept; i++)
+      statementcache_index_add(sc, i);
+  return 0;
+}
+
+/* how many reprepares in a window make adaptive mode grow the cache */
+static unsigned
+statementcache_adapt_threshold(StatementCache *sc)
+{
+  return Py_MIN(SC_ADAPT_WINDOW / 16, Py_MAX(8, sc->maxentries / 2));
+}
+
+/* called in adaptive mode every SC_ADAPT_WINDOW lookups, or sooner
+   once there have been enough reprepares */
+static void
+statementcache_adapt(StatementCache *sc)
+{
+  unsigned reprepares = sc->reprepares - sc->window_reprepares, used = 0, i, size = sc->maxentries;
+  unsigned long long window_start = sc->window_lookups;
+
+  sc->window_lookups = sc->lookups;
+  sc->window_reprepares = sc->reprepares;
+
+  if (reprepares >= statementcache_adapt_threshold(sc))
+    /* queries we had evicted keep coming back, so grow by at least as
+       many as came back */
+    size = Py_MIN(sc->adaptive_max, Py_MAX(size * 2, size + reprepares));
+  else if (reprepares == 0)
+  {
+    for (i = 0; sc->hashes && i <= sc->highest_used; i++)
+      if (sc->caches[i] && sc->caches[i]->last_use >= window_start)
+        used++;
+    /* less than a quarter of the entries were used */
+    if (used * 4 < sc->maxentries)
+      size = Py_MAX(sc->adaptive_min, size / 2);
+  }
+  if (size != sc->maxentries && 0 == statementcache_resize(sc, size))
+    sc->resizes++;
+}
+
+#define SC_NOT_FOUND ((unsigned)-1)
+
+static int
+statementcache_matches(StatementCache *sc, unsigned i, Py_hash_t hash, const char *utf8, Py_ssize_t utf8size,
+                       APSWStatementOptions *options)
+{
+  return sc->hashes[i] == hash && sc->caches[i]->utf8_size == utf8size
+         && 0 == memcmp(utf8, sc->caches[i]->utf8, utf8size)
+         && 0 == memcmp(&sc->caches[i]->options, options, sizeof(APSWStatementOptions));
+}
+
+/* returns which entry matches or SC_NOT_FOUND */
+static unsigned
+statementcache_find(StatementCache *sc, Py_hash_t hash, const char *utf8, Py_ssize_t utf8size,
+                    APSWStatementOptions *options)
+{
+  unsigned i;
+
+  if (sc->index_heads)
+  {
+    for (i = sc->index_heads[statementcache_bucket(sc, hash)]; i; i = sc->index_next[i - 1])
+      if (statementcache_matches(sc, i - 1, hash, utf8, utf8size, options))
+        return i - 1;
+  }
+  else
+  {
+    for (i = 0; i <= sc->highest_used; i++)
+      if (statementcache_matches(sc, i, hash, utf8, utf8size, options))
+        return i;
+  }
+  return SC_NOT_FOUND;
+}
+
 static int
 statementcache_prepare_internal(StatementCache *sc, const char *utf8, Py_ssize_t utf8size, PyObject *query,
                                 APSWStatement **statement_out, APSWStatementOptions *options)
@@ -203,34 +485,39 @@ statementcache_prepare_internal(StatementCache *sc, const char *utf8, Py_ssize_t
   int res = SQLITE_OK;
 
   *statement_out = NULL;
-  if (sc->maxentries && utf8size < SC_MAX_ITEM_SIZE && options->can_cache)
-  {
-    unsigned i;
+  if (sc->adaptive_max
+      && (sc->lookups - sc->window_lookups >= SC_ADAPT_WINDOW
+          || sc->reprepares - sc->window_reprepares >= statementcache_adapt_threshold(sc)))
+    statementcache_adapt(sc);
+  sc->lookups++;
+  /* the hash is needed even with no cache entries because the cache
+     can be resized while the statement is in use */
+  if (utf8size < SC_MAX_ITEM_SIZE && options->can_cache)
     hash = apsw_hash_bytes((void *)utf8, utf8size);
-
-    for (i = 0; i <= sc->highest_used; i++)
+  if (sc->maxentries && hash != SC_SENTINEL_HASH)
+  {
+    unsigned i = statementcache_find(sc, hash, utf8, utf8size, options);
+    if (i != SC_NOT_FOUND)
     {
-      if (sc->hashes[i] == hash && sc->caches[i]->utf8_size == utf8size
-          && 0 == memcmp(utf8, sc->caches[i]->utf8, utf8size)
-          && 0 == memcmp(&sc->caches[i]->options, options, sizeof(APSWStatementOptions)))
+      /* cache hit */
+      if (sc->index_heads)
+        statementcache_index_remove(sc, i);
+      sc->hashes[i] = SC_SENTINEL_HASH;
+      statement = sc->caches[i];
+      sc->caches[i] = NULL;
+      res = sqlite3_clear_bindings(statement->vdbestatement);
+      if (res)
       {
-        /* cache hit */
-        sc->hashes[i] = SC_SENTINEL_HASH;
-        statement = sc->caches[i];
-        sc->caches[i] = NULL;
-        res = sqlite3_clear_bindings(statement->vdbestatement);
-        if (res)
-        {
-          SET_EXC(res, sc->db);
-          statementcache_finalize(sc, statement);
-          return res;
-        }
-        *statement_out = statement;
-        statement->uses++;
-        sc->hits++;
-        assert(res == SQLITE_OK);
+        SET_EXC(res, sc->db);
+        statementcache_finalize(sc, statement);
         return res;
       }
+      *statement_out = statement;
+      statement->uses++;
+      statement->last_use = sc->lookups;
+      sc->hits++;
+      assert(res == SQLITE_OK);
+      return res;
     }
   }
   /* cache miss */
@@ -248,10 +535,17 @@ statementcache_prepare_internal(StatementCache *sc, const char *utf8, Py_ssize_t
      length passed to sqlite3_prepare_v3 */
 
   assert(0 == utf8[utf8size]);
+  PyTime_t prepare_start = 0, prepare_end = 0;
+  int track = sc->track;
   /* note that prepare can return ok while a python level exception occurred that couldn't be reported */
   Py_BEGIN_ALLOW_THREADS
+    if (track)
+      PyTime_PerfCounterRaw(&prepare_start);
     res = sqlite3_prepare_v3(sc->db, utf8, utf8size + 1, options->prepare_flags, &vdbestatement, &tail);
+    if (track)
+      PyTime_PerfCounterRaw(&prepare_end);
   Py_END_ALLOW_THREADS;
+  sc->prepare_ns += prepare_end - prepare_start;
   if (res != SQLITE_OK || PyErr_Occurred())
   {
     SET_EXC(res, sc->db);
@@ -315,8 +609,22 @@ statementcache_prepare_internal(StatementCache *sc, const char *utf8, Py_ssize_t
   statement->query_size = tail - utf8;
   statement->utf8_size = utf8size;
   statement->uses = 1;
+  statement->evictions = 0;
+  statement->prepare_ns = prepare_end - prepare_start;
+  statement->last_use = sc->lookups;
   memcpy(&statement->options, options, sizeof(APSWStatementOptions));
 
+  if (hash != SC_SENTINEL_HASH && sc->evicted_hashes)
+  {
+    unsigned slot = statementcache_mix(hash, sc->evicted_mask);
+    if (sc->evicted_hashes[slot] == hash)
+    {
+      statement->evictions = sc->evicted_counts[slot];
+      sc->evicted_hashes[slot] = SC_SENTINEL_HASH;
+      sc->reprepares++;
+    }
+  }
+
   if (vdbestatement && tail == orig_tail && !statementcache_hasmore(statement))
   {
     /* no subsequent queries, so use sqlite's copy of the utf8
@@ -406,6 +714,10 @@ statementcache_free(StatementCache *sc)
         }
     }
     PyMem_Free(sc->caches);
+    PyMem_Free(sc->evicted_hashes);
+    PyMem_Free(sc->evicted_counts);
+    PyMem_Free(sc->index_heads);
+    PyMem_Free(sc->index_next);
 #if SC_STATEMENT_RECYCLE_BIN_ENTRIES > 0
     while (sc->recycle_bin_next > 0)
     {
@@ -425,19 +737,8 @@ statementcache_init(sqlite3 *db, unsigned size)
   StatementCache *res;
   res = (StatementCache *)PyMem_Calloc(1, sizeof(StatementCache));
   if (res)
-  {
-    res->hashes = size ? PyMem_Calloc(size, sizeof(Py_hash_t)) : 0;
-    res->caches = size ? PyMem_Calloc(size, sizeof(APSWStatement *)) : 0;
-    res->maxentries = size;
     res->db = db;
-    if (res->hashes)
-    {
-      unsigned i;
-      for (i = 0; i <= res->highest_used; i++)
-        res->hashes[i] = SC_SENTINEL_HASH;
-    }
-  }
-  if (!res || (size && !res->hashes) || (size && !res->caches))
+  if (!res || statementcache_resize(res, size))
   {
     statementcache_free(res);
     res = NULL;
@@ -446,45 +747,71 @@ statementcache_init(sqlite3 *db, unsigned size)
   return res;
 }
 
+static int
+statementcache_uses_cmp(const void *left, const void *right)
+{
+  unsigned l = (*(APSWStatement *const *)left)->uses, r = (*(APSWStatement *const *)right)->uses;
+  /* descending order */
+  return (l < r) ? 1 : (l > r) ? -1 : 0;
+}
+
 static PyObject *
-statementcache_stats(StatementCache *sc, int include_entries)
+statementcache_stats(StatementCache *sc, int include_entries, int top)
 {
   /* Update the table of explanations in Connection_cache_stats if you
      update this */
   PyObject *res = NULL, *entries = NULL, *entry = NULL;
+  APSWStatement **stmts = NULL;
 
-  res = Py_BuildValue("{s: I, s: I, s: I, s: I, s: I, s: I, s: I, s: I, s: I}", "size", sc->maxentries, "evictions",
-                      sc->evictions, "no_cache", sc->no_cache, "hits", sc->hits, "no_vdbe", sc->no_vdbe, "misses",
-                      sc->misses, "too_big", sc->too_big, "no_cache", sc->no_cache, "max_cacheable_bytes",
-                      SC_MAX_ITEM_SIZE);
+  res = Py_BuildValue("{s: I, s: I, s: I, s: I, s: I, s: I, s: I, s: I, s: I, s: I, s: L, s: I}", "size",
+                      sc->maxentries, "evictions", sc->evictions, "no_cache", sc->no_cache, "hits", sc->hits,
+                      "no_vdbe", sc->no_vdbe, "misses", sc->misses, "too_big", sc->too_big, "no_cache", sc->no_cache,
+                      "max_cacheable_bytes", SC_MAX_ITEM_SIZE, "reprepares", sc->reprepares, "prepare_ns",
+                      (long long)sc->prepare_ns, "resizes", sc->resizes);
   if (res && include_entries)
   {
     int pycres;
+    unsigned i, count = 0;
+
     entries = PyList_New(0);
-    if (!entries)
+    stmts = PyMem_Calloc(sc->maxentries + 1, sizeof(APSWStatement *));
+    if (!entries || !stmts)
+    {
+      if (!PyErr_Occurred())
+        PyErr_NoMemory();
       goto fail;
+    }
 
-    unsigned i;
     for (i = 0; sc->hashes && i <= sc->highest_used; i++)
-    {
       if (sc->hashes[i] != SC_SENTINEL_HASH)
-      {
-        APSWStatement *stmt = sc->caches[i];
-        entry = Py_BuildValue("{s: s#, s: O, s: i, s: i, s: I}", "query", stmt->utf8, stmt->query_size, "has_more",
-                              (stmt->query_size == stmt->utf8_size) ? Py_False : Py_True, "prepare_flags",
-                              stmt->options.prepare_flags, "explain", stmt->options.explain, "uses", stmt->uses);
-        if (!entry)
-          goto fail;
-        pycres = PyList_Append(entries, entry);
-        if (pycres)
-          goto fail;
-        Py_CLEAR(entry);
-      }
+        stmts[count++] = sc->caches[i];
+
+    if (top >= 0)
+    {
+      qsort(stmts, count, sizeof(APSWStatement *), statementcache_uses_cmp);
+      count = Py_MIN(count, (unsigned)top);
+    }
+
+    for (i = 0; i < count; i++)
+    {
+      APSWStatement *stmt = stmts[i];
+      entry = Py_BuildValue("{s: s#, s: O, s: i, s: i, s: I, s: I, s: L, s: K}", "query", stmt->utf8,
+                            stmt->query_size, "has_more", (stmt->query_size == stmt->utf8_size) ? Py_False : Py_True,
+                            "prepare_flags", stmt->options.prepare_flags, "explain", stmt->options.explain, "uses",
+                            stmt->uses, "evictions", stmt->evictions, "prepare_ns", (long long)stmt->prepare_ns,
+                            "age", sc->lookups - stmt->last_use);
+      if (!entry)
+        goto fail;
+      pycres = PyList_Append(entries, entry);
+      if (pycres)
+        goto fail;
+      Py_CLEAR(entry);
     }
     pycres = PyDict_SetItemString(res, "entries", entries);
     if (pycres)
       goto fail;
     Py_DECREF(entries);
+    PyMem_Free(stmts);
   }
   return res;
 
@@ -492,5 +819,6 @@ fail:
   Py_XDECREF(entries);
   Py_XDECREF(res);
   Py_XDECREF(entry);
+  PyMem_Free(stmts);
   return NULL;
-}
\ No newline at end of file
+}
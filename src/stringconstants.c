@@ -46,6 +46,8 @@
 #undef UpdateChangeRow
 #undef UpdateDeleteRow
 #undef UpdateInsertRow
+#undef s_arrow_c_array
+#undef s_arrow_c_stream
 #undef s_module
 #undef _coro_for_exception
 #undef _coro_for_stopasynciteration
@@ -55,6 +57,7 @@
 #undef apsw_shell
 #undef async_controller
 #undef async_cursor_prefetch
+#undef async_cursor_prefetch_bytes
 #undef async_run_coro
 #undef can_cache
 #undef close
@@ -102,6 +105,7 @@
 #undef xOpen
 #undef xRandomness
 #undef xRead
+#undef xReadInto
 #undef xSectorSize
 #undef xSetSystemCall
 #undef xSleep
@@ -154,6 +158,8 @@ static struct _apsw_string_table
     PyObject *UpdateChangeRow;
     PyObject *UpdateDeleteRow;
     PyObject *UpdateInsertRow;
+    PyObject *s_arrow_c_array;
+    PyObject *s_arrow_c_stream;
     PyObject *s_module;
     PyObject *_coro_for_exception;
     PyObject *_coro_for_stopasynciteration;
@@ -163,6 +169,7 @@ static struct _apsw_string_table
     PyObject *apsw_shell;
     PyObject *async_controller;
     PyObject *async_cursor_prefetch;
+    PyObject *async_cursor_prefetch_bytes;
     PyObject *async_run_coro;
     PyObject *can_cache;
     PyObject *close;
@@ -210,6 +217,7 @@ static struct _apsw_string_table
     PyObject *xOpen;
     PyObject *xRandomness;
     PyObject *xRead;
+    PyObject *xReadInto;
     PyObject *xSectorSize;
     PyObject *xSetSystemCall;
     PyObject *xSleep;
@@ -263,6 +271,8 @@ fini_apsw_strings(void)
     Py_CLEAR(apst.UpdateChangeRow);
     Py_CLEAR(apst.UpdateDeleteRow);
     Py_CLEAR(apst.UpdateInsertRow);
+    Py_CLEAR(apst.s_arrow_c_array);
+    Py_CLEAR(apst.s_arrow_c_stream);
     Py_CLEAR(apst.s_module);
     Py_CLEAR(apst._coro_for_exception);
     Py_CLEAR(apst._coro_for_stopasynciteration);
@@ -272,6 +282,7 @@ fini_apsw_strings(void)
     Py_CLEAR(apst.apsw_shell);
     Py_CLEAR(apst.async_controller);
     Py_CLEAR(apst.async_cursor_prefetch);
+    Py_CLEAR(apst.async_cursor_prefetch_bytes);
     Py_CLEAR(apst.async_run_coro);
     Py_CLEAR(apst.can_cache);
     Py_CLEAR(apst.close);
@@ -319,6 +330,7 @@ fini_apsw_strings(void)
     Py_CLEAR(apst.xOpen);
     Py_CLEAR(apst.xRandomness);
     Py_CLEAR(apst.xRead);
+    Py_CLEAR(apst.xReadInto);
     Py_CLEAR(apst.xSectorSize);
     Py_CLEAR(apst.xSetSystemCall);
     Py_CLEAR(apst.xSleep);
@@ -373,6 +385,8 @@ init_apsw_strings()
         || (!apst.UpdateChangeRow && 0 == (apst.UpdateChangeRow = PyUnicode_FromString("UpdateChangeRow")))
         || (!apst.UpdateDeleteRow && 0 == (apst.UpdateDeleteRow = PyUnicode_FromString("UpdateDeleteRow")))
         || (!apst.UpdateInsertRow && 0 == (apst.UpdateInsertRow = PyUnicode_FromString("UpdateInsertRow")))
+        || (!apst.s_arrow_c_array && 0 == (apst.s_arrow_c_array = PyUnicode_FromString("__arrow_c_array__")))
+        || (!apst.s_arrow_c_stream && 0 == (apst.s_arrow_c_stream = PyUnicode_FromString("__arrow_c_stream__")))
         || (!apst.s_module && 0 == (apst.s_module = PyUnicode_FromString("__module__")))
         || (!apst._coro_for_exception && 0 == (apst._coro_for_exception = PyUnicode_FromString("_coro_for_exception")))
         || (!apst._coro_for_stopasynciteration && 0 == (apst._coro_for_stopasynciteration = PyUnicode_FromString("_coro_for_stopasynciteration")))
@@ -382,6 +396,7 @@ init_apsw_strings()
         || (!apst.apsw_shell && 0 == (apst.apsw_shell = PyUnicode_FromString("apsw.shell")))
         || (!apst.async_controller && 0 == (apst.async_controller = PyUnicode_FromString("async_controller")))
         || (!apst.async_cursor_prefetch && 0 == (apst.async_cursor_prefetch = PyUnicode_FromString("async_cursor_prefetch")))
+        || (!apst.async_cursor_prefetch_bytes && 0 == (apst.async_cursor_prefetch_bytes = PyUnicode_FromString("async_cursor_prefetch_bytes")))
         || (!apst.async_run_coro && 0 == (apst.async_run_coro = PyUnicode_FromString("async_run_coro")))
         || (!apst.can_cache && 0 == (apst.can_cache = PyUnicode_FromString("can_cache")))
         || (!apst.close && 0 == (apst.close = PyUnicode_FromString("close")))
@@ -429,6 +444,7 @@ init_apsw_strings()
         || (!apst.xOpen && 0 == (apst.xOpen = PyUnicode_FromString("xOpen")))
         || (!apst.xRandomness && 0 == (apst.xRandomness = PyUnicode_FromString("xRandomness")))
         || (!apst.xRead && 0 == (apst.xRead = PyUnicode_FromString("xRead")))
+        || (!apst.xReadInto && 0 == (apst.xReadInto = PyUnicode_FromString("xReadInto")))
         || (!apst.xSectorSize && 0 == (apst.xSectorSize = PyUnicode_FromString("xSectorSize")))
         || (!apst.xSetSystemCall && 0 == (apst.xSetSystemCall = PyUnicode_FromString("xSetSystemCall")))
         || (!apst.xSleep && 0 == (apst.xSleep = PyUnicode_FromString("xSleep")))
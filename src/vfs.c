@@ -277,6 +277,7 @@ typedef struct /* inherits */
 {
   const struct sqlite3_io_methods *pMethods; /* structure sqlite needs */
   PyObject *file;
+  int read_into; /* use xReadInto instead of xRead, decided in xOpen */
 } APSWSQLite3File;
 
 /* this is only used if there is inheritance */
@@ -303,6 +304,9 @@ static PyTypeObject APSWURIFilenameType;
 
 static const struct sqlite3_io_methods apsw_io_methods_v1;
 static const struct sqlite3_io_methods apsw_io_methods_v2;
+static const struct sqlite3_io_methods apsw_io_methods_v3;
+static int apswvfsfile_overrides(PyObject *file, PyObject *name);
+static int apswvfsfile_wants_read_into(PyObject *file);
 
 typedef struct
 {
@@ -663,14 +667,20 @@ apswvfs_xOpen(sqlite3_vfs *vfs, const char *zName, sqlite3_file *file, int infla
   /* If we are inheriting from another file object, and that file
      object supports version 2 io_methods (Shm* family of functions)
      then we need to allocate an io_methods dupe of our own and fill
-     in their shm methods. */
+     in their shm methods.  Version 3 (memory mapping) is also proxied
+     when reads are inherited, because fetched pages bypass xRead. */
+  apswfile->read_into = apswvfsfile_wants_read_into(pyresult);
   int is_file = PyObject_TypeCheck(pyresult, &APSWVFSFileType) == 1;
   if (is_file)
   {
     APSWVFSFile *f = (APSWVFSFile *)pyresult;
     if (!f->base || !f->base->pMethods || !f->base->pMethods->xShmMap)
       goto version1;
-    apswfile->pMethods = &apsw_io_methods_v2;
+    if (f->base->pMethods->iVersion >= 3 && f->base->pMethods->xFetch && f->base->pMethods->xUnfetch
+        && !apswfile->read_into && !apswvfsfile_overrides(pyresult, apst.xRead))
+      apswfile->pMethods = &apsw_io_methods_v3;
+    else
+      apswfile->pMethods = &apsw_io_methods_v2;
   }
   else
   {
@@ -2034,7 +2044,10 @@ APSWVFSFile_dealloc(PyObject *self_)
 
       If the VFS that you inherit from supports :ref:`write ahead
       logging <wal>` then your :class:`VFSFile` will also support the
-      xShm methods necessary to implement wal.
+      xShm methods necessary to implement wal.  If it also supports
+      `memory mapped I/O <https://sqlite.org/mmap.html>`__ and your
+      class does not override :meth:`~VFSFile.xRead` or
+      :meth:`~VFSFile.xReadInto` then memory mapping is available too.
 
     .. seealso::
 
@@ -2165,6 +2178,99 @@ finally:
   return res;
 }
 
+/* Returns true if the class of file has its own implementation of
+   method name, rather than inheriting the VFSFile one.  Files not
+   derived from VFSFile only need to have the method. */
+static int
+apswvfsfile_overrides(PyObject *file, PyObject *name)
+{
+  PyObject *theirs = PyObject_GetAttr((PyObject *)Py_TYPE(file), name), *ours = NULL;
+  int overrides = !!theirs;
+
+  if (theirs && PyObject_TypeCheck(file, &APSWVFSFileType))
+  {
+    ours = PyObject_GetAttr((PyObject *)&APSWVFSFileType, name);
+    overrides = ours && ours != theirs;
+  }
+  Py_XDECREF(theirs);
+  Py_XDECREF(ours);
+  PyErr_Clear();
+  return overrides;
+}
+
+/* Python files opt in to xReadInto by defining it in their class.
+   VFSFile provides an implementation so subclasses have to override
+   it, otherwise xRead overrides would be bypassed. */
+static int
+apswvfsfile_wants_read_into(PyObject *file)
+{
+  return apswvfsfile_overrides(file, apst.xReadInto);
+}
+
+/* Calls xReadInto with a memoryview over SQLite's buffer which is
+   released afterwards, so Python code can't keep using the memory */
+static int
+apswvfsfile_read_into(PyObject *file, void *bufout, int amount, sqlite3_int64 offset)
+{
+  int result = SQLITE_ERROR;
+  PyObject *view = NULL, *pyresult = NULL, *released = NULL;
+  long long got = -1;
+
+  view = PyMemoryView_FromMemory((char *)bufout, amount, PyBUF_WRITE);
+  if (!view)
+    goto finally;
+
+  PyObject *vargs[] = { NULL, file, view, PyLong_FromLongLong(offset) };
+  if (vargs[3])
+    pyresult = PyObject_VectorcallMethod(apst.xReadInto, vargs + 1, 3 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
+  Py_XDECREF(vargs[3]);
+
+  PyObject *rargs[] = { NULL, view };
+  CHAIN_EXC(released = PyObject_VectorcallMethod(apst.release, rargs + 1, 1 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL));
+  Py_XDECREF(released);
+
+  if (!pyresult)
+  {
+    assert(PyErr_Occurred());
+    result = MakeSqliteMsgFromPyException(NULL);
+    goto finally;
+  }
+  if (PyErr_Occurred())
+    goto finally;
+
+  if (!PyLong_Check(pyresult))
+  {
+    PyErr_Format(PyExc_TypeError, "xReadInto should return an int number of bytes read, not %s",
+                 Py_TypeName(pyresult));
+    goto finally;
+  }
+  got = PyLong_AsLongLong(pyresult);
+  if (PyErr_Occurred())
+    goto finally;
+  if (got < 0 || got > amount)
+  {
+    PyErr_Format(PyExc_ValueError, "xReadInto returned %lld which is not between zero and the buffer length %d", got,
+                 amount);
+    goto finally;
+  }
+
+  if (got < amount)
+  {
+    memset((char *)bufout + got, 0, amount - got);
+    result = SQLITE_IOERR_SHORT_READ;
+  }
+  else
+    result = SQLITE_OK;
+
+finally:
+  if (PyErr_Occurred())
+    AddTraceBackHere(__FILE__, __LINE__, "apswvfsfile_xRead", "{s: i, s: L, s: O}", "amount", amount, "offset", offset,
+                     "result", OBJ(pyresult));
+  Py_XDECREF(pyresult);
+  Py_XDECREF(view);
+  return result;
+}
+
 static int
 apswvfsfile_xRead(sqlite3_file *file, void *bufout, int amount, sqlite3_int64 offset)
 {
@@ -2175,6 +2281,12 @@ apswvfsfile_xRead(sqlite3_file *file, void *bufout, int amount, sqlite3_int64 of
 
   FILEPREAMBLE;
 
+  if (apswfile->read_into)
+  {
+    result = apswvfsfile_read_into(apswfile->file, bufout, amount, offset);
+    goto done;
+  }
+
   PyObject *vargs[] = { NULL, apswfile->file, PyLong_FromLong(amount), PyLong_FromLongLong(offset) };
   if (vargs[2] && vargs[3])
     pybuf = PyObject_VectorcallMethod(apst.xRead, vargs + 1, 3 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
@@ -2218,6 +2330,7 @@ finally:
   if (asrb == 0)
     PyBuffer_Release(&py3buffer);
   Py_XDECREF(pybuf);
+done:
   FILEPOSTAMBLE;
   return result;
 }
@@ -2285,6 +2398,78 @@ apswvfsfilepy_xRead(PyObject *self_, PyObject *const *fast_args, Py_ssize_t fast
   return NULL;
 }
 
+/** .. method:: xReadInto(buffer: Buffer, offset: int) -> int
+
+    Read into the writable *buffer* starting at *offset* in the file,
+    returning how many bytes were read.  Returning less than the
+    buffer length is a short read, and SQLite gets zeroes for the
+    remainder.
+
+    This is an alternative to :meth:`xRead` that avoids allocating
+    and copying a :class:`bytes` for every read.  It is only used if
+    your class defines or overrides it, in which case SQLite's own
+    memory is provided as a :class:`memoryview` that is released
+    when your method returns.  You must not keep references to
+    *buffer* or anything derived from it, and should update it in
+    place such as ``buffer[:] = data`` or passing it to
+    ``super().xReadInto(buffer, offset)`` and then transforming it.
+
+    :param buffer: Writable buffer, whose length is the amount to read
+    :param offset: Where to start reading.
+
+    :raises BufferError: If *buffer* is not writable
+*/
+static PyObject *
+apswvfsfilepy_xReadInto(PyObject *self_, PyObject *const *fast_args, Py_ssize_t fast_nargs,
+                        PyObject *fast_kwnames)
+{
+  APSWVFSFile *self = (APSWVFSFile *)self_;
+  PyObject *buffer = NULL;
+  sqlite3_int64 offset;
+  Py_buffer py3buffer;
+  int res, amount;
+
+  CHECKVFSFILEPY;
+  VFSFILENOTIMPLEMENTED(xRead, 1);
+
+  {
+    VFSFile_xReadInto_CHECK;
+    ARG_PROLOG(2, VFSFile_xReadInto_KWNAMES);
+    ARG_MANDATORY ARG_Buffer(buffer);
+    ARG_MANDATORY ARG_int64(offset);
+    ARG_EPILOG(NULL, VFSFile_xReadInto_USAGE, );
+  }
+
+  if (PyObject_GetBufferContiguous(buffer, &py3buffer, PyBUF_WRITABLE | PyBUF_SIMPLE))
+    return NULL;
+
+  if (py3buffer.len > INT_MAX)
+  {
+    PyBuffer_Release(&py3buffer);
+    return PyErr_Format(PyExc_ValueError, "Buffer is too large (%zd bytes)", py3buffer.len);
+  }
+
+  amount = (int)py3buffer.len;
+  res = self->base->pMethods->xRead(self->base, py3buffer.buf, amount, offset);
+
+  if (res == SQLITE_IOERR_SHORT_READ)
+  {
+    /* We don't know how short the read was, so look for first
+         non-trailing null byte.  */
+    while (amount && ((char *)py3buffer.buf)[amount - 1] == 0)
+      amount--;
+    res = SQLITE_OK;
+  }
+
+  PyBuffer_Release(&py3buffer);
+
+  if (res == SQLITE_OK)
+    return PyLong_FromLong(amount);
+
+  SET_EXC(res, NULL);
+  return NULL;
+}
+
 static int
 apswvfsfile_xWrite(sqlite3_file *file, const void *buffer, int amount, sqlite3_int64 offset)
 {
@@ -3055,6 +3240,20 @@ apswproxyxShmUnmap(sqlite3_file *file, int deleteFlag)
   return f->base->pMethods->xShmUnmap(f->base, deleteFlag);
 }
 
+static int
+apswproxyxFetch(sqlite3_file *file, sqlite3_int64 offset, int amount, void **pp)
+{
+  APSWPROXYBASE;
+  return f->base->pMethods->xFetch(f->base, offset, amount, pp);
+}
+
+static int
+apswproxyxUnfetch(sqlite3_file *file, sqlite3_int64 offset, void *p)
+{
+  APSWPROXYBASE;
+  return f->base->pMethods->xUnfetch(f->base, offset, p);
+}
+
 static const struct sqlite3_io_methods apsw_io_methods_v1 = {
   1,                                  /* version */
   apswvfsfile_xClose,                 /* close */
@@ -3095,8 +3294,31 @@ static const struct sqlite3_io_methods apsw_io_methods_v2 = {
   apswproxyxShmUnmap                  /* shmunmap */
 };
 
+static const struct sqlite3_io_methods apsw_io_methods_v3 = {
+  3,                                  /* version */
+  apswvfsfile_xClose,                 /* close */
+  apswvfsfile_xRead,                  /* read */
+  apswvfsfile_xWrite,                 /* write */
+  apswvfsfile_xTruncate,              /* truncate */
+  apswvfsfile_xSync,                  /* sync */
+  apswvfsfile_xFileSize,              /* filesize */
+  apswvfsfile_xLock,                  /* lock */
+  apswvfsfile_xUnlock,                /* unlock */
+  apswvfsfile_xCheckReservedLock,     /* checkreservedlock */
+  apswvfsfile_xFileControl,           /* filecontrol */
+  apswvfsfile_xSectorSize,            /* sectorsize */
+  apswvfsfile_xDeviceCharacteristics, /* device characteristics */
+  apswproxyxShmMap,                   /* shmmap */
+  apswproxyxShmLock,                  /* shmlock */
+  apswproxyxShmBarrier,               /* shmbarrier */
+  apswproxyxShmUnmap,                 /* shmunmap */
+  apswproxyxFetch,                    /* fetch */
+  apswproxyxUnfetch                   /* unfetch */
+};
+
 static PyMethodDef APSWVFSFile_methods[] = {
   { "xRead", (PyCFunction)apswvfsfilepy_xRead, METH_FASTCALL | METH_KEYWORDS, VFSFile_xRead_DOC },
+  { "xReadInto", (PyCFunction)apswvfsfilepy_xReadInto, METH_FASTCALL | METH_KEYWORDS, VFSFile_xReadInto_DOC },
   { "xUnlock", (PyCFunction)apswvfsfilepy_xUnlock, METH_FASTCALL | METH_KEYWORDS, VFSFile_xUnlock_DOC },
   { "xLock", (PyCFunction)apswvfsfilepy_xLock, METH_FASTCALL | METH_KEYWORDS, VFSFile_xLock_DOC },
   { "xClose", (PyCFunction)apswvfsfilepy_xClose, METH_NOARGS, VFSFile_xClose_DOC },
@@ -3317,3 +3539,795 @@ static PyTypeObject APSWURIFilenameType = {
 };
 
 #undef CHECK_SCOPE
+
+/** .. class:: IOStatsVFS
+
+  A pass through VFS implemented in C that records how many
+  operations of each kind happen, how many bytes are moved, and how
+  long they take.  It is intended to be cheap enough to leave on in
+  production, unlike measuring with a :class:`VFS` implemented in
+  Python.  Statistics are kept per file type, and are read with
+  :meth:`snapshot`.
+
+  .. code-block:: python
+
+    stats = apsw.IOStatsVFS("iostats")
+    con = apsw.Connection("database.db", vfs="iostats")
+    ...
+    print(stats.snapshot()["main_db"]["read"])
+
+  The VFS is unregistered when this object is garbage collected,
+  which won't happen while files opened through it are still open.
+*/
+
+/* latency histogram buckets - bucket i counts operations that took
+   less than 2**i microseconds, with the last being everything
+   longer */
+#define IOSTATS_HISTOGRAM_SIZE 24
+
+typedef struct
+{
+  sqlite3_int64 count;
+  sqlite3_int64 bytes;
+  sqlite3_int64 errors;
+  sqlite3_int64 ns;
+  sqlite3_int64 histogram[IOSTATS_HISTOGRAM_SIZE];
+} IOStatsOp;
+
+/* these must match iostats_op_names */
+enum
+{
+  IOSTATS_READ,
+  IOSTATS_WRITE,
+  IOSTATS_SYNC,
+  IOSTATS_TRUNCATE,
+  IOSTATS_LOCK,
+  IOSTATS_UNLOCK,
+  IOSTATS_SHM_LOCK,
+  IOSTATS_FETCH,
+  IOSTATS_NUM_OPS
+};
+
+static const char *const iostats_op_names[IOSTATS_NUM_OPS]
+    = { "read", "write", "sync", "truncate", "lock", "unlock", "shm_lock", "fetch" };
+
+/* these must match iostats_file_types */
+enum
+{
+  IOSTATS_MAIN_DB,
+  IOSTATS_MAIN_JOURNAL,
+  IOSTATS_WAL,
+  IOSTATS_TEMP_DB,
+  IOSTATS_TEMP_JOURNAL,
+  IOSTATS_TRANSIENT_DB,
+  IOSTATS_SUBJOURNAL,
+  IOSTATS_SUPER_JOURNAL,
+  IOSTATS_OTHER,
+  IOSTATS_NUM_FILE_TYPES
+};
+
+static const struct
+{
+  const char *name;
+  int flag;
+} iostats_file_types[IOSTATS_NUM_FILE_TYPES] = {
+  { "main_db", SQLITE_OPEN_MAIN_DB },
+  { "main_journal", SQLITE_OPEN_MAIN_JOURNAL },
+  { "wal", SQLITE_OPEN_WAL },
+  { "temp_db", SQLITE_OPEN_TEMP_DB },
+  { "temp_journal", SQLITE_OPEN_TEMP_JOURNAL },
+  { "transient_db", SQLITE_OPEN_TRANSIENT_DB },
+  { "subjournal", SQLITE_OPEN_SUBJOURNAL },
+  { "super_journal", SQLITE_OPEN_SUPER_JOURNAL },
+  { "other", 0 },
+};
+
+typedef struct
+{
+  sqlite3_int64 opens[IOSTATS_NUM_FILE_TYPES];
+  IOStatsOp ops[IOSTATS_NUM_FILE_TYPES][IOSTATS_NUM_OPS];
+} IOStats;
+
+typedef struct
+{
+  PyObject_HEAD
+  sqlite3_vfs *basevfs;       /* who we pass everything through to */
+  PyObject *base_owner;       /* Python object for basevfs if it is one of ours */
+  sqlite3_vfs *containingvfs; /* pointer given to sqlite for this instance */
+  int registered;
+  int init_was_called;
+  sqlite3_mutex *mutex; /* protects stats */
+  IOStats stats;
+} APSWIOStatsVFS;
+
+typedef struct /* inherits */
+{
+  const struct sqlite3_io_methods *pMethods; /* structure sqlite needs */
+  struct sqlite3_io_methods methods;         /* matches what base provides */
+  APSWIOStatsVFS *owner;
+  int file_type;
+  sqlite3_file *base; /* memory immediately following this struct */
+} APSWIOStatsFile;
+
+#define IOSTATS_FILE_SIZE ((sizeof(APSWIOStatsFile) + 7) & ~(size_t)7)
+
+#define IOSTATSVFS(vfs) (((APSWIOStatsVFS *)((vfs)->pAppData))->basevfs)
+
+#define IOSTATSFILE                                                                                                    \
+  APSWIOStatsFile *sf = (APSWIOStatsFile *)(void *)file;                                                               \
+  sqlite3_file *base = sf->base;
+
+#define IOSTATS_BEGIN                                                                                                  \
+  PyTime_t iostats_start, iostats_end;                                                                                 \
+  PyTime_PerfCounterRaw(&iostats_start);
+
+#define IOSTATS_END(op, nbytes, failed)                                                                                \
+  PyTime_PerfCounterRaw(&iostats_end);                                                                                 \
+  iostats_record(sf, op, nbytes, failed, iostats_end - iostats_start);
+
+static void
+iostats_record(APSWIOStatsFile *sf, int op, sqlite3_int64 nbytes, int failed, PyTime_t ns)
+{
+  IOStatsOp *stat = &sf->owner->stats.ops[sf->file_type][op];
+  sqlite3_int64 us = ns > 0 ? ns / 1000 : 0;
+  int bucket = 0;
+
+  while (us && bucket < IOSTATS_HISTOGRAM_SIZE - 1)
+  {
+    us >>= 1;
+    bucket++;
+  }
+
+  sqlite3_mutex_enter(sf->owner->mutex);
+  stat->count++;
+  stat->bytes += nbytes;
+  stat->errors += !!failed;
+  stat->ns += ns;
+  stat->histogram[bucket]++;
+  sqlite3_mutex_leave(sf->owner->mutex);
+}
+
+static int
+iostatsfile_xClose(sqlite3_file *file)
+{
+  IOSTATSFILE;
+  APSWIOStatsVFS *owner = sf->owner;
+  int res = base->pMethods->xClose(base);
+
+  PyGILState_STATE gilstate = PyGILState_Ensure();
+  Py_DECREF((PyObject *)owner);
+  PyGILState_Release(gilstate);
+  return res;
+}
+
+static int
+iostatsfile_xRead(sqlite3_file *file, void *buffer, int amount, sqlite3_int64 offset)
+{
+  IOSTATSFILE;
+  IOSTATS_BEGIN;
+  int res = base->pMethods->xRead(base, buffer, amount, offset);
+  IOSTATS_END(IOSTATS_READ, amount, res != SQLITE_OK && res != SQLITE_IOERR_SHORT_READ);
+  return res;
+}
+
+static int
+iostatsfile_xWrite(sqlite3_file *file, const void *buffer, int amount, sqlite3_int64 offset)
+{
+  IOSTATSFILE;
+  IOSTATS_BEGIN;
+  int res = base->pMethods->xWrite(base, buffer, amount, offset);
+  IOSTATS_END(IOSTATS_WRITE, amount, res != SQLITE_OK);
+  return res;
+}
+
+static int
+iostatsfile_xTruncate(sqlite3_file *file, sqlite3_int64 size)
+{
+  IOSTATSFILE;
+  IOSTATS_BEGIN;
+  int res = base->pMethods->xTruncate(base, size);
+  IOSTATS_END(IOSTATS_TRUNCATE, 0, res != SQLITE_OK);
+  return res;
+}
+
+static int
+iostatsfile_xSync(sqlite3_file *file, int flags)
+{
+  IOSTATSFILE;
+  IOSTATS_BEGIN;
+  int res = base->pMethods->xSync(base, flags);
+  IOSTATS_END(IOSTATS_SYNC, 0, res != SQLITE_OK);
+  return res;
+}
+
+static int
+iostatsfile_xFileSize(sqlite3_file *file, sqlite3_int64 *pSize)
+{
+  IOSTATSFILE;
+  return base->pMethods->xFileSize(base, pSize);
+}
+
+static int
+iostatsfile_xLock(sqlite3_file *file, int level)
+{
+  IOSTATSFILE;
+  IOSTATS_BEGIN;
+  int res = base->pMethods->xLock(base, level);
+  IOSTATS_END(IOSTATS_LOCK, 0, res != SQLITE_OK);
+  return res;
+}
+
+static int
+iostatsfile_xUnlock(sqlite3_file *file, int level)
+{
+  IOSTATSFILE;
+  IOSTATS_BEGIN;
+  int res = base->pMethods->xUnlock(base, level);
+  IOSTATS_END(IOSTATS_UNLOCK, 0, res != SQLITE_OK);
+  return res;
+}
+
+static int
+iostatsfile_xCheckReservedLock(sqlite3_file *file, int *pResOut)
+{
+  IOSTATSFILE;
+  return base->pMethods->xCheckReservedLock(base, pResOut);
+}
+
+static int
+iostatsfile_xFileControl(sqlite3_file *file, int op, void *pArg)
+{
+  IOSTATSFILE;
+  int res = base->pMethods->xFileControl(base, op, pArg);
+
+  /* prefix our name as other shims do */
+  if (op == SQLITE_FCNTL_VFSNAME && (res == SQLITE_OK || res == SQLITE_NOTFOUND))
+  {
+    char *name = (res == SQLITE_OK) ? *(char **)pArg : NULL;
+    if (name)
+      name = sqlite3_mprintf("%s/%z", sf->owner->containingvfs->zName, name);
+    else
+      name = sqlite3_mprintf("%s", sf->owner->containingvfs->zName);
+    *(char **)pArg = name;
+    res = name ? SQLITE_OK : SQLITE_NOMEM;
+  }
+  return res;
+}
+
+static int
+iostatsfile_xSectorSize(sqlite3_file *file)
+{
+  IOSTATSFILE;
+  return base->pMethods->xSectorSize(base);
+}
+
+static int
+iostatsfile_xDeviceCharacteristics(sqlite3_file *file)
+{
+  IOSTATSFILE;
+  return base->pMethods->xDeviceCharacteristics(base);
+}
+
+static int
+iostatsfile_xShmMap(sqlite3_file *file, int iPage, int pgsz, int isWrite, void volatile **pp)
+{
+  IOSTATSFILE;
+  return base->pMethods->xShmMap(base, iPage, pgsz, isWrite, pp);
+}
+
+static int
+iostatsfile_xShmLock(sqlite3_file *file, int offset, int n, int flags)
+{
+  IOSTATSFILE;
+  IOSTATS_BEGIN;
+  int res = base->pMethods->xShmLock(base, offset, n, flags);
+  IOSTATS_END(IOSTATS_SHM_LOCK, 0, res != SQLITE_OK);
+  return res;
+}
+
+static void
+iostatsfile_xShmBarrier(sqlite3_file *file)
+{
+  IOSTATSFILE;
+  base->pMethods->xShmBarrier(base);
+}
+
+static int
+iostatsfile_xShmUnmap(sqlite3_file *file, int deleteFlag)
+{
+  IOSTATSFILE;
+  return base->pMethods->xShmUnmap(base, deleteFlag);
+}
+
+static int
+iostatsfile_xFetch(sqlite3_file *file, sqlite3_int64 offset, int amount, void **pp)
+{
+  IOSTATSFILE;
+  IOSTATS_BEGIN;
+  int res = base->pMethods->xFetch(base, offset, amount, pp);
+  /* a NULL result is not an error - SQLite falls back to xRead */
+  IOSTATS_END(IOSTATS_FETCH, (res == SQLITE_OK && *pp) ? amount : 0, res != SQLITE_OK);
+  return res;
+}
+
+static int
+iostatsfile_xUnfetch(sqlite3_file *file, sqlite3_int64 offset, void *p)
+{
+  IOSTATSFILE;
+  return base->pMethods->xUnfetch(base, offset, p);
+}
+
+static int
+iostatsvfs_xOpen(sqlite3_vfs *vfs, const char *zName, sqlite3_file *file, int flags, int *pOutFlags)
+{
+  APSWIOStatsVFS *self = (APSWIOStatsVFS *)vfs->pAppData;
+  APSWIOStatsFile *sf = (APSWIOStatsFile *)(void *)file;
+  const sqlite3_io_methods *bm;
+  int res, i;
+
+  sf->base = (sqlite3_file *)(void *)((char *)file + IOSTATS_FILE_SIZE);
+  res = self->basevfs->xOpen(self->basevfs, zName, sf->base, flags, pOutFlags);
+
+  bm = sf->base->pMethods;
+  if (!bm)
+  {
+    sf->pMethods = NULL;
+    return res;
+  }
+
+  sf->owner = self;
+  sf->file_type = IOSTATS_OTHER;
+  for (i = 0; i < IOSTATS_OTHER; i++)
+    if (flags & iostats_file_types[i].flag)
+    {
+      sf->file_type = i;
+      break;
+    }
+
+  /* provide exactly the methods the base file does */
+  memset(&sf->methods, 0, sizeof(sf->methods));
+#define M(n) sf->methods.n = bm->n ? iostatsfile_##n : NULL
+  sf->methods.iVersion = Py_MIN(bm->iVersion, 3);
+  M(xClose);
+  M(xRead);
+  M(xWrite);
+  M(xTruncate);
+  M(xSync);
+  M(xFileSize);
+  M(xLock);
+  M(xUnlock);
+  M(xCheckReservedLock);
+  M(xFileControl);
+  M(xSectorSize);
+  M(xDeviceCharacteristics);
+  if (bm->iVersion >= 2)
+  {
+    M(xShmMap);
+    M(xShmLock);
+    M(xShmBarrier);
+    M(xShmUnmap);
+  }
+  if (bm->iVersion >= 3)
+  {
+    M(xFetch);
+    M(xUnfetch);
+  }
+#undef M
+  sf->pMethods = &sf->methods;
+
+  /* the file keeps us alive until closed */
+  PyGILState_STATE gilstate = PyGILState_Ensure();
+  Py_INCREF((PyObject *)self);
+  PyGILState_Release(gilstate);
+
+  sqlite3_mutex_enter(self->mutex);
+  self->stats.opens[sf->file_type]++;
+  sqlite3_mutex_leave(self->mutex);
+
+  return res;
+}
+
+static int
+iostatsvfs_xDelete(sqlite3_vfs *vfs, const char *zName, int syncDir)
+{
+  return IOSTATSVFS(vfs)->xDelete(IOSTATSVFS(vfs), zName, syncDir);
+}
+
+static int
+iostatsvfs_xAccess(sqlite3_vfs *vfs, const char *zName, int flags, int *pResOut)
+{
+  return IOSTATSVFS(vfs)->xAccess(IOSTATSVFS(vfs), zName, flags, pResOut);
+}
+
+static int
+iostatsvfs_xFullPathname(sqlite3_vfs *vfs, const char *zName, int nOut, char *zOut)
+{
+  return IOSTATSVFS(vfs)->xFullPathname(IOSTATSVFS(vfs), zName, nOut, zOut);
+}
+
+static void *
+iostatsvfs_xDlOpen(sqlite3_vfs *vfs, const char *zFilename)
+{
+  return IOSTATSVFS(vfs)->xDlOpen(IOSTATSVFS(vfs), zFilename);
+}
+
+static void
+iostatsvfs_xDlError(sqlite3_vfs *vfs, int nByte, char *zErrMsg)
+{
+  IOSTATSVFS(vfs)->xDlError(IOSTATSVFS(vfs), nByte, zErrMsg);
+}
+
+static void (*iostatsvfs_xDlSym(sqlite3_vfs *vfs, void *handle, const char *zSymbol))(void)
+{
+  return IOSTATSVFS(vfs)->xDlSym(IOSTATSVFS(vfs), handle, zSymbol);
+}
+
+static void
+iostatsvfs_xDlClose(sqlite3_vfs *vfs, void *handle)
+{
+  IOSTATSVFS(vfs)->xDlClose(IOSTATSVFS(vfs), handle);
+}
+
+static int
+iostatsvfs_xRandomness(sqlite3_vfs *vfs, int nByte, char *zOut)
+{
+  return IOSTATSVFS(vfs)->xRandomness(IOSTATSVFS(vfs), nByte, zOut);
+}
+
+static int
+iostatsvfs_xSleep(sqlite3_vfs *vfs, int microseconds)
+{
+  return IOSTATSVFS(vfs)->xSleep(IOSTATSVFS(vfs), microseconds);
+}
+
+static int
+iostatsvfs_xCurrentTime(sqlite3_vfs *vfs, double *pTime)
+{
+  return IOSTATSVFS(vfs)->xCurrentTime(IOSTATSVFS(vfs), pTime);
+}
+
+static int
+iostatsvfs_xGetLastError(sqlite3_vfs *vfs, int nByte, char *zOut)
+{
+  return IOSTATSVFS(vfs)->xGetLastError(IOSTATSVFS(vfs), nByte, zOut);
+}
+
+static int
+iostatsvfs_xCurrentTimeInt64(sqlite3_vfs *vfs, sqlite3_int64 *pTime)
+{
+  return IOSTATSVFS(vfs)->xCurrentTimeInt64(IOSTATSVFS(vfs), pTime);
+}
+
+static int
+iostatsvfs_xSetSystemCall(sqlite3_vfs *vfs, const char *zName, sqlite3_syscall_ptr call)
+{
+  return IOSTATSVFS(vfs)->xSetSystemCall(IOSTATSVFS(vfs), zName, call);
+}
+
+static sqlite3_syscall_ptr
+iostatsvfs_xGetSystemCall(sqlite3_vfs *vfs, const char *zName)
+{
+  return IOSTATSVFS(vfs)->xGetSystemCall(IOSTATSVFS(vfs), zName);
+}
+
+static const char *
+iostatsvfs_xNextSystemCall(sqlite3_vfs *vfs, const char *zName)
+{
+  return IOSTATSVFS(vfs)->xNextSystemCall(IOSTATSVFS(vfs), zName);
+}
+
+/** .. method:: __init__(name: str, base: str | None = None, makedefault: bool = False)
+
+    :param name: The name to register this vfs under.  If the name
+        already exists then this vfs will replace the prior one of the
+        same name.
+    :param base: The vfs to pass everything through to, with *None* or
+        an empty string meaning the default vfs.  It can be a
+        :class:`VFS` implemented in Python.
+    :param makedefault: Whether this becomes the default vfs.
+
+    :raises ValueError: If the base vfs is not found.
+
+    -* sqlite3_vfs_register sqlite3_vfs_find
+*/
+static int
+APSWIOStatsVFS_init(PyObject *self_, PyObject *args, PyObject *kwargs)
+{
+  APSWIOStatsVFS *self = (APSWIOStatsVFS *)self_;
+  const char *base = NULL, *name = NULL;
+  int makedefault = 0, res;
+
+  {
+    IOStatsVFS_init_CHECK;
+    PREVENT_INIT_MULTIPLE_CALLS;
+    ARG_CONVERT_VARARGS_TO_FASTCALL(3, IOStatsVFS_init_USAGE);
+    ARG_PROLOG(3, IOStatsVFS_init_KWNAMES);
+    ARG_MANDATORY ARG_str(name);
+    ARG_OPTIONAL ARG_optional_str(base);
+    ARG_OPTIONAL ARG_bool(makedefault);
+    ARG_EPILOG(-1, IOStatsVFS_init_USAGE, Py_XDECREF(fast_kwnames));
+  }
+
+  if (base && !strlen(base))
+    base = NULL;
+
+  self->basevfs = sqlite3_vfs_find(base);
+  if (!self->basevfs)
+  {
+    PyErr_Format(PyExc_ValueError, "Base vfs named \"%s\" not found", base ? base : "<default>");
+    return -1;
+  }
+
+  /* keep Python implemented bases alive */
+  if (self->basevfs->xAccess == apswvfs_xAccess || self->basevfs->xOpen == iostatsvfs_xOpen)
+    self->base_owner = Py_NewRef((PyObject *)self->basevfs->pAppData);
+
+  self->mutex = sqlite3_mutex_alloc(SQLITE_MUTEX_FAST);
+  self->containingvfs = (sqlite3_vfs *)PyMem_Calloc(1, sizeof(sqlite3_vfs));
+  if (!self->containingvfs || (sqlite3_threadsafe() && !self->mutex))
+  {
+    PyErr_NoMemory();
+    goto error;
+  }
+
+  self->containingvfs->iVersion = Py_MIN(self->basevfs->iVersion, 3);
+  self->containingvfs->szOsFile = (int)IOSTATS_FILE_SIZE + self->basevfs->szOsFile;
+  self->containingvfs->mxPathname = self->basevfs->mxPathname;
+  self->containingvfs->zName = apsw_strdup(name);
+  if (!self->containingvfs->zName)
+    goto error;
+  self->containingvfs->pAppData = self;
+  self->containingvfs->xOpen = iostatsvfs_xOpen;
+
+#define M(n) self->containingvfs->n = self->basevfs->n ? iostatsvfs_##n : NULL
+  M(xDelete);
+  M(xAccess);
+  M(xFullPathname);
+  M(xDlOpen);
+  M(xDlError);
+  M(xDlSym);
+  M(xDlClose);
+  M(xRandomness);
+  M(xSleep);
+  M(xCurrentTime);
+  M(xGetLastError);
+  if (self->containingvfs->iVersion >= 2)
+    M(xCurrentTimeInt64);
+  if (self->containingvfs->iVersion >= 3)
+  {
+    M(xSetSystemCall);
+    M(xGetSystemCall);
+    M(xNextSystemCall);
+  }
+#undef M
+
+  res = sqlite3_vfs_register(self->containingvfs, makedefault);
+  if (res == SQLITE_OK)
+  {
+    self->registered = 1;
+    return 0;
+  }
+
+  SET_EXC(res, NULL);
+
+error:
+  if (self->containingvfs)
+    PyMem_Free((void *)(self->containingvfs->zName));
+  PyMem_Free(self->containingvfs);
+  self->containingvfs = NULL;
+  if (self->mutex)
+    sqlite3_mutex_free(self->mutex);
+  self->mutex = NULL;
+  Py_CLEAR(self->base_owner);
+  return -1;
+}
+
+/** .. method:: unregister() -> None
+
+   Unregisters the VFS making it unavailable to future database
+   opens.  Databases already open continue to be counted.  It is
+   safe to call this routine multiple times.
+
+   -* sqlite3_vfs_unregister
+*/
+static PyObject *
+apswiostatsvfs_unregister(PyObject *self_, PyObject *Py_UNUSED(unused))
+{
+  APSWIOStatsVFS *self = (APSWIOStatsVFS *)self_;
+
+  if (self->registered)
+  {
+    int res = sqlite3_vfs_unregister(self->containingvfs);
+    self->registered = 0;
+    if (res)
+    {
+      SET_EXC(res, NULL);
+      return NULL;
+    }
+  }
+  Py_RETURN_NONE;
+}
+
+/** .. method:: snapshot(reset: bool = False) -> dict[str, dict[str, Any]]
+
+  Returns the statistics so far, optionally resetting them to zero
+  atomically.  Only file types that have been used are included,
+  from ``main_db``, ``main_journal``, ``wal``, ``temp_db``,
+  ``temp_journal``, ``transient_db``, ``subjournal``,
+  ``super_journal``, and ``other``.
+
+  Each file type is a dict with ``opens`` being how many files were
+  opened, and a dict for each of ``read``, ``write``, ``sync``,
+  ``truncate``, ``lock``, ``unlock``, ``shm_lock`` (:ref:`WAL <wal>`
+  locking), and ``fetch`` (`memory mapped <https://sqlite.org/mmap.html>`__
+  reads).
+
+  .. list-table::
+    :header-rows: 1
+    :widths: auto
+
+    * - Key
+      - Explanation
+    * - count
+      - How many calls were made
+    * - bytes
+      - Bytes requested for ``read`` and ``write``, and bytes
+        mapped for ``fetch``
+    * - errors
+      - How many calls failed.  Short reads are not counted as errors.
+    * - ns
+      - Total nanoseconds spent in the calls
+    * - histogram
+      - A list of how many calls had each latency.  Item *i* counts
+        calls taking less than 2 ** *i* microseconds (and at least
+        the previous item's limit), with the last item also counting
+        everything longer.
+
+  :param reset: Zero the statistics after taking the snapshot
+*/
+static PyObject *
+apswiostatsvfs_snapshot(PyObject *self_, PyObject *const *fast_args, Py_ssize_t fast_nargs, PyObject *fast_kwnames)
+{
+  APSWIOStatsVFS *self = (APSWIOStatsVFS *)self_;
+  PyObject *res = NULL, *filetype = NULL, *op = NULL, *histogram = NULL;
+  IOStats *stats = NULL;
+  int reset = 0, i, j, k;
+
+  if (!self->containingvfs)
+    return PyErr_Format(PyExc_ValueError, "IOStatsVFS has not been initialized");
+
+  {
+    IOStatsVFS_snapshot_CHECK;
+    ARG_PROLOG(1, IOStatsVFS_snapshot_KWNAMES);
+    ARG_OPTIONAL ARG_bool(reset);
+    ARG_EPILOG(NULL, IOStatsVFS_snapshot_USAGE, );
+  }
+
+  /* copy out so Python objects aren't made while holding the mutex */
+  stats = PyMem_Malloc(sizeof(IOStats));
+  if (!stats)
+    return PyErr_NoMemory();
+
+  sqlite3_mutex_enter(self->mutex);
+  memcpy(stats, &self->stats, sizeof(IOStats));
+  if (reset)
+    memset(&self->stats, 0, sizeof(IOStats));
+  sqlite3_mutex_leave(self->mutex);
+
+  res = PyDict_New();
+  if (!res)
+    goto fail;
+
+  for (i = 0; i < IOSTATS_NUM_FILE_TYPES; i++)
+  {
+    /* files can remain open across a reset */
+    int used = !!stats->opens[i];
+    for (j = 0; !used && j < IOSTATS_NUM_OPS; j++)
+      used = !!stats->ops[i][j].count;
+    if (!used)
+      continue;
+    filetype = Py_BuildValue("{s: L}", "opens", stats->opens[i]);
+    if (!filetype)
+      goto fail;
+    for (j = 0; j < IOSTATS_NUM_OPS; j++)
+    {
+      IOStatsOp *stat = &stats->ops[i][j];
+      histogram = PyList_New(IOSTATS_HISTOGRAM_SIZE);
+      if (!histogram)
+        goto fail;
+      for (k = 0; k < IOSTATS_HISTOGRAM_SIZE; k++)
+      {
+        PyObject *item = PyLong_FromLongLong(stat->histogram[k]);
+        if (!item)
+          goto fail;
+        PyList_SET_ITEM(histogram, k, item);
+      }
+      op = Py_BuildValue("{s: L, s: L, s: L, s: L, s: N}", "count", stat->count, "bytes", stat->bytes, "errors",
+                         stat->errors, "ns", stat->ns, "histogram", histogram);
+      histogram = NULL;
+      if (!op || PyDict_SetItemString(filetype, iostats_op_names[j], op))
+        goto fail;
+      Py_CLEAR(op);
+    }
+    if (PyDict_SetItemString(res, iostats_file_types[i].name, filetype))
+      goto fail;
+    Py_CLEAR(filetype);
+  }
+
+  PyMem_Free(stats);
+  return res;
+
+fail:
+  PyMem_Free(stats);
+  Py_XDECREF(histogram);
+  Py_XDECREF(op);
+  Py_XDECREF(filetype);
+  Py_XDECREF(res);
+  return NULL;
+}
+
+static void
+APSWIOStatsVFS_dealloc(PyObject *self_)
+{
+  APSWIOStatsVFS *self = (APSWIOStatsVFS *)self_;
+
+  if (self->containingvfs)
+  {
+    PyObject *xx;
+
+    /* not allowed to clobber existing exception */
+    PY_ERR_FETCH(exc_save);
+    xx = apswiostatsvfs_unregister(self_, NULL);
+    Py_XDECREF(xx);
+
+    if (PyErr_Occurred())
+      apsw_write_unraisable(NULL);
+    PY_ERR_RESTORE(exc_save);
+
+    PyMem_Free((void *)(self->containingvfs->zName));
+    /* zero it out so any attempt to use results in core dump */
+    memset(self->containingvfs, 0, sizeof(sqlite3_vfs));
+    PyMem_Free(self->containingvfs);
+    self->containingvfs = NULL;
+  }
+  if (self->mutex)
+    sqlite3_mutex_free(self->mutex);
+  self->mutex = NULL;
+  Py_CLEAR(self->base_owner);
+
+  Py_TpFree(self_);
+}
+
+static PyObject *
+APSWIOStatsVFS_tp_repr(PyObject *self_)
+{
+  APSWIOStatsVFS *self = (APSWIOStatsVFS *)self_;
+  if (!self->containingvfs)
+    return PyUnicode_FromFormat("<%s object at %p>", Py_TypeName(self_), self);
+  return PyUnicode_FromFormat("<%s \"%s\" inherits from \"%s\" at %p>", Py_TypeName(self_), self->containingvfs->zName,
+                              self->basevfs->zName, self);
+}
+
+static PyMethodDef APSWIOStatsVFS_methods[] = {
+  { "snapshot", (PyCFunction)apswiostatsvfs_snapshot, METH_FASTCALL | METH_KEYWORDS, IOStatsVFS_snapshot_DOC },
+  { "unregister", (PyCFunction)apswiostatsvfs_unregister, METH_NOARGS, IOStatsVFS_unregister_DOC },
+  /* Sentinel */
+  { 0, 0, 0, 0 }
+};
+
+static PyTypeObject APSWIOStatsVFSType = {
+  PyVarObject_HEAD_INIT(NULL, 0).tp_name = "apsw.IOStatsVFS",
+  .tp_basicsize = sizeof(APSWIOStatsVFS),
+  .tp_dealloc = APSWIOStatsVFS_dealloc,
+  .tp_flags = Py_TPFLAGS_DEFAULT,
+  .tp_doc = IOStatsVFS_class_DOC,
+  .tp_methods = APSWIOStatsVFS_methods,
+  .tp_init = APSWIOStatsVFS_init,
+  .tp_new = PyType_GenericNew,
+  .tp_repr = APSWIOStatsVFS_tp_repr,
+};
+
+#undef IOSTATSVFS
+#undef IOSTATSFILE
+#undef IOSTATS_BEGIN
+#undef IOSTATS_END
@@ -1758,8 +1758,16 @@ typedef struct
   sqlite3_vtab_cursor used_by_sqlite; /* I don't touch this */
   PyObject *cursor;                   /* Object implementing cursor */
   int use_no_change;
+  int row_cursor; /* cursor is a VTRowCursor whose methods can be called directly */
 } apsw_vtable_cursor;
 
+/* VTRowCursor is defined after the VTCursor documentation */
+static int VTRowCursor_is_direct(PyObject *cursor);
+static int VTRowCursor_eof(PyObject *self);
+static int VTRowCursor_next_internal(PyObject *self);
+static PyObject *VTRowCursor_value(PyObject *self, int which);
+static int VTRowCursor_rowid(PyObject *self, sqlite3_int64 *rowid);
+
 static int
 apswvtabOpen(sqlite3_vtab *pVtab, sqlite3_vtab_cursor **ppCursor)
 {
@@ -1789,6 +1797,7 @@ apswvtabOpen(sqlite3_vtab *pVtab, sqlite3_vtab_cursor **ppCursor)
   assert((void *)avc == (void *)&(avc->used_by_sqlite)); /* detect if weird padding happens */
   avc->cursor = res;
   avc->use_no_change = ((apsw_vtable *)pVtab)->use_no_change;
+  avc->row_cursor = VTRowCursor_is_direct(res);
   res = NULL;
   *ppCursor = (sqlite3_vtab_cursor *)avc;
   goto finally;
@@ -2398,6 +2407,12 @@ apswvtabEof(sqlite3_vtab_cursor *pCursor)
   if (PyErr_Occurred())
     goto pyexception;
 
+  if (((apsw_vtable_cursor *)pCursor)->row_cursor)
+  {
+    sqliteres = VTRowCursor_eof(cursor);
+    goto finally;
+  }
+
   PyObject *vargs[] = { NULL, cursor };
   res = PyObject_VectorcallMethod(apst.Eof, vargs + 1, 1 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
   if (!res)
@@ -2462,12 +2477,17 @@ apswvtabColumn(sqlite3_vtab_cursor *pCursor, sqlite3_context *result, int ncolum
 
   assert(!PyErr_Occurred());
 
-  PyObject *vargs[] = { NULL, cursor, PyLong_FromLong(ncolumn) };
-  if (vargs[2])
+  if (!nc && ((apsw_vtable_cursor *)pCursor)->row_cursor)
+    res = VTRowCursor_value(cursor, ncolumn);
+  else
   {
-    res = PyObject_VectorcallMethod(nc ? apst.ColumnNoChange : apst.Column, vargs + 1,
-                                    2 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
-    Py_DECREF(vargs[2]);
+    PyObject *vargs[] = { NULL, cursor, PyLong_FromLong(ncolumn) };
+    if (vargs[2])
+    {
+      res = PyObject_VectorcallMethod(nc ? apst.ColumnNoChange : apst.Column, vargs + 1,
+                                      2 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
+      Py_DECREF(vargs[2]);
+    }
   }
 
   if (!res)
@@ -2518,10 +2538,18 @@ apswvtabNext(sqlite3_vtab_cursor *pCursor)
   gilstate = PyGILState_Ensure();
 
   cursor = ((apsw_vtable_cursor *)pCursor)->cursor;
-  PyObject *vargs[] = { NULL, cursor };
-  res = PyObject_VectorcallMethod(apst.Next, vargs + 1, 1 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
-  if (res)
-    goto finally;
+  if (((apsw_vtable_cursor *)pCursor)->row_cursor)
+  {
+    if (0 == VTRowCursor_next_internal(cursor))
+      goto finally;
+  }
+  else
+  {
+    PyObject *vargs[] = { NULL, cursor };
+    res = PyObject_VectorcallMethod(apst.Next, vargs + 1, 1 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
+    if (res)
+      goto finally;
+  }
 
   /* pyexception:  we had an exception in python code */
   assert(PyErr_Occurred());
@@ -2593,6 +2621,13 @@ apswvtabRowid(sqlite3_vtab_cursor *pCursor, sqlite3_int64 *pRowid)
   if (PyErr_Occurred())
     goto pyexception;
 
+  if (((apsw_vtable_cursor *)pCursor)->row_cursor)
+  {
+    if (0 == VTRowCursor_rowid(cursor, pRowid))
+      goto finally;
+    goto pyexception;
+  }
+
   PyObject *vargs[] = { NULL, cursor };
   res = PyObject_VectorcallMethod(apst.Rowid, vargs + 1, 1 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
   if (!res)
@@ -2620,6 +2655,408 @@ finally:
   return sqliteres;
 }
 
+/** .. class:: VTRowCursor
+
+  A base class implementing :class:`VTCursor` methods in C for rows
+  coming from a Python iterator.  :meth:`apsw.ext.make_virtual_module`
+  uses this so that getting values does not need Python code.  Your
+  subclass provides :meth:`~VTCursor.Filter` which calls
+  :meth:`set_rows`.  SQLite's calls for :meth:`Eof`, :meth:`Next`,
+  :meth:`Column`, and :meth:`Rowid` are then handled directly in C,
+  unless your subclass overrides them.
+*/
+
+/* values for access which match apsw.ext.VTColumnAccess */
+#define VTROW_BY_INDEX 1
+#define VTROW_BY_NAME 2
+#define VTROW_BY_ATTR 3
+
+typedef struct
+{
+  PyObject_HEAD
+  PyObject *rows; /* iterator, NULL at end */
+  PyObject *current_row;
+  PyObject *columns;       /* tuple of interned names */
+  PyObject *hidden_values; /* tuple or list */
+  Py_ssize_t num_columns;
+  int access;
+  int repr_invalid;
+  int primary_key; /* -1 for none */
+} VTRowCursor;
+
+static int
+VTRowCursor_tp_traverse(PyObject *self_, visitproc visit, void *arg)
+{
+  VTRowCursor *self = (VTRowCursor *)self_;
+  Py_VISIT(self->rows);
+  Py_VISIT(self->current_row);
+  Py_VISIT(self->columns);
+  Py_VISIT(self->hidden_values);
+  return 0;
+}
+
+static int
+VTRowCursor_tp_clear(PyObject *self_)
+{
+  VTRowCursor *self = (VTRowCursor *)self_;
+  Py_CLEAR(self->rows);
+  Py_CLEAR(self->current_row);
+  Py_CLEAR(self->columns);
+  Py_CLEAR(self->hidden_values);
+  return 0;
+}
+
+static void
+VTRowCursor_dealloc(PyObject *self)
+{
+  PyObject_GC_UnTrack(self);
+  VTRowCursor_tp_clear(self);
+  Py_TYPE(self)->tp_free(self);
+}
+
+/* moves to the next row, closing the iterator at the end */
+static int
+VTRowCursor_next_internal(PyObject *self_)
+{
+  VTRowCursor *self = (VTRowCursor *)self_;
+  PyObject *row;
+
+  if (!self->rows)
+    return 0;
+  row = PyIter_Next(self->rows);
+  if (row)
+  {
+    Py_XSETREF(self->current_row, row);
+    return 0;
+  }
+  if (PyErr_Occurred())
+    return -1;
+
+  PyObject *rows = self->rows;
+  self->rows = NULL;
+  if (PyObject_HasAttr(rows, apst.close))
+  {
+    PyObject *vargs[] = { NULL, rows };
+    PyObject *res = PyObject_VectorcallMethod(apst.close, vargs + 1, 1 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
+    Py_XDECREF(res);
+  }
+  Py_DECREF(rows);
+  return PyErr_Occurred() ? -1 : 0;
+}
+
+/* returns a new reference to the value of column which */
+static PyObject *
+VTRowCursor_value(PyObject *self_, int which)
+{
+  VTRowCursor *self = (VTRowCursor *)self_;
+  PyObject *value = NULL;
+  Py_ssize_t num_hidden = self->hidden_values ? PySequence_Fast_GET_SIZE(self->hidden_values) : 0;
+
+  if (which < 0 || which >= self->num_columns + num_hidden)
+    return PyErr_Format(PyExc_IndexError, "Column %d is out of range", which);
+  if (which >= self->num_columns)
+    return Py_NewRef(PySequence_Fast_GET_ITEM(self->hidden_values, which - self->num_columns));
+  if (!self->current_row)
+    return PyErr_Format(PyExc_ValueError, "There is no current row");
+
+  switch (self->access)
+  {
+  case VTROW_BY_INDEX:
+    if (PyTuple_CheckExact(self->current_row) && which < PyTuple_GET_SIZE(self->current_row))
+      value = Py_NewRef(PyTuple_GET_ITEM(self->current_row, which));
+    else
+      value = PySequence_GetItem(self->current_row, which);
+    break;
+  case VTROW_BY_NAME:
+    value = PyObject_GetItem(self->current_row, PyTuple_GET_ITEM(self->columns, which));
+    break;
+  default:
+    assert(self->access == VTROW_BY_ATTR);
+    value = PyObject_GetAttr(self->current_row, PyTuple_GET_ITEM(self->columns, which));
+    break;
+  }
+
+  if (value && self->repr_invalid && !Py_IsNone(value) && !PyLong_Check(value) && !PyFloat_Check(value)
+      && !PyUnicode_Check(value) && !PyBytes_Check(value))
+    Py_SETREF(value, PyObject_Repr(value));
+  return value;
+}
+
+static int
+VTRowCursor_eof(PyObject *self)
+{
+  return ((VTRowCursor *)self)->rows ? 0 : 1;
+}
+
+static int
+VTRowCursor_rowid(PyObject *self_, sqlite3_int64 *rowid)
+{
+  VTRowCursor *self = (VTRowCursor *)self_;
+  if (self->primary_key < 0)
+  {
+    /* the id of the row object */
+    *rowid = (sqlite3_int64)(uintptr_t)self->current_row;
+    return 0;
+  }
+  PyObject *value = VTRowCursor_value(self_, self->primary_key);
+  if (!value)
+    return -1;
+  Py_SETREF(value, PyNumber_Long(value));
+  if (!value)
+    return -1;
+  *rowid = PyLong_AsLongLong(value);
+  Py_DECREF(value);
+  return PyErr_Occurred() ? -1 : 0;
+}
+
+/** .. method:: set_rows(rows: Iterator[Any], hidden_values: tuple[SQLiteValue, ...] | list[SQLiteValue], columns: tuple[str, ...], access: int, repr_invalid: bool = False, primary_key: int | None = None) -> None
+
+  Starts iterating over *rows*, which is immediately advanced to the
+  first row.
+
+  :param rows: Each item is a row, with the iterator's ``close`` method
+     called when the end is reached.
+  :param hidden_values: Values for columns after *columns*, such as
+     :meth:`apsw.ext.make_virtual_module` parameters.  If it is a
+     list then changes made while iterating *rows* are used for
+     following rows.
+  :param columns: Column names
+  :param access: The value of a :class:`apsw.ext.VTColumnAccess` member saying
+     how column values are found in each row
+  :param repr_invalid: If *True* then values that are not valid
+     :class:`SQLiteValue` are converted to a string using :func:`repr`
+  :param primary_key: Which column is the rowid.  If *None* then the
+     :func:`id` of the row is used.
+*/
+static PyObject *
+VTRowCursor_set_rows(PyObject *self_, PyObject *const *fast_args, Py_ssize_t fast_nargs, PyObject *fast_kwnames)
+{
+  VTRowCursor *self = (VTRowCursor *)self_;
+  PyObject *rows = NULL, *hidden_values = NULL, *columns = NULL, *primary_key = NULL, *names = NULL;
+  int access, repr_invalid = 0, pk = -1;
+  Py_ssize_t i;
+
+  {
+    VTRowCursor_set_rows_CHECK;
+    ARG_PROLOG(6, VTRowCursor_set_rows_KWNAMES);
+    ARG_MANDATORY ARG_pyobject(rows);
+    ARG_MANDATORY ARG_pyobject(hidden_values);
+    ARG_MANDATORY ARG_TYPE_CHECK(columns, &PyTuple_Type, PyObject *);
+    ARG_MANDATORY ARG_int(access);
+    ARG_OPTIONAL ARG_bool(repr_invalid);
+    ARG_OPTIONAL ARG_pyobject(primary_key);
+    ARG_EPILOG(NULL, VTRowCursor_set_rows_USAGE, );
+  }
+
+  if (!PyTuple_Check(hidden_values) && !PyList_Check(hidden_values))
+    return PyErr_Format(PyExc_TypeError, "Expected hidden_values to be a tuple or list not %s",
+                        Py_TypeName(hidden_values));
+
+  if (access != VTROW_BY_INDEX && access != VTROW_BY_NAME && access != VTROW_BY_ATTR)
+    return PyErr_Format(PyExc_ValueError, "access %d is not a VTColumnAccess value", access);
+
+  if (primary_key && !Py_IsNone(primary_key))
+  {
+    pk = PyLong_AsInt(primary_key);
+    if (pk == -1 && PyErr_Occurred())
+      return NULL;
+    if (pk < 0 || pk >= PyTuple_GET_SIZE(columns))
+      return PyErr_Format(PyExc_ValueError, "primary_key %d should be None or a column number < %zd", pk,
+                          PyTuple_GET_SIZE(columns));
+  }
+
+  names = PyTuple_New(PyTuple_GET_SIZE(columns));
+  if (!names)
+    return NULL;
+  for (i = 0; i < PyTuple_GET_SIZE(columns); i++)
+  {
+    PyObject *name = PyTuple_GET_ITEM(columns, i);
+    if (!PyUnicode_CheckExact(name))
+    {
+      Py_DECREF(names);
+      return PyErr_Format(PyExc_TypeError, "Column names should be str not %s", Py_TypeName(name));
+    }
+    /* interned names make attribute and dict lookups quicker */
+    Py_INCREF(name);
+    PyUnicode_InternInPlace(&name);
+    PyTuple_SET_ITEM(names, i, name);
+  }
+
+  rows = PyObject_GetIter(rows);
+  if (!rows)
+  {
+    Py_DECREF(names);
+    return NULL;
+  }
+
+  Py_XSETREF(self->rows, rows);
+  Py_CLEAR(self->current_row);
+  Py_XSETREF(self->columns, names);
+  Py_XSETREF(self->hidden_values, Py_NewRef(hidden_values));
+  self->num_columns = PyTuple_GET_SIZE(names);
+  self->access = access;
+  self->repr_invalid = repr_invalid;
+  self->primary_key = pk;
+
+  if (VTRowCursor_next_internal(self_))
+    return NULL;
+  Py_RETURN_NONE;
+}
+
+/** .. method:: Eof() -> bool
+
+  Returns *True* if the end of the rows has been reached.
+*/
+static PyObject *
+VTRowCursor_Eof(PyObject *self, PyObject *Py_UNUSED(unused))
+{
+  return Py_NewRef(VTRowCursor_eof(self) ? Py_True : Py_False);
+}
+
+/** .. method:: Next() -> None
+
+  Advances to the next row.
+*/
+static PyObject *
+VTRowCursor_Next(PyObject *self, PyObject *Py_UNUSED(unused))
+{
+  if (VTRowCursor_next_internal(self))
+    return NULL;
+  Py_RETURN_NONE;
+}
+
+/** .. method:: Column(number: int) -> SQLiteValue
+
+  Returns the value of column *number* in the current row.  Numbers
+  past the row columns come from *hidden_values*, and -1 returns the
+  :meth:`Rowid`.  Values are found using ``row[number]``,
+  ``row[columns[number]]``, or ``getattr(row, columns[number])``
+  depending on *access*.
+*/
+static PyObject *
+VTRowCursor_Column(PyObject *self, PyObject *const *fast_args, Py_ssize_t fast_nargs, PyObject *fast_kwnames)
+{
+  int number;
+  {
+    VTRowCursor_Column_CHECK;
+    ARG_PROLOG(1, VTRowCursor_Column_KWNAMES);
+    ARG_MANDATORY ARG_int(number);
+    ARG_EPILOG(NULL, VTRowCursor_Column_USAGE, );
+  }
+  if (number == -1)
+  {
+    sqlite3_int64 rowid;
+    if (VTRowCursor_rowid(self, &rowid))
+      return NULL;
+    return PyLong_FromLongLong(rowid);
+  }
+  return VTRowCursor_value(self, number);
+}
+
+/** .. method:: Rowid() -> int
+
+  Returns the *primary_key* column, or the :func:`id` of the current
+  row.
+*/
+static PyObject *
+VTRowCursor_Rowid(PyObject *self, PyObject *Py_UNUSED(unused))
+{
+  sqlite3_int64 rowid;
+  if (VTRowCursor_rowid(self, &rowid))
+    return NULL;
+  return PyLong_FromLongLong(rowid);
+}
+
+/** .. method:: Close() -> None
+
+  Closes the rows iterator if it has not reached the end.
+*/
+static PyObject *
+VTRowCursor_Close(PyObject *self_, PyObject *Py_UNUSED(unused))
+{
+  VTRowCursor *self = (VTRowCursor *)self_;
+  PyObject *rows = self->rows, *res = NULL;
+
+  self->rows = NULL;
+  Py_CLEAR(self->current_row);
+  if (rows && PyObject_HasAttr(rows, apst.close))
+  {
+    PyObject *vargs[] = { NULL, rows };
+    res = PyObject_VectorcallMethod(apst.close, vargs + 1, 1 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
+  }
+  Py_XDECREF(rows);
+  if (PyErr_Occurred())
+  {
+    Py_XDECREF(res);
+    return NULL;
+  }
+  Py_XDECREF(res);
+  Py_RETURN_NONE;
+}
+
+/** .. attribute:: current_row
+  :type: Any
+
+  The current row object, or *None* if there isn't one.
+*/
+static PyObject *
+VTRowCursor_get_current_row(PyObject *self, void *Py_UNUSED(unused))
+{
+  PyObject *row = ((VTRowCursor *)self)->current_row;
+  return Py_NewRef(row ? row : Py_None);
+}
+
+static PyGetSetDef VTRowCursor_getsetters[] = {
+  { "current_row", VTRowCursor_get_current_row, NULL, VTRowCursor_current_row_DOC },
+  { 0 },
+};
+
+static PyMethodDef VTRowCursor_methods[] = {
+  { "set_rows", (PyCFunction)VTRowCursor_set_rows, METH_FASTCALL | METH_KEYWORDS, VTRowCursor_set_rows_DOC },
+  { "Eof", (PyCFunction)VTRowCursor_Eof, METH_NOARGS, VTRowCursor_Eof_DOC },
+  { "Next", (PyCFunction)VTRowCursor_Next, METH_NOARGS, VTRowCursor_Next_DOC },
+  { "Column", (PyCFunction)VTRowCursor_Column, METH_FASTCALL | METH_KEYWORDS, VTRowCursor_Column_DOC },
+  { "Rowid", (PyCFunction)VTRowCursor_Rowid, METH_NOARGS, VTRowCursor_Rowid_DOC },
+  { "Close", (PyCFunction)VTRowCursor_Close, METH_NOARGS, VTRowCursor_Close_DOC },
+  { 0 },
+};
+
+static PyTypeObject VTRowCursorType = {
+  PyVarObject_HEAD_INIT(NULL, 0).tp_name = "apsw.VTRowCursor",
+  .tp_doc = VTRowCursor_class_DOC,
+  .tp_basicsize = sizeof(VTRowCursor),
+  .tp_dealloc = VTRowCursor_dealloc,
+  .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE | Py_TPFLAGS_HAVE_GC,
+  .tp_traverse = VTRowCursor_tp_traverse,
+  .tp_clear = VTRowCursor_tp_clear,
+  .tp_methods = VTRowCursor_methods,
+  .tp_getset = VTRowCursor_getsetters,
+  .tp_new = PyType_GenericNew,
+};
+
+/* Returns 1 if SQLite's calls can go directly to the C
+   implementation, which is when the subclass hasn't overridden
+   any of the methods */
+static int
+VTRowCursor_is_direct(PyObject *cursor)
+{
+  PyObject *names[] = { apst.Eof, apst.Next, apst.Column, apst.Rowid };
+  int i, direct = 1;
+
+  if (!PyObject_TypeCheck(cursor, &VTRowCursorType))
+    return 0;
+  for (i = 0; direct && i < (int)(sizeof(names) / sizeof(names[0])); i++)
+  {
+    PyObject *ours = PyObject_GetAttr((PyObject *)&VTRowCursorType, names[i]),
+             *theirs = PyObject_GetAttr((PyObject *)Py_TYPE(cursor), names[i]);
+    direct = ours && ours == theirs;
+    Py_XDECREF(ours);
+    Py_XDECREF(theirs);
+  }
+  PyErr_Clear();
+  return direct;
+}
+
 /* xShadowName has no context information so we have to make
    make multiple functions (so each has a different address
    and do lots of housekeeping.
@@ -2851,4 +3288,925 @@ apswvtabSetupModuleDef(PyObject *datasource, int iVersion, int eponymous, int ep
   return mod;
 }
 
+/* Columnar data virtual table.  This backs
+   Connection.create_columns_table with values coming from buffers,
+   Arrow C data interface arrays, or tuples of Python objects.  Only
+   the last needs the GIL to answer xColumn. */
+
+enum
+{
+  COLUMNS_NULL,
+  COLUMNS_INT8,
+  COLUMNS_UINT8,
+  COLUMNS_INT16,
+  COLUMNS_UINT16,
+  COLUMNS_INT32,
+  COLUMNS_UINT32,
+  COLUMNS_INT64,
+  COLUMNS_FLOAT,
+  COLUMNS_DOUBLE,
+  COLUMNS_BOOL_BYTE, /* one byte per value */
+  COLUMNS_BOOL_BIT,  /* Arrow bitmap */
+  COLUMNS_UTF8,
+  COLUMNS_LARGE_UTF8,
+  COLUMNS_BINARY,
+  COLUMNS_LARGE_BINARY,
+  COLUMNS_OBJECT,
+};
+
+static const char *const columns_decltype[] = {
+  "",     "INTEGER", "INTEGER", "INTEGER", "INTEGER", "INTEGER", "INTEGER", "INTEGER", "REAL",
+  "REAL", "INTEGER", "INTEGER", "TEXT",    "TEXT",    "BLOB",    "BLOB",    "",
+};
+
+/* one column of one chunk */
+typedef struct
+{
+  int kind;
+  const void *values;             /* fixed width values, or offsets for variable width */
+  const unsigned char *data;      /* variable width data */
+  const unsigned char *validity;  /* Arrow validity bitmap, NULL if no nulls */
+  int64_t offset;                 /* added to the row number */
+  PyObject *objects;              /* tuple for COLUMNS_OBJECT */
+} columns_source;
+
+typedef struct
+{
+  sqlite3_int64 start, length;
+  columns_source *sources;
+} columns_chunk;
+
+typedef struct columns_table
+{
+  int ncols, nchunks, chunks_allocated;
+  sqlite3_int64 nrows;
+  columns_chunk *chunks;
+  char *declaration;
+  /* what we have to release */
+  Py_buffer *views;
+  int nviews;
+  struct ArrowSchema arrow_schema;
+  struct ArrowArray *arrow_arrays;
+} columns_table;
+
+typedef struct
+{
+  sqlite3_vtab base;
+  columns_table *table;
+} columns_vtab;
+
+typedef struct
+{
+  sqlite3_vtab_cursor base;
+  columns_table *table;
+  sqlite3_int64 row, end;
+  int chunk;
+} columns_cursor;
+
+static void
+columns_table_free(void *context)
+{
+  columns_table *ct = (columns_table *)context;
+  PyGILState_STATE gilstate = PyGILState_Ensure();
+  int i, j;
+
+  for (i = 0; i < ct->nchunks; i++)
+  {
+    if (ct->chunks[i].sources)
+      for (j = 0; j < ct->ncols; j++)
+        Py_XDECREF(ct->chunks[i].sources[j].objects);
+    PyMem_Free(ct->chunks[i].sources);
+  }
+  PyMem_Free(ct->chunks);
+  for (i = 0; i < ct->nviews; i++)
+    PyBuffer_Release(&ct->views[i]);
+  PyMem_Free(ct->views);
+  if (ct->arrow_arrays)
+    for (i = 0; i < ct->nchunks; i++)
+      if (ct->arrow_arrays[i].release)
+        ct->arrow_arrays[i].release(&ct->arrow_arrays[i]);
+  PyMem_Free(ct->arrow_arrays);
+  if (ct->arrow_schema.release)
+    ct->arrow_schema.release(&ct->arrow_schema);
+  sqlite3_free(ct->declaration);
+  PyMem_Free(ct);
+
+  PyGILState_Release(gilstate);
+}
+
+/* adds an empty chunk returning its sources, with arrow_arrays kept
+   the same size if in use */
+static columns_source *
+columns_table_add_chunk(columns_table *ct)
+{
+  if (ct->nchunks == ct->chunks_allocated)
+  {
+    int allocated = 8 + ct->chunks_allocated * 2;
+    columns_chunk *chunks = PyMem_Realloc(ct->chunks, sizeof(columns_chunk) * allocated);
+    if (!chunks)
+      goto nomem;
+    ct->chunks = chunks;
+    if (ct->arrow_schema.release)
+    {
+      struct ArrowArray *arrays = PyMem_Realloc(ct->arrow_arrays, sizeof(struct ArrowArray) * allocated);
+      if (!arrays)
+        goto nomem;
+      ct->arrow_arrays = arrays;
+      memset(ct->arrow_arrays + ct->chunks_allocated, 0,
+             sizeof(struct ArrowArray) * (allocated - ct->chunks_allocated));
+    }
+    ct->chunks_allocated = allocated;
+  }
+  columns_chunk *chunk = &ct->chunks[ct->nchunks];
+  chunk->start = ct->nrows;
+  chunk->length = 0;
+  chunk->sources = PyMem_Calloc(ct->ncols + 1, sizeof(columns_source));
+  if (!chunk->sources)
+    goto nomem;
+  ct->nchunks++;
+  return chunk->sources;
+
+nomem:
+  PyErr_NoMemory();
+  return NULL;
+}
+
+/* sqlite3_str records any out of memory for columns_declaration_finish
+   to report */
+static sqlite3_str *
+columns_declaration_start(void)
+{
+  sqlite3_str *decl = sqlite3_str_new(NULL);
+  sqlite3_str_appendall(decl, "CREATE TABLE x(");
+  return decl;
+}
+
+static void
+columns_declaration_add(sqlite3_str *decl, int column, const char *name, int kind)
+{
+  sqlite3_str_appendf(decl, "%s\"%w\" %s", column ? ", " : "", name, columns_decltype[kind]);
+}
+
+/* Arrow names can be empty */
+static void
+columns_declaration_add_arrow(sqlite3_str *decl, int column, const struct ArrowSchema *schema, int kind)
+{
+  if (schema->name && *schema->name)
+    columns_declaration_add(decl, column, schema->name, kind);
+  else
+  {
+    char name[32];
+    PyOS_snprintf(name, sizeof(name), "c%d", column);
+    columns_declaration_add(decl, column, name, kind);
+  }
+}
+
+static int
+columns_declaration_finish(columns_table *ct, sqlite3_str *decl)
+{
+  sqlite3_str_appendall(decl, ")");
+  if (sqlite3_str_errcode(decl))
+  {
+    sqlite3_free(sqlite3_str_finish(decl));
+    PyErr_NoMemory();
+    return -1;
+  }
+  ct->declaration = sqlite3_str_finish(decl);
+  return 0;
+}
+
+static int
+columns_source_from_buffer(columns_table *ct, columns_source *source, PyObject *name, PyObject *value,
+                           sqlite3_int64 *length)
+{
+  Py_buffer *view = &ct->views[ct->nviews];
+  if (0 != PyObject_GetBuffer(value, view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS))
+    return -1;
+  ct->nviews++;
+
+  const char *format = view->format ? view->format : "B";
+  if (*format == '@' || *format == '=' || *format == (PY_LITTLE_ENDIAN ? '<' : '>'))
+    format++;
+
+  int kind = -1;
+  if (view->ndim <= 1 && strlen(format) == 1)
+  {
+    if (strchr("bhilqn", *format))
+      kind = (view->itemsize == 1)   ? COLUMNS_INT8
+             : (view->itemsize == 2) ? COLUMNS_INT16
+             : (view->itemsize == 4) ? COLUMNS_INT32
+             : (view->itemsize == 8) ? COLUMNS_INT64
+                                     : -1;
+    else if (strchr("BHILQN", *format))
+      kind = (view->itemsize == 1)   ? COLUMNS_UINT8
+             : (view->itemsize == 2) ? COLUMNS_UINT16
+             : (view->itemsize == 4) ? COLUMNS_UINT32
+                                     : -1;
+    else if (*format == 'f' && view->itemsize == 4)
+      kind = COLUMNS_FLOAT;
+    else if (*format == 'd' && view->itemsize == 8)
+      kind = COLUMNS_DOUBLE;
+    else if (*format == '?' && view->itemsize == 1)
+      kind = COLUMNS_BOOL_BYTE;
+  }
+  if (kind < 0)
+  {
+    PyErr_Format(PyExc_ValueError, "Column %R buffer format \"%s\" size %zd is not supported", name, view->format,
+                 view->itemsize);
+    return -1;
+  }
+  /* see carray for why this is checked */
+  unsigned align = ((uintptr_t)view->buf) % view->itemsize;
+  if (align)
+  {
+    PyErr_Format(PyExc_ValueError, "Column %R buffer data is at %p which is not aligned, misaligned at %u", name,
+                 view->buf, align);
+    return -1;
+  }
+  source->kind = kind;
+  source->values = view->buf;
+  *length = view->len / view->itemsize;
+  return 0;
+}
+
+static int
+columns_table_from_dict(columns_table *ct, PyObject *columns)
+{
+  /* a copy because converting sequences runs Python code */
+  PyObject *items = PyDict_Items(columns);
+  columns_source *sources;
+  sqlite3_str *decl = NULL;
+  int column;
+
+  if (!items)
+    return -1;
+  ct->ncols = (int)PyList_GET_SIZE(items);
+  if (!ct->ncols)
+  {
+    PyErr_Format(PyExc_ValueError, "At least one column must be provided");
+    goto error;
+  }
+  ct->views = PyMem_Calloc(ct->ncols, sizeof(Py_buffer));
+  if (!ct->views)
+  {
+    PyErr_NoMemory();
+    goto error;
+  }
+  sources = columns_table_add_chunk(ct);
+  if (!sources)
+    goto error;
+  decl = columns_declaration_start();
+
+  for (column = 0; column < ct->ncols; column++)
+  {
+    PyObject *name = PyTuple_GET_ITEM(PyList_GET_ITEM(items, column), 0),
+             *value = PyTuple_GET_ITEM(PyList_GET_ITEM(items, column), 1);
+    sqlite3_int64 length;
+    const char *utf8 = PyUnicode_Check(name) ? PyUnicode_AsUTF8(name) : NULL;
+    if (!utf8)
+    {
+      if (!PyErr_Occurred())
+        PyErr_Format(PyExc_TypeError, "Column names must be str not %s", Py_TypeName(name));
+      goto error;
+    }
+    if (PyObject_CheckBuffer(value))
+    {
+      if (columns_source_from_buffer(ct, &sources[column], name, value, &length))
+        goto error;
+    }
+    else if (PyUnicode_Check(value))
+    {
+      PyErr_Format(PyExc_TypeError, "Column %R should be a buffer or sequence of values, not str", name);
+      goto error;
+    }
+    else
+    {
+      sources[column].objects = PySequence_Tuple(value);
+      if (!sources[column].objects)
+        goto error;
+      sources[column].kind = COLUMNS_OBJECT;
+      length = PyTuple_GET_SIZE(sources[column].objects);
+    }
+    if (column && length != ct->chunks[0].length)
+    {
+      PyErr_Format(PyExc_ValueError, "Column %R has %lld rows but previous columns have %lld", name, length,
+                   ct->chunks[0].length);
+      goto error;
+    }
+    ct->chunks[0].length = length;
+    columns_declaration_add(decl, column, utf8, sources[column].kind);
+  }
+  ct->nrows = ct->chunks[0].length;
+  Py_DECREF(items);
+  return columns_declaration_finish(ct, decl);
+
+error:
+  if (decl)
+    sqlite3_free(sqlite3_str_finish(decl));
+  Py_DECREF(items);
+  return -1;
+}
+
+/* sets up one column from an Arrow child array */
+static int
+columns_source_from_arrow(columns_source *source, const struct ArrowSchema *schema, const struct ArrowArray *array,
+                          int64_t parent_offset, int column)
+{
+  const char *format = schema->format;
+  int kind = -1, nbuffers = 2;
+
+  if (!strcmp(format, "n"))
+    kind = COLUMNS_NULL, nbuffers = 0;
+  else if (!strcmp(format, "b"))
+    kind = COLUMNS_BOOL_BIT;
+  else if (!strcmp(format, "c"))
+    kind = COLUMNS_INT8;
+  else if (!strcmp(format, "C"))
+    kind = COLUMNS_UINT8;
+  else if (!strcmp(format, "s"))
+    kind = COLUMNS_INT16;
+  else if (!strcmp(format, "S"))
+    kind = COLUMNS_UINT16;
+  else if (!strcmp(format, "i") || !strcmp(format, "tdD") || !strcmp(format, "tts") || !strcmp(format, "ttm"))
+    kind = COLUMNS_INT32;
+  else if (!strcmp(format, "I"))
+    kind = COLUMNS_UINT32;
+  else if (!strcmp(format, "l") || !strcmp(format, "tdm") || !strcmp(format, "ttu") || !strcmp(format, "ttn")
+           || !strncmp(format, "ts", 2) || !strncmp(format, "tD", 2))
+    kind = COLUMNS_INT64;
+  else if (!strcmp(format, "f"))
+    kind = COLUMNS_FLOAT;
+  else if (!strcmp(format, "g"))
+    kind = COLUMNS_DOUBLE;
+  else if (!strcmp(format, "u"))
+    kind = COLUMNS_UTF8, nbuffers = 3;
+  else if (!strcmp(format, "U"))
+    kind = COLUMNS_LARGE_UTF8, nbuffers = 3;
+  else if (!strcmp(format, "z"))
+    kind = COLUMNS_BINARY, nbuffers = 3;
+  else if (!strcmp(format, "Z"))
+    kind = COLUMNS_LARGE_BINARY, nbuffers = 3;
+
+  if (kind < 0 || schema->dictionary || array->dictionary || array->n_children)
+  {
+    PyErr_Format(PyExc_ValueError, "Column %d (%s) Arrow format \"%s\" is not supported", column,
+                 schema->name ? schema->name : "", format);
+    return -1;
+  }
+  if (array->n_buffers != nbuffers)
+  {
+    PyErr_Format(PyExc_ValueError, "Column %d (%s) Arrow format \"%s\" should have %d buffers not %lld", column,
+                 schema->name ? schema->name : "", format, nbuffers, (long long)array->n_buffers);
+    return -1;
+  }
+  source->kind = kind;
+  source->offset = parent_offset + array->offset;
+  source->validity = (nbuffers && array->null_count) ? array->buffers[0] : NULL;
+  source->values = (nbuffers > 1) ? array->buffers[1] : NULL;
+  source->data = (nbuffers > 2) ? array->buffers[2] : NULL;
+  return 0;
+}
+
+/* ct->arrow_schema has been filled in */
+static int
+columns_table_arrow_schema(columns_table *ct)
+{
+  struct ArrowSchema *schema = &ct->arrow_schema;
+  if (!schema->release)
+  {
+    PyErr_Format(PyExc_ValueError, "Arrow schema has already been released");
+    return -1;
+  }
+  if (strcmp(schema->format, "+s") || !schema->n_children)
+  {
+    PyErr_Format(PyExc_ValueError, "Arrow data must be a struct (record batch) with at least one column, not \"%s\"",
+                 schema->format);
+    return -1;
+  }
+  ct->ncols = (int)schema->n_children;
+  return 0;
+}
+
+/* ct->arrow_arrays[ct->nchunks - 1] has been filled in */
+static int
+columns_table_arrow_chunk(columns_table *ct, columns_source *sources)
+{
+  const struct ArrowArray *array = &ct->arrow_arrays[ct->nchunks - 1];
+  int column;
+  sqlite3_str *decl = NULL;
+
+  if (array->n_children != ct->ncols)
+  {
+    PyErr_Format(PyExc_ValueError, "Arrow array has %lld columns but the schema has %d", (long long)array->n_children,
+                 ct->ncols);
+    return -1;
+  }
+  if (array->n_buffers && array->buffers[0] && array->null_count)
+  {
+    PyErr_Format(PyExc_ValueError, "Arrow record batches with null rows are not supported");
+    return -1;
+  }
+  if (ct->nchunks == 1)
+    decl = columns_declaration_start();
+  for (column = 0; column < ct->ncols; column++)
+  {
+    struct ArrowSchema *schema = ct->arrow_schema.children[column];
+    if (columns_source_from_arrow(&sources[column], schema, array->children[column], array->offset, column))
+      goto error;
+    if (decl)
+      columns_declaration_add_arrow(decl, column, schema, sources[column].kind);
+  }
+  ct->chunks[ct->nchunks - 1].length = array->length;
+  ct->nrows += array->length;
+  return decl ? columns_declaration_finish(ct, decl) : 0;
+
+error:
+  if (decl)
+    sqlite3_free(sqlite3_str_finish(decl));
+  return -1;
+}
+
+static int
+columns_table_from_arrow_array(columns_table *ct, PyObject *columns)
+{
+  PyObject *capsules = NULL;
+  int res = -1;
+
+  PyObject *vargs[] = { NULL, columns };
+  capsules = PyObject_VectorcallMethod(apst.s_arrow_c_array, vargs + 1, 1 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
+  if (!capsules)
+    goto finally;
+  if (!PyTuple_Check(capsules) || PyTuple_GET_SIZE(capsules) != 2
+      || !PyCapsule_IsValid(PyTuple_GET_ITEM(capsules, 0), "arrow_schema")
+      || !PyCapsule_IsValid(PyTuple_GET_ITEM(capsules, 1), "arrow_array"))
+  {
+    PyErr_Format(PyExc_TypeError, "__arrow_c_array__ should return a tuple of arrow_schema and arrow_array capsules");
+    goto finally;
+  }
+
+  /* move them out of the capsules, with the capsule destructor
+     releasing anything not moved */
+  struct ArrowSchema *schema = PyCapsule_GetPointer(PyTuple_GET_ITEM(capsules, 0), "arrow_schema");
+  struct ArrowArray *array = PyCapsule_GetPointer(PyTuple_GET_ITEM(capsules, 1), "arrow_array");
+  ct->arrow_schema = *schema;
+  schema->release = NULL;
+  if (columns_table_arrow_schema(ct))
+    goto finally;
+
+  columns_source *sources = columns_table_add_chunk(ct);
+  if (!sources)
+    goto finally;
+  ct->arrow_arrays[0] = *array;
+  array->release = NULL;
+
+  res = columns_table_arrow_chunk(ct, sources);
+
+finally:
+  Py_XDECREF(capsules);
+  return res;
+}
+
+static int
+columns_table_from_arrow_stream(columns_table *ct, PyObject *columns)
+{
+  PyObject *capsule = NULL;
+  struct ArrowArrayStream stream = { 0 };
+  int res = -1;
+
+  PyObject *vargs[] = { NULL, columns };
+  capsule = PyObject_VectorcallMethod(apst.s_arrow_c_stream, vargs + 1, 1 | PY_VECTORCALL_ARGUMENTS_OFFSET, NULL);
+  if (!capsule)
+    goto finally;
+  if (!PyCapsule_IsValid(capsule, "arrow_array_stream"))
+  {
+    PyErr_Format(PyExc_TypeError, "__arrow_c_stream__ should return an arrow_array_stream capsule");
+    goto finally;
+  }
+  /* move it out of the capsule */
+  struct ArrowArrayStream *source = PyCapsule_GetPointer(capsule, "arrow_array_stream");
+  stream = *source;
+  source->release = NULL;
+  Py_CLEAR(capsule);
+
+  if (stream.get_schema(&stream, &ct->arrow_schema))
+    goto stream_error;
+  if (columns_table_arrow_schema(ct))
+    goto finally;
+
+  for (;;)
+  {
+    struct ArrowArray array = { 0 };
+    if (stream.get_next(&stream, &array))
+      goto stream_error;
+    if (!array.release)
+      break;
+    columns_source *sources = columns_table_add_chunk(ct);
+    if (!sources)
+    {
+      array.release(&array);
+      goto finally;
+    }
+    ct->arrow_arrays[ct->nchunks - 1] = array;
+    if (columns_table_arrow_chunk(ct, sources))
+      goto finally;
+  }
+
+  if (!ct->declaration)
+  {
+    /* no batches, so use the schema for the declaration */
+    sqlite3_str *decl = columns_declaration_start();
+    int column;
+    for (column = 0; column < ct->ncols; column++)
+      columns_declaration_add_arrow(decl, column, ct->arrow_schema.children[column], COLUMNS_NULL);
+    if (columns_declaration_finish(ct, decl))
+      goto finally;
+  }
+  res = 0;
+  goto finally;
+
+stream_error:
+{
+  const char *msg = stream.get_last_error(&stream);
+  PyErr_Format(PyExc_ValueError, "Arrow stream error: %s", msg ? msg : "(no message)");
+}
+
+finally:
+  if (stream.release)
+    stream.release(&stream);
+  Py_XDECREF(capsule);
+  return res;
+}
+
+/* Returns NULL with an exception on failure */
+static columns_table *
+columns_table_create(PyObject *columns)
+{
+  columns_table *ct = PyMem_Calloc(1, sizeof(columns_table));
+  int res;
+  if (!ct)
+  {
+    PyErr_NoMemory();
+    return NULL;
+  }
+
+  if (PyDict_Check(columns))
+    res = columns_table_from_dict(ct, columns);
+  else if (PyObject_HasAttr(columns, apst.s_arrow_c_stream))
+    res = columns_table_from_arrow_stream(ct, columns);
+  else if (PyObject_HasAttr(columns, apst.s_arrow_c_array))
+    res = columns_table_from_arrow_array(ct, columns);
+  else
+  {
+    PyErr_Format(PyExc_TypeError, "Expected a dict of columns or an object supporting the Arrow PyCapsule interface, not %s",
+                 Py_TypeName(columns));
+    res = -1;
+  }
+
+  if (res)
+  {
+    columns_table_free(ct);
+    return NULL;
+  }
+  return ct;
+}
+
+static int
+columns_vtab_connect(sqlite3 *db, void *pAux, int argc, const char *const *argv, sqlite3_vtab **pVTab, char **errmsg)
+{
+  columns_table *ct = (columns_table *)pAux;
+  columns_vtab *vtab;
+  int res;
+
+  (void)argc;
+  (void)argv;
+  (void)errmsg;
+
+  res = sqlite3_declare_vtab(db, ct->declaration);
+  if (res != SQLITE_OK)
+    return res;
+  vtab = sqlite3_malloc(sizeof(columns_vtab));
+  if (!vtab)
+    return SQLITE_NOMEM;
+  memset(vtab, 0, sizeof(*vtab));
+  vtab->table = ct;
+  *pVTab = &vtab->base;
+  return SQLITE_OK;
+}
+
+static int
+columns_vtab_disconnect(sqlite3_vtab *pVTab)
+{
+  sqlite3_free(pVTab);
+  return SQLITE_OK;
+}
+
+/* idxNum bits saying which rowid constraints were used, in argv order */
+#define COLUMNS_ROWID_EQ 1
+#define COLUMNS_ROWID_GT 2
+#define COLUMNS_ROWID_GE 4
+#define COLUMNS_ROWID_LT 8
+#define COLUMNS_ROWID_LE 16
+
+static int
+columns_vtab_best_index(sqlite3_vtab *pVTab, sqlite3_index_info *info)
+{
+  columns_table *ct = ((columns_vtab *)pVTab)->table;
+  int i, eq = -1, lower = -1, upper = -1, argv_index = 0;
+
+  for (i = 0; i < info->nConstraint; i++)
+  {
+    if (!info->aConstraint[i].usable || info->aConstraint[i].iColumn != -1)
+      continue;
+    switch (info->aConstraint[i].op)
+    {
+    case SQLITE_INDEX_CONSTRAINT_EQ:
+      if (eq < 0)
+        eq = i;
+      break;
+    case SQLITE_INDEX_CONSTRAINT_GT:
+    case SQLITE_INDEX_CONSTRAINT_GE:
+      if (lower < 0)
+        lower = i;
+      break;
+    case SQLITE_INDEX_CONSTRAINT_LT:
+    case SQLITE_INDEX_CONSTRAINT_LE:
+      if (upper < 0)
+        upper = i;
+      break;
+    }
+  }
+
+  /* SQLite also checks the constraints so we don't have to be exact */
+  info->idxNum = 0;
+  if (eq >= 0)
+  {
+    info->idxNum |= COLUMNS_ROWID_EQ;
+    info->aConstraintUsage[eq].argvIndex = ++argv_index;
+  }
+  if (lower >= 0)
+  {
+    info->idxNum |= (info->aConstraint[lower].op == SQLITE_INDEX_CONSTRAINT_GT) ? COLUMNS_ROWID_GT : COLUMNS_ROWID_GE;
+    info->aConstraintUsage[lower].argvIndex = ++argv_index;
+  }
+  if (upper >= 0)
+  {
+    info->idxNum |= (info->aConstraint[upper].op == SQLITE_INDEX_CONSTRAINT_LT) ? COLUMNS_ROWID_LT : COLUMNS_ROWID_LE;
+    info->aConstraintUsage[upper].argvIndex = ++argv_index;
+  }
+
+  if (eq >= 0)
+  {
+    info->estimatedRows = 1;
+    info->estimatedCost = 1;
+    info->idxFlags |= SQLITE_INDEX_SCAN_UNIQUE;
+  }
+  else
+  {
+    info->estimatedRows = Py_MAX(1, ct->nrows / ((lower >= 0) + (upper >= 0) + 1));
+    info->estimatedCost = (double)info->estimatedRows;
+  }
+
+  if (info->nOrderBy == 1 && info->aOrderBy[0].iColumn == -1 && !info->aOrderBy[0].desc)
+    info->orderByConsumed = 1;
+
+  return SQLITE_OK;
+}
+
+static int
+columns_vtab_open(sqlite3_vtab *pVTab, sqlite3_vtab_cursor **ppCursor)
+{
+  columns_cursor *cursor = sqlite3_malloc(sizeof(columns_cursor));
+  if (!cursor)
+    return SQLITE_NOMEM;
+  memset(cursor, 0, sizeof(*cursor));
+  cursor->table = ((columns_vtab *)pVTab)->table;
+  *ppCursor = &cursor->base;
+  return SQLITE_OK;
+}
+
+static int
+columns_vtab_close(sqlite3_vtab_cursor *pCursor)
+{
+  sqlite3_free(pCursor);
+  return SQLITE_OK;
+}
+
+/* narrows [*lo, *hi) by a rowid constraint.  Non-numeric values are
+   ignored because SQLite checks the constraint anyway */
+static void
+columns_rowid_bound(sqlite3_value *value, int op, sqlite3_int64 nrows, sqlite3_int64 *lo, sqlite3_int64 *hi)
+{
+  sqlite3_int64 v;
+
+  switch (sqlite3_value_type(value))
+  {
+  case SQLITE_INTEGER:
+    v = sqlite3_value_int64(value);
+    break;
+  case SQLITE_FLOAT: {
+    double d = sqlite3_value_double(value);
+    if (isnan(d))
+    {
+      *hi = *lo;
+      return;
+    }
+    if (op == COLUMNS_ROWID_EQ && d != floor(d))
+    {
+      *hi = *lo;
+      return;
+    }
+    d = (op == COLUMNS_ROWID_GE || op == COLUMNS_ROWID_LT) ? ceil(d) : floor(d);
+    v = (d < -1) ? -1 : (d > (double)nrows) ? nrows : (sqlite3_int64)d;
+    break;
+  }
+  default:
+    return;
+  }
+
+  v = (v < -1) ? -1 : (v > nrows) ? nrows : v;
+  switch (op)
+  {
+  case COLUMNS_ROWID_EQ:
+    *lo = Py_MAX(*lo, v);
+    *hi = Py_MIN(*hi, v + 1);
+    break;
+  case COLUMNS_ROWID_GT:
+    *lo = Py_MAX(*lo, v + 1);
+    break;
+  case COLUMNS_ROWID_GE:
+    *lo = Py_MAX(*lo, v);
+    break;
+  case COLUMNS_ROWID_LT:
+    *hi = Py_MIN(*hi, v);
+    break;
+  case COLUMNS_ROWID_LE:
+    *hi = Py_MIN(*hi, v + 1);
+    break;
+  }
+}
+
+static int
+columns_vtab_filter(sqlite3_vtab_cursor *pCursor, int idxNum, const char *idxStr, int argc, sqlite3_value **argv)
+{
+  columns_cursor *cursor = (columns_cursor *)pCursor;
+  columns_table *ct = cursor->table;
+  sqlite3_int64 lo = 0, hi = ct->nrows;
+  int bit, arg = 0;
+
+  (void)idxStr;
+
+  for (bit = COLUMNS_ROWID_EQ; bit <= COLUMNS_ROWID_LE; bit <<= 1)
+    if ((idxNum & bit) && arg < argc)
+      columns_rowid_bound(argv[arg++], bit, ct->nrows, &lo, &hi);
+
+  cursor->row = lo;
+  cursor->end = Py_MAX(lo, hi);
+
+  /* find the last chunk starting at or before row */
+  int first = 0, last = ct->nchunks - 1;
+  while (first < last)
+  {
+    int middle = (first + last + 1) / 2;
+    if (ct->chunks[middle].start <= cursor->row)
+      first = middle;
+    else
+      last = middle - 1;
+  }
+  cursor->chunk = first;
+  return SQLITE_OK;
+}
+
+static int
+columns_vtab_next(sqlite3_vtab_cursor *pCursor)
+{
+  columns_cursor *cursor = (columns_cursor *)pCursor;
+  columns_table *ct = cursor->table;
+
+  cursor->row++;
+  while (cursor->chunk + 1 < ct->nchunks
+         && cursor->row >= ct->chunks[cursor->chunk].start + ct->chunks[cursor->chunk].length)
+    cursor->chunk++;
+  return SQLITE_OK;
+}
+
+static int
+columns_vtab_eof(sqlite3_vtab_cursor *pCursor)
+{
+  columns_cursor *cursor = (columns_cursor *)pCursor;
+  return cursor->row >= cursor->end;
+}
+
+static int
+columns_vtab_rowid(sqlite3_vtab_cursor *pCursor, sqlite3_int64 *pRowid)
+{
+  *pRowid = ((columns_cursor *)pCursor)->row;
+  return SQLITE_OK;
+}
+
+static int
+columns_vtab_column(sqlite3_vtab_cursor *pCursor, sqlite3_context *context, int ncolumn)
+{
+  columns_cursor *cursor = (columns_cursor *)pCursor;
+  const columns_chunk *chunk = &cursor->table->chunks[cursor->chunk];
+  const columns_source *source = &chunk->sources[ncolumn];
+  int64_t i = cursor->row - chunk->start + source->offset;
+
+  if (source->validity && !(source->validity[i >> 3] & (1 << (i & 7))))
+  {
+    sqlite3_result_null(context);
+    return SQLITE_OK;
+  }
+
+  switch (source->kind)
+  {
+  case COLUMNS_NULL:
+    sqlite3_result_null(context);
+    break;
+  case COLUMNS_INT8:
+    sqlite3_result_int(context, ((const int8_t *)source->values)[i]);
+    break;
+  case COLUMNS_UINT8:
+    sqlite3_result_int(context, ((const uint8_t *)source->values)[i]);
+    break;
+  case COLUMNS_INT16:
+    sqlite3_result_int(context, ((const int16_t *)source->values)[i]);
+    break;
+  case COLUMNS_UINT16:
+    sqlite3_result_int(context, ((const uint16_t *)source->values)[i]);
+    break;
+  case COLUMNS_INT32:
+    sqlite3_result_int(context, ((const int32_t *)source->values)[i]);
+    break;
+  case COLUMNS_UINT32:
+    sqlite3_result_int64(context, ((const uint32_t *)source->values)[i]);
+    break;
+  case COLUMNS_INT64:
+    sqlite3_result_int64(context, ((const int64_t *)source->values)[i]);
+    break;
+  case COLUMNS_FLOAT:
+    sqlite3_result_double(context, ((const float *)source->values)[i]);
+    break;
+  case COLUMNS_DOUBLE:
+    sqlite3_result_double(context, ((const double *)source->values)[i]);
+    break;
+  case COLUMNS_BOOL_BYTE:
+    sqlite3_result_int(context, ((const uint8_t *)source->values)[i] != 0);
+    break;
+  case COLUMNS_BOOL_BIT:
+    sqlite3_result_int(context, (((const uint8_t *)source->values)[i >> 3] >> (i & 7)) & 1);
+    break;
+  case COLUMNS_UTF8:
+  case COLUMNS_LARGE_UTF8:
+  case COLUMNS_BINARY:
+  case COLUMNS_LARGE_BINARY: {
+    int64_t start, end;
+    if (source->kind == COLUMNS_UTF8 || source->kind == COLUMNS_BINARY)
+    {
+      start = ((const int32_t *)source->values)[i];
+      end = ((const int32_t *)source->values)[i + 1];
+    }
+    else
+    {
+      start = ((const int64_t *)source->values)[i];
+      end = ((const int64_t *)source->values)[i + 1];
+    }
+    /* a NULL pointer would give a null result */
+    const char *data = (end > start) ? (const char *)source->data + start : "";
+    if (source->kind == COLUMNS_UTF8 || source->kind == COLUMNS_LARGE_UTF8)
+      sqlite3_result_text64(context, data, end - start, SQLITE_STATIC, SQLITE_UTF8);
+    else
+      sqlite3_result_blob64(context, data, end - start, SQLITE_STATIC);
+    break;
+  }
+  case COLUMNS_OBJECT: {
+    int res = SQLITE_OK;
+    PyGILState_STATE gilstate = PyGILState_Ensure();
+    if (!set_context_result(context, PyTuple_GET_ITEM(source->objects, i)))
+    {
+      res = MakeSqliteMsgFromPyException(&pCursor->pVtab->zErrMsg);
+      AddTraceBackHere(__FILE__, __LINE__, "ColumnsTable.xColumn", "{s: i, s: L}", "column", ncolumn, "row",
+                       cursor->row);
+    }
+    PyGILState_Release(gilstate);
+    return res;
+  }
+  }
+  return SQLITE_OK;
+}
+
+static sqlite3_module columns_module = {
+  .iVersion = 1,
+  .xConnect = columns_vtab_connect,
+  .xBestIndex = columns_vtab_best_index,
+  .xDisconnect = columns_vtab_disconnect,
+  .xDestroy = columns_vtab_disconnect,
+  .xOpen = columns_vtab_open,
+  .xClose = columns_vtab_close,
+  .xFilter = columns_vtab_filter,
+  .xNext = columns_vtab_next,
+  .xEof = columns_vtab_eof,
+  .xColumn = columns_vtab_column,
+  .xRowid = columns_vtab_rowid,
+};
+
 /* end of Virtual table code */
@@ -7,6 +7,7 @@ around iteration
 
 import asyncio
 import contextlib
+import functools
 import resource
 import sqlite3
 import time
@@ -90,6 +91,26 @@ async def aiosqlite_bench(prefetch: int):
         return start, get_times()
 
 
+async def apsw_concurrent_bench(completion_batch: int):
+    # many tasks each making small queries on the same connection,
+    # which is where coalescing completions helps
+    controller = functools.partial(apsw.aio.AsyncIO, completion_batch=completion_batch)
+    with apsw.aio.contextvar_set(apsw.async_controller, controller):
+        async with contextlib.aclosing(await apsw.Connection.as_async(":memory:")) as con:
+            await con.execute(setup)
+            start = get_times()
+
+            async def task():
+                for _ in range(200):
+                    await (await con.execute(length)).get
+
+            await asyncio.gather(*(task() for _ in range(concurrent_tasks)))
+            return start, get_times()
+
+
+concurrent_tasks = 500
+
+
 # sqlite3.sqlite_version is what aiosqlite is using.  this is to
 # confirm they are using the same sqlite library/version
 print(f"""\
@@ -151,3 +172,15 @@ for prefetch in (1, 2, 16, 64, 512, 8192, 65536):
                 raise Exception(f"Unhandled {mode=}")
         show(f"{'apsw ' if 'aiosqlite' not in mode else ''}{mode}", prefetch, start, end)
 
+print(f"""
+
+{concurrent_tasks:,} tasks each making small queries on one connection
+
+{'CompletionBatch':>25s} {'Wall':>8s} {'CpuTotal':>10s} {'CpuEvtLoop':>12s} {'CpuDbWorker':>12s}""")
+
+for completion_batch in (1, 16, 256):
+    start, end = asyncio.run(apsw_concurrent_bench(completion_batch))
+    wall = end[0] - start[0]
+    cpu_total = end[1] - start[1]
+    cpu_async = end[2] - start[2]
+    print(f"{completion_batch:>25,} {wall:8.3f} {cpu_total:10.3f} {cpu_async:>12.3f} {cpu_total - cpu_async:>12.3f}")
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+
+# Compares database size against read speed for apsw.ext.CompressedVFS
+# with various codecs and cache sizes
+
+import os
+import random
+import statistics
+import tempfile
+import time
+
+import apsw
+import apsw.ext
+
+# ensure repeatable runs
+random.seed(0)
+
+ROWS = 50_000
+LOOKUPS = 20_000
+
+words = [
+    "".join(random.choice("abcdefghijklmnopqrstuvwxyz") for _ in range(random.randrange(2, 10))) for _ in range(500)
+]
+
+
+def gen_text():
+    return " ".join(random.choice(words) for _ in range(random.randrange(10, 60)))
+
+
+data = [(i, gen_text(), random.randrange(1_000_000)) for i in range(ROWS)]
+keys = [random.randrange(ROWS) for _ in range(LOOKUPS)]
+
+# name, vfs name, codec, cache pages
+configs = [
+    ("plain", "", None, 0),
+    ("zlib-1", "cpr_zlib1", apsw.ext.ZlibCodec(level=1), 1024),
+    ("zlib-6", "cpr_zlib6", apsw.ext.ZlibCodec(level=6), 1024),
+    ("zlib-9", "cpr_zlib9", apsw.ext.ZlibCodec(level=9), 1024),
+    ("zlib-6 nocache", "cpr_zlib6n", apsw.ext.ZlibCodec(level=6), 0),
+    ("lzma-6", "cpr_lzma6", apsw.ext.LZMACodec(preset=6), 1024),
+    ("lzma-6 nocache", "cpr_lzma6n", apsw.ext.LZMACodec(preset=6), 0),
+]
+
+vfs = [apsw.ext.CompressedVFS(vfs_name, codec=codec, cache_pages=cache) for _, vfs_name, codec, cache in configs if codec]
+
+tmpdir = tempfile.mkdtemp()
+
+results = {}
+
+for name, vfs_name, codec, cache in configs:
+    fname = os.path.join(tmpdir, vfs_name or "plain") + ".db"
+    con = apsw.Connection(fname, vfs=vfs_name or None)
+    # keep SQLite's own page cache small so reads reach the VFS
+    con.pragma("cache_size", 10)
+    start = time.perf_counter()
+    with con:
+        con.execute("create table t(id integer primary key, text, value)")
+        con.executemany("insert into t values(?,?,?)", data)
+    insert = time.perf_counter() - start
+    size = os.path.getsize(fname)
+
+    scans = []
+    lookups = []
+    for _ in range(3):
+        start = time.perf_counter()
+        con.execute("select sum(length(text)) from t").get
+        scans.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        for key in keys:
+            con.execute("select text from t where id=?", (key,)).get
+        lookups.append(time.perf_counter() - start)
+    con.close()
+    results[name] = (size, insert, statistics.median(scans), statistics.median(lookups))
+    print(f"{name:20} done", flush=True)
+
+plain_size = results["plain"][0]
+print(f"\n{'':20}{'size':>12}{'ratio':>8}{'insert':>9}{'scan':>9}{'lookup us':>11}\n")
+for name, (size, insert, scan, lookup) in results.items():
+    print(
+        f"{name:20}{size:12,d}{size / plain_size:8.2f}{insert:9.3f}{scan:9.3f}{lookup / LOOKUPS * 1_000_000:11.1f}"
+    )
+
+for v in vfs:
+    v.unregister()
@@ -79,6 +79,7 @@ vfsfile = apsw.VFSFile(
     "", con.db_filename("main"), [apsw.SQLITE_OPEN_MAIN_DB | apsw.SQLITE_OPEN_CREATE | apsw.SQLITE_OPEN_READWRITE, 0]
 )
 session = apsw.Session(con, "main")
+iostats = apsw.IOStatsVFS("iostats")
 
 # virtual tables aren't real - just check their size hasn't changed
 for n, e in (("VTModule", 3), ("VTTable", 17), ("VTCursor", 7)):
@@ -92,11 +93,13 @@ for name, obj in (
     ("Blob", blob),
     ("VFS", vfs),
     ("VFSFile", vfsfile),
+    ("IOStatsVFS", iostats),
     ("apsw", apsw),
     ("VFSFcntlPragma", apsw.VFSFcntlPragma),
     ("zeroblob", apsw.zeroblob(3)),
     ("Session", session),
     ("PreUpdate", apsw.PreUpdate),
+    ("VTRowCursor", apsw.VTRowCursor()),
 ):
     if name not in classes:
         retval = 1
@@ -131,6 +134,8 @@ for name, obj in (
                 "Connection",
                 "VFS",
                 "VFSFile",
+                "IOStatsVFS",
+                "VTRowCursor",
                 "zeroblob",
                 "Shell",
                 "URIFilename",
@@ -44,13 +44,14 @@ docstrings_skip = {
     "apsw.SQLITE_VERSION_NUMBER",
     "apsw.async_run_coro",
     "apsw.async_cursor_prefetch",
+    "apsw.async_cursor_prefetch_bytes",
     "apsw.async_controller",
 }
 
 virtual_table_classes = {"VTCursor", "VTModule", "VTTable"}
 
 # which classes can be subclassed at runtime - all others are marked final
-subclassable = {"Connection", "Cursor", "VFS", "VFSFile", "zeroblob", "Session", "Changeset"}
+subclassable = {"Connection", "Cursor", "VFS", "VFSFile", "zeroblob", "Session", "Changeset", "VTRowCursor"}
 
 
 def sqlite_links():
@@ -363,6 +364,7 @@ type_overrides = {
     "Blob.read_into": {"buffer": "PyObject", "offset": "int64", "length": "int64"},
     "Blob.reopen": {"rowid": "int64"},
     "Connection.blob_open": {"rowid": "int64"},
+    "Connection.create_columns_table": {"columns": "PyObject"},
     "Connection.drop_modules": {"keep": "PyObject"},
     "Connection.file_control": {"pointer": "pointer"},
     "Connection.read": {
@@ -371,6 +373,7 @@ type_overrides = {
     "Connection.set_last_insert_rowid": {"rowid": "int64"},
     "Cursor.execute": {"statements": "strtype"},
     "Cursor.executemany": {"statements": "strtype", "sequenceofbindings": "Sequence"},
+    "Cursor.fetch_into": {"buffers": "Sequence"},
     "FTS5ExtensionApi.tokenize": {
         "locale": "utf8_and_size_or_none",
     },
@@ -383,6 +386,7 @@ type_overrides = {
     "VFSFile.__init__": {"filename": "PyObject", "flags": "list[int,int]"},
     "VFSFile.xFileControl": {"ptr": "pointer"},
     "VFSFile.xRead": {"offset": "int64"},
+    "VFSFile.xReadInto": {"offset": "int64"},
     "VFSFile.xTruncate": {"newsize": "int64"},
     "VFSFile.xWrite": {"offset": "int64"},
     "VFSFcntlPragma.__init__": {
@@ -392,6 +396,12 @@ type_overrides = {
     "VFS.xDlSym": {"handle": "pointer"},
     "VFS.xSetSystemCall": {"pointer": "pointer"},
     "VFS.xOpen": {"flags": "list[int,int]"},
+    "VTRowCursor.set_rows": {
+        "rows": "PyObject",
+        "hidden_values": "PyObject",
+        "columns": "PyObject",
+        "primary_key": "PyObject",
+    },
     "zeroblob.__init__": {"size": "uint64"},
 }
 
@@ -27,7 +27,7 @@ names += """
 xAccess xCheckReservedLock xClose xCurrentTime xCurrentTimeInt64
 xDeviceCharacteristics xFileControl xFileSize xGetLastError
 xGetSystemCall xDelete xDlClose xDlError xDlOpen xDlSym xFullPathname
-xLock xNextSystemCall xOpen xRandomness xRead xSectorSize
+xLock xNextSystemCall xOpen xRandomness xRead xReadInto xSectorSize
 xSetSystemCall xSleep xSync xTruncate xUnlock xWrite
 """
 
@@ -50,13 +50,13 @@ release UPDATE INSERT DELETE
 
 null true false
 
-async_controller async_run_coro async_cursor_prefetch send
+async_controller async_run_coro async_cursor_prefetch async_cursor_prefetch_bytes send
 apsw.aio Auto configure _coro_for_value _coro_for_exception
 _coro_for_stopasynciteration
 
 apsw.shell main Shell
 
-__module__
+__module__ __arrow_c_array__ __arrow_c_stream__
 """
 
 
@@ -72,6 +72,8 @@ def mangle(name):
         "true": "strue",
         "false": "sfalse",
         "__module__": "s_module",
+        "__arrow_c_array__": "s_arrow_c_array",
+        "__arrow_c_stream__": "s_arrow_c_stream",
         "register": "sregister",
     }.get(name, name).replace(".", "_")
 
@@ -80,6 +80,51 @@ def data_source(count):
         yield t9
 
 
+class PythonRowCursor:
+    """Pure Python equivalent of :class:`apsw.VTRowCursor` to measure
+    how much the C implementation saves"""
+
+    def set_rows(self, rows, hidden_values, columns, access, repr_invalid=False, primary_key=None):
+        self.rows = iter(rows)
+        self.hidden_values = hidden_values
+        self.columns = columns
+        self.num_columns = len(columns)
+        self.access = apsw.ext.VTColumnAccess(access)
+        self.repr_invalid = repr_invalid
+        self.primary_key = primary_key
+        self.Next()
+
+    def Eof(self):
+        return self.rows is None
+
+    def Next(self):
+        try:
+            self.current_row = next(self.rows)
+        except StopIteration:
+            self.rows = None
+
+    def Column(self, which):
+        if which >= self.num_columns:
+            return self.hidden_values[which - self.num_columns]
+        if self.access is apsw.ext.VTColumnAccess.By_Index:
+            v = self.current_row[which]
+        elif self.access is apsw.ext.VTColumnAccess.By_Name:
+            v = self.current_row[self.columns[which]]
+        else:
+            v = getattr(self.current_row, self.columns[which])
+        if self.repr_invalid and v is not None and not isinstance(v, (int, float, str, bytes)):
+            v = repr(v)
+        return v
+
+    def Rowid(self):
+        if self.primary_key is None:
+            return id(self.current_row)
+        return self.Column(self.primary_key)
+
+    def Close(self):
+        self.rows = None
+
+
 con = apsw.Connection("")
 
 ROWS = 1_000_000
@@ -88,7 +133,7 @@ times: dict[str, list[float]] = {}
 
 counter = 0
 for i in range(6):
-    for config in ("", "repr", "hidden"):
+    for config in ("", "repr", "hidden", "python"):
         for kind in ("index", "dict", "attr"):
             rec = kind
             if config:
@@ -109,7 +154,15 @@ for i in range(6):
                 "attr": apsw.ext.VTColumnAccess.By_Attr,
             }[kind]
             data_source.column_access = access
-            apsw.ext.make_virtual_module(con, f"data_source{counter}", data_source, repr_invalid=config == "repr")
+            # make_virtual_module cursors subclass apsw.VTRowCursor when called
+            # so this substitutes the pure Python version
+            row_cursor = apsw.VTRowCursor
+            if config == "python":
+                apsw.VTRowCursor = PythonRowCursor
+            try:
+                apsw.ext.make_virtual_module(con, f"data_source{counter}", data_source, repr_invalid=config == "repr")
+            finally:
+                apsw.VTRowCursor = row_cursor
             query = "select *"
             if config == "hidden":
                 query += ",count"